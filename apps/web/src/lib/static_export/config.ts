@@ -50,6 +50,7 @@ export const STATIC_FILES = {
   USERS: "users.json",
   SITE_CONFIG: "site_config.json",
   USER_STATS: "user_stats.json",
+  INDEX: "index.json",
 
   // Division-specific files
   SCOREBOARD: "scoreboard.json",
@@ -3,6 +3,10 @@ import {
   filterTeams,
   filterUsers,
   getDivisionFilePath,
+  getTeamFilePath,
+  getChallengeFilePath,
+  getChallengeSolvesFilePath,
+  getScoreboardPageFilePath,
 } from "./utils";
 import { STATIC_EXPORT_CONFIG, STATIC_ROUTES, STATIC_FILES } from "./config";
 import type {
@@ -25,6 +29,7 @@ import type {
   ScoreboardEntry,
   UserMeResponse,
   MyTeamResponse,
+  ExportIndex,
 } from "./types";
 
 export const IS_STATIC_EXPORT = STATIC_EXPORT_CONFIG.enabled;
@@ -36,6 +41,7 @@ class StaticExportHandler {
   private scoreboardMap = new Map<number, Map<number, ScoreboardEntry>>(); // division: { team: entry }
   private taggedScoreboardsCache = new Map<string, ScoreboardResponse>();
   private setupPromise: Promise<void> | null = null;
+  private indexPromise: Promise<ExportIndex | null> | null = null;
   private viewAs: number | null = null;
 
   constructor() {
@@ -88,6 +94,9 @@ class StaticExportHandler {
     }
     this.teamsMap = new Map(teamsData.data.entries.map((val) => [val.id, val]));
 
+    // Sharded exports look up team entries from the team shards instead
+    if (await this.loadIndex()) return;
+
     const divisions = await this.loadStaticFile<DivisionsResponse>(
       STATIC_FILES.DIVISIONS,
     );
@@ -98,7 +107,7 @@ class StaticExportHandler {
     await Promise.all(
       divisions.data.map(async ({ id }) => {
         const scoreboard = await this.loadStaticFile<ScoreboardResponse>(
-          getDivisionFilePath("1", STATIC_FILES.SCOREBOARD),
+          getDivisionFilePath(id.toString(), STATIC_FILES.SCOREBOARD),
         );
         if (!scoreboard) {
           throw new Error("Scoreboard data not available in static export");
@@ -111,6 +120,32 @@ class StaticExportHandler {
     );
   }
 
+  loadIndex(): Promise<ExportIndex | null> {
+    if (!this.indexPromise) {
+      const index = this.loadStaticFile<ExportIndex>(STATIC_FILES.INDEX);
+      this.indexPromise = index.catch(() => null);
+    }
+    return this.indexPromise;
+  }
+
+  private async getScoreboardEntry(
+    team: Team,
+  ): Promise<ScoreboardEntry | undefined> {
+    const s = this.scoreboardMap.get(team.division_id);
+    if (s) {
+      return s.get(team.id);
+    }
+    const shard = await this.loadStaticFile<{ data: ScoreboardEntry }>(
+      getTeamFilePath(team.id.toString()),
+    );
+    if (!shard) {
+      throw new Error(
+        `Scoreboard data for division ${team.division_id} not available`,
+      );
+    }
+    return shard.data;
+  }
+
   async loadStaticFile<T = unknown>(path: string): Promise<T | null> {
     if (this.cache.has(path)) {
       return this.cache.get(path) as T;
@@ -198,13 +233,7 @@ class StaticExportHandler {
     if (!team) {
       throw new Error(`Team data not available for team ${this.viewAs}`);
     }
-    const s = this.scoreboardMap.get(team.division_id);
-    if (!s) {
-      throw new Error(
-        `Scoreboard data for division ${team.division_id} not available`,
-      );
-    }
-    const scoreboardEntry = s.get(team.id);
+    const scoreboardEntry = await this.getScoreboardEntry(team);
     const solves = new Set(
       scoreboardEntry?.solves
         .filter((v) => !v.hidden)
@@ -351,6 +380,16 @@ class StaticExportHandler {
       STATIC_EXPORT_CONFIG.maxPageSize,
     );
 
+    const index = tagsParam.length ? null : await this.loadIndex();
+    if (index) {
+      return this.loadScoreboardPages(
+        divisionId,
+        page,
+        pageSize,
+        index.scoreboard_page_size,
+      );
+    }
+
     let baseScoreboard: ScoreboardResponse;
 
     if (tagsParam.length) {
@@ -402,10 +441,57 @@ class StaticExportHandler {
     };
   }
 
+  private async loadScoreboardPages(
+    divisionId: string,
+    page: number,
+    pageSize: number,
+    shardSize: number,
+  ): Promise<ScoreboardResponse> {
+    const start = (page - 1) * pageSize;
+    const firstShard = Math.floor(start / shardSize) + 1;
+    const first = await this.loadStaticFile<ScoreboardResponse>(
+      getScoreboardPageFilePath(divisionId, firstShard),
+    );
+    if (!first) {
+      throw new Error(`Scoreboard not available for division ${divisionId}`);
+    }
+
+    const total = first.data.total;
+    const lastShard = Math.min(
+      Math.floor((start + pageSize - 1) / shardSize) + 1,
+      Math.ceil(total / shardSize),
+    );
+    const rest = await Promise.all(
+      Array.from({ length: Math.max(0, lastShard - firstShard) }, (_, i) =>
+        this.loadStaticFile<ScoreboardResponse>(
+          getScoreboardPageFilePath(divisionId, firstShard + i + 1),
+        ),
+      ),
+    );
+    const entries = [first, ...rest].flatMap((s) => s?.data.entries || []);
+    const offset = start - (firstShard - 1) * shardSize;
+
+    return {
+      data: {
+        entries: entries.slice(offset, offset + pageSize),
+        page_size: pageSize,
+        total,
+      },
+    };
+  }
+
   async handleScoreboardTeamQuery(
     teamId: string,
     _params: URLSearchParams,
   ): Promise<{ data: ScoreboardEntry }> {
+    // Exports include a per-team shard with the team's graph; older exports
+    // only have the division scoreboards.
+    const shard = await this.loadStaticFile<{ data: ScoreboardEntry }>(
+      getTeamFilePath(teamId),
+    );
+    if (shard) {
+      return shard;
+    }
     await this.ensureSetup();
     const division_id = this.teamsMap.get(Number(teamId))?.division_id;
     const s = this.scoreboardMap.get(division_id!);
@@ -420,6 +506,16 @@ class StaticExportHandler {
   async handleChallengeDetails(
     challengeId: string,
   ): Promise<ChallengeDetailsResponse> {
+    if (await this.loadIndex()) {
+      const challenge = await this.loadStaticFile<ChallengeDetailsResponse>(
+        getChallengeFilePath(challengeId),
+      );
+      if (!challenge) {
+        throw new Error(`Challenge ${challengeId} not found in static export`);
+      }
+      return challenge;
+    }
+
     const challengeDetails = await this.loadStaticFile<
       ChallengeDetailsResponse[]
     >(STATIC_FILES.CHALLENGE_DETAILS);
@@ -441,6 +537,18 @@ class StaticExportHandler {
     challengeId: string,
     divisionId: string,
   ): Promise<ChallengeSolvesResponse> {
+    if (await this.loadIndex()) {
+      const solves = await this.loadStaticFile<ChallengeSolvesResponse>(
+        getChallengeSolvesFilePath(divisionId, challengeId),
+      );
+      if (!solves) {
+        throw new Error(
+          `No solves found for challenge ${challengeId} in division ${divisionId}`,
+        );
+      }
+      return solves;
+    }
+
     const challengeSolves = await this.loadStaticFile<ChallengeSolves>(
       getDivisionFilePath(divisionId, STATIC_FILES.CHALLENGE_SOLVES),
     );
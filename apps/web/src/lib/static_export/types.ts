@@ -82,6 +82,14 @@ export interface PaginatedResponse<T> {
   };
 }
 
+// Manifest of a sharded export (static exporter --sharded)
+export interface ExportIndex {
+  version: number;
+  scoreboard_page_size: number;
+  team_shards: number;
+  files: { [path: string]: { size: number; sha256: string } };
+}
+
 // Challenge solves structure (keyed by challenge ID)
 export interface ChallengeSolves {
   [challengeId: string]: ChallengeSolvesResponse;
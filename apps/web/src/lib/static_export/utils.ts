@@ -71,3 +71,28 @@ export function getDivisionFilePath(
 ): string {
   return `division:${divisionId}/${filename}`;
 }
+
+export function getTeamFilePath(teamId: string): string {
+  return `teams/${teamId}.json`;
+}
+
+export function getChallengeFilePath(challengeId: string): string {
+  return `challenges/${challengeId}.json`;
+}
+
+export function getChallengeSolvesFilePath(
+  divisionId: string,
+  challengeId: string,
+): string {
+  return getDivisionFilePath(
+    divisionId,
+    `challenge_solves/${challengeId}.json`,
+  );
+}
+
+export function getScoreboardPageFilePath(
+  divisionId: string,
+  page: number,
+): string {
+  return getDivisionFilePath(divisionId, `scoreboard/${page}.json`);
+}
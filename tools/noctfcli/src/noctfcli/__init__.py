@@ -1,11 +1,27 @@
 """noctfcli - CLI tool for noCTF challenge management."""
 
+import importlib
+from typing import TYPE_CHECKING, Any
+
 __version__ = "0.1.0"
 
-from .cli import build_cli
-from .client import NoCTFClient
-from .exceptions import APIError, NoCTFError, ValidationError
-from .models import Challenge, ChallengeConfig
+if TYPE_CHECKING:
+    from .cli import build_cli
+    from .client import NoCTFClient
+    from .exceptions import APIError, NoCTFError, ValidationError
+    from .models import Challenge, ChallengeConfig
+
+# Exports are imported on first access so that the CLI entry point does not
+# pay for httpx and pydantic before it knows which command is being run.
+_EXPORTS = {
+    "APIError": ".exceptions",
+    "Challenge": ".models",
+    "ChallengeConfig": ".models",
+    "NoCTFClient": ".client",
+    "NoCTFError": ".exceptions",
+    "ValidationError": ".exceptions",
+    "build_cli": ".cli",
+}
 
 __all__ = [
     "APIError",
@@ -16,3 +32,12 @@ __all__ = [
     "ValidationError",
     "build_cli",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    msg = f"module {__name__!r} has no attribute {name!r}"
+    raise AttributeError(msg)
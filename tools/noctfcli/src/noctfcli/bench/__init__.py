@@ -0,0 +1,5 @@
+"""Benchmarks and load generation for noctfcli and the noCTF API."""
+
+from .histogram import LatencyHistogram
+
+__all__ = ["LatencyHistogram"]
@@ -0,0 +1,234 @@
+import asyncio
+import random
+import time
+from collections.abc import Awaitable
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable, Optional
+
+from noctfcli import __version__
+from noctfcli.client import NoCTFClient
+from noctfcli.exceptions import APIError, NoCTFError
+
+from .histogram import LatencyHistogram
+
+RESULT_VERSION = 1
+
+OPERATIONS = {
+    "list": "GET /challenges",
+    "detail": "GET /challenges/:id",
+    "scoreboard": "GET /scoreboard/divisions/:id",
+    "solves": "GET /challenges/:id/solves",
+    "submit": "POST /challenges/:id/solves",
+}
+"""Workload operations mapped to the endpoint label they are reported under."""
+
+DEFAULT_MIX = {"list": 30, "detail": 30, "scoreboard": 20, "solves": 15, "submit": 5}
+
+
+def parse_mix(spec: str) -> dict[str, float]:
+    """Parse a workload mix such as "list=30,detail=30,submit=5".
+
+    Raises:
+        NoCTFError: If an operation is unknown or a weight is invalid
+    """
+
+    mix: dict[str, float] = {}
+    for part in spec.split(","):
+        name, _, weight = part.strip().partition("=")
+        if name not in OPERATIONS:
+            expected = ", ".join(OPERATIONS)
+            msg = f"Unknown operation '{name}' (expected one of {expected})"
+            raise NoCTFError(msg)
+        try:
+            mix[name] = float(weight) if weight else 1.0
+        except ValueError as e:
+            raise NoCTFError(f"Invalid weight for '{name}': {weight}") from e
+    if not any(w > 0 for w in mix.values()):
+        raise NoCTFError("Workload mix must have at least one positive weight")
+    return mix
+
+
+@dataclass
+class EndpointStats:
+    histogram: LatencyHistogram = field(default_factory=LatencyHistogram)
+    errors: int = 0
+    error_statuses: dict[str, int] = field(default_factory=dict)
+
+    @property
+    def requests(self) -> int:
+        return self.histogram.count + self.errors
+
+    def to_dict(self, elapsed: float) -> dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "error_rate": self.errors / self.requests if self.requests else 0.0,
+            "error_statuses": self.error_statuses,
+            "throughput": self.requests / elapsed if elapsed else 0.0,
+            "latency_ms": self.histogram.summary_ms(),
+            "histogram": self.histogram.to_dict(),
+        }
+
+
+@dataclass
+class EventFixture:
+    """IDs discovered from the target event that operations pick from."""
+
+    challenge_ids: list[int]
+    scoreboard_pages: dict[int, int]
+
+
+class LoadTest:
+    """Runs a weighted mix of API operations with many asyncio virtual users.
+
+    Each virtual user repeatedly picks an operation by weight, times it and
+    optionally sleeps for the think time. Successful requests are recorded in
+    a per-endpoint latency histogram; failures are counted by status.
+    """
+
+    def __init__(
+        self,
+        clients: list[NoCTFClient],
+        mix: dict[str, float],
+        users: int = 10,
+        duration: float = 30.0,
+        ramp_up: float = 0.0,
+        think_time: float = 0.0,
+        scoreboard_page_size: int = 50,
+        flag: str = "bench{incorrect}",
+        seed: Optional[int] = None,
+    ) -> None:
+        self.clients = clients
+        self.mix = {k: v for k, v in mix.items() if v > 0}
+        self.users = users
+        self.duration = duration
+        self.ramp_up = ramp_up
+        self.think_time = think_time
+        self.scoreboard_page_size = scoreboard_page_size
+        self.flag = flag
+        self.seed = seed
+        self.stats = {OPERATIONS[op]: EndpointStats() for op in self.mix}
+        self.elapsed = 0.0
+
+    async def discover(self) -> EventFixture:
+        """Find challenges and scoreboard page counts of the target event."""
+
+        client = self.clients[0]
+        challenges = await client.list_public_challenges()
+        if not challenges:
+            raise NoCTFError("No challenges visible to the benchmark user")
+
+        pages: dict[int, int] = {}
+        if "scoreboard" in self.mix:
+            for division in await client.list_divisions():
+                first = await client.get_scoreboard_page(
+                    division["id"],
+                    1,
+                    self.scoreboard_page_size,
+                )
+                page_size = first.get("page_size") or self.scoreboard_page_size
+                pages[division["id"]] = max(1, -(-first.get("total", 0) // page_size))
+            if not pages:
+                raise NoCTFError("No divisions visible to the benchmark user")
+
+        return EventFixture([c["id"] for c in challenges], pages)
+
+    def _operation(
+        self,
+        op: str,
+        client: NoCTFClient,
+        fixture: EventFixture,
+        rng: random.Random,
+    ) -> Callable[[], Awaitable[Any]]:
+        challenge_id = rng.choice(fixture.challenge_ids)
+        if op == "list":
+            return client.list_public_challenges
+        if op == "detail":
+            return lambda: client.get_public_challenge(challenge_id)
+        if op == "solves":
+            return lambda: client.get_challenge_solves(challenge_id)
+        if op == "submit":
+            return lambda: client.submit_flag(challenge_id, self.flag)
+        division_id = rng.choice(list(fixture.scoreboard_pages))
+        page = rng.randint(1, fixture.scoreboard_pages[division_id])
+        return lambda: client.get_scoreboard_page(
+            division_id,
+            page,
+            self.scoreboard_page_size,
+        )
+
+    async def _virtual_user(
+        self,
+        index: int,
+        fixture: EventFixture,
+        deadline: float,
+    ) -> None:
+        loop = asyncio.get_running_loop()
+        client = self.clients[index % len(self.clients)]
+        rng = random.Random(None if self.seed is None else self.seed + index)
+        ops = list(self.mix)
+        weights = list(self.mix.values())
+
+        if self.ramp_up:
+            await asyncio.sleep(self.ramp_up * index / self.users)
+
+        while loop.time() < deadline:
+            op = rng.choices(ops, weights)[0]
+            call = self._operation(op, client, fixture, rng)
+            stats = self.stats[OPERATIONS[op]]
+            start = time.perf_counter()
+            try:
+                await call()
+            except APIError as e:
+                stats.errors += 1
+                status = str(e.status_code or type(e).__name__)
+                stats.error_statuses[status] = stats.error_statuses.get(status, 0) + 1
+            else:
+                stats.histogram.record(time.perf_counter() - start)
+
+            if self.think_time:
+                await asyncio.sleep(self.think_time)
+
+    async def run(self, fixture: Optional[EventFixture] = None) -> dict[str, Any]:
+        """Run the load test and return JSON-serializable results."""
+
+        if fixture is None:
+            fixture = await self.discover()
+
+        loop = asyncio.get_running_loop()
+        started_at = datetime.now(timezone.utc)
+        start = loop.time()
+        deadline = start + self.ramp_up + self.duration
+        await asyncio.gather(
+            *(self._virtual_user(i, fixture, deadline) for i in range(self.users)),
+        )
+        self.elapsed = loop.time() - start
+        return self.results(started_at)
+
+    def results(self, started_at: datetime) -> dict[str, Any]:
+        total = EndpointStats()
+        for stats in self.stats.values():
+            total.histogram.merge(stats.histogram)
+            total.errors += stats.errors
+
+        return {
+            "version": RESULT_VERSION,
+            "kind": "api",
+            "noctfcli_version": __version__,
+            "base_url": self.clients[0].base_url,
+            "started_at": started_at.isoformat(),
+            "elapsed": self.elapsed,
+            "config": {
+                "users": self.users,
+                "duration": self.duration,
+                "ramp_up": self.ramp_up,
+                "think_time": self.think_time,
+                "mix": self.mix,
+            },
+            "endpoints": {
+                label: stats.to_dict(self.elapsed)
+                for label, stats in self.stats.items()
+            },
+            "total": total.to_dict(self.elapsed),
+        }
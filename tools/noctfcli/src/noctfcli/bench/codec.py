@@ -0,0 +1,149 @@
+import platform
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Optional
+
+from noctfcli import __version__
+from noctfcli.exceptions import NoCTFError
+from noctfcli.fastjson import JSONBackend, available_backends
+from noctfcli.utils import format_api_datetime
+
+from .histogram import LatencyHistogram
+
+RESULT_VERSION = 1
+
+
+def scoreboard_payload(teams: int, challenges: int, seed: int = 0) -> dict[str, Any]:
+    """A /scoreboard/divisions/:id response with solves and score graphs."""
+
+    rng = random.Random(seed)
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    entries = []
+    for rank in range(1, teams + 1):
+        solved = rng.sample(range(1, challenges + 1), rng.randint(0, challenges))
+        solves = [
+            {
+                "team_id": rank,
+                "challenge_id": challenge_id,
+                "hidden": False,
+                "bonus": None,
+                "value": rng.randint(50, 500),
+                "created_at": format_api_datetime(
+                    start + timedelta(seconds=rng.randint(0, 172800)),
+                ),
+            }
+            for challenge_id in solved
+        ]
+        times = sorted(rng.randint(0, 172800) for _ in solved)
+        scores = [sum(s["value"] for s in solves[: i + 1]) for i in range(len(solves))]
+        entries.append(
+            {
+                "team_id": rank,
+                "rank": rank,
+                "score": scores[-1] if scores else 0,
+                "last_solve": solves[-1]["created_at"] if solves else None,
+                "updated_at": format_api_datetime(start),
+                "hidden": False,
+                "tag_ids": [],
+                "solves": solves,
+                "awards": [],
+                "graph": [times, scores],
+            },
+        )
+    return {"data": {"entries": entries, "page_size": teams, "total": teams}}
+
+
+def teams_payload(teams: int, seed: int = 0) -> dict[str, Any]:
+    """A /teams/query response."""
+
+    rng = random.Random(seed)
+    created_at = format_api_datetime(datetime(2025, 1, 1, tzinfo=timezone.utc))
+    entries = [
+        {
+            "id": i,
+            "name": f"team-{i}-{rng.getrandbits(32):08x}",
+            "bio": "We play CTFs. " * rng.randint(0, 8),
+            "country": rng.choice([None, "AU", "US", "DE", "JP"]),
+            "division_id": 1,
+            "tag_ids": rng.sample(range(1, 6), rng.randint(0, 2)),
+            "created_at": created_at,
+            "members": [
+                {"user_id": i * 10 + j, "role": "owner" if j == 0 else "member"}
+                for j in range(rng.randint(1, 4))
+            ],
+        }
+        for i in range(1, teams + 1)
+    ]
+    return {"data": {"entries": entries, "page_size": teams, "total": teams}}
+
+
+def default_payloads(teams: int, challenges: int) -> dict[str, Any]:
+    return {
+        "scoreboard": scoreboard_payload(teams, challenges),
+        "teams": teams_payload(teams),
+    }
+
+
+class CodecBenchmark:
+    """Times JSON encoding and decoding of API payloads with each backend.
+
+    Args:
+        payloads: Payload name mapped to decoded JSON data
+        backends: Backend names to compare (default: every installed backend)
+        runs: Timed runs per payload, backend and operation
+    """
+
+    def __init__(
+        self,
+        payloads: dict[str, Any],
+        backends: Optional[list[str]] = None,
+        runs: int = 20,
+    ) -> None:
+        self.payloads = payloads
+        self.backends = backends or available_backends()
+        self.runs = runs
+
+    def _time(self, operation: Callable[[], Any]) -> LatencyHistogram:
+        histogram = LatencyHistogram()
+        for _ in range(self.runs):
+            start = time.perf_counter()
+            operation()
+            histogram.record(time.perf_counter() - start)
+        return histogram
+
+    def run(self) -> dict[str, Any]:
+        """Run every combination and return JSON-serializable results."""
+
+        reference = JSONBackend("json")
+        results: dict[str, Any] = {}
+        for name, payload in self.payloads.items():
+            encoded = reference.dumps(payload)
+            for backend_name in self.backends:
+                backend = JSONBackend(backend_name)
+                if backend.dumps(payload) != encoded:
+                    msg = f"{backend_name} output differs from json for {name}"
+                    raise NoCTFError(msg)
+                operations = {
+                    "encode": lambda b=backend, p=payload: b.dumps(p),
+                    "decode": lambda b=backend, e=encoded: b.loads(e),
+                }
+                for operation, func in operations.items():
+                    histogram = self._time(func)
+                    results[f"{name} {operation} ({backend_name})"] = {
+                        "payload": name,
+                        "operation": operation,
+                        "backend": backend_name,
+                        "bytes": len(encoded),
+                        "runs": self.runs,
+                        "latency_ms": histogram.summary_ms(),
+                        "histogram": histogram.to_dict(),
+                    }
+
+        return {
+            "version": RESULT_VERSION,
+            "kind": "json",
+            "noctfcli_version": __version__,
+            "python": platform.python_version(),
+            "payloads": results,
+        }
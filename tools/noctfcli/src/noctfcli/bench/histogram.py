@@ -0,0 +1,95 @@
+from typing import Any, Optional
+
+SUB_BUCKET_BITS = 7
+"""Significant bits kept per value, bounding the relative error to 1/64."""
+
+PERCENTILES = (50.0, 90.0, 95.0, 99.0, 99.9)
+
+
+class LatencyHistogram:
+    """Log-linear latency histogram in the style of HdrHistogram.
+
+    Values are recorded in microseconds. Each power of two is split into
+    2**(SUB_BUCKET_BITS - 1) linear buckets, so memory stays bounded regardless
+    of how many samples are recorded while percentiles stay within ~1.6%.
+    """
+
+    def __init__(self) -> None:
+        self.counts: dict[int, int] = {}
+        self.count = 0
+        self.total = 0
+        self.min: Optional[int] = None
+        self.max: Optional[int] = None
+
+    @staticmethod
+    def _bucket(value: int) -> int:
+        shift = max(0, value.bit_length() - SUB_BUCKET_BITS)
+        return (value >> shift) << shift
+
+    def record(self, seconds: float) -> None:
+        value = max(0, round(seconds * 1_000_000))
+        bucket = self._bucket(value)
+        self.counts[bucket] = self.counts.get(bucket, 0) + 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        for bucket, count in other.counts.items():
+            self.counts[bucket] = self.counts.get(bucket, 0) + count
+        self.count += other.count
+        self.total += other.total
+        if other.min is not None:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+        if other.max is not None:
+            self.max = other.max if self.max is None else max(self.max, other.max)
+
+    def percentile(self, p: float) -> int:
+        """Value in microseconds below which p percent of samples fall.
+
+        Returns 0 for an empty histogram.
+        """
+
+        maximum = self.max
+        if not self.count or maximum is None:
+            return 0
+        target = max(1, round(self.count * p / 100))
+        seen = 0
+        for bucket in sorted(self.counts):
+            seen += self.counts[bucket]
+            if seen >= target:
+                return min(bucket, maximum)
+        return maximum
+
+    def summary_ms(self) -> dict[str, float]:
+        """Min, mean, max and standard percentiles in milliseconds."""
+
+        summary = {
+            "min": (self.min or 0) / 1000,
+            "mean": (self.total / self.count / 1000) if self.count else 0.0,
+            "max": (self.max or 0) / 1000,
+        }
+        for p in PERCENTILES:
+            summary[f"p{p:g}"] = self.percentile(p) / 1000
+        return summary
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "unit": "us",
+            "count": self.count,
+            "total": self.total,
+            "min": self.min,
+            "max": self.max,
+            "buckets": sorted(self.counts.items()),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "LatencyHistogram":
+        hist = cls()
+        hist.counts = {int(b): int(c) for b, c in data["buckets"]}
+        hist.count = data["count"]
+        hist.total = data["total"]
+        hist.min = data["min"]
+        hist.max = data["max"]
+        return hist
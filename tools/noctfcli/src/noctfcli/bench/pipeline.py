@@ -0,0 +1,221 @@
+import asyncio
+import io
+import math
+import platform
+import random
+import string
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable
+
+import yaml
+from rich.console import Console
+
+from noctfcli import __version__
+from noctfcli.client import NoCTFClient
+from noctfcli.commands.update import UpdateProcessor
+from noctfcli.commands.upload import UploadProcessor
+from noctfcli.exceptions import NoCTFError
+from noctfcli.models import ChallengeConfig, ChallengeFileAttachment, ExternalFileConfig
+from noctfcli.stub_server import StubServer
+from noctfcli.utils import calculate_file_hash, find_challenge_files
+from noctfcli.validator import ChallengeValidator
+
+from .histogram import LatencyHistogram
+
+RESULT_VERSION = 1
+
+
+@dataclass
+class TreeSpec:
+    """Shape of a synthetic challenge tree.
+
+    File sizes are drawn from a log-normal distribution with the given median,
+    so most files are small with a long tail of large ones as in real CTFs.
+    """
+
+    challenges: int = 50
+    files: int = 2
+    file_size: int = 64 * 1024
+    file_size_sigma: float = 1.0
+    description_size: int = 2048
+    seed: int = 0
+
+
+def generate_tree(root: Path, spec: TreeSpec) -> dict[str, int]:
+    """Write a synthetic challenge tree under root.
+
+    Returns:
+        Number of challenges and files and total file bytes written
+    """
+
+    rng = random.Random(spec.seed)
+    total_bytes = 0
+    for i in range(spec.challenges):
+        slug = f"bench-{i + 1:04d}"
+        directory = root / slug
+        directory.mkdir(parents=True, exist_ok=True)
+
+        files = []
+        for j in range(spec.files):
+            size = round(spec.file_size * math.exp(rng.gauss(0, spec.file_size_sigma)))
+            name = f"dist-{j + 1}.bin"
+            (directory / name).write_bytes(rng.randbytes(size))
+            files.append(name)
+            total_bytes += size
+
+        words = []
+        length = 0
+        while length < spec.description_size:
+            word = "".join(rng.choices(string.ascii_lowercase, k=rng.randint(2, 9)))
+            words.append(word)
+            length += len(word) + 1
+        config = {
+            "version": "1",
+            "slug": slug,
+            "title": f"Benchmark challenge {i + 1}",
+            "categories": [rng.choice(["web", "pwn", "crypto", "rev", "misc"])],
+            "difficulty": rng.choice(["easy", "medium", "hard"]),
+            "description": " ".join(words),
+            "flags": [f"flag{{{slug}}}"],
+            "files": files,
+            "scoring": {"strategy": "core:static", "params": {"base": 100}},
+        }
+        (directory / "noctf.yaml").write_text(yaml.safe_dump(config, sort_keys=False))
+
+    return {
+        "challenges": spec.challenges,
+        "files": spec.challenges * spec.files,
+        "bytes": total_bytes,
+    }
+
+
+class PipelineBenchmark:
+    """Times each stage of deploying a challenge tree.
+
+    Local stages (discovery, parse, validate, hash, payload) run on their own
+    so a slowdown can be attributed; deploy uploads the whole tree to a fresh
+    StubServer and redeploy runs an unchanged update against it.
+
+    Args:
+        root: Challenge tree to deploy
+        runs: Timed runs per stage
+    """
+
+    def __init__(self, root: Path, runs: int = 5) -> None:
+        self.root = root
+        self.runs = runs
+        self.validator = ChallengeValidator()
+        self.console = Console(file=io.StringIO())
+
+    def _time(self, stage: Callable[[], int]) -> tuple[LatencyHistogram, int]:
+        histogram = LatencyHistogram()
+        items = 0
+        for _ in range(self.runs):
+            start = time.perf_counter()
+            items = stage()
+            histogram.record(time.perf_counter() - start)
+        return histogram, items
+
+    async def _deploy(self, server: StubServer, *, update: bool) -> int:
+        async with NoCTFClient(server.url) as client:
+            client.set_token("bench")
+            processor_class = UpdateProcessor if update else UploadProcessor
+            processor = processor_class(client, self.console)
+            results = await processor.process_challenges(self.root)
+        failed = [r for r in results if r.error]
+        if failed:
+            msg = f"{len(failed)} challenges failed to deploy: {failed[0].error}"
+            raise NoCTFError(msg)
+        return len(results)
+
+    def run(self) -> dict[str, Any]:
+        """Run every stage and return JSON-serializable results."""
+
+        paths = find_challenge_files(self.root)
+        raw = [yaml.safe_load(p.read_text()) for p in paths]
+        configs = [self.validator.validate_data(d, p) for d, p in zip(raw, paths)]
+        local_files = [
+            p.parent / entry
+            for p, config in zip(paths, configs)
+            for entry in config.files
+            if not isinstance(entry, ExternalFileConfig)
+        ]
+        payload_client = NoCTFClient("http://localhost")
+
+        def discovery() -> int:
+            return len(find_challenge_files(self.root))
+
+        def parse() -> int:
+            for path in paths:
+                with open(path) as f:
+                    yaml.safe_load(f)
+            return len(paths)
+
+        def validate() -> int:
+            for data, path in zip(raw, paths):
+                config = self.validator.validate_data(data, path)
+                self.validator.validate_files_exist(config, path.parent)
+            return len(raw)
+
+        def hash_files() -> int:
+            for path in local_files:
+                calculate_file_hash(path)
+            return len(local_files)
+
+        def payload() -> int:
+            for config in configs:
+                payload_client.config_to_api_data(config, _attachments(config))
+            return len(configs)
+
+        stages: dict[str, Callable[[], int]] = {
+            "discovery": discovery,
+            "parse": parse,
+            "validate": validate,
+            "hash": hash_files,
+            "payload": payload,
+        }
+        timings = {name: self._time(stage) for name, stage in stages.items()}
+
+        deploy = LatencyHistogram()
+        redeploy = LatencyHistogram()
+        for _ in range(self.runs):
+            with StubServer() as server:
+                start = time.perf_counter()
+                deployed = asyncio.run(self._deploy(server, update=False))
+                deploy.record(time.perf_counter() - start)
+
+                start = time.perf_counter()
+                asyncio.run(self._deploy(server, update=True))
+                redeploy.record(time.perf_counter() - start)
+        timings["deploy"] = (deploy, deployed)
+        timings["redeploy"] = (redeploy, deployed)
+
+        return {
+            "version": RESULT_VERSION,
+            "kind": "pipeline",
+            "noctfcli_version": __version__,
+            "python": platform.python_version(),
+            "tree": {
+                "challenges": len(paths),
+                "files": len(local_files),
+                "bytes": sum(p.stat().st_size for p in local_files),
+            },
+            "stages": {
+                name: {
+                    "runs": self.runs,
+                    "items": items,
+                    "latency_ms": histogram.summary_ms(),
+                    "histogram": histogram.to_dict(),
+                }
+                for name, (histogram, items) in timings.items()
+            },
+        }
+
+
+def _attachments(config: ChallengeConfig) -> list[ChallengeFileAttachment]:
+    return [
+        ChallengeFileAttachment(id=i, is_attachment=True)
+        for i in range(1, len(config.files) + 1)
+    ]
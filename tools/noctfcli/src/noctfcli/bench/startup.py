@@ -0,0 +1,110 @@
+import platform
+import subprocess
+import sys
+import time
+from dataclasses import dataclass
+from typing import Any
+
+from noctfcli import __version__
+
+from .histogram import LatencyHistogram
+
+RESULT_VERSION = 1
+
+DEFAULT_COMMANDS = ("--help", "validate --help", "update --help")
+
+HEAVY_MODULES = ("httpx", "jsonschema", "pydantic", "rich", "yaml")
+"""Packages that --help should not need to import."""
+
+
+@dataclass
+class ImportRecord:
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_importtime(output: str) -> list[ImportRecord]:
+    """Parse the stderr of ``python -X importtime``.
+
+    Lines look like ``import time:       391 |       1215 |   encodings.utf_8``
+    where the indentation of the module name gives its nesting depth.
+    """
+
+    records = []
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|", 2)
+        if not self_us.strip().isdigit():
+            continue  # column header
+        stripped = name.lstrip()
+        records.append(
+            ImportRecord(
+                module=stripped.rstrip(),
+                self_us=int(self_us),
+                cumulative_us=int(cumulative_us),
+                depth=(len(name) - len(stripped) - 1) // 2,
+            ),
+        )
+    return records
+
+
+def _cli_command(args: list[str], *, importtime: bool = False) -> list[str]:
+    options = ["-X", "importtime"] if importtime else []
+    return [sys.executable, *options, "-m", "noctfcli.cli", *args]
+
+
+class StartupBenchmark:
+    """Times fresh interpreter runs of CLI commands.
+
+    Each command is run once under ``-X importtime`` to attribute import cost
+    and then ``runs`` times to measure wall time including interpreter start.
+    """
+
+    def __init__(self, commands: list[list[str]], runs: int = 10) -> None:
+        self.commands = commands
+        self.runs = runs
+
+    def _measure(self, args: list[str]) -> dict[str, Any]:
+        profile = subprocess.run(
+            _cli_command(args, importtime=True),
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+        records = parse_importtime(profile.stderr)
+        top_level = {r.module.split(".")[0] for r in records}
+
+        histogram = LatencyHistogram()
+        for _ in range(self.runs):
+            start = time.perf_counter()
+            subprocess.run(_cli_command(args), capture_output=True, check=False)
+            histogram.record(time.perf_counter() - start)
+
+        slowest = sorted(records, key=lambda r: r.self_us, reverse=True)[:10]
+        return {
+            "runs": self.runs,
+            "exit_code": profile.returncode,
+            "latency_ms": histogram.summary_ms(),
+            "import_ms": sum(r.cumulative_us for r in records if r.depth == 0) / 1000,
+            "modules": len(records),
+            "heavy_imports": [m for m in HEAVY_MODULES if m in top_level],
+            "slowest_imports": [[r.module, r.self_us / 1000] for r in slowest],
+            "histogram": histogram.to_dict(),
+        }
+
+    def run(self) -> dict[str, Any]:
+        """Run every command and return JSON-serializable results."""
+
+        return {
+            "version": RESULT_VERSION,
+            "kind": "startup",
+            "noctfcli_version": __version__,
+            "python": platform.python_version(),
+            "commands": {
+                " ".join(["noctfcli", *args]): self._measure(args)
+                for args in self.commands
+            },
+        }
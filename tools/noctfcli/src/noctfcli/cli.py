@@ -1,54 +1,155 @@
-import sys
+import importlib
 from pathlib import Path
-from typing import Optional, Type
+from typing import Optional
 
 import click
-from rich.console import Console
 
 from noctfcli import __version__
-from noctfcli.commands.common import CLIContextObj
-from noctfcli.commands.delete import delete
-from noctfcli.commands.list_cmd import list_challenges
-from noctfcli.commands.show import show
-from noctfcli.commands.update import update
-from noctfcli.commands.upload import upload
-from noctfcli.commands.validate import validate
-from noctfcli.config import Config
-from noctfcli.exceptions import ConfigurationError
-from noctfcli.preprocessor import PreprocessorBase
-
-
-def build_cli(Preprocessor: Optional[Type[PreprocessorBase]] = None):
-    console = Console()
-
-    @click.group()
+from noctfcli.context import CLIContextObj, PreprocessorClasses
+
+COMMANDS: dict[str, tuple[str, str]] = {
+    "audit": (
+        "noctfcli.commands.audit:audit",
+        "Follow and export the admin audit log.",
+    ),
+    "bench": (
+        "noctfcli.commands.bench:bench",
+        "Benchmark the noCTF API and noctfcli itself.",
+    ),
+    "delete": ("noctfcli.commands.delete:delete", "Delete a challenge."),
+    "list": ("noctfcli.commands.list_cmd:list_challenges", "List all challenges."),
+    "pull": (
+        "noctfcli.commands.pull:pull",
+        "Export challenges from the server to noctf.yaml files.",
+    ),
+    "release": (
+        "noctfcli.commands.release:release",
+        "Release waves of challenges at scheduled times.",
+    ),
+    "scoreboard": (
+        "noctfcli.commands.scoreboard:scoreboard",
+        "Record, replay and verify division scoreboards.",
+    ),
+    "show": (
+        "noctfcli.commands.show:show",
+        "Show detailed information about a challenge.",
+    ),
+    "submissions": (
+        "noctfcli.commands.submissions:submissions",
+        "Work with challenge submissions.",
+    ),
+    "teams": (
+        "noctfcli.commands.teams:teams",
+        "Manage teams in bulk.",
+    ),
+    "update": (
+        "noctfcli.commands.update:update",
+        "Update existing challenges from a directory.",
+    ),
+    "upload": (
+        "noctfcli.commands.upload:upload",
+        "Upload all challenge from a directory.",
+    ),
+    "users": (
+        "noctfcli.commands.users:users",
+        "Manage users in bulk.",
+    ),
+    "validate": (
+        "noctfcli.commands.validate:validate",
+        "Validate all noctf.yaml files in a directory.",
+    ),
+    "weights": (
+        "noctfcli.commands.weights:weights",
+        "Bulk update per-team challenge weights.",
+    ),
+}
+"""Command name mapped to the "module:attribute" defining it and its short help."""
+
+
+class LazyGroup(click.Group):
+    """Click group that imports a command's module only when it is invoked.
+
+    Importing every command pulls in httpx, pydantic, jsonschema and rich, so
+    the short help listed by --help is kept alongside the import path instead.
+    """
+
+    def __init__(
+        self,
+        *args,
+        lazy_commands: Optional[dict[str, tuple[str, str]]] = None,
+        **kwargs,
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self.lazy_commands = dict(lazy_commands or {})
+
+    def list_commands(self, ctx: click.Context) -> list[str]:
+        return sorted({*super().list_commands(ctx), *self.lazy_commands})
+
+    def get_command(self, ctx: click.Context, cmd_name: str) -> Optional[click.Command]:
+        if cmd_name in self.commands or cmd_name not in self.lazy_commands:
+            return super().get_command(ctx, cmd_name)
+
+        module_name, _, attr = self.lazy_commands[cmd_name][0].partition(":")
+        command = getattr(importlib.import_module(module_name), attr)
+        self.add_command(command, cmd_name)
+        return command
+
+    def format_commands(
+        self,
+        ctx: click.Context,
+        formatter: click.HelpFormatter,
+    ) -> None:
+        rows = []
+        for name in self.list_commands(ctx):
+            if name in self.commands:
+                command = self.commands[name]
+                if command.hidden:
+                    continue
+                rows.append((name, command.get_short_help_str(formatter.width)))
+            else:
+                rows.append((name, self.lazy_commands[name][1]))
+
+        if rows:
+            with formatter.section("Commands"):
+                formatter.write_dl(rows)
+
+
+def build_cli(Preprocessor: PreprocessorClasses = None):  # noqa: N803
+    """Build the noctfcli command group.
+
+    Args:
+        Preprocessor: Preprocessor class, or classes applied in order,
+            run on each challenge config before it is uploaded
+    """
+
+    @click.group(cls=LazyGroup, lazy_commands=COMMANDS)
     @click.version_option(version=__version__)
     @click.option(
         "--config",
         type=click.Path(exists=True, path_type=Path),
         help="Configuration file path",
     )
+    @click.option(
+        "--trace",
+        "trace_path",
+        type=click.Path(path_type=Path, dir_okay=False),
+        help="Write a Chrome/Perfetto trace of requests and local phases to this file",
+    )
     @click.pass_context
     def cli(
         ctx: click.Context,
-        config: Path,
+        config: Optional[Path],
+        trace_path: Optional[Path],
     ) -> None:
         """noctfcli - CLI tool for noCTF challenge management."""
 
-        try:
-            app_config = Config.init(config)
-            preprocessor = Preprocessor(config) if Preprocessor else None
-            ctx.obj = CLIContextObj(config=app_config, preprocessor=preprocessor)
-        except ConfigurationError as e:
-            console.print(f"[red]Configuration error:[/red] {e.message}")
-            sys.exit(1)
-
-    cli.add_command(list_challenges)
-    cli.add_command(show)
-    cli.add_command(upload)
-    cli.add_command(update)
-    cli.add_command(validate)
-    cli.add_command(delete)
+        if trace_path:
+            from noctfcli.tracing import Tracer
+
+            tracer = ctx.with_resource(Tracer().activate())
+            ctx.call_on_close(lambda: tracer.write(trace_path))
+
+        ctx.obj = CLIContextObj(config, Preprocessor)
 
     return cli
 
@@ -1,9 +1,12 @@
-import json
+import asyncio
+import math
+from collections import deque
+from collections.abc import AsyncIterator
 from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any, Literal, Optional, Union, overload
+from typing import TYPE_CHECKING, Any, Literal, Optional, Union, overload
 
-import httpx
 from pydantic import ValidationError as PydanticValidationError
 
 from .config import Config
@@ -14,15 +17,30 @@ from .exceptions import (
     NotFoundError,
     ValidationError,
 )
+from .fastjson import dumps, loads
 from .models import (
+    CHALLENGE_SUMMARY_LIST,
     Challenge,
     ChallengeConfig,
     ChallengeFile,
     ChallengeFileAttachment,
     ChallengeSummary,
     ExternalFileConfig,
+    TeamRecord,
+    UserRecord,
 )
-from .utils import filename_from_url
+from .signing import content_digest, sign_request
+from .tracing import RequestEvent, RequestHook, RequestTimer, current_tracer
+from .utils import filename_from_url, format_api_datetime, parse_api_datetime
+
+if TYPE_CHECKING:
+    import httpx
+
+MAX_WEIGHT_ITEMS = 2000
+"""Most team weights the server accepts in one update request."""
+
+MAX_QUERY_IDS = 50
+"""Most IDs the server accepts in one team or user query."""
 
 
 class NoCTFClient:
@@ -33,6 +51,8 @@ class NoCTFClient:
         base_url: str,
         timeout: float = 30.0,
         verify_ssl: bool = True,
+        max_connections: Optional[int] = None,
+        request_hooks: Optional[list[RequestHook]] = None,
     ) -> None:
         """Initialize the client.
 
@@ -40,11 +60,15 @@ class NoCTFClient:
             base_url: Base URL of the noCTF API
             timeout: Request timeout in seconds
             verify_ssl: Whether to verify SSL certificates
+            max_connections: Connection pool size (httpx default if None)
+            request_hooks: Callables invoked with a RequestEvent after each request
         """
 
         self.base_url = base_url.rstrip("/")
         self.timeout = timeout
         self.verify_ssl = verify_ssl
+        self.max_connections = max_connections
+        self.request_hooks: list[RequestHook] = list(request_hooks or [])
         self._token: Optional[str] = None
         self._client: Optional[httpx.AsyncClient] = None
 
@@ -55,19 +79,46 @@ class NoCTFClient:
     async def __aexit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
         await self.close()
 
-    async def _ensure_client(self) -> None:
+    async def _ensure_client(self) -> "httpx.AsyncClient":
         if self._client is None:
+            # httpx is imported on first use so that commands which never
+            # make a request (such as --dry-run) do not pay for it.
+            import httpx
+
+            limits = (
+                httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                )
+                if self.max_connections
+                else httpx.Limits()
+            )
             self._client = httpx.AsyncClient(
                 base_url=self.base_url,
                 timeout=self.timeout,
                 verify=self.verify_ssl,
+                limits=limits,
             )
+        return self._client
 
     async def close(self) -> None:
         if self._client is not None:
             await self._client.aclose()
             self._client = None
 
+    def add_request_hook(self, hook: RequestHook) -> None:
+        """Register a callable to be invoked with a RequestEvent after each request.
+
+        Hooks are called for failed requests too, and only add the cost of
+        timestamping connection phases while at least one is registered.
+        """
+
+        self.request_hooks.append(hook)
+
+    def _emit_request_event(self, event: RequestEvent) -> None:
+        for hook in self.request_hooks:
+            hook(event)
+
     async def _request(
         self,
         method: str,
@@ -76,25 +127,53 @@ class NoCTFClient:
         params: Optional[dict[str, Any]] = None,
         files: Optional[dict[str, Any]] = None,
         auth: bool = True,
+        signing_key: Optional[tuple[str, str]] = None,
     ) -> dict[str, Any]:
-        await self._ensure_client()
-        assert self._client is not None
+        import httpx
+
+        client = await self._ensure_client()
 
         headers = {}
         if auth and self._token:
             headers["Authorization"] = f"Bearer {self._token}"
 
+        content = None
+        if data is not None:
+            content = dumps(data)
+            headers["Content-Type"] = "application/json"
+
+        if signing_key is not None:
+            key_id, key = signing_key
+            url = httpx.URL(f"{self.base_url}{path}")
+            authority = f"{url.host}:{url.port}" if url.port else url.host
+            headers.update(
+                sign_request(
+                    method,
+                    url.path,
+                    authority,
+                    key,
+                    key_id,
+                    digest=content_digest(content) if content is not None else None,
+                ),
+            )
+
+        timer = RequestTimer() if self.request_hooks else None
         try:
-            response = await self._client.request(
+            response = await client.request(
                 method=method,
                 url=path,
-                json=data,
+                content=content,
                 params=params,
                 files=files,
                 headers=headers,
+                extensions={"trace": timer} if timer else None,
             )
         except httpx.RequestError as e:
+            if timer:
+                self._emit_request_event(timer.event(method, path, error=e))
             raise APIError(f"Request failed: {e}") from e
+        if timer:
+            self._emit_request_event(timer.event(method, path, response))
 
         if response.status_code == 401:
             raise AuthenticationError("Authentication failed")
@@ -105,7 +184,7 @@ class NoCTFClient:
         if response.status_code >= 400:
             error_data = {}
             try:
-                error_data = response.json()
+                error_data = loads(response.content)
                 message = error_data.get("message", f"HTTP {response.status_code}")
             except Exception:
                 message = f"HTTP {response.status_code}"
@@ -119,11 +198,602 @@ class NoCTFClient:
             return {}
 
         try:
-            return response.json()
+            return loads(response.content)
         except Exception as e:
             msg = f"Failed to parse response: {e}"
             raise APIError(msg) from e
 
+    async def _paginate(
+        self,
+        path: str,
+        query: dict[str, Any],
+        page_size: int = 100,
+        prefetch: int = 1,
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Iterate over the entries of a paginated query endpoint.
+
+        Requests for the next pages are issued before the entries of the
+        current page are yielded, so they are in flight while the caller
+        consumes it. Once the first page gives the total, up to prefetch pages
+        are requested ahead.
+
+        Args:
+            path: Query endpoint path
+            query: Request body (without page and page_size)
+            page_size: Requested page size (the server may cap it)
+            prefetch: Pages requested ahead of the one being consumed
+
+        Yields:
+            Raw entry dicts
+        """
+
+        def fetch(page: int) -> "asyncio.Task[dict[str, Any]]":
+            body = {**query, "page": page, "page_size": page_size}
+            return asyncio.ensure_future(self._request("POST", path, data=body))
+
+        pending: deque[asyncio.Task[dict[str, Any]]] = deque([fetch(1)])
+        page = 0
+        next_page = 2
+        try:
+            while pending:
+                response = await pending.popleft()
+                page += 1
+                data = response.get("data", {})
+                entries = data.get("entries", [])
+                actual_page_size = data.get("page_size", page_size)
+                total = data.get("total")
+
+                fetched = (page - 1) * actual_page_size + len(entries)
+                has_more = len(entries) >= actual_page_size and (
+                    total is None or fetched < total
+                )
+                if not has_more:
+                    while pending:
+                        pending.pop().cancel()
+                else:
+                    last_page = (
+                        None if total is None else math.ceil(total / actual_page_size)
+                    )
+                    while len(pending) < max(1, prefetch) and (
+                        last_page is None or next_page <= last_page
+                    ):
+                        pending.append(fetch(next_page))
+                        next_page += 1
+
+                for entry in entries:
+                    yield entry
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _query_ids(
+        self,
+        path: str,
+        query: dict[str, Any],
+        ids: Optional[list[int]],
+        page_size: int,
+        prefetch: int,
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Paginate a query, splitting an ids filter into accepted chunks."""
+
+        if not ids:
+            async for entry in self._paginate(path, query, page_size, prefetch):
+                yield entry
+            return
+        for start in range(0, len(ids), MAX_QUERY_IDS):
+            chunk = {**query, "ids": ids[start : start + MAX_QUERY_IDS]}
+            async for entry in self._paginate(path, chunk, page_size, prefetch):
+                yield entry
+
+    def iter_submissions(
+        self,
+        challenge_id: Optional[list[int]] = None,
+        team_id: Optional[list[int]] = None,
+        user_id: Optional[list[int]] = None,
+        status: Optional[list[str]] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        page_size: int = 100,
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Iterate over submissions matching the given filters, newest first.
+
+        Submissions are yielded as raw dicts to keep per-row overhead low.
+
+        Args:
+            challenge_id: Only include these challenges
+            team_id: Only include these teams
+            user_id: Only include these users
+            status: Only include these statuses
+            since: Only include submissions created at or after this time
+            until: Only include submissions created at or before this time
+            page_size: Requested page size
+
+        Returns:
+            Async iterator of submission dicts
+        """
+
+        query: dict[str, Any] = {}
+        if challenge_id:
+            query["challenge_id"] = challenge_id
+        if team_id:
+            query["team_id"] = team_id
+        if user_id:
+            query["user_id"] = user_id
+        if status:
+            query["status"] = status
+        if since or until:
+            query["created_at"] = [
+                format_api_datetime(since) if since else None,
+                format_api_datetime(until) if until else None,
+            ]
+
+        return self._paginate("/admin/submissions/query", query, page_size)
+
+    async def iter_teams(
+        self,
+        division_id: Optional[int] = None,
+        name: Optional[str] = None,
+        ids: Optional[list[int]] = None,
+        flags: Optional[list[str]] = None,
+        page_size: int = 100,
+        prefetch: int = 4,
+    ) -> AsyncIterator[TeamRecord]:
+        """Iterate over teams matching the given filters.
+
+        Args:
+            division_id: Only include teams in this division
+            name: Only include teams whose name contains this
+            ids: Only include these teams
+            flags: Only include teams with any of these flags, or without
+                any of the flags given with a ``!`` prefix
+            page_size: Requested page size (the server caps it at 100)
+            prefetch: Pages requested ahead of the one being consumed
+
+        Yields:
+            Team records
+        """
+
+        query: dict[str, Any] = {}
+        if division_id is not None:
+            query["division_id"] = division_id
+        if name:
+            query["name"] = name
+        if flags:
+            query["flags"] = flags
+
+        async for entry in self._query_ids(
+            "/admin/teams/query",
+            query,
+            ids,
+            page_size,
+            prefetch,
+        ):
+            yield TeamRecord(
+                id=entry["id"],
+                name=entry["name"],
+                bio=entry.get("bio", ""),
+                division_id=entry["division_id"],
+                country=entry.get("country"),
+                tag_ids=entry.get("tag_ids", []),
+                flags=entry.get("flags", []),
+                members=entry.get("members", []),
+                created_at=parse_api_datetime(entry["created_at"]),
+            )
+
+    async def iter_users(
+        self,
+        name: Optional[str] = None,
+        ids: Optional[list[int]] = None,
+        flags: Optional[list[str]] = None,
+        roles: Optional[list[str]] = None,
+        page_size: int = 100,
+        prefetch: int = 4,
+    ) -> AsyncIterator[UserRecord]:
+        """Iterate over users matching the given filters.
+
+        Args:
+            name: Only include users whose name contains this
+            ids: Only include these users
+            flags: Only include users with any of these flags, or without
+                any of the flags given with a ``!`` prefix
+            roles: Only include users with any of these roles (``!`` as for
+                flags)
+            page_size: Requested page size (the server caps it at 100)
+            prefetch: Pages requested ahead of the one being consumed
+
+        Yields:
+            User records
+        """
+
+        query: dict[str, Any] = {}
+        if name:
+            query["name"] = name
+        if flags:
+            query["flags"] = flags
+        if roles:
+            query["roles"] = roles
+
+        async for entry in self._query_ids(
+            "/admin/users/query",
+            query,
+            ids,
+            page_size,
+            prefetch,
+        ):
+            yield UserRecord(
+                id=entry["id"],
+                name=entry["name"],
+                bio=entry.get("bio", ""),
+                team_id=entry.get("team_id"),
+                country=entry.get("country"),
+                flags=entry.get("flags", []),
+                roles=entry.get("roles", []),
+                identities=entry.get("identities", []),
+                created_at=parse_api_datetime(entry["created_at"]),
+            )
+
+    async def update_team(self, team: TeamRecord) -> None:
+        """Replace a team's name, bio, country, division, tags and flags.
+
+        Args:
+            team: Team record holding the new values
+        """
+
+        await self._request(
+            "PUT",
+            f"/admin/teams/{team.id}",
+            data={
+                "name": team.name,
+                "bio": team.bio,
+                "country": team.country,
+                "division_id": team.division_id,
+                "tag_ids": team.tag_ids,
+                "flags": team.flags,
+            },
+        )
+
+    async def set_team_member(
+        self,
+        team_id: int,
+        user_id: int,
+        role: Literal["owner", "member", "none"],
+    ) -> None:
+        """Add a user to a team, change their role, or remove them.
+
+        Args:
+            team_id: Team ID
+            user_id: User ID
+            role: New role, or "none" to remove the user from the team
+        """
+
+        await self._request(
+            "PUT",
+            f"/admin/teams/{team_id}/members",
+            data={"user_id": user_id, "role": role},
+        )
+
+    async def list_team_tags(self) -> list[dict[str, Any]]:
+        """List all team tags.
+
+        Returns:
+            Team tag dicts
+        """
+
+        response = await self._request("GET", "/admin/team_tags")
+        return response.get("data", {}).get("tags", [])
+
+    async def create_team_tag(
+        self,
+        name: str,
+        description: str = "",
+        *,
+        is_joinable: bool = False,
+    ) -> dict[str, Any]:
+        """Create a team tag.
+
+        Args:
+            name: Tag name
+            description: Tag description
+            is_joinable: Whether players can add the tag to their team
+
+        Returns:
+            Created team tag dict
+        """
+
+        response = await self._request(
+            "POST",
+            "/admin/team_tags",
+            data={
+                "name": name,
+                "description": description,
+                "is_joinable": is_joinable,
+            },
+        )
+        return response.get("data", {})
+
+    async def list_admin_divisions(self) -> list[dict[str, Any]]:
+        """List all divisions, including hidden ones.
+
+        Returns:
+            Division dicts
+        """
+
+        response = await self._request("GET", "/admin/divisions")
+        return response.get("data", [])
+
+    async def revoke_user_sessions(
+        self,
+        user_id: int,
+        app_id: Optional[int] = None,
+    ) -> None:
+        """Revoke a user's sessions.
+
+        Args:
+            user_id: User ID
+            app_id: Revoke the sessions of this app instead of the website's
+        """
+
+        await self._request(
+            "POST",
+            f"/admin/users/{user_id}/sessions/revoke",
+            data={"app_id": app_id},
+        )
+
+    async def get_current_user(self) -> dict[str, Any]:
+        """Get the user the token belongs to.
+
+        Returns:
+            User dict
+        """
+
+        response = await self._request("GET", "/user/me")
+        return response.get("data", {})
+
+    async def query_audit_log(
+        self,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        actor: Optional[list[str]] = None,
+        entities: Optional[list[str]] = None,
+        operation: Optional[list[str]] = None,
+        page_size: int = 1000,
+    ) -> list[dict[str, Any]]:
+        """Fetch the newest audit log entries within a time range.
+
+        Args:
+            since: Only include entries created at or after this time
+            until: Only include entries created at or before this time
+            actor: Only include entries by these actors
+            entities: Only include entries touching any of these entities
+            operation: Only include entries matching this operation pattern
+            page_size: Maximum number of entries (the server caps it at 1000)
+
+        Returns:
+            Audit log entry dicts, newest first
+        """
+
+        query: dict[str, Any] = {"page_size": page_size}
+        if since or until:
+            query["created_at"] = [
+                format_api_datetime(since) if since else None,
+                format_api_datetime(until) if until else None,
+            ]
+        if actor:
+            query["actor"] = actor
+        if entities:
+            query["entities"] = entities
+        if operation:
+            query["operation"] = operation
+
+        response = await self._request("POST", "/admin/audit_log/query", data=query)
+        return response.get("data", {}).get("entries", [])
+
+    async def iter_audit_log(
+        self,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        actor: Optional[list[str]] = None,
+        entities: Optional[list[str]] = None,
+        operation: Optional[list[str]] = None,
+        page_size: int = 1000,
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Iterate over all audit log entries within a time range, newest first.
+
+        The endpoint has no page offset, so this walks backwards in time using
+        the oldest timestamp of each page as the next upper bound. Timestamps
+        only have millisecond precision, so each bound overlaps the previous
+        page by one millisecond and entries already yielded are skipped.
+
+        Args:
+            since: Only include entries created at or after this time
+            until: Only include entries created at or before this time
+            actor: Only include entries by these actors
+            entities: Only include entries touching any of these entities
+            operation: Only include entries matching this operation pattern
+            page_size: Entries requested per page
+
+        Yields:
+            Audit log entry dicts
+        """
+
+        seen: set[tuple[Any, ...]] = set()
+        while True:
+            entries = await self.query_audit_log(
+                since,
+                until,
+                actor=actor,
+                entities=entities,
+                operation=operation,
+                page_size=page_size,
+            )
+            for entry in entries:
+                if audit_log_key(entry) not in seen:
+                    yield entry
+
+            if len(entries) < page_size:
+                return
+
+            oldest = parse_api_datetime(entries[-1]["created_at"])
+            next_until = oldest + timedelta(milliseconds=1)
+            if until is not None and next_until >= until:
+                # More than a page of entries share this millisecond; skipping
+                # the rest of it is the only way to make progress.
+                next_until = oldest - timedelta(milliseconds=1)
+
+            until = next_until
+            seen = {
+                audit_log_key(e)
+                for e in entries
+                if parse_api_datetime(e["created_at"]) <= until
+            }
+
+    async def list_divisions(self) -> list[dict[str, Any]]:
+        """List divisions visible to the current user.
+
+        Returns:
+            Division dicts
+        """
+
+        response = await self._request("GET", "/divisions")
+        return response.get("data", [])
+
+    async def get_scoreboard_page(
+        self,
+        division_id: int,
+        page: int = 1,
+        page_size: int = 50,
+        graph_interval: Optional[int] = None,
+    ) -> dict[str, Any]:
+        """Get a single page of a division scoreboard.
+
+        Args:
+            division_id: Division ID
+            page: Page number (1-based)
+            page_size: Requested page size (the server may cap it)
+            graph_interval: Include score graphs bucketed to this interval
+
+        Returns:
+            Scoreboard page data with entries, page_size and total
+        """
+
+        params: dict[str, Any] = {"page": page, "page_size": page_size}
+        if graph_interval:
+            params["graph_interval"] = graph_interval
+        response = await self._request(
+            "GET",
+            f"/scoreboard/divisions/{division_id}",
+            params=params,
+        )
+        return response.get("data", {})
+
+    async def get_scoreboard(
+        self,
+        division_id: int,
+        page_size: int = 1000,
+        graph_interval: Optional[int] = None,
+    ) -> list[dict[str, Any]]:
+        """Get every entry of a division scoreboard.
+
+        The first page reveals the total, after which the remaining pages are
+        fetched concurrently.
+
+        Args:
+            division_id: Division ID
+            page_size: Requested page size (the server may cap it)
+            graph_interval: Include score graphs bucketed to this interval
+
+        Returns:
+            Scoreboard entries ordered by rank
+        """
+
+        first = await self.get_scoreboard_page(
+            division_id,
+            1,
+            page_size,
+            graph_interval,
+        )
+        entries = list(first.get("entries", []))
+        actual_page_size = first.get("page_size") or page_size
+        pages = -(-first.get("total", 0) // actual_page_size)
+        rest = await asyncio.gather(
+            *(
+                self.get_scoreboard_page(
+                    division_id,
+                    page,
+                    actual_page_size,
+                    graph_interval,
+                )
+                for page in range(2, pages + 1)
+            ),
+        )
+        for data in rest:
+            entries.extend(data.get("entries", []))
+        return entries
+
+    async def list_public_challenges(self) -> list[dict[str, Any]]:
+        """List challenges as seen by the current user.
+
+        Returns:
+            Public challenge summary dicts
+        """
+
+        response = await self._request("GET", "/challenges")
+        return response.get("data", {}).get("challenges", [])
+
+    async def get_public_challenge(self, challenge_id: int) -> dict[str, Any]:
+        """Get a challenge as seen by the current user.
+
+        Args:
+            challenge_id: Challenge ID
+
+        Returns:
+            Public challenge dict
+        """
+
+        response = await self._request("GET", f"/challenges/{challenge_id}")
+        return response.get("data", {})
+
+    async def get_challenge_solves(
+        self,
+        challenge_id: int,
+        division_id: Optional[int] = None,
+    ) -> list[dict[str, Any]]:
+        """List the solves of a challenge.
+
+        Args:
+            challenge_id: Challenge ID
+            division_id: Only include solves from this division
+
+        Returns:
+            Solve dicts
+        """
+
+        params = {"division_id": division_id} if division_id is not None else None
+        response = await self._request(
+            "GET",
+            f"/challenges/{challenge_id}/solves",
+            params=params,
+        )
+        return response.get("data", [])
+
+    async def submit_flag(self, challenge_id: int, data: str) -> dict[str, Any]:
+        """Submit a flag for a challenge as the current user.
+
+        Args:
+            challenge_id: Challenge ID
+            data: Submission data
+
+        Returns:
+            Submission result with status and hidden
+        """
+
+        response = await self._request(
+            "POST",
+            f"/challenges/{challenge_id}/solves",
+            data={"data": data},
+        )
+        return response.get("data", {})
+
     def set_token(self, token: str) -> None:
         """Set authentication token.
 
@@ -153,7 +823,7 @@ class NoCTFClient:
         challenges_data = response.get("data", [])
 
         try:
-            return [ChallengeSummary(**challenge) for challenge in challenges_data]
+            return CHALLENGE_SUMMARY_LIST.validate_python(challenges_data)
         except PydanticValidationError as e:
             msg = f"Invalid challenge data: {e}"
             raise ValidationError(msg) from e
@@ -162,12 +832,79 @@ class NoCTFClient:
         self,
         files: list[ChallengeFileAttachment],
     ) -> list[ChallengeFile]:
-        out = []
-        for f in files:
-            response = await self._request("GET", f"/admin/files/{f.id}")
-            file_data = response.get("data", {})
-            out.append(ChallengeFile(**file_data))
-        return out
+        return list(
+            await asyncio.gather(*(self.get_file_metadata(f.id) for f in files)),
+        )
+
+    async def get_file_metadata(self, file_id: int) -> ChallengeFile:
+        """Get metadata for an uploaded file.
+
+        Args:
+            file_id: File ID
+
+        Returns:
+            File metadata
+        """
+
+        response = await self._request("GET", f"/admin/files/{file_id}")
+        file_data = response.get("data", {})
+
+        try:
+            return ChallengeFile(**file_data)
+        except PydanticValidationError as e:
+            msg = f"Invalid file data: {e}"
+            raise ValidationError(msg) from e
+
+    async def download_file(
+        self,
+        file: ChallengeFile,
+        dest: Path,
+        chunk_size: int = 65536,
+    ) -> None:
+        """Download a file to disk without buffering it in memory.
+
+        Args:
+            file: File metadata (the signed URL may be relative to the API)
+            dest: Destination path
+            chunk_size: Size of chunks written to disk
+        """
+
+        import httpx
+
+        client = await self._ensure_client()
+
+        # Signed URLs are unique per file, so group downloads under one name.
+        template = "(file download)"
+        timer = RequestTimer() if self.request_hooks else None
+        try:
+            async with client.stream(
+                "GET",
+                file.url,
+                extensions={"trace": timer} if timer else None,
+            ) as response:
+                if response.status_code >= 400:
+                    if timer:
+                        self._emit_request_event(
+                            timer.event("GET", file.url, response, template=template),
+                        )
+                    raise APIError(
+                        f"Failed to download {file.filename}: "
+                        f"HTTP {response.status_code}",
+                        status_code=response.status_code,
+                    )
+                with open(dest, "wb") as f:
+                    async for chunk in response.aiter_bytes(chunk_size):
+                        f.write(chunk)
+            if timer:
+                self._emit_request_event(
+                    timer.event("GET", file.url, response, template=template),
+                )
+        except httpx.RequestError as e:
+            if timer:
+                self._emit_request_event(
+                    timer.event("GET", file.url, error=e, template=template),
+                )
+            raise APIError(f"Download failed: {e}") from e
 
     @overload
     async def get_challenge(
@@ -201,7 +938,36 @@ class NoCTFClient:
         if not chall:
             raise NotFoundError(f"Challenge with slug {slug} not found")
 
-        response = await self._request("GET", f"/admin/challenges/{chall.id}")
+        return await self.get_challenge_by_id(chall.id, with_files=with_files)
+
+    @overload
+    async def get_challenge_by_id(
+        self,
+        challenge_id: int,
+        with_files: Literal[False] = False,
+    ) -> Challenge: ...
+    @overload
+    async def get_challenge_by_id(
+        self,
+        challenge_id: int,
+        with_files: Literal[True] = True,
+    ) -> tuple[Challenge, list[ChallengeFile]]: ...
+    async def get_challenge_by_id(
+        self,
+        challenge_id: int,
+        with_files: bool = False,
+    ) -> Union[Challenge, tuple[Challenge, list[ChallengeFile]]]:
+        """Get a challenge by ID without listing all challenges.
+
+        Args:
+            challenge_id: Challenge ID
+            with_files: Whether to fetch file details
+
+        Returns:
+            Challenge data
+        """
+
+        response = await self._request("GET", f"/admin/challenges/{challenge_id}")
         challenge_data = response.get("data", {})
 
         try:
@@ -231,7 +997,7 @@ class NoCTFClient:
             Created challenge
         """
 
-        api_data = self._config_to_api_data(config, files)
+        api_data = self.config_to_api_data(config, files)
 
         response = await self._request("POST", "/admin/challenges", data=api_data)
         challenge_data = response.get("data", {})
@@ -261,16 +1027,148 @@ class NoCTFClient:
             New version number
         """
 
-        api_data = self._config_to_api_data(config, files)
-        api_data["version"] = version
+        api_data = self.config_to_api_data(config, files)
+        return await self._put_challenge(challenge_id, api_data, version)
+
+    async def restore_challenge(self, challenge: Challenge, version: int) -> int:
+        """Put a challenge back to a previously fetched state.
+
+        Args:
+            challenge: Challenge as it was before the changes being undone
+            version: Current challenge version
+
+        Returns:
+            New version number
+        """
+
+        api_data = {
+            "title": challenge.title,
+            "description": challenge.description,
+            "tags": challenge.tags,
+            "hidden": challenge.hidden,
+            "visible_at": format_api_datetime(challenge.visible_at)
+            if challenge.visible_at
+            else None,
+            "private_metadata": challenge.private_metadata,
+        }
+        return await self._put_challenge(challenge.id, api_data, version)
 
+    async def set_challenge_hidden(
+        self,
+        challenge_id: Union[int, str],
+        *,
+        hidden: bool,
+        version: int,
+    ) -> int:
+        """Hide or unhide a challenge without sending the rest of it.
+
+        Args:
+            challenge_id: Challenge ID or slug
+            hidden: Whether the challenge is hidden
+            version: Current challenge version
+
+        Returns:
+            New version number
+        """
+
+        return await self._put_challenge(challenge_id, {"hidden": hidden}, version)
+
+    async def _put_challenge(
+        self,
+        challenge_id: Union[int, str],
+        api_data: dict[str, Any],
+        version: int,
+    ) -> int:
         response = await self._request(
             "PUT",
             f"/admin/challenges/{challenge_id}",
-            data=api_data,
+            data={**api_data, "version": version},
         )
         return response.get("data", {}).get("version", version + 1)
 
+    async def list_challenge_weights(
+        self,
+        challenge_id: int,
+        key: str,
+        team_id: Optional[list[int]] = None,
+        page_size: int = MAX_WEIGHT_ITEMS,
+    ) -> list[dict[str, Any]]:
+        """List the teams with a submission weight set for a challenge.
+
+        The request is signed with the challenge's weight update key rather
+        than sent with the session token.
+
+        Args:
+            challenge_id: Challenge ID
+            key: The challenge's solve.weight_update_key
+            team_id: Only include these teams (at most 50)
+            page_size: Entries requested per page
+
+        Returns:
+            Weight entry dicts with id, team_id, created_at and updated_at
+        """
+
+        params: dict[str, Any] = {"page_size": page_size}
+        if team_id:
+            params["team_id"] = team_id
+
+        entries: list[dict[str, Any]] = []
+        page = 1
+        while True:
+            response = await self._request(
+                "GET",
+                f"/admin/challenges/{challenge_id}/weights",
+                params={**params, "page": page},
+                auth=False,
+                signing_key=(str(challenge_id), key),
+            )
+            data = response.get("data", {})
+            page_entries = data.get("entries", [])
+            entries.extend(page_entries)
+            if (
+                len(page_entries) < data.get("page_size", page_size)
+                or len(entries) >= data.get("total", 0)
+            ):
+                return entries
+            page += 1
+
+    async def update_challenge_weights(
+        self,
+        challenge_id: int,
+        items: list[dict[str, int]],
+        key: str,
+    ) -> list[dict[str, Any]]:
+        """Set the submission weight of teams for a challenge.
+
+        The request is signed with the challenge's weight update key rather
+        than sent with the session token. The server only accepts updates
+        while the competition is active.
+
+        Args:
+            challenge_id: Challenge ID
+            items: Dicts of team_id and weight, at most MAX_WEIGHT_ITEMS
+            key: The challenge's solve.weight_update_key
+
+        Returns:
+            Updated weight entry dicts
+
+        Raises:
+            ValidationError: If items is empty or too long
+        """
+
+        if not 1 <= len(items) <= MAX_WEIGHT_ITEMS:
+            msg = f"Weight updates must have 1 to {MAX_WEIGHT_ITEMS} items"
+            raise ValidationError(msg, field="items", value=len(items))
+
+        response = await self._request(
+            "PUT",
+            f"/admin/challenges/{challenge_id}/weights",
+            data={"items": items},
+            auth=False,
+            signing_key=(str(challenge_id), key),
+        )
+        return response.get("data", {}).get("entries", [])
+
     async def delete_challenge(self, slug: str) -> None:
         """Delete a challenge.
 
@@ -321,16 +1219,23 @@ class NoCTFClient:
 
         Returns:
             File metadata
+
+        Raises:
+            ValidationError: If the hash or size has not been filled in
         """
 
+        if external.hash is None or external.size is None:
+            msg = f"Hash and size of {external.url} are not known"
+            raise ValidationError(msg, field="files", value=external.url)
+
         filename = filename_from_url(external.url)
-        blob = json.dumps(
+        blob = dumps(
             {
                 "url": external.url,
                 "hash": external.hash,
                 "size": external.size,
             },
-        ).encode()
+        )
         files = {"file": (filename, blob, "application/json")}
         response = await self._request(
             "POST",
@@ -347,7 +1252,7 @@ class NoCTFClient:
             msg = f"Invalid file data: {e}"
             raise ValidationError(msg) from e
 
-    def _config_to_api_data(
+    def config_to_api_data(
         self,
         config: ChallengeConfig,
         files: list[ChallengeFileAttachment],
@@ -384,10 +1289,7 @@ class NoCTFClient:
             "description": description,
             "tags": tags,
             "hidden": config.hidden,
-            "visible_at": config.visible_at.isoformat(timespec="milliseconds").replace(
-                "+00:00",
-                "Z",
-            )
+            "visible_at": format_api_datetime(config.visible_at)
             if config.visible_at
             else None,
             "private_metadata": {
@@ -422,6 +1324,72 @@ class NoCTFClient:
             },
         }
 
+    def challenge_to_config(
+        self,
+        challenge: Challenge,
+        files: list[Union[str, ExternalFileConfig]],
+    ) -> ChallengeConfig:
+        """Convert API challenge data back to a ChallengeConfig.
+
+        Inverse of config_to_api_data. Connection info cannot be separated
+        from the description once merged, so it stays in the description.
+
+        Args:
+            challenge: Challenge data
+            files: File entries to reference from the config
+
+        Returns:
+            Challenge configuration
+        """
+
+        tags = dict(challenge.tags)
+        categories = [c for c in tags.pop("categories", "").split(",") if c]
+        difficulty = tags.pop("difficulty", None)
+
+        solve_data = challenge.private_metadata.get("solve", {})
+        manual = solve_data.get("manual", {})
+        solve = {
+            "source": solve_data.get("source", "flag"),
+            **(
+                {
+                    "allow_cancel": manual.get("allow_cancel", False),
+                    "input_type": manual.get("input_type", "text"),
+                }
+                if manual
+                else {}
+            ),
+            **(
+                {"weight_update_key": solve_data["weight_update_key"]}
+                if solve_data.get("weight_update_key")
+                else {}
+            ),
+        }
+
+        score_data = challenge.private_metadata.get("score", {})
+        scoring = {
+            k: score_data[k] for k in ("strategy", "params", "bonus") if k in score_data
+        }
+
+        try:
+            return ChallengeConfig(
+                slug=challenge.slug,
+                title=challenge.title,
+                categories=categories,
+                description=challenge.description,
+                difficulty=difficulty,
+                tags=tags,
+                flags=challenge.flags,
+                files=files,
+                hints=challenge.private_metadata.get("hints", []),
+                hidden=challenge.hidden,
+                visible_at=challenge.visible_at,
+                scoring=scoring,
+                solve=solve,
+            )
+        except PydanticValidationError as e:
+            msg = f"Challenge {challenge.slug} cannot be represented as config: {e}"
+            raise ValidationError(msg) from e
+
     async def upload_file_entry(
         self,
         entry: Union[str, ExternalFileConfig],
@@ -461,6 +1429,18 @@ class NoCTFClient:
         ]
 
 
+def audit_log_key(entry: dict[str, Any]) -> tuple[Any, ...]:
+    """Identity of an audit log entry, which has no ID of its own."""
+
+    return (
+        entry["created_at"],
+        entry["actor"],
+        entry["operation"],
+        tuple(entry["entities"]),
+        entry["data"],
+    )
+
+
 @asynccontextmanager
 async def create_client(config: Config):
     """Create an authenticated noCTF client instance
@@ -472,10 +1452,12 @@ async def create_client(config: Config):
         Authenticated noCTF client
     """
 
+    tracer = current_tracer()
     client = NoCTFClient(
         config.api_url,
         timeout=config.timeout,
         verify_ssl=config.verify_ssl,
+        request_hooks=[tracer] if tracer else None,
     )
     token = config.get_token()
     client.set_token(token)
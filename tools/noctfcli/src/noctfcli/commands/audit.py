@@ -0,0 +1,309 @@
+import asyncio
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Optional, Union
+
+import click
+import httpx
+from rich.markup import escape
+
+from noctfcli.client import NoCTFClient, audit_log_key, create_client
+from noctfcli.exceptions import NoCTFError
+from noctfcli.fastjson import dumps_str
+from noctfcli.utils import parse_api_datetime
+from noctfcli.writers import RecordFormat, open_record_writer
+
+from .common import CLIContextObj, console, handle_errors
+
+AUDIT_LOG_FIELDS: dict[str, type] = {
+    "created_at": str,
+    "actor": str,
+    "operation": str,
+    "entities": list,
+    "data": str,
+}
+
+
+def filter_options(func):
+    func = click.option(
+        "--operation",
+        "operations",
+        multiple=True,
+        help="Only include entries matching this operation (SQL LIKE pattern)",
+    )(func)
+    func = click.option(
+        "--entity",
+        "entities",
+        multiple=True,
+        help="Only include entries touching this entity, e.g. user:1",
+    )(func)
+    return click.option(
+        "--actor",
+        "actors",
+        multiple=True,
+        help="Only include entries by this actor, e.g. user:1",
+    )(func)
+
+
+def print_entry(entry: dict[str, Any], as_json: bool) -> None:
+    if as_json:
+        click.echo(dumps_str(entry))
+        return
+    entities = ",".join(entry["entities"])
+    data = f" {escape(entry['data'])}" if entry["data"] else ""
+    console.print(
+        f"[dim]{entry['created_at']}[/dim] [cyan]{escape(entry['actor'])}[/cyan] "
+        f"[bold]{escape(entry['operation'])}[/bold] {escape(entities)}{data}",
+    )
+
+
+@click.group()
+def audit() -> None:
+    """Follow and export the admin audit log."""
+
+
+@audit.command()
+@click.option(
+    "--lines",
+    "-n",
+    type=click.IntRange(min=0, max=1000),
+    default=10,
+    show_default=True,
+    help="Number of existing entries to show first",
+)
+@filter_options
+@click.option(
+    "--min-interval",
+    type=click.FloatRange(min=0.1),
+    default=1.0,
+    show_default=True,
+    help="Poll interval in seconds while entries are arriving",
+)
+@click.option(
+    "--max-interval",
+    type=click.FloatRange(min=0.1),
+    default=15.0,
+    show_default=True,
+    help="Longest poll interval in seconds when the log is idle",
+)
+@click.option("--json", "as_json", is_flag=True, help="Print entries as NDJSON")
+@click.pass_obj
+@handle_errors
+async def tail(
+    ctx: CLIContextObj,
+    lines: int,
+    actors: tuple[str, ...],
+    entities: tuple[str, ...],
+    operations: tuple[str, ...],
+    min_interval: float,
+    max_interval: float,
+    as_json: bool,
+) -> None:
+    """Follow new audit log entries as they are created."""
+
+    filters = {
+        "actor": list(actors),
+        "entities": list(entities),
+        "operation": list(operations),
+    }
+
+    async with create_client(ctx.config) as client:
+        latest = await client.query_audit_log(page_size=max(lines, 1), **filters)
+        for entry in reversed(latest[:lines]):
+            print_entry(entry, as_json)
+
+        # The high-water mark only has millisecond precision and the query
+        # bound is inclusive, so remember what was printed at that instant.
+        high_water = (
+            parse_api_datetime(latest[0]["created_at"])
+            if latest
+            else datetime.now(timezone.utc)
+        )
+        seen = {
+            audit_log_key(e)
+            for e in latest
+            if parse_api_datetime(e["created_at"]) >= high_water
+        }
+
+        interval = min_interval
+        while True:
+            await asyncio.sleep(interval)
+
+            new_entries = [
+                e
+                async for e in client.iter_audit_log(since=high_water, **filters)
+                if audit_log_key(e) not in seen
+            ]
+            if not new_entries:
+                interval = min(interval * 2, max_interval)
+                continue
+
+            for entry in reversed(new_entries):
+                print_entry(entry, as_json)
+
+            high_water = parse_api_datetime(new_entries[0]["created_at"])
+            seen = {
+                key
+                for key in seen | {audit_log_key(e) for e in new_entries}
+                if parse_api_datetime(key[0]) >= high_water
+            }
+            interval = min_interval
+
+
+async def _fetch_window(
+    client: NoCTFClient,
+    queue: "asyncio.Queue[Union[dict[str, Any], BaseException, None]]",
+    since: Optional[datetime],
+    until: datetime,
+    exclusive_until: bool,
+    filters: dict[str, Any],
+    page_size: int,
+) -> None:
+    try:
+        async for entry in client.iter_audit_log(
+            since,
+            until,
+            page_size=page_size,
+            **filters,
+        ):
+            if exclusive_until and parse_api_datetime(entry["created_at"]) >= until:
+                continue
+            await queue.put(entry)
+        await queue.put(None)
+    except (NoCTFError, httpx.HTTPError) as e:
+        await queue.put(e)
+
+
+async def _next_entry(
+    queue: "asyncio.Queue[Union[dict[str, Any], BaseException, None]]",
+    task: "asyncio.Future[None]",
+) -> Union[dict[str, Any], BaseException, None]:
+    """Take the next item a window's fetch put on its queue.
+
+    Raises:
+        Exception: Whatever crashed the fetch before it finished the window,
+            rather than waiting forever for its next item
+    """
+
+    if not queue.empty():
+        return queue.get_nowait()
+    get = asyncio.ensure_future(queue.get())
+    await asyncio.wait({get, task}, return_when=asyncio.FIRST_COMPLETED)
+    if not get.done() and task.exception() is not None:
+        get.cancel()
+        raise task.exception()  # type: ignore[misc]
+    return await get
+
+
+@audit.command(name="export")
+@click.argument("output", type=click.Path(path_type=Path, dir_okay=False))
+@click.option(
+    "--since",
+    type=click.DateTime(),
+    help="Only export entries created at or after this time (UTC). "
+    "Required to fetch pages concurrently",
+)
+@click.option(
+    "--until",
+    type=click.DateTime(),
+    help="Only export entries created at or before this time (UTC) "
+    "[default: start of export]",
+)
+@filter_options
+@click.option(
+    "--concurrency",
+    type=click.IntRange(min=1),
+    default=4,
+    show_default=True,
+    help="Number of time windows fetched concurrently",
+)
+@click.option(
+    "--page-size",
+    type=click.IntRange(min=1, max=1000),
+    default=1000,
+    show_default=True,
+    help="Entries requested per page",
+)
+@click.pass_obj
+@handle_errors
+async def export_audit_log(
+    ctx: CLIContextObj,
+    output: Path,
+    since: Optional[datetime],
+    until: Optional[datetime],
+    actors: tuple[str, ...],
+    entities: tuple[str, ...],
+    operations: tuple[str, ...],
+    concurrency: int,
+    page_size: int,
+) -> None:
+    """Stream the audit log to an NDJSON file, newest first."""
+
+    filters = {
+        "actor": list(actors),
+        "entities": list(entities),
+        "operation": list(operations),
+    }
+    until = until.replace(tzinfo=timezone.utc) if until else datetime.now(timezone.utc)
+    if since:
+        since = since.replace(tzinfo=timezone.utc)
+
+    # Split the range into windows, newest first, each walked by its own task.
+    # Bounded queues let older windows prefetch without buffering the log.
+    windows: list[tuple[Optional[datetime], datetime]] = [(since, until)]
+    if since and concurrency > 1:
+        step = (until - since) / concurrency
+        bounds = [until - step * i for i in range(concurrency)] + [since]
+        # Bounds are sent with millisecond precision, so align them up front
+        # to keep adjacent windows from overlapping.
+        bounds = [b.replace(microsecond=b.microsecond // 1000 * 1000) for b in bounds]
+        windows = list(zip(bounds[1:], bounds[:-1]))
+
+    async with create_client(ctx.config) as client:
+        start = time.perf_counter()
+        queues: list[asyncio.Queue[Union[dict[str, Any], BaseException, None]]] = [
+            asyncio.Queue(maxsize=page_size * 2) for _ in windows
+        ]
+        tasks = [
+            asyncio.ensure_future(
+                _fetch_window(
+                    client,
+                    queue,
+                    lo,
+                    hi,
+                    exclusive_until=i > 0,
+                    filters=filters,
+                    page_size=page_size,
+                ),
+            )
+            for i, (queue, (lo, hi)) in enumerate(zip(queues, windows))
+        ]
+
+        try:
+            records = open_record_writer(
+                RecordFormat.NDJSON,
+                output,
+                AUDIT_LOG_FIELDS,
+            )
+            with records as writer, console.status("Exporting audit log...") as status:
+                for queue, task in zip(queues, tasks):
+                    while True:
+                        item = await _next_entry(queue, task)
+                        if item is None:
+                            break
+                        if isinstance(item, BaseException):
+                            raise item
+                        writer.write(item)
+                        if writer.count % 1000 == 0:
+                            status.update(f"Exported {writer.count} entries...")
+        finally:
+            for task in tasks:
+                task.cancel()
+        elapsed = time.perf_counter() - start
+
+    rate = writer.count / elapsed if elapsed else 0
+    console.print(
+        f"[green]Exported {writer.count} audit log entries to {output}[/green] "
+        f"[dim]({elapsed:.1f}s, {rate:.0f} rows/s)[/dim]",
+    )
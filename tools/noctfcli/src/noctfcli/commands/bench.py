@@ -0,0 +1,676 @@
+import json
+import shlex
+import sys
+import tempfile
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Optional
+
+import click
+from rich.table import Table
+
+from noctfcli.bench.api import DEFAULT_MIX, LoadTest, parse_mix
+from noctfcli.bench.codec import CodecBenchmark, default_payloads
+from noctfcli.bench.pipeline import PipelineBenchmark, TreeSpec, generate_tree
+from noctfcli.bench.startup import DEFAULT_COMMANDS, StartupBenchmark
+from noctfcli.client import NoCTFClient
+from noctfcli.fastjson import BACKENDS, available_backends, loads
+from noctfcli.stub_server import StubFaults, StubServer
+from noctfcli.tracing import current_tracer
+from noctfcli.utils import format_bytes
+
+from .common import CLIContextObj, console, handle_errors
+
+LATENCY_KEYS = ("p50", "p95", "p99")
+
+RESULT_SECTIONS = {
+    "api": "endpoints",
+    "json": "payloads",
+    "pipeline": "stages",
+    "startup": "commands",
+}
+"""Result kind mapped to the key holding its per-benchmark statistics."""
+
+
+def print_endpoint_table(title: str, endpoints: dict[str, dict[str, Any]]) -> None:
+    table = Table(title=title)
+    table.add_column("Endpoint", style="bold")
+    table.add_column("Requests", justify="right")
+    table.add_column("Req/s", justify="right", style="cyan")
+    table.add_column("Errors", justify="right", style="red")
+    for key in LATENCY_KEYS:
+        table.add_column(f"{key} ms", justify="right", style="green")
+    table.add_column("max ms", justify="right", style="dim")
+
+    for label, stats in endpoints.items():
+        latency = stats["latency_ms"]
+        table.add_row(
+            label,
+            str(stats["requests"]),
+            f"{stats['throughput']:.1f}",
+            f"{stats['error_rate']:.1%}",
+            *(f"{latency[key]:.1f}" for key in LATENCY_KEYS),
+            f"{latency['max']:.1f}",
+        )
+    console.print(table)
+
+
+@click.group()
+def bench() -> None:
+    """Benchmark the noCTF API and noctfcli itself."""
+
+
+@bench.command()
+@click.option(
+    "--users",
+    type=click.IntRange(min=1),
+    default=10,
+    show_default=True,
+    help="Number of concurrent virtual users",
+)
+@click.option(
+    "--duration",
+    type=click.FloatRange(min=0),
+    default=30.0,
+    show_default=True,
+    help="Seconds to run after ramp-up",
+)
+@click.option(
+    "--ramp-up",
+    type=click.FloatRange(min=0),
+    default=0.0,
+    show_default=True,
+    help="Seconds over which virtual users are started",
+)
+@click.option(
+    "--think-time",
+    type=click.FloatRange(min=0),
+    default=0.0,
+    show_default=True,
+    help="Seconds each virtual user waits between requests",
+)
+@click.option(
+    "--mix",
+    default=",".join(f"{k}={v}" for k, v in DEFAULT_MIX.items()),
+    show_default=True,
+    help="Weighted operations: list, detail, scoreboard, solves, submit",
+)
+@click.option(
+    "--url",
+    help="API base URL to benchmark instead of the configured api_url",
+)
+@click.option(
+    "--tokens",
+    type=click.Path(exists=True, path_type=Path, dir_okay=False),
+    help="File with one player token per line, assigned round-robin to users",
+)
+@click.option(
+    "--connections",
+    type=click.IntRange(min=1),
+    help="Connection pool size per token",
+)
+@click.option("--seed", type=int, help="Random seed for reproducible request mixes")
+@click.option(
+    "--output",
+    "-o",
+    type=click.Path(path_type=Path, dir_okay=False),
+    help="Write JSON results to this file",
+)
+@click.pass_obj
+@handle_errors
+async def api(
+    ctx: CLIContextObj,
+    users: int,
+    duration: float,
+    ramp_up: float,
+    think_time: float,
+    mix: str,
+    url: Optional[str],
+    tokens: Optional[Path],
+    connections: Optional[int],
+    seed: Optional[int],
+    output: Optional[Path],
+) -> None:
+    """Generate load against the API with a weighted workload mix."""
+
+    config = ctx.config
+    token_list = (
+        [t.strip() for t in tokens.read_text().splitlines() if t.strip()]
+        if tokens
+        else [config.get_token()]
+    )
+    tracer = current_tracer()
+    clients = []
+    for token in token_list:
+        client = NoCTFClient(
+            url or config.api_url,
+            timeout=config.timeout,
+            verify_ssl=config.verify_ssl,
+            max_connections=connections,
+            request_hooks=[tracer] if tracer else None,
+        )
+        client.set_token(token)
+        clients.append(client)
+
+    load_test = LoadTest(
+        clients,
+        parse_mix(mix),
+        users=users,
+        duration=duration,
+        ramp_up=ramp_up,
+        think_time=think_time,
+        seed=seed,
+    )
+    try:
+        fixture = await load_test.discover()
+        console.print(
+            f"[blue]Running {users} virtual users for {ramp_up + duration:g}s "
+            f"against {clients[0].base_url}...[/blue]",
+        )
+        with console.status("Generating load..."):
+            results = await load_test.run(fixture)
+    finally:
+        for client in clients:
+            await client.close()
+
+    print_endpoint_table(
+        f"{results['total']['requests']} requests in {results['elapsed']:.1f}s",
+        {**results["endpoints"], "total": results["total"]},
+    )
+    if output:
+        output.write_text(json.dumps(results, indent=2))
+        console.print(f"[green]Results written to {output}[/green]")
+
+
+@bench.command()
+@click.option(
+    "--command",
+    "commands",
+    multiple=True,
+    help="CLI arguments to time, e.g. 'validate --help' (can be repeated) "
+    f"[default: {', '.join(repr(c) for c in DEFAULT_COMMANDS)}]",
+)
+@click.option(
+    "--runs",
+    type=click.IntRange(min=1),
+    default=10,
+    show_default=True,
+    help="Timed runs per command",
+)
+@click.option(
+    "--budget-ms",
+    type=click.FloatRange(min=0),
+    help="Exit with status 1 if any command's median exceeds this",
+)
+@click.option(
+    "--output",
+    "-o",
+    type=click.Path(path_type=Path, dir_okay=False),
+    help="Write JSON results to this file",
+)
+def startup(
+    commands: tuple[str, ...],
+    runs: int,
+    budget_ms: Optional[float],
+    output: Optional[Path],
+) -> None:
+    """Time CLI startup in fresh interpreters and profile its imports."""
+
+    benchmark = StartupBenchmark(
+        [shlex.split(c) for c in commands or DEFAULT_COMMANDS],
+        runs=runs,
+    )
+    with console.status("Timing CLI startup..."):
+        results = benchmark.run()
+
+    table = Table(title=f"CLI startup (Python {results['python']}, {runs} runs)")
+    table.add_column("Command", style="bold")
+    for key in LATENCY_KEYS:
+        table.add_column(f"{key} ms", justify="right", style="green")
+    table.add_column("Imports ms", justify="right", style="cyan")
+    table.add_column("Modules", justify="right")
+    table.add_column("Heavy imports", style="yellow")
+    for name, stats in results["commands"].items():
+        table.add_row(
+            name,
+            *(f"{stats['latency_ms'][key]:.1f}" for key in LATENCY_KEYS),
+            f"{stats['import_ms']:.1f}",
+            str(stats["modules"]),
+            ", ".join(stats["heavy_imports"]) or "-",
+        )
+    console.print(table)
+
+    name, slowest = max(
+        results["commands"].items(),
+        key=lambda item: item[1]["import_ms"],
+    )
+    table = Table(title=f"Slowest imports ({name})")
+    table.add_column("Module")
+    table.add_column("Self ms", justify="right")
+    for module, self_ms in slowest["slowest_imports"]:
+        table.add_row(module, f"{self_ms:.1f}")
+    console.print(table)
+
+    if output:
+        output.write_text(json.dumps(results, indent=2))
+        console.print(f"[green]Results written to {output}[/green]")
+
+    failed = [n for n, stats in results["commands"].items() if stats["exit_code"]]
+    if failed:
+        console.print(f"[red]Commands failed: {', '.join(failed)}[/red]")
+        sys.exit(1)
+    if budget_ms is not None:
+        over = [
+            n
+            for n, stats in results["commands"].items()
+            if stats["latency_ms"]["p50"] > budget_ms
+        ]
+        if over:
+            console.print(
+                f"[red]Median startup over {budget_ms:g}ms: {', '.join(over)}[/red]",
+            )
+            sys.exit(1)
+
+
+@bench.command()
+@click.argument(
+    "challenges_directory",
+    required=False,
+    type=click.Path(exists=True, path_type=Path, file_okay=False, dir_okay=True),
+)
+@click.option(
+    "--challenges",
+    type=click.IntRange(min=1),
+    default=TreeSpec.challenges,
+    show_default=True,
+    help="Challenges in the generated tree",
+)
+@click.option(
+    "--files",
+    type=click.IntRange(min=0),
+    default=TreeSpec.files,
+    show_default=True,
+    help="Files per generated challenge",
+)
+@click.option(
+    "--file-size",
+    type=click.FloatRange(min=0),
+    default=TreeSpec.file_size / 1024,
+    show_default=True,
+    help="Median generated file size in KiB",
+)
+@click.option(
+    "--file-size-sigma",
+    type=click.FloatRange(min=0),
+    default=TreeSpec.file_size_sigma,
+    show_default=True,
+    help="Spread of the log-normal file size distribution (0 for equal sizes)",
+)
+@click.option(
+    "--description-size",
+    type=click.IntRange(min=0),
+    default=TreeSpec.description_size,
+    show_default=True,
+    help="Characters of description per generated challenge",
+)
+@click.option(
+    "--seed",
+    type=int,
+    default=TreeSpec.seed,
+    show_default=True,
+    help="Random seed for the generated tree",
+)
+@click.option(
+    "--runs",
+    type=click.IntRange(min=1),
+    default=5,
+    show_default=True,
+    help="Timed runs per stage",
+)
+@click.option(
+    "--output",
+    "-o",
+    type=click.Path(path_type=Path, dir_okay=False),
+    help="Write JSON results to this file",
+)
+def pipeline(
+    challenges_directory: Optional[Path],
+    challenges: int,
+    files: int,
+    file_size: float,
+    file_size_sigma: float,
+    description_size: int,
+    seed: int,
+    runs: int,
+    output: Optional[Path],
+) -> None:
+    """Time each stage of deploying a challenge tree.
+
+    Benchmarks CHALLENGES_DIRECTORY if given, otherwise a synthetic tree
+    generated from the options. Deploys go to an in-process stub server.
+    """
+
+    spec = None
+    with tempfile.TemporaryDirectory(prefix="noctfcli-bench-") as tmp:
+        root = challenges_directory
+        if root is None:
+            spec = TreeSpec(
+                challenges=challenges,
+                files=files,
+                file_size=round(file_size * 1024),
+                file_size_sigma=file_size_sigma,
+                description_size=description_size,
+                seed=seed,
+            )
+            root = Path(tmp)
+            with console.status("Generating challenge tree..."):
+                generate_tree(root, spec)
+
+        with console.status("Timing deployment pipeline..."):
+            results = PipelineBenchmark(root, runs=runs).run()
+    results["spec"] = asdict(spec) if spec else None
+
+    tree = results["tree"]
+    table = Table(
+        title=f"{tree['challenges']} challenges, {tree['files']} files, "
+        f"{format_bytes(tree['bytes'])} ({runs} runs)",
+    )
+    table.add_column("Stage", style="bold")
+    table.add_column("Items", justify="right")
+    for key in LATENCY_KEYS:
+        table.add_column(f"{key} ms", justify="right", style="green")
+    table.add_column("Items/s", justify="right", style="cyan")
+    for name, stats in results["stages"].items():
+        latency = stats["latency_ms"]
+        table.add_row(
+            name,
+            str(stats["items"]),
+            *(f"{latency[key]:.1f}" for key in LATENCY_KEYS),
+            f"{stats['items'] / latency['mean'] * 1000:.0f}"
+            if latency["mean"]
+            else "-",
+        )
+    console.print(table)
+
+    if output:
+        output.write_text(json.dumps(results, indent=2))
+        console.print(f"[green]Results written to {output}[/green]")
+
+
+@bench.command("json")
+@click.option(
+    "--payload",
+    "payload_files",
+    multiple=True,
+    type=click.Path(exists=True, path_type=Path, dir_okay=False),
+    help="JSON file to benchmark, e.g. a saved scoreboard.json (can be repeated) "
+    "[default: generated scoreboard and teams responses]",
+)
+@click.option(
+    "--teams",
+    type=click.IntRange(min=1),
+    default=2000,
+    show_default=True,
+    help="Teams in generated payloads",
+)
+@click.option(
+    "--challenges",
+    type=click.IntRange(min=1),
+    default=40,
+    show_default=True,
+    help="Challenges in the generated scoreboard",
+)
+@click.option(
+    "--backend",
+    "backends",
+    multiple=True,
+    type=click.Choice(BACKENDS),
+    help="Backend to compare (can be repeated) [default: all installed]",
+)
+@click.option(
+    "--runs",
+    type=click.IntRange(min=1),
+    default=20,
+    show_default=True,
+    help="Timed runs per payload, backend and operation",
+)
+@click.option(
+    "--output",
+    "-o",
+    type=click.Path(path_type=Path, dir_okay=False),
+    help="Write JSON results to this file",
+)
+def json_(
+    payload_files: tuple[Path, ...],
+    teams: int,
+    challenges: int,
+    backends: tuple[str, ...],
+    runs: int,
+    output: Optional[Path],
+) -> None:
+    """Compare JSON backends on realistic API payloads."""
+
+    installed = available_backends()
+    missing = [b for b in backends if b not in installed]
+    if missing:
+        console.print(f"[red]Backends not installed: {', '.join(missing)}[/red]")
+        sys.exit(1)
+
+    if payload_files:
+        payloads = {p.name: loads(p.read_bytes()) for p in payload_files}
+    else:
+        payloads = default_payloads(teams, challenges)
+    benchmark = CodecBenchmark(payloads, list(backends) or installed, runs=runs)
+    with console.status("Timing JSON backends..."):
+        results = benchmark.run()
+
+    table = Table(title=f"JSON backends (Python {results['python']}, {runs} runs)")
+    table.add_column("Payload", style="bold")
+    table.add_column("Operation")
+    table.add_column("Backend")
+    table.add_column("Size", justify="right")
+    for key in LATENCY_KEYS:
+        table.add_column(f"{key} ms", justify="right", style="green")
+    table.add_column("vs json", justify="right", style="cyan")
+    stats_by_key = {
+        (s["payload"], s["operation"], s["backend"]): s
+        for s in results["payloads"].values()
+    }
+    for (payload, operation, backend), stats in stats_by_key.items():
+        latency = stats["latency_ms"]
+        baseline = stats_by_key.get((payload, operation, "json"))
+        speedup = (
+            f"{baseline['latency_ms']['p50'] / latency['p50']:.1f}x"
+            if baseline and latency["p50"]
+            else "-"
+        )
+        table.add_row(
+            payload,
+            operation,
+            backend,
+            format_bytes(stats["bytes"]),
+            *(f"{latency[key]:.2f}" for key in LATENCY_KEYS),
+            speedup,
+        )
+    console.print(table)
+
+    if output:
+        output.write_text(json.dumps(results, indent=2))
+        console.print(f"[green]Results written to {output}[/green]")
+
+
+@bench.command()
+@click.option("--host", default="127.0.0.1", show_default=True, help="Bind address")
+@click.option("--port", type=int, default=8000, show_default=True, help="Bind port")
+@click.option("--token", help="Require this bearer token on every request")
+@click.option(
+    "--latency",
+    type=click.FloatRange(min=0),
+    default=0.0,
+    show_default=True,
+    help="Milliseconds added to every response",
+)
+@click.option(
+    "--jitter",
+    type=click.FloatRange(min=0),
+    default=0.0,
+    show_default=True,
+    help="Maximum extra random milliseconds per response",
+)
+@click.option(
+    "--bandwidth",
+    type=click.FloatRange(min=1),
+    help="Limit request and response bodies to this many KiB/s",
+)
+@click.option(
+    "--error-rate",
+    type=click.FloatRange(min=0, max=1),
+    default=0.0,
+    show_default=True,
+    help="Fraction of requests that fail",
+)
+@click.option(
+    "--error-status",
+    type=click.IntRange(min=400, max=599),
+    default=503,
+    show_default=True,
+    help="HTTP status of injected failures",
+)
+@click.option(
+    "--challenges",
+    type=click.IntRange(min=0),
+    default=0,
+    show_default=True,
+    help="Number of challenges to seed",
+)
+@click.option(
+    "--teams",
+    type=click.IntRange(min=0),
+    default=0,
+    show_default=True,
+    help="Number of teams to seed",
+)
+@click.option(
+    "--divisions",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Number of divisions to seed",
+)
+@click.option("--seed", type=int, help="Random seed for jitter and failures")
+def stub(
+    host: str,
+    port: int,
+    token: Optional[str],
+    latency: float,
+    jitter: float,
+    bandwidth: Optional[float],
+    error_rate: float,
+    error_status: int,
+    challenges: int,
+    teams: int,
+    divisions: int,
+    seed: Optional[int],
+) -> None:
+    """Serve an in-memory stub of the noCTF API for offline testing."""
+
+    faults = StubFaults(
+        latency=latency / 1000,
+        jitter=jitter / 1000,
+        bandwidth=bandwidth * 1024 if bandwidth else None,
+        error_rate=error_rate,
+        error_status=error_status,
+        seed=seed,
+    )
+    server = StubServer(host, port, faults=faults, token=token)
+    server.seed(challenges=challenges, teams=teams, divisions=divisions)
+    console.print(f"[green]Stub noCTF API listening on {server.url}[/green]")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+        console.print(
+            f"[dim]Served {sum(server.requests.values())} requests[/dim]",
+        )
+
+
+def _change(before: float, after: float) -> Optional[float]:
+    return (after - before) / before if before else None
+
+
+@bench.command()
+@click.argument(
+    "baseline",
+    type=click.Path(exists=True, path_type=Path, dir_okay=False),
+)
+@click.argument(
+    "current",
+    type=click.Path(exists=True, path_type=Path, dir_okay=False),
+)
+@click.option(
+    "--threshold",
+    type=click.FloatRange(min=0),
+    default=10.0,
+    show_default=True,
+    help="Percent slowdown that counts as a regression",
+)
+def compare(baseline: Path, current: Path, threshold: float) -> None:
+    """Compare two benchmark result files and flag regressions.
+
+    Exits with status 1 if any p50/p95/p99 latency grew, or any throughput
+    dropped, by more than the threshold.
+    """
+
+    before = json.loads(baseline.read_text())
+    after = json.loads(current.read_text())
+    if before.get("kind") != after.get("kind"):
+        console.print(
+            f"[red]Cannot compare {before.get('kind')} results with "
+            f"{after.get('kind')} results[/red]",
+        )
+        sys.exit(1)
+    section = RESULT_SECTIONS[after["kind"]]
+
+    limit = threshold / 100
+    regressions = []
+    table = Table(title=f"{current} vs {baseline}")
+    table.add_column("Benchmark", style="bold")
+    table.add_column("Metric")
+    table.add_column("Baseline", justify="right")
+    table.add_column("Current", justify="right")
+    table.add_column("Change", justify="right")
+
+    for name, stats in after[section].items():
+        if name not in before[section]:
+            continue
+        old = before[section][name]
+        metrics = [
+            (f"{key} ms", old["latency_ms"][key], stats["latency_ms"][key], 1)
+            for key in LATENCY_KEYS
+        ]
+        if "throughput" in stats:
+            metrics.append(("req/s", old["throughput"], stats["throughput"], -1))
+
+        for metric, old_value, new_value, direction in metrics:
+            change = _change(old_value, new_value)
+            regressed = change is not None and change * direction > limit
+            if regressed:
+                regressions.append(f"{name} {metric}")
+            style = "red" if regressed else "green"
+            table.add_row(
+                name,
+                metric,
+                f"{old_value:.2f}",
+                f"{new_value:.2f}",
+                "-" if change is None else f"[{style}]{change:+.1%}[/{style}]",
+            )
+
+    console.print(table)
+    if regressions:
+        console.print(f"[red]{len(regressions)} regressions over {threshold:g}%:[/red]")
+        for regression in regressions:
+            console.print(f"  - {regression}")
+        sys.exit(1)
+    console.print(f"[green]No regressions over {threshold:g}%[/green]")
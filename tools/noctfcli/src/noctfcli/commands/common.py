@@ -1,16 +1,15 @@
 import asyncio
 import sys
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
 from functools import wraps
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Union
 
 from rich.console import Console
 
-from noctfcli.client import NoCTFClient
-from noctfcli.config import Config
+from noctfcli.context import CLIContextObj
 from noctfcli.exceptions import NoCTFError
+from noctfcli.external import RemoteFileHasher
 from noctfcli.models import (
     ChallengeConfig,
     ChallengeFileAttachment,
@@ -18,17 +17,17 @@ from noctfcli.models import (
     UploadUpdateResult,
     UploadUpdateResultEnum,
 )
-from noctfcli.preprocessor import PreprocessorBase
-from noctfcli.utils import find_challenge_files
+from noctfcli.preprocessor import PreprocessorBase, PreprocessorPipeline
+from noctfcli.tracing import span
+from noctfcli.utils import cache_directory, find_challenge_files
 from noctfcli.validator import ChallengeValidator
 
-console = Console()
+if TYPE_CHECKING:
+    from noctfcli.client import NoCTFClient
 
+console = Console()
 
-@dataclass
-class CLIContextObj:
-    config: Config
-    preprocessor: Optional[PreprocessorBase]
+__all__ = ["CLIContextObj", "ChallengeProcessor", "console", "handle_errors"]
 
 
 def handle_errors(async_func):
@@ -54,12 +53,14 @@ def handle_errors(async_func):
 class ChallengeProcessor(ABC):
     def __init__(
         self,
-        client: NoCTFClient,
+        client: "NoCTFClient",
         console: Console,
-        preprocessor: Optional[PreprocessorBase] = None,
+        preprocessor: Union[PreprocessorBase, PreprocessorPipeline, None] = None,
     ):
         self.client = client
         self.console = console
+        if isinstance(preprocessor, PreprocessorBase):
+            preprocessor = PreprocessorPipeline([preprocessor])
         self.preprocessor = preprocessor
         self.validator = ChallengeValidator()
 
@@ -76,35 +77,127 @@ class ChallengeProcessor(ABC):
             )
 
         yaml_files = find_challenge_files(challenges_directory)
-        for yaml_path in yaml_files:
+        configs = await self._load_challenges(yaml_files)
+        if not dry_run:
+            await self._fill_external_files(configs)
+        for yaml_path, challenge_config in configs.items():
             try:
-                challenge_config = self.validator.validate_challenge_complete(yaml_path)
-                if self.preprocessor:
-                    challenge_config = self.preprocessor.preprocess(challenge_config)
+                if isinstance(challenge_config, Exception):
+                    error = challenge_config
+                else:
+                    with span("challenge", path=str(yaml_path)):
+                        if dry_run:
+                            self._handle_dry_run(challenge_config, yaml_path)
+                            continue
+
+                        result = await self._process_single_challenge(
+                            challenge_config,
+                            yaml_path,
+                        )
+                        results.append(result)
+                        continue
+            except Exception as e:
+                error = e
+
+            results.append(
+                UploadUpdateResult(
+                    challenge=yaml_path.parent.name,
+                    status=UploadUpdateResultEnum.FAILED,
+                    error=str(error),
+                ),
+            )
+            self.console.print(
+                f"[red]Error processing challenge {yaml_path}: {error}[/red]",
+            )
+
+        return results
+
+    async def _load_challenges(
+        self,
+        yaml_paths: list[Path],
+    ) -> dict[Path, Union[ChallengeConfig, Exception]]:
+        """Validate noctf.yaml files and apply the preprocessor to them.
+
+        Challenges are preprocessed concurrently once all are validated.
 
-                if dry_run:
-                    self._handle_dry_run(challenge_config, yaml_path)
-                    continue
+        Returns:
+            Each path mapped to its config, or the exception that failed it
+        """
 
-                result = await self._process_single_challenge(
-                    challenge_config,
+        configs: dict[Path, Union[ChallengeConfig, Exception]] = {}
+        for yaml_path in yaml_paths:
+            try:
+                configs[yaml_path] = self.validator.validate_challenge_complete(
                     yaml_path,
                 )
-                results.append(result)
+            except (NoCTFError, OSError) as e:
+                configs[yaml_path] = e
 
-            except Exception as e:
-                results.append(
-                    UploadUpdateResult(
-                        challenge=yaml_path.parent.name,
-                        status=UploadUpdateResultEnum.FAILED,
-                        error=str(e),
-                    ),
-                )
-                self.console.print(
-                    f"[red]Error processing challenge {yaml_path}: {e}[/red]",
-                )
+        if self.preprocessor:
+            valid = {
+                path: config
+                for path, config in configs.items()
+                if isinstance(config, ChallengeConfig)
+            }
+            outcomes = await self.preprocessor.preprocess_many(list(valid.values()))
+            for path, outcome in zip(valid, outcomes):
+                if isinstance(outcome, Exception):
+                    configs[path] = outcome
+                elif isinstance(outcome, BaseException):
+                    raise outcome
+                else:
+                    configs[path] = outcome
 
-        return results
+        return configs
+
+    async def _fill_external_files(
+        self,
+        configs: dict[Path, Union[ChallengeConfig, Exception]],
+    ) -> None:
+        """Compute the hash and size of external files that do not declare them.
+
+        This downloads every such file that changed since it was last hashed,
+        so it is only done right before challenges are uploaded.
+        """
+
+        def incomplete(entry: object) -> bool:
+            return isinstance(entry, ExternalFileConfig) and entry.hash is None
+
+        urls = [
+            entry.url
+            for config in configs.values()
+            if isinstance(config, ChallengeConfig)
+            for entry in config.files
+            if incomplete(entry)
+        ]
+        if not urls:
+            return
+
+        self.console.print(
+            f"[blue]Hashing {len(set(urls))} external files...[/blue]",
+        )
+        async with RemoteFileHasher(cache_directory() / "external.json") as hasher:
+            digests = await hasher.digest_many(urls)
+
+        for path, config in configs.items():
+            if not isinstance(config, ChallengeConfig):
+                continue
+            files = []
+            for entry in config.files:
+                if incomplete(entry):
+                    digest = digests[entry.url]
+                    if isinstance(digest, Exception):
+                        configs[path] = digest
+                        break
+                    files.append(
+                        entry.model_copy(
+                            update={"hash": digest.hash, "size": digest.size},
+                        ),
+                    )
+                else:
+                    files.append(entry)
+            else:
+                configs[path] = config.model_copy(update={"files": files})
 
     def _handle_dry_run(
         self,
@@ -119,7 +212,12 @@ class ChallengeProcessor(ABC):
             )
             for file_path in challenge_config.files:
                 if isinstance(file_path, ExternalFileConfig):
-                    self.console.print(f"  • {file_path.url} (external)")
+                    computed = (
+                        ", hash and size computed on upload"
+                        if file_path.hash is None
+                        else ""
+                    )
+                    self.console.print(f"  • {file_path.url} (external{computed})")
                 else:
                     self.console.print(f"  • {yaml_path.parent / file_path}")
 
@@ -0,0 +1,195 @@
+import asyncio
+from pathlib import Path
+from typing import Union
+
+import click
+from pydantic import ValidationError as PydanticValidationError
+from rich.console import Console
+
+from noctfcli.client import NoCTFClient, create_client
+from noctfcli.exceptions import NoCTFError, ValidationError
+from noctfcli.models import (
+    ChallengeFile,
+    ChallengeSummary,
+    ExternalFileConfig,
+    UploadUpdateResult,
+    UploadUpdateResultEnum,
+)
+from noctfcli.utils import dump_challenge_config, print_results_summary
+
+from .common import CLIContextObj, console, handle_errors
+
+HANDOUT_DIRECTORY = "publish"
+
+
+def handout_name(filename: str) -> str:
+    """The name to save an attachment as inside the handout directory.
+
+    Any directory part is dropped so a name from the server cannot write
+    outside the challenge directory.
+
+    Raises:
+        ValidationError: If nothing usable is left of the name
+    """
+
+    name = Path(filename.replace("\\", "/")).name
+    if name in ("", ".", ".."):
+        msg = f"Invalid attachment filename: {filename!r}"
+        raise ValidationError(msg)
+    return name
+
+
+class PullProcessor:
+    def __init__(
+        self,
+        client: NoCTFClient,
+        console: Console,
+        concurrency: int = 8,
+        download_files: bool = True,
+        overwrite: bool = False,
+    ):
+        self.client = client
+        self.console = console
+        self.download_files = download_files
+        self.overwrite = overwrite
+        self._semaphore = asyncio.Semaphore(concurrency)
+
+    async def pull_challenges(
+        self,
+        output_directory: Path,
+        slugs: tuple[str, ...] = (),
+    ) -> list[UploadUpdateResult]:
+        challenges = await self.client.list_challenges()
+        if slugs:
+            challenges = [c for c in challenges if c.slug in slugs]
+
+        return list(
+            await asyncio.gather(
+                *(self._pull_single(c, output_directory) for c in challenges),
+            ),
+        )
+
+    async def _pull_single(
+        self,
+        summary: ChallengeSummary,
+        output_directory: Path,
+    ) -> UploadUpdateResult:
+        challenge_dir = output_directory / summary.slug
+        yaml_path = challenge_dir / "noctf.yaml"
+        if yaml_path.exists() and not self.overwrite:
+            self.console.print(
+                f"[yellow]Warning: {yaml_path} already exists.[/yellow] "
+                "[dim]Use --overwrite to replace it[/dim]",
+            )
+            return UploadUpdateResult(
+                challenge=summary.slug,
+                status=UploadUpdateResultEnum.SKIPPED,
+            )
+
+        try:
+            async with self._semaphore:
+                challenge, files = await self.client.get_challenge_by_id(
+                    summary.id,
+                    with_files=True,
+                )
+
+            challenge_dir.mkdir(parents=True, exist_ok=True)
+            entries = await self._pull_files(files, challenge_dir)
+            config = self.client.challenge_to_config(challenge, entries)
+            yaml_path.write_text(dump_challenge_config(config), encoding="utf-8")
+        except (NoCTFError, PydanticValidationError, OSError) as e:
+            self.console.print(
+                f"[red]Error pulling challenge {summary.slug}: {e}[/red]",
+            )
+            return UploadUpdateResult(
+                challenge=summary.slug,
+                status=UploadUpdateResultEnum.FAILED,
+                error=str(e),
+            )
+
+        self.console.print(
+            f"[green]Pulled challenge: {challenge.title}[/green] "
+            f"({len(entries)} files)",
+        )
+        return UploadUpdateResult(
+            challenge=summary.slug,
+            status=UploadUpdateResultEnum.PULLED,
+        )
+
+    async def _pull_files(
+        self,
+        files: list[ChallengeFile],
+        challenge_dir: Path,
+    ) -> list[Union[str, ExternalFileConfig]]:
+        entries: list[Union[str, ExternalFileConfig]] = []
+        downloads = []
+        used_names: set[str] = set()
+
+        for f in files:
+            if f.provider == "external":
+                entries.append(ExternalFileConfig(url=f.url, hash=f.hash, size=f.size))
+                continue
+
+            name = handout_name(f.filename)
+            if name in used_names:
+                name = f"{f.id}-{name}"
+            used_names.add(name)
+            relative = f"{HANDOUT_DIRECTORY}/{name}"
+            entries.append(relative)
+            if self.download_files:
+                downloads.append(self._download(f, challenge_dir / relative))
+
+        if downloads:
+            (challenge_dir / HANDOUT_DIRECTORY).mkdir(exist_ok=True)
+            await asyncio.gather(*downloads)
+
+        return entries
+
+    async def _download(self, file: ChallengeFile, dest: Path) -> None:
+        async with self._semaphore:
+            await self.client.download_file(file, dest)
+
+
+@click.command()
+@click.argument(
+    "output_directory",
+    type=click.Path(path_type=Path, file_okay=False, dir_okay=True),
+)
+@click.option(
+    "--slug",
+    "slugs",
+    multiple=True,
+    help="Only pull the given challenge (can be repeated)",
+)
+@click.option(
+    "--concurrency",
+    type=click.IntRange(min=1),
+    default=8,
+    show_default=True,
+    help="Maximum number of concurrent requests",
+)
+@click.option("--no-files", is_flag=True, help="Do not download handout files")
+@click.option("--overwrite", is_flag=True, help="Overwrite existing noctf.yaml files")
+@click.pass_obj
+@handle_errors
+async def pull(
+    ctx: CLIContextObj,
+    output_directory: Path,
+    slugs: tuple[str, ...],
+    concurrency: int,
+    no_files: bool,
+    overwrite: bool,
+) -> None:
+    """Export challenges from the server to noctf.yaml files."""
+
+    async with create_client(ctx.config) as client:
+        processor = PullProcessor(
+            client,
+            console,
+            concurrency=concurrency,
+            download_files=not no_files,
+            overwrite=overwrite,
+        )
+        results = await processor.pull_challenges(output_directory, slugs)
+
+    print_results_summary(console, results)
@@ -0,0 +1,416 @@
+import asyncio
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Optional, Union
+
+import click
+import yaml
+from pydantic import ValidationError as PydanticValidationError
+from rich.table import Table
+
+from noctfcli.client import create_client
+from noctfcli.exceptions import NoCTFError, ValidationError
+from noctfcli.fastjson import dumps
+from noctfcli.models import (
+    ChallengeConfig,
+    ChallengeFileAttachment,
+    ReleasePlan,
+    ReleaseWave,
+    UploadUpdateResult,
+    UploadUpdateResultEnum,
+)
+from noctfcli.utils import find_challenge_files, print_results_summary
+
+from .common import CLIContextObj, console, handle_errors
+from .update import AtomicUpdateProcessor
+
+WARMUP_SECONDS = 2.0
+"""Seconds before a wave that the challenges' current versions are fetched.
+
+This also opens the pooled connections the release requests are sent on,
+well within httpx's five second keep-alive expiry.
+"""
+
+
+def _utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def load_release_plan(path: Path) -> ReleasePlan:
+    """Load a YAML release plan.
+
+    Raises:
+        ValidationError: If the plan is malformed
+    """
+
+    try:
+        with open(path) as f:
+            return ReleasePlan.model_validate(yaml.safe_load(f))
+    except (yaml.YAMLError, PydanticValidationError) as e:
+        msg = f"Invalid release plan {path}: {e}"
+        raise ValidationError(msg) from e
+
+
+@dataclass
+class StagedRelease:
+    """A challenge whose content is uploaded and hidden, ready to release."""
+
+    config: ChallengeConfig
+    challenge_id: int
+    version: int
+    sent_at: Optional[float] = None
+    done_at: Optional[float] = None
+    error: Optional[str] = None
+
+
+@dataclass
+class WaveReport:
+    """When the challenges of a wave became visible."""
+
+    wave: ReleaseWave
+    releases: list[StagedRelease]
+
+    def to_dict(self) -> dict[str, Any]:
+        """Times in milliseconds relative to the scheduled instant."""
+
+        scheduled = _utc(self.wave.at).timestamp()
+        done = [r.done_at for r in self.releases if r.done_at is not None]
+        sent = [r.sent_at for r in self.releases if r.sent_at is not None]
+
+        def offset(value: float) -> float:
+            return round((value - scheduled) * 1000, 3)
+
+        return {
+            "name": self.wave.name,
+            "scheduled": _utc(self.wave.at).isoformat(),
+            "challenges": len(self.releases),
+            "failed": sum(1 for r in self.releases if r.error),
+            "first_sent_ms": offset(min(sent)) if sent else None,
+            "first_visible_ms": offset(min(done)) if done else None,
+            "last_visible_ms": offset(max(done)) if done else None,
+            "skew_ms": round((max(done) - min(done)) * 1000, 3) if done else None,
+            "releases": {
+                r.config.slug: {
+                    "sent_ms": offset(r.sent_at) if r.sent_at else None,
+                    "visible_ms": offset(r.done_at) if r.done_at else None,
+                    "error": r.error,
+                }
+                for r in self.releases
+            },
+        }
+
+
+class ReleaseProcessor(AtomicUpdateProcessor):
+    """Releases waves of challenges at scheduled times.
+
+    Every challenge is updated ahead of time with its files uploaded and
+    ``hidden`` set. At each wave's instant only ``hidden: false`` is sent for
+    its challenges, all at once, so the time between the first and last of
+    them becoming visible is a single small request's worth of latency.
+
+    A challenge's visible_at is sent as configured, so the server still
+    withholds it until then if the local clock runs ahead.
+    """
+
+    async def plan_waves(
+        self,
+        challenges_directory: Path,
+        plan: Optional[ReleasePlan] = None,
+    ) -> list[tuple[ReleaseWave, list[tuple[ChallengeConfig, Path]]]]:
+        """Match challenges in a directory to release waves.
+
+        Without a plan, unhidden challenges with a visible_at are released in
+        waves grouped by that time.
+
+        Returns:
+            Waves in time order with the config and path of their challenges
+
+        Raises:
+            NoCTFError: If a planned challenge is not in the directory
+        """
+
+        configs: dict[str, tuple[ChallengeConfig, Path]] = {}
+        yaml_paths = find_challenge_files(challenges_directory)
+        for yaml_path, outcome in (await self._load_challenges(yaml_paths)).items():
+            if isinstance(outcome, Exception):
+                msg = f"Error loading challenge {yaml_path}: {outcome}"
+                raise NoCTFError(msg) from outcome
+            configs[outcome.slug] = (outcome, yaml_path)
+
+        if plan is not None:
+            waves = plan.waves
+        else:
+            grouped: dict[datetime, list[str]] = {}
+            for slug, (config, _) in configs.items():
+                if config.visible_at and not config.hidden:
+                    grouped.setdefault(_utc(config.visible_at), []).append(slug)
+            waves = [
+                ReleaseWave(at=at, challenges=slugs) for at, slugs in grouped.items()
+            ]
+
+        missing = [
+            slug for wave in waves for slug in wave.challenges if slug not in configs
+        ]
+        if missing:
+            msg = f"Planned challenges not found in directory: {', '.join(missing)}"
+            raise NoCTFError(msg)
+
+        return sorted(
+            ((wave, [configs[slug] for slug in wave.challenges]) for wave in waves),
+            key=lambda item: _utc(item[0].at),
+        )
+
+    async def stage(
+        self,
+        challenges: list[tuple[ChallengeConfig, Path]],
+    ) -> tuple[list[StagedRelease], list[UploadUpdateResult]]:
+        """Upload files and update challenges with hidden set.
+
+        Challenges that are already visible are skipped rather than hidden.
+
+        Returns:
+            Staged challenges and the results of those that were not staged
+        """
+
+        configs: dict[Path, Union[ChallengeConfig, Exception]] = {
+            yaml_path: config for config, yaml_path in challenges
+        }
+        await self._fill_external_files(configs)
+        challenge_ids = await self._challenge_ids()
+
+        async def stage_one(
+            config: Union[ChallengeConfig, Exception],
+            yaml_path: Path,
+        ) -> Optional[StagedRelease]:
+            if isinstance(config, Exception):
+                raise config
+            pending = await self._prepare(config, yaml_path, challenge_ids)
+            existing = pending.previous
+            if not existing.hidden and (
+                existing.visible_at is None
+                or _utc(existing.visible_at) <= datetime.now(timezone.utc)
+            ):
+                return None
+            return await self._stage_hidden(
+                config,
+                pending.files,
+                existing.id,
+                existing.version,
+            )
+
+        outcomes = await asyncio.gather(
+            *(stage_one(configs[path], path) for _, path in challenges),
+            return_exceptions=True,
+        )
+        staged = []
+        results = []
+        for (config, _), outcome in zip(challenges, outcomes):
+            if isinstance(outcome, BaseException):
+                results.append(
+                    UploadUpdateResult(
+                        challenge=config.slug,
+                        status=UploadUpdateResultEnum.FAILED,
+                        error=str(outcome) or type(outcome).__name__,
+                    ),
+                )
+            elif outcome is None:
+                results.append(
+                    UploadUpdateResult(
+                        challenge=config.slug,
+                        status=UploadUpdateResultEnum.SKIPPED,
+                        error="Already visible",
+                    ),
+                )
+            else:
+                staged.append(outcome)
+        return staged, results
+
+    async def _stage_hidden(
+        self,
+        config: ChallengeConfig,
+        files: list[ChallengeFileAttachment],
+        challenge_id: int,
+        version: int,
+    ) -> StagedRelease:
+        async with self._semaphore:
+            new_version = await self.client.update_challenge(
+                challenge_id,
+                config.model_copy(update={"hidden": True}),
+                files,
+                version,
+            )
+        return StagedRelease(config, challenge_id, new_version)
+
+    async def release_wave(
+        self,
+        wave: ReleaseWave,
+        staged: list[StagedRelease],
+    ) -> WaveReport:
+        """Wait for a wave's instant and unhide its challenges together."""
+
+        scheduled = _utc(wave.at).timestamp()
+        await asyncio.sleep(max(0.0, scheduled - WARMUP_SECONDS - time.time()))
+
+        async def refresh(release: StagedRelease) -> None:
+            try:
+                challenge = await self.client.get_challenge_by_id(release.challenge_id)
+            except NoCTFError:
+                # Fall back to the staged version
+                return
+            release.version = challenge.version
+
+        await asyncio.gather(*(refresh(release) for release in staged))
+        await asyncio.sleep(max(0.0, scheduled - time.time()))
+
+        async def unhide(release: StagedRelease) -> None:
+            release.sent_at = time.time()
+            try:
+                release.version = await self.client.set_challenge_hidden(
+                    release.challenge_id,
+                    hidden=False,
+                    version=release.version,
+                )
+            except NoCTFError as e:
+                release.error = e.message
+            else:
+                release.done_at = time.time()
+
+        await asyncio.gather(*(unhide(release) for release in staged))
+        return WaveReport(wave, staged)
+
+
+def print_wave_report(report: WaveReport) -> None:
+    data = report.to_dict()
+    name = data["name"] or data["scheduled"]
+    if data["skew_ms"] is None:
+        console.print(f"[red]Wave {name}: no challenges were released[/red]")
+        return
+    color = "yellow" if data["failed"] else "green"
+    console.print(
+        f"[{color}]Wave {name}: released {data['challenges'] - data['failed']}"
+        f"/{data['challenges']} challenges[/{color}] "
+        f"[dim](first request {data['first_sent_ms']:+.1f}ms, visible "
+        f"{data['first_visible_ms']:+.1f}ms to {data['last_visible_ms']:+.1f}ms, "
+        f"skew {data['skew_ms']:.1f}ms)[/dim]",
+    )
+
+
+@click.command()
+@click.argument(
+    "challenges_directory",
+    type=click.Path(exists=True, path_type=Path, file_okay=False, dir_okay=True),
+)
+@click.option(
+    "--plan",
+    "plan_path",
+    type=click.Path(exists=True, path_type=Path, dir_okay=False),
+    help="YAML wave plan [default: group challenges by visible_at]",
+)
+@click.option(
+    "--concurrency",
+    type=click.IntRange(min=1),
+    default=8,
+    show_default=True,
+    help="Challenges staged at once",
+)
+@click.option(
+    "--report",
+    "report_path",
+    type=click.Path(path_type=Path, dir_okay=False),
+    help="Write per-wave release timings to this JSON file",
+)
+@click.option("--dry-run", is_flag=True, help="Show the schedule without releasing")
+@click.pass_obj
+@handle_errors
+async def release(
+    ctx: CLIContextObj,
+    challenges_directory: Path,
+    plan_path: Optional[Path],
+    concurrency: int,
+    report_path: Optional[Path],
+    dry_run: bool,
+) -> None:
+    """Release waves of challenges at scheduled times."""
+
+    plan = load_release_plan(plan_path) if plan_path else None
+
+    async with create_client(ctx.config) as client:
+        processor = ReleaseProcessor(
+            client,
+            console,
+            ctx.preprocessor_pipeline,
+            concurrency=concurrency,
+        )
+        waves = await processor.plan_waves(challenges_directory, plan)
+        if not waves:
+            console.print("[yellow]No challenges to release[/yellow]")
+            return
+
+        table = Table(title="Release schedule")
+        table.add_column("Wave", style="cyan")
+        table.add_column("At (UTC)", style="magenta")
+        table.add_column("Challenges", style="green")
+        for wave, challenges in waves:
+            table.add_row(
+                wave.name or "-",
+                _utc(wave.at).strftime("%Y-%m-%d %H:%M:%S"),
+                ", ".join(config.slug for config, _ in challenges),
+            )
+        console.print(table)
+        if dry_run:
+            return
+
+        console.print("[blue]Staging challenges...[/blue]")
+        staged_waves = []
+        results: list[UploadUpdateResult] = []
+        for wave, challenges in waves:
+            staged, skipped = await processor.stage(challenges)
+            staged_waves.append((wave, staged))
+            results.extend(skipped)
+        failed = [r for r in results if r.status == UploadUpdateResultEnum.FAILED]
+        if failed:
+            for result in failed:
+                console.print(f"[red]{result.challenge}: {result.error}[/red]")
+            msg = (
+                f"{len(failed)} challenges failed to stage, nothing was released "
+                "(staged challenges are left hidden)"
+            )
+            raise NoCTFError(msg)
+
+        reports = []
+        for wave, staged in staged_waves:
+            if not staged:
+                continue
+            if _utc(wave.at) <= datetime.now(timezone.utc):
+                console.print(
+                    f"[yellow]Wave {wave.name or wave.at} is due, "
+                    "releasing now[/yellow]",
+                )
+            else:
+                console.print(
+                    f"[blue]Waiting to release {len(staged)} challenges at "
+                    f"{_utc(wave.at).strftime('%Y-%m-%d %H:%M:%S')} UTC...[/blue]",
+                )
+            report = await processor.release_wave(wave, staged)
+            print_wave_report(report)
+            reports.append(report)
+            results.extend(
+                UploadUpdateResult(
+                    challenge=r.config.slug,
+                    status=UploadUpdateResultEnum.FAILED
+                    if r.error
+                    else UploadUpdateResultEnum.RELEASED,
+                    error=r.error,
+                )
+                for r in staged
+            )
+            if report_path:
+                report_path.write_bytes(
+                    dumps({"waves": [r.to_dict() for r in reports]}),
+                )
+
+    print_results_summary(console, results)
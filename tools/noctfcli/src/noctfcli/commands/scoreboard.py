@@ -0,0 +1,281 @@
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+import click
+from rich.table import Table
+
+from noctfcli.client import create_client
+from noctfcli.exceptions import NoCTFError
+from noctfcli.fastjson import dumps, loads
+from noctfcli.models import ChallengeConfig, ScoringConfig
+from noctfcli.recording import ScoreboardRecorder, ScoreboardRecording
+from noctfcli.scoring import load_export, verify_export
+from noctfcli.utils import find_challenge_files
+from noctfcli.validator import ChallengeValidator
+
+from .common import CLIContextObj, console, handle_errors
+
+
+@click.group()
+def scoreboard() -> None:
+    """Record, replay and verify division scoreboards."""
+
+
+@scoreboard.command()
+@click.argument("output", type=click.Path(path_type=Path, dir_okay=False))
+@click.option(
+    "--division",
+    "divisions",
+    type=int,
+    multiple=True,
+    help="Only record this division ID (can be repeated) [default: all]",
+)
+@click.option(
+    "--interval",
+    type=click.FloatRange(min=0.1),
+    default=1.0,
+    show_default=True,
+    help="Seconds between polls",
+)
+@click.option(
+    "--keyframe-interval",
+    type=click.FloatRange(min=1),
+    default=300.0,
+    show_default=True,
+    help="Seconds between full snapshots",
+)
+@click.option(
+    "--duration",
+    type=click.FloatRange(min=0),
+    help="Stop after this many seconds [default: run until interrupted]",
+)
+@click.pass_obj
+@handle_errors
+async def record(
+    ctx: CLIContextObj,
+    output: Path,
+    divisions: tuple[int, ...],
+    interval: float,
+    keyframe_interval: float,
+    duration: Optional[float],
+) -> None:
+    """Append delta-encoded scoreboard snapshots to a recording file."""
+
+    async with create_client(ctx.config) as client:
+        division_ids = list(divisions)
+        if not division_ids:
+            division_ids = [d["id"] for d in await client.list_divisions()]
+        recorder = ScoreboardRecorder(
+            client,
+            output,
+            division_ids,
+            interval=interval,
+            keyframe_interval=keyframe_interval,
+        )
+        console.print(
+            f"[blue]Recording divisions {division_ids} to {output} "
+            f"every {interval}s...[/blue]",
+        )
+
+        def on_error(division_id: int, e: Exception) -> None:
+            console.print(f"[red]Failed to fetch division {division_id}: {e}[/red]")
+
+        try:
+            await recorder.run(duration, on_error=on_error)
+        finally:
+            console.print(
+                f"[green]Wrote {recorder.frames} frames "
+                f"({recorder.bytes_written} bytes)[/green]",
+            )
+
+
+@scoreboard.command()
+@click.argument(
+    "recording",
+    type=click.Path(exists=True, path_type=Path, dir_okay=False),
+)
+@click.option("--division", type=int, required=True, help="Division ID")
+@click.option(
+    "--at",
+    type=click.DateTime(),
+    help="Instant to reconstruct (UTC) [default: end of recording]",
+)
+@click.option("--top", type=int, default=20, show_default=True, help="Rows to show")
+@handle_errors
+async def replay(
+    recording: Path,
+    division: int,
+    at: Optional[datetime],
+    top: int,
+) -> None:
+    """Show a recorded scoreboard as it was at a given instant."""
+
+    rec = ScoreboardRecording(recording)
+    if at is None:
+        timestamp = rec.timestamps(division)[1]
+    else:
+        timestamp = at.replace(tzinfo=timezone.utc).timestamp()
+
+    state = rec.at(division, timestamp)
+    when = datetime.fromtimestamp(timestamp, timezone.utc)
+    table = Table(title=f"Division {division} at {when:%Y-%m-%d %H:%M:%S} UTC")
+    table.add_column("Rank", style="cyan")
+    table.add_column("Team ID", style="green")
+    table.add_column("Score", style="bold")
+    table.add_column("Last Solve", style="dim")
+
+    for team_id, (score, rank, last_solve) in sorted(
+        state.items(),
+        key=lambda item: item[1][1],
+    )[:top]:
+        last = "-"
+        if last_solve is not None:
+            solved_at = datetime.fromtimestamp(last_solve / 1000, timezone.utc)
+            last = solved_at.strftime("%Y-%m-%d %H:%M:%S")
+        table.add_row(str(rank), str(team_id), f"{score:g}", last)
+
+    console.print(table)
+
+
+async def load_scoring(
+    ctx: CLIContextObj,
+    challenges_directory: Path,
+) -> dict[str, ScoringConfig]:
+    """Read the scoring config of each challenge by slug, after preprocessing.
+
+    Raises:
+        NoCTFError: If a noctf.yaml is invalid or fails to preprocess
+    """
+
+    validator = ChallengeValidator()
+    configs: list[ChallengeConfig] = [
+        validator.validate_yaml_file(path)
+        for path in find_challenge_files(challenges_directory)
+    ]
+    if ctx.preprocessor_pipeline:
+        outcomes = await ctx.preprocessor_pipeline.preprocess_many(configs)
+        for outcome in outcomes:
+            if isinstance(outcome, BaseException):
+                raise outcome
+        configs = outcomes  # type: ignore[assignment]
+    return {config.slug: config.scoring for config in configs}
+
+
+@scoreboard.command()
+@click.argument(
+    "export_dir",
+    type=click.Path(exists=True, path_type=Path, file_okay=False),
+)
+@click.argument(
+    "challenges_directory",
+    type=click.Path(exists=True, path_type=Path, file_okay=False),
+)
+@click.option(
+    "--division",
+    "divisions",
+    type=int,
+    multiple=True,
+    help="Only verify this division ID (can be repeated) [default: all]",
+)
+@click.option(
+    "--samples",
+    type=click.IntRange(min=1),
+    default=100,
+    show_default=True,
+    help="Instants in the recomputed score timeline",
+)
+@click.option(
+    "--timeline",
+    "timeline_path",
+    type=click.Path(path_type=Path, dir_okay=False),
+    help="Write each team's recomputed score and rank timeline to this JSON file",
+)
+@click.option(
+    "--report",
+    "report_path",
+    type=click.Path(path_type=Path, dir_okay=False),
+    help="Write every mismatch to this JSON file",
+)
+@click.option(
+    "--top",
+    type=int,
+    default=20,
+    show_default=True,
+    help="Mismatches to show",
+)
+@click.pass_obj
+@handle_errors
+async def verify(
+    ctx: CLIContextObj,
+    export_dir: Path,
+    challenges_directory: Path,
+    divisions: tuple[int, ...],
+    samples: int,
+    timeline_path: Optional[Path],
+    report_path: Optional[Path],
+    top: int,
+) -> None:
+    """Recompute the scoreboards of a static export from its solves.
+
+    Scoring configs are read from the noctf.yaml files in
+    CHALLENGES_DIRECTORY and matched to exported challenges by slug.
+    """
+
+    scoring = await load_scoring(ctx, challenges_directory)
+    division_ids = list(divisions)
+    if not division_ids:
+        exported = loads((export_dir / "divisions.json").read_bytes())
+        division_ids = [d["id"] for d in exported["data"]]
+
+    timelines, reports, failed = {}, [], 0
+    for division_id in division_ids:
+        start = time.perf_counter()
+        export = load_export(export_dir, division_id)
+        loaded = time.perf_counter() - start
+        result, diff = verify_export(export, scoring, samples)
+        reports.append(diff.to_dict())
+        if timeline_path:
+            timelines[str(division_id)] = result.timeline()
+
+        console.print(
+            f"[blue]Division {division_id}: recomputed {len(result.team_id)} "
+            f"teams from {diff.solves} solves[/blue] "
+            f"[dim](loaded in {loaded:.2f}s, "
+            f"recomputed in {result.elapsed:.3f}s)[/dim]",
+        )
+        if diff.weighted:
+            console.print(
+                f"[yellow]Kept exported values of solves of weighted challenges "
+                f"{', '.join(map(str, diff.weighted))}[/yellow]",
+            )
+        if diff.ok:
+            console.print("[green]Scoreboard matches[/green]")
+            continue
+
+        failed += 1
+        title = f"Division {division_id}: {len(diff.mismatches)} mismatches"
+        table = Table(title=title)
+        table.add_column("Team ID", style="green")
+        table.add_column("Field")
+        table.add_column("Challenge ID")
+        table.add_column("Exported", style="bold")
+        table.add_column("Recomputed", style="bold")
+        for mismatch in diff.mismatches[:top]:
+            table.add_row(
+                str(mismatch.team_id),
+                mismatch.field,
+                "-" if mismatch.challenge_id is None else str(mismatch.challenge_id),
+                "-" if mismatch.exported is None else str(mismatch.exported),
+                "-" if mismatch.recomputed is None else str(mismatch.recomputed),
+            )
+        console.print(table)
+
+    if timeline_path:
+        timeline_path.write_bytes(dumps(timelines))
+    if report_path:
+        report_path.write_bytes(dumps(reports))
+    if failed:
+        msg = f"Recomputed scoreboards of {failed} divisions do not match the export"
+        raise NoCTFError(msg)
@@ -0,0 +1,462 @@
+import asyncio
+import csv
+import time
+from collections.abc import Awaitable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Literal, Optional
+
+import click
+from rich.console import Console
+from rich.table import Table
+
+from noctfcli.client import NoCTFClient, create_client
+from noctfcli.exceptions import NoCTFError, ValidationError
+from noctfcli.fastjson import dumps
+from noctfcli.models import TeamRecord, UploadUpdateResultEnum, UserRecord
+
+from .common import CLIContextObj, console, handle_errors
+
+TEAM_COLUMNS = ["id", "name", "division", "tags", "flags", "country", "bio"]
+MEMBER_COLUMNS = ["owner", "members"]
+LIST_SEPARATOR = ";"
+
+
+def _split(value: str) -> list[str]:
+    return [item.strip() for item in value.split(LIST_SEPARATOR) if item.strip()]
+
+
+@dataclass
+class TeamImportRow:
+    """A row of a team import CSV; None leaves a field unchanged."""
+
+    line: int
+    name: str
+    id: Optional[int] = None
+    division: Optional[str] = None
+    tags: Optional[list[str]] = None
+    flags: Optional[list[str]] = None
+    country: Optional[str] = None
+    bio: Optional[str] = None
+    owner: Optional[str] = None
+    members: list[str] = field(default_factory=list)
+
+
+def read_team_rows(path: Path) -> list[TeamImportRow]:
+    """Read a team import CSV.
+
+    The header names the columns. Only name is required; id, division (ID,
+    slug or name), tags and flags (separated by ``;``), country, bio, owner
+    and members (user IDs or names separated by ``;``) are optional, and an
+    empty cell leaves that field unchanged.
+
+    Rows are not checked for duplicates here, as a team may be given by id
+    in one row and by name in another; see TeamImporter.check_duplicates.
+
+    Raises:
+        ValidationError: If a column is unknown or a row has no name
+    """
+
+    rows = []
+    with open(path, newline="") as f:
+        reader = csv.DictReader(f)
+        unknown = set(reader.fieldnames or []) - set(TEAM_COLUMNS + MEMBER_COLUMNS)
+        if unknown:
+            msg = f"{path}: unknown columns: {', '.join(sorted(unknown))}"
+            raise ValidationError(msg)
+
+        for line, raw in enumerate(reader, start=2):
+            cells = {k: (v or "").strip() for k, v in raw.items() if k}
+            name = cells.get("name", "")
+            if not name:
+                raise ValidationError(f"{path}:{line}: missing team name")
+            try:
+                team_id = int(cells["id"]) if cells.get("id") else None
+            except ValueError as e:
+                raise ValidationError(f"{path}:{line}: invalid id: {e}") from e
+
+            rows.append(
+                TeamImportRow(
+                    line=line,
+                    name=name,
+                    id=team_id,
+                    division=cells.get("division") or None,
+                    tags=_split(cells["tags"]) if cells.get("tags") else None,
+                    flags=_split(cells["flags"]) if cells.get("flags") else None,
+                    country=cells.get("country") or None,
+                    bio=cells.get("bio") or None,
+                    owner=cells.get("owner") or None,
+                    members=_split(cells.get("members", "")),
+                ),
+            )
+    return rows
+
+
+@dataclass
+class TeamImportResult:
+    """Outcome of importing one row."""
+
+    line: int
+    team: str
+    status: UploadUpdateResultEnum = UploadUpdateResultEnum.SKIPPED
+    changes: list[str] = field(default_factory=list)
+    requests: int = 0
+    error: Optional[str] = None
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "line": self.line,
+            "team": self.team,
+            "status": self.status.value,
+            "changes": self.changes,
+            "requests": self.requests,
+            "error": self.error,
+        }
+
+
+class TeamImporter:
+    """Brings existing teams in line with import rows.
+
+    Teams, users, tags and divisions are each listed once up front and looked
+    up locally, so only the requests needed to change something are sent.
+    Rows already matching the server are skipped, making imports idempotent.
+    Rows are imported concurrently, with every request sharing one limit.
+
+    Teams are created when players register, so rows must match an existing
+    team, by id or otherwise by name.
+
+    Args:
+        concurrency: Maximum requests in flight
+        dry_run: Work out the changes without sending them
+    """
+
+    def __init__(
+        self,
+        client: NoCTFClient,
+        concurrency: int = 16,
+        *,
+        dry_run: bool = False,
+    ) -> None:
+        self.client = client
+        self.dry_run = dry_run
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self.teams: dict[int, TeamRecord] = {}
+        self.team_names: dict[str, int] = {}
+        self.users: dict[int, UserRecord] = {}
+        self.user_names: dict[str, int] = {}
+        self.tags: dict[str, int] = {}
+        self.divisions: dict[str, int] = {}
+
+    async def load_index(self, rows: list[TeamImportRow]) -> None:
+        """List teams, tags, divisions and (if any row has members) users."""
+
+        async def load_teams() -> None:
+            async for team in self.client.iter_teams():
+                self.teams[team.id] = team
+                self.team_names[team.name.casefold()] = team.id
+
+        async def load_users() -> None:
+            async for user in self.client.iter_users():
+                self.users[user.id] = user
+                self.user_names[user.name.casefold()] = user.id
+
+        async def load_tags() -> None:
+            for tag in await self.client.list_team_tags():
+                self.tags[tag["name"].casefold()] = tag["id"]
+
+        async def load_divisions() -> None:
+            for division in await self.client.list_admin_divisions():
+                for key in (str(division["id"]), division["slug"], division["name"]):
+                    self.divisions.setdefault(key.casefold(), division["id"])
+
+        loaders = [load_teams(), load_tags(), load_divisions()]
+        if any(row.owner or row.members for row in rows):
+            loaders.append(load_users())
+        await asyncio.gather(*loaders)
+
+    async def create_missing_tags(self, rows: list[TeamImportRow]) -> list[str]:
+        """Create the tags named by rows that do not exist yet.
+
+        Returns:
+            Names of the tags created (or that would be, in a dry run)
+        """
+
+        missing = list(
+            dict.fromkeys(
+                tag
+                for row in rows
+                for tag in row.tags or []
+                if tag.casefold() not in self.tags
+            ),
+        )
+        if self.dry_run:
+            for offset, name in enumerate(missing, start=1):
+                self.tags[name.casefold()] = -offset
+            return missing
+
+        async def create(name: str) -> None:
+            async with self._semaphore:
+                tag = await self.client.create_team_tag(name)
+            self.tags[name.casefold()] = tag["id"]
+
+        await asyncio.gather(*(create(name) for name in missing))
+        return missing
+
+    def _find_team(self, row: TeamImportRow) -> TeamRecord:
+        team_id = (
+            row.id if row.id is not None else self.team_names.get(row.name.casefold())
+        )
+        if team_id is None or team_id not in self.teams:
+            msg = (
+                f"Team {row.id if row.id is not None else row.name} not found "
+                "(teams are created when players register)"
+            )
+            raise NoCTFError(msg)
+        return self.teams[team_id]
+
+    def check_duplicates(self, rows: list[TeamImportRow]) -> None:
+        """Check that no two rows resolve to the same team.
+
+        Rows that match no team are left to fail when imported.
+
+        Raises:
+            ValidationError: If a team appears twice, by id or by name
+        """
+
+        seen: dict[int, int] = {}
+        for row in rows:
+            try:
+                team = self._find_team(row)
+            except NoCTFError:
+                continue
+            if team.id in seen:
+                msg = (
+                    f"Line {row.line}: team {team.name} already imported "
+                    f"on line {seen[team.id]}"
+                )
+                raise ValidationError(msg)
+            seen[team.id] = row.line
+
+    def _find_user(self, ref: str) -> UserRecord:
+        user_id = int(ref) if ref.isdigit() else self.user_names.get(ref.casefold())
+        if user_id is None or user_id not in self.users:
+            raise NoCTFError(f"User {ref} not found")
+        return self.users[user_id]
+
+    def plan(
+        self,
+        row: TeamImportRow,
+    ) -> tuple[TeamRecord, dict[str, Any], list[tuple[int, UserRecord, str]]]:
+        """Work out the changes a row makes.
+
+        Returns:
+            The team, its changed fields, and the member changes as
+            (team ID, user, role) in the order to send them
+
+        Raises:
+            NoCTFError: If the team, a user, or the division is not found
+        """
+
+        team = self._find_team(row)
+        changes: dict[str, Any] = {}
+        if row.id is not None and row.name != team.name:
+            changes["name"] = row.name
+        if row.division is not None:
+            division_id = self.divisions.get(row.division.casefold())
+            if division_id is None:
+                raise NoCTFError(f"Division {row.division} not found")
+            changes["division_id"] = division_id
+        if row.tags is not None:
+            changes["tag_ids"] = sorted(self.tags[t.casefold()] for t in row.tags)
+        if row.flags is not None:
+            changes["flags"] = sorted(set(row.flags))
+        if row.country is not None:
+            changes["country"] = row.country.upper()
+        if row.bio is not None:
+            changes["bio"] = row.bio
+
+        current = {
+            "tag_ids": sorted(team.tag_ids),
+            "flags": sorted(team.flags),
+        }
+        changes = {
+            k: v for k, v in changes.items() if current.get(k, getattr(team, k)) != v
+        }
+
+        roles = {m["user_id"]: m["role"] for m in team.members}
+        wanted: list[tuple[UserRecord, Literal["owner", "member"]]] = []
+        if row.owner:
+            wanted.append((self._find_user(row.owner), "owner"))
+        wanted.extend(
+            (self._find_user(ref), "member") for ref in row.members if ref != row.owner
+        )
+
+        member_changes: list[tuple[int, UserRecord, str]] = []
+        for user, role in wanted:
+            if roles.get(user.id) == role or (
+                role == "member" and roles.get(user.id) == "owner"
+            ):
+                continue
+            if user.team_id is not None and user.team_id != team.id:
+                member_changes.append((user.team_id, user, "none"))
+            member_changes.append((team.id, user, role))
+        return team, changes, member_changes
+
+    async def _send(self, result: TeamImportResult, request: Awaitable[None]) -> None:
+        result.requests += 1
+        async with self._semaphore:
+            await request
+
+    async def import_row(self, row: TeamImportRow) -> TeamImportResult:
+        """Apply one row, returning what changed."""
+
+        result = TeamImportResult(row.line, row.name)
+        try:
+            team, changes, member_changes = self.plan(row)
+            result.changes.extend(
+                f"{name}: {getattr(team, name)!r} -> {value!r}"
+                for name, value in changes.items()
+            )
+            for team_id, user, role in member_changes:
+                if role == "none":
+                    result.changes.append(f"remove {user.name} from team {team_id}")
+                else:
+                    result.changes.append(f"{user.name} as {role}")
+
+            if not self.dry_run:
+                if changes:
+                    updated = team._replace(**changes)
+                    await self._send(result, self.client.update_team(updated))
+                    self.teams[team.id] = updated
+                for team_id, user, role in member_changes:
+                    await self._send(
+                        result,
+                        self.client.set_team_member(team_id, user.id, role),
+                    )
+        except NoCTFError as e:
+            result.status = UploadUpdateResultEnum.FAILED
+            result.error = e.message
+        else:
+            if result.changes:
+                result.status = UploadUpdateResultEnum.UPDATED
+        return result
+
+    async def run(self, rows: list[TeamImportRow]) -> list[TeamImportResult]:
+        """Import every row, returning a result per row in order."""
+
+        return list(await asyncio.gather(*(self.import_row(row) for row in rows)))
+
+
+def print_import_results(
+    console: Console,
+    results: list[TeamImportResult],
+    elapsed: float,
+) -> None:
+    changed = [r for r in results if r.status != UploadUpdateResultEnum.SKIPPED]
+    if changed:
+        table = Table(title="Team import")
+        table.add_column("Line", justify="right")
+        table.add_column("Team", style="green")
+        table.add_column("Changes")
+        table.add_column("Status")
+        for r in changed:
+            table.add_row(
+                str(r.line),
+                r.team,
+                "\n".join(r.changes) or "-",
+                f"[red]{r.error}[/red]"
+                if r.error
+                else f"[green]{r.status.value}[/green]",
+            )
+        console.print(table)
+
+    counts = {
+        status: sum(1 for r in results if r.status == status)
+        for status in (
+            UploadUpdateResultEnum.UPDATED,
+            UploadUpdateResultEnum.SKIPPED,
+            UploadUpdateResultEnum.FAILED,
+        )
+    }
+    requests = sum(r.requests for r in results)
+    console.print(
+        f"[green]{counts[UploadUpdateResultEnum.UPDATED]} teams updated[/green], "
+        f"{counts[UploadUpdateResultEnum.SKIPPED]} unchanged, "
+        f"[red]{counts[UploadUpdateResultEnum.FAILED]} failed[/red] "
+        f"[dim]({elapsed:.1f}s, {len(results) / elapsed if elapsed else 0:.0f} "
+        f"rows/s, {requests} requests)[/dim]",
+    )
+
+
+@click.group()
+def teams() -> None:
+    """Manage teams in bulk."""
+
+
+@teams.command(name="import")
+@click.argument(
+    "input_file",
+    type=click.Path(exists=True, path_type=Path, dir_okay=False),
+)
+@click.option(
+    "--concurrency",
+    type=click.IntRange(min=1),
+    default=16,
+    show_default=True,
+    help="Requests in flight at once",
+)
+@click.option(
+    "--report",
+    "report_path",
+    type=click.Path(path_type=Path, dir_okay=False),
+    help="Write per-row results to this JSON file",
+)
+@click.option("--dry-run", is_flag=True, help="Show the changes without sending them")
+@click.pass_obj
+@handle_errors
+async def import_teams(
+    ctx: CLIContextObj,
+    input_file: Path,
+    concurrency: int,
+    report_path: Optional[Path],
+    dry_run: bool,
+) -> None:
+    """Update team divisions, tags, flags and members from a CSV file."""
+
+    rows = read_team_rows(input_file)
+    console.print(f"[blue]Read {len(rows)} teams from {input_file}[/blue]")
+    if not rows:
+        return
+
+    async with create_client(ctx.config) as client:
+        importer = TeamImporter(client, concurrency=concurrency, dry_run=dry_run)
+        start = time.perf_counter()
+        await importer.load_index(rows)
+        console.print(
+            f"[dim]Indexed {len(importer.teams)} teams, {len(importer.users)} users, "
+            f"{len(importer.tags)} tags and {len(importer.divisions)} division "
+            f"names in {time.perf_counter() - start:.1f}s[/dim]",
+        )
+        importer.check_duplicates(rows)
+        created = await importer.create_missing_tags(rows)
+        if created:
+            verb = "Would create" if dry_run else "Created"
+            console.print(f"[blue]{verb} tags: {', '.join(created)}[/blue]")
+        results = await importer.run(rows)
+        elapsed = time.perf_counter() - start
+
+    print_import_results(console, results, elapsed)
+    if report_path:
+        report_path.write_bytes(
+            dumps(
+                {
+                    "elapsed": round(elapsed, 3),
+                    "dry_run": dry_run,
+                    "rows": [r.to_dict() for r in results],
+                },
+            ),
+        )
+    failed = [r for r in results if r.status == UploadUpdateResultEnum.FAILED]
+    if failed:
+        msg = f"Failed to import {len(failed)} teams"
+        raise NoCTFError(msg)
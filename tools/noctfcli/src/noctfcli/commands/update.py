@@ -1,10 +1,15 @@
+import asyncio
+import time
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Optional
 
 import click
 
 from noctfcli.client import create_client
-from noctfcli.exceptions import NotFoundError
+from noctfcli.exceptions import NoCTFError, NotFoundError
 from noctfcli.models import (
+    Challenge,
     ChallengeConfig,
     ChallengeFileAttachment,
     ExternalFileConfig,
@@ -14,10 +19,11 @@ from noctfcli.models import (
 from noctfcli.utils import (
     calculate_file_hash,
     filename_from_url,
+    find_challenge_files,
     print_results_summary,
 )
 
-from .common import CLIContextObj, ChallengeProcessor, console, handle_errors
+from .common import ChallengeProcessor, CLIContextObj, console, handle_errors
 
 
 class UpdateProcessor(ChallengeProcessor):
@@ -80,6 +86,10 @@ class UpdateProcessor(ChallengeProcessor):
     ) -> list[ChallengeFileAttachment]:
         files = []
         to_upload = []
+        attachments = {ef.id: ef.is_attachment for ef in existing.files}
+        existing_by_content = {}
+        for ef in existing_files:
+            existing_by_content.setdefault((ef.filename, ef.hash), ef)
 
         for f in challenge_config.files:
             if isinstance(f, ExternalFileConfig):
@@ -88,25 +98,15 @@ class UpdateProcessor(ChallengeProcessor):
             else:
                 fn = Path(f).name
                 expected_hash = f"sha256:{calculate_file_hash(yaml_path.parent / f)}"
-            existing_f = next(
-                (
-                    ef
-                    for ef in existing_files
-                    if ef.filename == fn and ef.hash == expected_hash
-                ),
-                None,
-            )
+            existing_f = existing_by_content.get((fn, expected_hash))
             if existing_f:
                 self.console.print(
                     f"\tFile [bold]{fn}[/bold] exists and will not be reuploaded",
                 )
-                is_attachment = next(
-                    ef for ef in existing.files if ef.id == existing_f.id
-                ).is_attachment
                 files.append(
                     ChallengeFileAttachment(
                         id=existing_f.id,
-                        is_attachment=is_attachment,
+                        is_attachment=attachments[existing_f.id],
                     ),
                 )
             else:
@@ -136,23 +136,250 @@ class UpdateProcessor(ChallengeProcessor):
         return files
 
 
+@dataclass
+class PendingUpdate:
+    """A prepared update and what is needed to undo it."""
+
+    config: ChallengeConfig
+    files: list[ChallengeFileAttachment]
+    previous: Challenge
+    new_version: Optional[int] = None
+
+
+class AtomicUpdateProcessor(UpdateProcessor):
+    """Updates every challenge in a directory, or none of them.
+
+    All challenges are validated, fetched and have their files uploaded
+    concurrently before anything visible changes. The challenge PUTs are then
+    sent together, and if any of them fails the ones that succeeded are put
+    back to the state fetched in the first phase. Files uploaded for an
+    aborted update are left unreferenced.
+
+    Args:
+        concurrency: Maximum challenges prepared or updated at once
+    """
+
+    def __init__(self, *args, concurrency: int = 8, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._semaphore = asyncio.Semaphore(concurrency)
+
+    async def process_challenges(
+        self,
+        challenges_directory: Path,
+        dry_run: bool = False,
+    ) -> list[UploadUpdateResult]:
+        if dry_run:
+            return await super().process_challenges(challenges_directory, dry_run)
+
+        yaml_paths = find_challenge_files(challenges_directory)
+        configs: dict[Path, ChallengeConfig] = {}
+        errors: dict[str, str] = {}
+        loaded = await self._load_challenges(yaml_paths)
+        await self._fill_external_files(loaded)
+        for yaml_path, outcome in loaded.items():
+            if isinstance(outcome, Exception):
+                errors[yaml_path.parent.name] = str(outcome)
+            else:
+                configs[yaml_path] = outcome
+        if errors:
+            return self._abort(errors, [c.slug for c in configs.values()])
+
+        self.console.print(
+            f"[blue]Preparing {len(configs)} challenges...[/blue]",
+        )
+        challenge_ids = await self._challenge_ids()
+        prepared = await asyncio.gather(
+            *(
+                self._prepare(config, path, challenge_ids)
+                for path, config in configs.items()
+            ),
+            return_exceptions=True,
+        )
+        pending = []
+        for config, outcome in zip(configs.values(), prepared):
+            if isinstance(outcome, BaseException):
+                errors[config.slug] = str(outcome) or type(outcome).__name__
+            else:
+                pending.append(outcome)
+        if errors:
+            return self._abort(errors, [p.config.slug for p in pending])
+
+        self.console.print(f"[blue]Applying {len(pending)} updates...[/blue]")
+        start = time.perf_counter()
+        try:
+            applied = await asyncio.gather(
+                *(self._apply(update) for update in pending),
+                return_exceptions=True,
+            )
+        except asyncio.CancelledError:
+            await self._rollback([u for u in pending if u.new_version is not None])
+            raise
+        window_ms = (time.perf_counter() - start) * 1000
+
+        for update, outcome in zip(pending, applied):
+            if isinstance(outcome, BaseException):
+                errors[update.config.slug] = str(outcome) or type(outcome).__name__
+        if not errors:
+            self.console.print(
+                f"[green]Updated {len(pending)} challenges "
+                f"in {window_ms:.0f}ms[/green]",
+            )
+            return [
+                UploadUpdateResult(
+                    challenge=update.config.slug,
+                    status=UploadUpdateResultEnum.UPDATED,
+                )
+                for update in pending
+            ]
+
+        self.console.print(
+            f"[red]{len(errors)} updates failed, rolling back "
+            f"{len(pending) - len(errors)} applied updates...[/red]",
+        )
+        rollback_errors = await self._rollback(
+            [u for u in pending if u.new_version is not None],
+        )
+        results = []
+        for update in pending:
+            slug = update.config.slug
+            if slug in errors:
+                status, error = UploadUpdateResultEnum.FAILED, errors[slug]
+            elif slug in rollback_errors:
+                status = UploadUpdateResultEnum.FAILED
+                error = (
+                    f"Rollback failed, left at version {update.new_version}: "
+                    f"{rollback_errors[slug]}"
+                )
+            else:
+                status, error = UploadUpdateResultEnum.ROLLED_BACK, None
+            results.append(
+                UploadUpdateResult(challenge=slug, status=status, error=error),
+            )
+        return results
+
+    def _abort(
+        self,
+        errors: dict[str, str],
+        unchanged: list[str],
+    ) -> list[UploadUpdateResult]:
+        self.console.print(
+            f"[red]{len(errors)} challenges failed to prepare, "
+            "no challenges were updated[/red]",
+        )
+        return [
+            UploadUpdateResult(
+                challenge=slug,
+                status=UploadUpdateResultEnum.FAILED,
+                error=error,
+            )
+            for slug, error in errors.items()
+        ] + [
+            UploadUpdateResult(
+                challenge=slug,
+                status=UploadUpdateResultEnum.SKIPPED,
+                error="Not updated because another challenge failed",
+            )
+            for slug in unchanged
+        ]
+
+    async def _challenge_ids(self) -> dict[str, int]:
+        """Map challenge slugs to IDs from a single listing."""
+
+        return {c.slug: c.id for c in await self.client.list_challenges()}
+
+    async def _prepare(
+        self,
+        challenge_config: ChallengeConfig,
+        yaml_path: Path,
+        challenge_ids: dict[str, int],
+    ) -> PendingUpdate:
+        challenge_id = challenge_ids.get(challenge_config.slug)
+        if challenge_id is None:
+            msg = "Challenge not found, use 'noctfcli upload' to create it"
+            raise NoCTFError(msg)
+        async with self._semaphore:
+            existing, existing_files = await self.client.get_challenge_by_id(
+                challenge_id,
+                with_files=True,
+            )
+            files = await self._handle_file_updates(
+                challenge_config,
+                yaml_path,
+                existing,
+                existing_files,
+            )
+        return PendingUpdate(challenge_config, files, existing)
+
+    async def _apply(self, update: PendingUpdate) -> None:
+        async with self._semaphore:
+            update.new_version = await self.client.update_challenge(
+                update.previous.id,
+                update.config,
+                update.files,
+                update.previous.version,
+            )
+
+    async def _rollback(self, applied: list[PendingUpdate]) -> dict[str, str]:
+        async def restore(update: PendingUpdate) -> None:
+            if update.new_version is None:
+                msg = f"Challenge {update.config.slug} was not updated"
+                raise NoCTFError(msg)
+            async with self._semaphore:
+                await self.client.restore_challenge(
+                    update.previous,
+                    update.new_version,
+                )
+
+        outcomes = await asyncio.gather(
+            *(restore(update) for update in applied),
+            return_exceptions=True,
+        )
+        return {
+            update.config.slug: str(outcome) or type(outcome).__name__
+            for update, outcome in zip(applied, outcomes)
+            if isinstance(outcome, BaseException)
+        }
+
+
 @click.command()
 @click.argument(
     "challenges_directory",
     type=click.Path(exists=True, path_type=Path, file_okay=False, dir_okay=True),
 )
 @click.option("--dry-run", is_flag=True, help="Validate without updating")
+@click.option(
+    "--atomic",
+    is_flag=True,
+    help="Prepare every challenge first and roll back all updates if any fails",
+)
+@click.option(
+    "--concurrency",
+    type=click.IntRange(min=1),
+    default=8,
+    show_default=True,
+    help="Challenges prepared and updated at once with --atomic",
+)
 @click.pass_obj
 @handle_errors
 async def update(
     ctx: CLIContextObj,
     challenges_directory: Path,
     dry_run: bool,
+    atomic: bool,
+    concurrency: int,
 ) -> None:
     """Update existing challenges from a directory."""
 
     async with create_client(ctx.config) as client:
-        processor = UpdateProcessor(client, console, ctx.preprocessor)
+        if atomic:
+            processor = AtomicUpdateProcessor(
+                client,
+                console,
+                ctx.preprocessor_pipeline,
+                concurrency=concurrency,
+            )
+        else:
+            processor = UpdateProcessor(client, console, ctx.preprocessor_pipeline)
         results = await processor.process_challenges(challenges_directory, dry_run)
 
     print_results_summary(console, results)
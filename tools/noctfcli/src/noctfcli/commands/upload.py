@@ -69,7 +69,7 @@ async def upload(
     """Upload all challenge from a directory."""
 
     async with create_client(ctx.config) as client:
-        processor = UploadProcessor(client, console, ctx.preprocessor)
+        processor = UploadProcessor(client, console, ctx.preprocessor_pipeline)
         results = await processor.process_challenges(challenges_directory, dry_run)
 
     print_results_summary(console, results)
@@ -0,0 +1,331 @@
+import asyncio
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+import click
+
+from noctfcli.client import NoCTFClient, create_client
+from noctfcli.exceptions import APIError, NoCTFError, ValidationError
+from noctfcli.fastjson import dumps
+from noctfcli.models import UserRecord
+from noctfcli.retry import retry
+
+from .common import CLIContextObj, console, handle_errors
+
+
+def read_user_ids(path: Path) -> list[int]:
+    """Read user IDs from a file with one per line (blank lines and # comments
+    are skipped).
+
+    Raises:
+        ValidationError: If a line is not an integer
+    """
+
+    ids = []
+    with open(path) as f:
+        for line, text in enumerate(f, start=1):
+            value = text.split("#", 1)[0].strip()
+            if not value:
+                continue
+            try:
+                ids.append(int(value))
+            except ValueError as e:
+                raise ValidationError(f"{path}:{line}: invalid user ID") from e
+    return ids
+
+
+@dataclass
+class RevocationReport:
+    """Outcome of revoking the sessions of many users."""
+
+    users: int
+    revoked: list[int] = field(default_factory=list)
+    failed: dict[int, str] = field(default_factory=dict)
+    unfinished: list[int] = field(default_factory=list)
+    """Users whose revocation had not finished when the deadline passed."""
+    retries: int = 0
+    elapsed: float = 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "users": self.users,
+            "revoked": self.revoked,
+            "failed": {str(k): v for k, v in self.failed.items()},
+            "unfinished": self.unfinished,
+            "retries": self.retries,
+            "elapsed": round(self.elapsed, 3),
+        }
+
+
+class SessionRevoker:
+    """Revokes the sessions of many users concurrently.
+
+    Requests that fail with a connection error, 429 or 5xx are retried with
+    exponential backoff. Revocations still running when the deadline passes
+    are cancelled and reported as unfinished.
+
+    Args:
+        concurrency: Maximum requests in flight
+        retries: Retries per user before it is marked failed
+        deadline: Seconds before unfinished revocations are abandoned
+    """
+
+    def __init__(
+        self,
+        client: NoCTFClient,
+        concurrency: int = 32,
+        retries: int = 3,
+        deadline: float = 60.0,
+    ) -> None:
+        self.client = client
+        self.retries = retries
+        self.deadline = deadline
+        self._semaphore = asyncio.Semaphore(concurrency)
+
+    async def revoke(
+        self,
+        user_ids: list[int],
+        app_id: Optional[int] = None,
+        on_progress: Optional[Callable[[RevocationReport], None]] = None,
+    ) -> RevocationReport:
+        """Revoke the sessions of every user.
+
+        Args:
+            user_ids: Users whose sessions to revoke
+            app_id: Revoke the sessions of this app instead of the website's
+            on_progress: Called with the report as each user finishes
+
+        Returns:
+            Which users were revoked, failed or unfinished
+        """
+
+        report = RevocationReport(users=len(user_ids))
+
+        def count(_: APIError) -> None:
+            report.retries += 1
+
+        async def revoke_one(user_id: int) -> None:
+            try:
+                await retry(
+                    lambda: self.client.revoke_user_sessions(user_id, app_id),
+                    self.retries,
+                    self._semaphore,
+                    count,
+                )
+            except NoCTFError as e:
+                report.failed[user_id] = e.message
+            else:
+                report.revoked.append(user_id)
+            if on_progress is not None:
+                on_progress(report)
+
+        start = time.perf_counter()
+        tasks = {asyncio.ensure_future(revoke_one(uid)): uid for uid in user_ids}
+        if tasks:
+            _, pending = await asyncio.wait(tasks, timeout=self.deadline)
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.wait(pending)
+            report.unfinished = sorted(tasks[task] for task in pending)
+        report.elapsed = time.perf_counter() - start
+        return report
+
+
+async def resolve_users(
+    client: NoCTFClient,
+    ids: list[int],
+    name: Optional[str],
+    flags: list[str],
+    roles: list[str],
+) -> tuple[list[UserRecord], list[int]]:
+    """Find the users matching a filter through the admin user query.
+
+    Returns:
+        Matching users, and the requested IDs that do not exist
+    """
+
+    users = [
+        user
+        async for user in client.iter_users(
+            name=name,
+            ids=ids or None,
+            flags=flags or None,
+            roles=roles or None,
+        )
+    ]
+    found = {user.id for user in users}
+    return users, [uid for uid in dict.fromkeys(ids) if uid not in found]
+
+
+@click.group()
+def users() -> None:
+    """Manage users in bulk."""
+
+
+@users.command(name="revoke-sessions")
+@click.argument("user_ids", nargs=-1, type=int)
+@click.option(
+    "--ids-file",
+    type=click.Path(exists=True, path_type=Path, dir_okay=False),
+    help="File of user IDs, one per line",
+)
+@click.option("--name", help="Only users whose name contains this")
+@click.option(
+    "--flag",
+    "flags",
+    multiple=True,
+    help="Only users with this flag (prefix with ! to exclude; repeatable)",
+)
+@click.option(
+    "--role",
+    "roles",
+    multiple=True,
+    help="Only users with this role (prefix with ! to exclude; repeatable)",
+)
+@click.option(
+    "--all",
+    "all_users",
+    is_flag=True,
+    help="Revoke every user's sessions when no other filter is given",
+)
+@click.option(
+    "--app-id",
+    type=int,
+    help="Revoke sessions of this app [default: website sessions]",
+)
+@click.option(
+    "--concurrency",
+    type=click.IntRange(min=1),
+    default=32,
+    show_default=True,
+    help="Requests in flight at once",
+)
+@click.option(
+    "--retries",
+    type=click.IntRange(min=0),
+    default=3,
+    show_default=True,
+    help="Retries for requests failing with a connection error, 429 or 5xx",
+)
+@click.option(
+    "--deadline",
+    type=click.FloatRange(min=0, min_open=True),
+    default=60.0,
+    show_default=True,
+    help="Seconds before unfinished revocations are abandoned",
+)
+@click.option(
+    "--report",
+    "report_path",
+    type=click.Path(path_type=Path, dir_okay=False),
+    help="Write the revoked, failed and unfinished user IDs to this JSON file",
+)
+@click.option("--yes", is_flag=True, help="Do not ask for confirmation")
+@click.option("--dry-run", is_flag=True, help="Only list the matching users")
+@click.pass_obj
+@handle_errors
+async def revoke_sessions(
+    ctx: CLIContextObj,
+    user_ids: tuple[int, ...],
+    ids_file: Optional[Path],
+    name: Optional[str],
+    flags: tuple[str, ...],
+    roles: tuple[str, ...],
+    all_users: bool,
+    app_id: Optional[int],
+    concurrency: int,
+    retries: int,
+    deadline: float,
+    report_path: Optional[Path],
+    yes: bool,
+    dry_run: bool,
+) -> None:
+    """Revoke the sessions of users given by ID or matching a filter."""
+
+    ids = list(user_ids)
+    if ids_file:
+        ids.extend(read_user_ids(ids_file))
+    if not (ids or name or flags or roles or all_users):
+        msg = "Give user IDs, --ids-file, --name, --flag or --role (or --all)"
+        raise ValidationError(msg)
+
+    async with create_client(ctx.config) as client:
+        start = time.perf_counter()
+        with console.status("Resolving users..."):
+            matched, missing = await retry(
+                lambda: resolve_users(client, ids, name, list(flags), list(roles)),
+                retries,
+            )
+            try:
+                me = (await client.get_current_user()).get("id")
+            except NoCTFError:
+                me = None
+        console.print(
+            f"[blue]{len(matched)} users matched[/blue] "
+            f"[dim]({time.perf_counter() - start:.1f}s)[/dim]",
+        )
+        if missing:
+            console.print(
+                f"[yellow]Users not found: {', '.join(map(str, missing))}[/yellow]",
+            )
+        if any(user.id == me for user in matched):
+            # Revoking our own session would fail every request after it
+            console.print("[yellow]Skipping your own account[/yellow]")
+            matched = [user for user in matched if user.id != me]
+        if dry_run or not matched:
+            for user in matched[:20]:
+                console.print(f"  {user.id}\t{user.name}")
+            if len(matched) > 20:
+                console.print(f"  ... and {len(matched) - 20} more")
+            return
+        if not yes and not click.confirm(
+            f"Revoke the sessions of {len(matched)} users?",
+        ):
+            console.print("Cancelled")
+            return
+
+        revoker = SessionRevoker(
+            client,
+            concurrency=concurrency,
+            retries=retries,
+            deadline=deadline,
+        )
+        with console.status("Revoking sessions...") as status:
+
+            def progress(report: RevocationReport) -> None:
+                done = len(report.revoked) + len(report.failed)
+                status.update(
+                    f"Revoking sessions... {done}/{report.users} "
+                    f"({len(report.failed)} failed, {report.retries} retries)",
+                )
+
+            report = await revoker.revoke(
+                [user.id for user in matched],
+                app_id,
+                progress,
+            )
+
+    rate = len(report.revoked) / report.elapsed if report.elapsed else 0
+    console.print(
+        f"[green]Revoked sessions of {len(report.revoked)} users[/green] "
+        f"[dim]({report.elapsed:.1f}s, {rate:.0f} users/s, "
+        f"{report.retries} retries)[/dim]",
+    )
+    for user_id, error in sorted(report.failed.items()):
+        console.print(f"[red]User {user_id}: {error}[/red]")
+    if report.unfinished:
+        console.print(
+            f"[red]Deadline passed before {len(report.unfinished)} users were "
+            f"revoked: {', '.join(map(str, report.unfinished))}[/red]",
+        )
+    if report_path:
+        report_path.write_bytes(dumps(report.to_dict()))
+    if report.failed or report.unfinished:
+        msg = (
+            f"Failed to revoke sessions of "
+            f"{len(report.failed) + len(report.unfinished)} users"
+        )
+        raise NoCTFError(msg)
@@ -1,10 +1,20 @@
+import asyncio
 from pathlib import Path
-from typing import List
+from typing import List, Union
 
 import click
+from rich.markup import escape
 
-from noctfcli.models import UploadUpdateResult, UploadUpdateResultEnum
+from noctfcli.external import RemoteFileDigest, RemoteFileHasher
+from noctfcli.models import (
+    ChallengeConfig,
+    ExternalFileConfig,
+    UploadUpdateResult,
+    UploadUpdateResultEnum,
+)
+from noctfcli.regexcheck import DEFAULT_BUDGET, RegexFlagReport
 from noctfcli.utils import (
+    cache_directory,
     find_challenge_files,
     print_results_summary,
 )
@@ -13,39 +23,134 @@ from noctfcli.validator import ChallengeValidator
 from .common import console
 
 
+async def _hash_external_files(
+    configs: List[ChallengeConfig],
+) -> dict[str, Union[RemoteFileDigest, Exception]]:
+    urls = [
+        entry.url
+        for config in configs
+        for entry in config.files
+        if isinstance(entry, ExternalFileConfig)
+    ]
+    if not urls:
+        return {}
+    async with RemoteFileHasher(cache_directory() / "external.json") as hasher:
+        return await hasher.digest_many(urls)
+
+
+def check_external_files(
+    config: ChallengeConfig,
+    digests: dict[str, Union[RemoteFileDigest, Exception]],
+) -> List[str]:
+    """Print the check of each external file against its download.
+
+    Returns:
+        Problems found (empty if every declared hash and size matches)
+    """
+
+    problems = []
+    for entry in config.files:
+        if not isinstance(entry, ExternalFileConfig):
+            continue
+        digest = digests[entry.url]
+        if isinstance(digest, Exception):
+            problems.append(str(digest))
+            console.print(f"\t[red]✗[/red] {entry.url}: {digest}")
+            continue
+
+        mismatches = []
+        if entry.hash is not None and entry.hash != digest.hash:
+            mismatches.append(f"hash is {digest.hash}, declared {entry.hash}")
+        if entry.size is not None and entry.size != digest.size:
+            mismatches.append(f"size is {digest.size}, declared {entry.size}")
+        source = " [dim](cached)[/dim]" if digest.cached else ""
+        if mismatches:
+            problems.extend(f"{entry.url}: {m}" for m in mismatches)
+            console.print(
+                f"\t[red]✗[/red] {entry.url}{source}: {'; '.join(mismatches)}",
+            )
+        elif entry.hash is None:
+            console.print(
+                f"\t[yellow]•[/yellow] {entry.url}{source}: will be uploaded "
+                f"with hash: {digest.hash}, size: {digest.size}",
+            )
+        else:
+            console.print(f"\t[green]✓[/green] {entry.url}{source} matches")
+    return problems
+
+
+def print_regex_reports(reports: List[RegexFlagReport]) -> List[str]:
+    """Print the timing of each regex flag.
+
+    Returns:
+        Problems found (empty if every checked flag is within budget)
+    """
+
+    problems = []
+    for report in reports:
+        if report.error:
+            problems.append(report.error)
+            console.print(f"\t[red]✗[/red] {escape(report.error)}")
+            continue
+        if not report.inputs:
+            console.print(f"\t[yellow]•[/yellow] regex {escape(repr(report.pattern))}")
+            for warning in report.warnings:
+                console.print(f"\t  [yellow]•[/yellow] {escape(warning)}")
+            continue
+        worst = (report.worst_seconds or 0.0) * 1000
+        timing = (
+            f"stopped after {worst:.0f}ms"
+            if report.timed_out
+            else f"worst {worst:.3f}ms"
+        )
+        summary = (
+            f"regex {report.pattern!r}: {timing} on a "
+            f"{len(report.worst_input or '')}-char input "
+            f"({report.inputs} inputs tried)"
+        )
+        if report.ok:
+            console.print(f"\t[green]✓[/green] {escape(summary)}")
+        else:
+            summary += f", budget {report.budget * 1000:g}ms"
+            problems.append(summary)
+            console.print(f"\t[red]✗[/red] {escape(summary)}")
+        for warning in report.warnings:
+            console.print(f"\t  [yellow]•[/yellow] {escape(warning)}")
+    return problems
+
+
 @click.command()
 @click.argument(
     "challenges_directory",
     type=click.Path(exists=True, path_type=Path, file_okay=False, dir_okay=True),
 )
-def validate(challenges_directory: Path) -> None:
+@click.option(
+    "--verify-external",
+    is_flag=True,
+    help="Download external files and check their declared hash and size",
+)
+@click.option(
+    "--regex-budget",
+    type=click.FloatRange(min=0, min_open=True),
+    default=DEFAULT_BUDGET * 1000,
+    show_default=True,
+    help="Milliseconds a single match of a regex flag may take",
+)
+def validate(
+    challenges_directory: Path,
+    verify_external: bool,
+    regex_budget: float,
+) -> None:
     """Validate all noctf.yaml files in a directory."""
 
     results: List[UploadUpdateResult] = []
-    validator = ChallengeValidator()
+    validator = ChallengeValidator(regex_budget=regex_budget / 1000)
 
     yaml_files = find_challenge_files(challenges_directory)
+    configs: dict[Path, ChallengeConfig] = {}
     for yaml_path in yaml_files:
         try:
-            challenge_config = validator.validate_challenge_complete(yaml_path)
-
-            console.print(
-                f"[blue]Validating challenge {challenge_config.slug}...[/blue]",
-            )
-            console.print("\t[green]✓[/green] Challenge configuration is valid")
-            console.print(f"\tTitle: {challenge_config.title}")
-            console.print(f"\tSlug: {challenge_config.slug}")
-            console.print(f"\tCategories: {challenge_config.categories}")
-            console.print(f"\tFlags: {challenge_config.flags}")
-            console.print(f"\tFiles: {challenge_config.files}")
-
-            results.append(
-                UploadUpdateResult(
-                    challenge=challenge_config.slug,
-                    status=UploadUpdateResultEnum.VALIDATED,
-                ),
-            )
-
+            configs[yaml_path] = validator.validate_challenge_complete(yaml_path)
         except Exception as e:
             results.append(
                 UploadUpdateResult(
@@ -56,4 +161,34 @@ def validate(challenges_directory: Path) -> None:
             )
             console.print(f"[red]Error validating challenge {yaml_path}: {e}[/red]")
 
+    digests = (
+        asyncio.run(_hash_external_files(list(configs.values())))
+        if verify_external
+        else {}
+    )
+
+    for challenge_config in configs.values():
+        console.print(
+            f"[blue]Validating challenge {challenge_config.slug}...[/blue]",
+        )
+        console.print("\t[green]✓[/green] Challenge configuration is valid")
+        console.print(f"\tTitle: {challenge_config.title}")
+        console.print(f"\tSlug: {challenge_config.slug}")
+        console.print(f"\tCategories: {challenge_config.categories}")
+        console.print(f"\tFlags: {challenge_config.flags}")
+        console.print(f"\tFiles: {challenge_config.files}")
+
+        problems = print_regex_reports(validator.check_regex_flags(challenge_config))
+        if digests:
+            problems.extend(check_external_files(challenge_config, digests))
+        results.append(
+            UploadUpdateResult(
+                challenge=challenge_config.slug,
+                status=UploadUpdateResultEnum.FAILED
+                if problems
+                else UploadUpdateResultEnum.VALIDATED,
+                error="; ".join(problems) or None,
+            ),
+        )
+
     print_results_summary(console, results)
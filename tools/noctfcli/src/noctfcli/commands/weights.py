@@ -0,0 +1,335 @@
+import asyncio
+import csv
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Optional, TypeVar
+
+import click
+from rich.console import Console
+from rich.table import Table
+
+from noctfcli.client import MAX_WEIGHT_ITEMS, NoCTFClient, create_client
+from noctfcli.exceptions import APIError, NoCTFError, NotFoundError, ValidationError
+from noctfcli.fastjson import loads
+from noctfcli.retry import retry
+
+from .common import CLIContextObj, console, handle_errors
+
+T = TypeVar("T")
+
+WEIGHT_FORMATS = ["csv", "ndjson"]
+
+
+def read_weights(path: Path, fmt: Optional[str] = None) -> dict[str, dict[int, int]]:
+    """Read weight updates from a CSV or NDJSON file, grouped per challenge.
+
+    Each row has a challenge (ID or slug), team_id and weight. CSV files need
+    a header naming those columns. A later row for the same challenge and team
+    replaces an earlier one.
+
+    Args:
+        path: File to read
+        fmt: "csv" or "ndjson" (default: from the file extension)
+
+    Returns:
+        Challenge ID or slug mapped to team ID mapped to weight
+
+    Raises:
+        ValidationError: If a row is missing a field or has a non-integer value
+    """
+
+    if fmt is None:
+        fmt = "csv" if path.suffix.lower() == ".csv" else "ndjson"
+
+    grouped: dict[str, dict[int, int]] = {}
+    with open(path, newline="" if fmt == "csv" else None) as f:
+        if fmt == "csv":
+            rows: Any = enumerate(csv.DictReader(f), start=2)
+        else:
+            rows = ((n, loads(line)) for n, line in enumerate(f, 1) if line.strip())
+
+        for line, row in rows:
+            try:
+                challenge = str(row["challenge"]).strip()
+                team_id = int(row["team_id"])
+                weight = int(row["weight"])
+            except (KeyError, TypeError, ValueError) as e:
+                msg = f"{path}:{line}: expected challenge, team_id and weight: {e}"
+                raise ValidationError(msg) from e
+            grouped.setdefault(challenge, {})[team_id] = weight
+    return grouped
+
+
+@dataclass
+class WeightPushResult:
+    """Outcome of pushing the weights of one challenge."""
+
+    challenge: str
+    challenge_id: int
+    teams: int
+    requests: int = 0
+    retries: int = 0
+    elapsed: float = 0.0
+    error: Optional[str] = None
+
+
+class WeightPusher:
+    """Sends weight updates for many challenges with bounded concurrency.
+
+    Each challenge's updates are split into requests of at most
+    MAX_WEIGHT_ITEMS teams. Requests for all challenges share one concurrency
+    limit, and requests that fail with a connection error, 429 or 5xx are
+    retried with exponential backoff and a fresh signature.
+
+    Args:
+        concurrency: Maximum requests in flight
+        retries: Retries per request before the challenge is marked failed
+        batch_size: Teams per request
+    """
+
+    def __init__(
+        self,
+        client: NoCTFClient,
+        concurrency: int = 8,
+        retries: int = 3,
+        batch_size: int = MAX_WEIGHT_ITEMS,
+    ) -> None:
+        self.client = client
+        self.retries = retries
+        self.batch_size = batch_size
+        self._semaphore = asyncio.Semaphore(concurrency)
+
+    async def push(
+        self,
+        updates: dict[int, dict[int, int]],
+        names: dict[int, str],
+        key: Optional[str] = None,
+    ) -> list[WeightPushResult]:
+        """Push weights for every challenge.
+
+        Args:
+            updates: Challenge ID mapped to team ID mapped to weight
+            names: Challenge ID mapped to the name to report it by
+            key: Weight update key for every challenge (default: fetch each
+                challenge's own key)
+
+        Returns:
+            One result per challenge, in the order of updates
+        """
+
+        return list(
+            await asyncio.gather(
+                *(
+                    self._push_challenge(
+                        WeightPushResult(names[cid], cid, len(weights)),
+                        weights,
+                        key,
+                    )
+                    for cid, weights in updates.items()
+                ),
+            ),
+        )
+
+    async def _push_challenge(
+        self,
+        result: WeightPushResult,
+        weights: dict[int, int],
+        key: Optional[str],
+    ) -> WeightPushResult:
+        try:
+            if key is None:
+                key = await self._fetch_key(result)
+            items = [{"team_id": t, "weight": w} for t, w in weights.items()]
+            batches = [
+                items[i : i + self.batch_size]
+                for i in range(0, len(items), self.batch_size)
+            ]
+            start = time.perf_counter()
+            await asyncio.gather(
+                *(self._send(result, batch, key) for batch in batches),
+            )
+            result.elapsed = time.perf_counter() - start
+        except NoCTFError as e:
+            result.error = e.message
+        return result
+
+    async def _fetch_key(self, result: WeightPushResult) -> str:
+        challenge = await self._retry(
+            result,
+            lambda: self.client.get_challenge_by_id(result.challenge_id),
+        )
+        if not challenge.weight_update_key:
+            msg = "Challenge has no solve.weight_update_key"
+            raise NoCTFError(msg)
+        return challenge.weight_update_key
+
+    async def _send(
+        self,
+        result: WeightPushResult,
+        items: list[dict[str, int]],
+        key: str,
+    ) -> None:
+        def send() -> Awaitable[list[dict[str, Any]]]:
+            result.requests += 1
+            return self.client.update_challenge_weights(
+                result.challenge_id,
+                items,
+                key,
+            )
+
+        await self._retry(result, send)
+
+    async def _retry(
+        self,
+        result: WeightPushResult,
+        request: Callable[[], Awaitable[T]],
+    ) -> T:
+        def count(_: APIError) -> None:
+            result.retries += 1
+
+        return await retry(request, self.retries, self._semaphore, count)
+
+
+async def resolve_challenges(
+    client: NoCTFClient,
+    challenges: list[str],
+) -> dict[str, int]:
+    """Map challenge IDs or slugs to IDs, listing challenges at most once."""
+
+    resolved = {c: int(c) for c in challenges if c.isdigit()}
+    slugs = [c for c in challenges if not c.isdigit()]
+    if slugs:
+        by_slug = {c.slug: c.id for c in await client.list_challenges()}
+        for slug in slugs:
+            if slug not in by_slug:
+                raise NotFoundError(f"Challenge with slug {slug} not found")
+            resolved[slug] = by_slug[slug]
+    return resolved
+
+
+def print_push_results(
+    console: Console,
+    results: list[WeightPushResult],
+    elapsed: float,
+) -> None:
+    table = Table(title="Weight updates")
+    table.add_column("Challenge", style="green")
+    table.add_column("Teams", justify="right")
+    table.add_column("Requests", justify="right")
+    table.add_column("Retries", justify="right")
+    table.add_column("Time", justify="right")
+    table.add_column("Teams/s", justify="right")
+    table.add_column("Status")
+
+    for r in results:
+        rate = f"{r.teams / r.elapsed:.0f}" if r.elapsed and not r.error else "-"
+        table.add_row(
+            r.challenge,
+            str(r.teams),
+            str(r.requests),
+            str(r.retries),
+            f"{r.elapsed:.2f}s" if not r.error else "-",
+            rate,
+            f"[red]{r.error}[/red]" if r.error else "[green]OK[/green]",
+        )
+    console.print(table)
+
+    pushed = sum(r.teams for r in results if not r.error)
+    rate = pushed / elapsed if elapsed else 0
+    console.print(
+        f"[green]Updated {pushed} team weights[/green] "
+        f"[dim]({elapsed:.1f}s, {rate:.0f} teams/s)[/dim]",
+    )
+
+
+@click.group()
+def weights() -> None:
+    """Bulk update per-team challenge weights."""
+
+
+@weights.command(name="push")
+@click.argument(
+    "input_file",
+    type=click.Path(exists=True, path_type=Path, dir_okay=False),
+)
+@click.option(
+    "--format",
+    "fmt",
+    type=click.Choice(WEIGHT_FORMATS),
+    help="Input format [default: csv for .csv files, otherwise ndjson]",
+)
+@click.option(
+    "--key",
+    envvar="NOCTF_WEIGHT_UPDATE_KEY",
+    help="Weight update key for every challenge [default: each challenge's "
+    "solve.weight_update_key]",
+)
+@click.option(
+    "--concurrency",
+    type=click.IntRange(min=1),
+    default=8,
+    show_default=True,
+    help="Requests in flight at once",
+)
+@click.option(
+    "--retries",
+    type=click.IntRange(min=0),
+    default=3,
+    show_default=True,
+    help="Retries for requests failing with a connection error, 429 or 5xx",
+)
+@click.option(
+    "--batch-size",
+    type=click.IntRange(min=1, max=MAX_WEIGHT_ITEMS),
+    default=MAX_WEIGHT_ITEMS,
+    show_default=True,
+    help="Teams per request",
+)
+@click.option("--dry-run", is_flag=True, help="Read and group the input only")
+@click.pass_obj
+@handle_errors
+async def push(
+    ctx: CLIContextObj,
+    input_file: Path,
+    fmt: Optional[str],
+    key: Optional[str],
+    concurrency: int,
+    retries: int,
+    batch_size: int,
+    dry_run: bool,
+) -> None:
+    """Set team weights from a CSV or NDJSON file of challenge, team_id, weight."""
+
+    grouped = read_weights(input_file, fmt)
+    rows = sum(len(teams) for teams in grouped.values())
+    console.print(
+        f"[blue]Read {rows} team weights for {len(grouped)} challenges[/blue]",
+    )
+    if dry_run or not grouped:
+        return
+
+    async with create_client(ctx.config) as client:
+        ids = await resolve_challenges(client, list(grouped))
+        updates: dict[int, dict[int, int]] = {}
+        names: dict[int, str] = {}
+        for challenge, teams in grouped.items():
+            updates.setdefault(ids[challenge], {}).update(teams)
+            names.setdefault(ids[challenge], challenge)
+
+        pusher = WeightPusher(
+            client,
+            concurrency=concurrency,
+            retries=retries,
+            batch_size=batch_size,
+        )
+        start = time.perf_counter()
+        results = await pusher.push(updates, names, key)
+        elapsed = time.perf_counter() - start
+
+    print_push_results(console, results, elapsed)
+    failed = [r for r in results if r.error]
+    if failed:
+        msg = f"Failed to update weights for {len(failed)} challenges"
+        raise NoCTFError(msg)
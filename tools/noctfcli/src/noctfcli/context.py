@@ -0,0 +1,83 @@
+from collections.abc import Sequence
+from functools import cached_property
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional, Union
+
+from .exceptions import ConfigurationError
+
+if TYPE_CHECKING:
+    from .config import Config
+    from .preprocessor import PreprocessorBase, PreprocessorPipeline
+
+PreprocessorClasses = Union[
+    type["PreprocessorBase"],
+    Sequence[type["PreprocessorBase"]],
+    None,
+]
+
+
+class CLIContextObj:
+    """State shared by CLI commands.
+
+    The configuration and preprocessor are only loaded when a command first
+    uses them, so commands that need neither (and --help) start quickly and
+    work without a configuration file.
+    """
+
+    def __init__(
+        self,
+        config_path: Optional[Path],
+        preprocessor_classes: PreprocessorClasses = None,
+    ) -> None:
+        self.config_path = config_path
+        if preprocessor_classes is None:
+            preprocessor_classes = []
+        elif not isinstance(preprocessor_classes, Sequence):
+            preprocessor_classes = [preprocessor_classes]
+        self.preprocessor_classes = list(preprocessor_classes)
+
+    @cached_property
+    def config(self) -> "Config":
+        from .config import Config
+
+        if self.config_path is None:
+            msg = "Configuration file is required, pass it with --config"
+            raise ConfigurationError(msg)
+        return Config.init(self.config_path)
+
+    @cached_property
+    def preprocessors(self) -> list["PreprocessorBase"]:
+        """An instance of each preprocessor class, in order."""
+
+        return [cls(self.config_path) for cls in self.preprocessor_classes]
+
+    @cached_property
+    def preprocessor(self) -> Optional["PreprocessorBase"]:
+        """The preprocessor, or None if there is none.
+
+        Raises:
+            ConfigurationError: If several preprocessors are chained, which
+                only preprocessor_pipeline can apply
+        """
+
+        if not self.preprocessors:
+            return None
+        if len(self.preprocessors) > 1:
+            msg = "Several preprocessors are chained, use preprocessor_pipeline"
+            raise ConfigurationError(msg)
+        return self.preprocessors[0]
+
+    @cached_property
+    def preprocessor_pipeline(self) -> Optional["PreprocessorPipeline"]:
+        """Every preprocessor chained in order, or None if there are none."""
+
+        if not self.preprocessors:
+            return None
+
+        from .preprocessor import PreprocessorPipeline
+        from .utils import cache_directory
+
+        return PreprocessorPipeline(
+            self.preprocessors,
+            cache_directory=cache_directory() / "preprocess",
+        )
@@ -0,0 +1,185 @@
+"""Hash and size of externally hosted challenge files.
+
+Remote files are streamed and hashed chunk by chunk, so they are never held in
+memory. Results are cached on disk keyed on the URL together with the ETag and
+Last-Modified headers. Later runs send a conditional request, and a 304
+response reuses the cached result without downloading the file again.
+"""
+
+import asyncio
+import hashlib
+import os
+from dataclasses import asdict, dataclass, replace
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Optional, Union
+
+from .exceptions import APIError, NoCTFError
+from .fastjson import dumps, loads
+from .tracing import span
+
+if TYPE_CHECKING:
+    import httpx
+
+CACHE_VERSION = 1
+
+
+@dataclass
+class RemoteFileDigest:
+    """Hash and size of a remote file."""
+
+    url: str
+    hash: str
+    size: int
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    cached: bool = False
+    """True if the file was not transferred because it has not changed."""
+
+
+class RemoteFileHasher:
+    """Streams remote files to compute their sha256 hash and size.
+
+    Use as an async context manager; the cache is written on exit.
+
+    Args:
+        cache_path: JSON file remembering previous results (None to disable)
+        concurrency: Maximum downloads at once
+        timeout: Timeout in seconds for connecting and between chunks
+        chunk_size: Bytes read from the response at a time
+    """
+
+    def __init__(
+        self,
+        cache_path: Optional[Path] = None,
+        concurrency: int = 8,
+        timeout: float = 30.0,
+        chunk_size: int = 65536,
+    ) -> None:
+        self.cache_path = cache_path
+        self.timeout = timeout
+        self.chunk_size = chunk_size
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._cache: dict[str, RemoteFileDigest] = self._load_cache()
+        self._client: Optional[httpx.AsyncClient] = None
+
+    async def __aenter__(self) -> "RemoteFileHasher":
+        import httpx
+
+        self._client = httpx.AsyncClient(timeout=self.timeout, follow_redirects=True)
+        return self
+
+    async def __aexit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        self.save_cache()
+
+    def _load_cache(self) -> dict[str, RemoteFileDigest]:
+        if self.cache_path is None:
+            return {}
+        try:
+            data = loads(self.cache_path.read_bytes())
+        except (OSError, ValueError):
+            return {}
+        if data.get("version") != CACHE_VERSION:
+            return {}
+        return {
+            url: RemoteFileDigest(url=url, **entry)
+            for url, entry in data.get("entries", {}).items()
+        }
+
+    def save_cache(self) -> None:
+        """Write the cache file, if there is one."""
+
+        if self.cache_path is None:
+            return
+        entries = {}
+        for url, digest in self._cache.items():
+            entry = asdict(digest)
+            del entry["url"], entry["cached"]
+            entries[url] = entry
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.cache_path.with_suffix(f".{os.getpid()}.tmp")
+        temp_path.write_bytes(dumps({"version": CACHE_VERSION, "entries": entries}))
+        temp_path.replace(self.cache_path)
+
+    async def digest(self, url: str) -> RemoteFileDigest:
+        """Hash a remote file, unless the cached result is still current.
+
+        Raises:
+            APIError: If the file cannot be downloaded
+        """
+
+        import httpx
+
+        if self._client is None:
+            msg = "RemoteFileHasher must be used as an async context manager"
+            raise NoCTFError(msg)
+
+        cached = self._cache.get(url)
+        headers = {}
+        if cached is not None and cached.etag:
+            headers["If-None-Match"] = cached.etag
+        if cached is not None and cached.last_modified:
+            headers["If-Modified-Since"] = cached.last_modified
+
+        sha256 = hashlib.sha256()
+        size = 0
+        async with self._semaphore:
+            with span("hash_external", url=url):
+                try:
+                    async with self._client.stream(
+                        "GET",
+                        url,
+                        headers=headers,
+                    ) as response:
+                        status = response.status_code
+                        if status == 304 and cached is not None:
+                            return replace(cached, cached=True)
+                        if status == 304 or status >= 400:
+                            # A 304 without a cached result has no body to hash
+                            msg = f"Download of {url} failed: HTTP {status}"
+                            raise APIError(msg, status_code=status)
+                        async for chunk in response.aiter_bytes(self.chunk_size):
+                            sha256.update(chunk)
+                            size += len(chunk)
+                except httpx.RequestError as e:
+                    raise APIError(f"Download of {url} failed: {e}") from e
+
+        digest = RemoteFileDigest(
+            url=url,
+            hash=f"sha256:{sha256.hexdigest()}",
+            size=size,
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+        )
+        if digest.etag or digest.last_modified:
+            self._cache[url] = digest
+        else:
+            self._cache.pop(url, None)
+        return digest
+
+    async def digest_many(
+        self,
+        urls: list[str],
+    ) -> dict[str, Union[RemoteFileDigest, Exception]]:
+        """Hash remote files concurrently.
+
+        Returns:
+            Each distinct URL mapped to its digest or the error downloading it
+        """
+
+        unique = list(dict.fromkeys(urls))
+        outcomes = await asyncio.gather(
+            *(self.digest(url) for url in unique),
+            return_exceptions=True,
+        )
+        results: dict[str, Union[RemoteFileDigest, Exception]] = {}
+        for url, outcome in zip(unique, outcomes):
+            if isinstance(outcome, BaseException) and not isinstance(
+                outcome,
+                Exception,
+            ):
+                raise outcome
+            results[url] = outcome
+        return results
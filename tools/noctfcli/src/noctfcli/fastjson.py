@@ -0,0 +1,148 @@
+"""JSON encoding with an optional accelerated backend.
+
+orjson is used when installed, then msgspec, falling back to the standard
+library. Set NOCTFCLI_JSON_BACKEND=json (or orjson/msgspec) to pick one.
+
+``dumps`` always produces minified UTF-8, the same bytes as
+``json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode()`` for
+data decoded from API responses. Objects the fast encoders reject, such as
+integers beyond 64 bits, are encoded by the standard library instead. Floats
+are the one difference: values outside [1e-4, 1e16) keep the same value but
+are written as "1e16"/"0.00001" rather than "1e+16"/"1e-05", and NaN and
+infinities become null instead of invalid JSON. Checking for them would mean
+walking every object in Python, which costs more than the stdlib encoder.
+"""
+
+import gc
+import json
+import os
+from typing import Any, Callable, Union
+
+BACKENDS = ("orjson", "msgspec", "json")
+"""Supported backends in order of preference."""
+
+GC_PAUSE_BYTES = 1024 * 1024
+"""Documents at least this large are decoded with the cyclic GC paused.
+
+Decoding creates many container objects, which triggers collections that
+cannot find anything to free in a freshly built tree.
+"""
+
+
+def _stdlib_dumps(obj: Any) -> bytes:
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+class JSONBackend:
+    """Minified JSON encoder and decoder backed by one library.
+
+    Args:
+        name: One of BACKENDS
+
+    Raises:
+        ImportError: If the backend's library is not installed
+        ValueError: If the backend is unknown
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._fallback_errors: tuple[type[Exception], ...] = ()
+        self._dumps: Callable[[Any], bytes]
+        self._loads: Callable[[Union[bytes, str]], Any]
+
+        if name == "orjson":
+            import orjson
+
+            option = orjson.OPT_NON_STR_KEYS
+            self._dumps = lambda obj: orjson.dumps(obj, option=option)
+            self._loads = orjson.loads
+            self._fallback_errors = (orjson.JSONEncodeError,)
+        elif name == "msgspec":
+            import msgspec
+
+            def loads(data: Union[bytes, str]) -> Any:
+                try:
+                    return msgspec.json.decode(data)
+                except msgspec.DecodeError as e:
+                    raise ValueError(str(e)) from e
+
+            self._dumps = msgspec.json.Encoder().encode
+            self._loads = loads
+            self._fallback_errors = (msgspec.EncodeError, OverflowError)
+        elif name == "json":
+            self._dumps = _stdlib_dumps
+            self._loads = json.loads
+        else:
+            msg = f"Unknown JSON backend '{name}' (expected one of {BACKENDS})"
+            raise ValueError(msg)
+
+    def dumps(self, obj: Any) -> bytes:
+        """Encode obj as minified UTF-8 JSON."""
+
+        try:
+            return self._dumps(obj)
+        except self._fallback_errors:
+            return _stdlib_dumps(obj)
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        """Decode JSON from bytes or str.
+
+        Raises:
+            ValueError: If data is not valid JSON
+        """
+
+        if len(data) < GC_PAUSE_BYTES or not gc.isenabled():
+            return self._loads(data)
+        gc.disable()
+        try:
+            return self._loads(data)
+        finally:
+            gc.enable()
+
+
+def available_backends() -> list[str]:
+    """Names of the backends that can be loaded, fastest first."""
+
+    available = []
+    for name in BACKENDS:
+        try:
+            JSONBackend(name)
+        except ImportError:
+            continue
+        available.append(name)
+    return available
+
+
+def _default_backend() -> JSONBackend:
+    preferred = os.environ.get("NOCTFCLI_JSON_BACKEND", "").lower()
+    if preferred:
+        return JSONBackend(preferred)
+    return JSONBackend(available_backends()[0])
+
+
+_backend = _default_backend()
+
+BACKEND = _backend.name
+"""Name of the backend used by dumps and loads."""
+
+
+def dumps(obj: Any) -> bytes:
+    """Encode obj as minified UTF-8 JSON."""
+
+    return _backend.dumps(obj)
+
+
+def dumps_str(obj: Any) -> str:
+    """Encode obj as a minified JSON string."""
+
+    return _backend.dumps(obj).decode()
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Decode JSON from bytes or str.
+
+    Raises:
+        ValueError: If data is not valid JSON
+    """
+
+    return _backend.loads(data)
@@ -1,9 +1,17 @@
 from datetime import datetime
 from enum import Enum
+from functools import cached_property
 from pathlib import Path
-from typing import Any, Optional, Union
+from typing import Any, NamedTuple, Optional, Union
 
-from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    Field,
+    TypeAdapter,
+    field_validator,
+    model_validator,
+)
 
 
 class FlagStrategy(str, Enum):
@@ -78,15 +86,30 @@ class ExternalFileConfig(BaseModel):
     """Reference to an externally hosted file.
 
     The file is not uploaded; only its location and integrity metadata are
-    stored. All three fields are required because the CLI does not compute the
-    hash or size of a remote file.
+    stored. Hash and size are declared together or not at all. If they are
+    omitted, upload and update download the file to compute them, and
+    ``validate --verify-external`` checks declared values.
     """
 
     model_config = ConfigDict(extra="forbid")
 
     url: str = Field(..., description="URL of the file")
-    hash: str = Field(..., description="File hash (e.g. sha256:<hex>)")
-    size: int = Field(..., description="File size in bytes")
+    hash: Optional[str] = Field(
+        default=None,
+        description="File hash (e.g. sha256:<hex>), computed if omitted",
+    )
+    size: Optional[int] = Field(
+        default=None,
+        description="File size in bytes, computed if omitted",
+    )
+
+    @model_validator(mode="after")
+    def validate_hash_and_size(self) -> "ExternalFileConfig":
+        """A hash without a size (or the reverse) would be left unverified."""
+        if (self.hash is None) != (self.size is None):
+            msg = "external files must declare both hash and size, or neither"
+            raise ValueError(msg)
+        return self
 
 
 class ChallengeHint(BaseModel):
@@ -213,24 +236,44 @@ class Challenge(BaseModel):
     updated_at: datetime = Field(..., description="Last update timestamp")
     private_metadata: dict[str, Any] = Field(..., description="Private metadata")
 
-    @property
+    # The views below are decoded from private_metadata once and cached on the
+    # instance, so treat private_metadata as read-only after construction.
+
+    @cached_property
     def files(self) -> list[ChallengeFileAttachment]:
         """Get challenge files."""
         files_data = self.private_metadata.get("files", [])
-        return [ChallengeFileAttachment(**file_data) for file_data in files_data]
+        return _ATTACHMENT_LIST.validate_python(files_data)
 
-    @property
+    @cached_property
     def flags(self) -> list[Flag]:
         """Get challenge flags."""
         solve_data = self.private_metadata.get("solve", {})
         flags_data = solve_data.get("flag", [])
-        return [Flag(**flag_data) for flag_data in flags_data]
+        return _FLAG_LIST.validate_python(flags_data)
     
     @property
     def hints(self) -> list[ChallengeHint]:
         """Get challenge hints."""
         return self.private_metadata.get("hints", [])
 
+    @property
+    def weight_update_key(self) -> Optional[str]:
+        """Get the key that signs weight updates, if one is set."""
+        return self.private_metadata.get("solve", {}).get("weight_update_key")
+
+    def model_copy(
+        self,
+        *,
+        update: Optional[dict[str, Any]] = None,
+        deep: bool = False,
+    ) -> "Challenge":
+        copy = super().model_copy(update=update, deep=deep)
+        if update:
+            for view in ("files", "flags"):
+                copy.__dict__.pop(view, None)
+        return copy
+
 
 class ChallengeSummary(BaseModel):
     """Challenge summary for listing."""
@@ -245,11 +288,72 @@ class ChallengeSummary(BaseModel):
     updated_at: datetime
 
 
+_ATTACHMENT_LIST = TypeAdapter(list[ChallengeFileAttachment])
+_FLAG_LIST = TypeAdapter(list[Flag])
+
+CHALLENGE_SUMMARY_LIST = TypeAdapter(list[ChallengeSummary])
+"""Validates a whole challenge list response in one call instead of per row."""
+
+
+class TeamRecord(NamedTuple):
+    """A team from the admin team query.
+
+    A plain tuple rather than a model, so walking every team stays cheap.
+    """
+
+    id: int
+    name: str
+    bio: str
+    division_id: int
+    country: Optional[str]
+    tag_ids: list[int]
+    flags: list[str]
+    members: list[dict[str, Any]]
+    """Members as ``{"user_id": ..., "role": "owner" | "member"}``."""
+    created_at: datetime
+
+
+class UserRecord(NamedTuple):
+    """A user from the admin user query."""
+
+    id: int
+    name: str
+    bio: str
+    team_id: Optional[int]
+    country: Optional[str]
+    flags: list[str]
+    roles: list[str]
+    identities: list[dict[str, Any]]
+    """Linked identities as ``{"provider": ..., "provider_id": ...}``."""
+    created_at: datetime
+
+
+class ReleaseWave(BaseModel):
+    """Challenges released together at one instant."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    name: Optional[str] = Field(default=None, description="Wave name")
+    at: datetime = Field(..., description="Release time (UTC if no offset)")
+    challenges: list[str] = Field(..., min_length=1, description="Challenge slugs")
+
+
+class ReleasePlan(BaseModel):
+    """Schedule of release waves."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    waves: list[ReleaseWave] = Field(..., min_length=1, description="Release waves")
+
+
 class UploadUpdateResultEnum(str, Enum):
     UPLOADED = "uploaded"
     UPDATED = "updated"
+    PULLED = "pulled"
     VALIDATED = "validated"
     SKIPPED = "skipped"
+    ROLLED_BACK = "rolled_back"
+    RELEASED = "released"
     FAILED = "failed"
 
 
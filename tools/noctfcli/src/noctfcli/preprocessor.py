@@ -1,15 +1,147 @@
+import asyncio
+import hashlib
+import inspect
+import os
 from abc import ABC, abstractmethod
+from collections.abc import Awaitable, Sequence
 from pathlib import Path
-from typing import Optional
+from typing import ClassVar, Optional, Union
 
+from noctfcli.fastjson import dumps, loads
 from noctfcli.models import ChallengeConfig
+from noctfcli.tracing import span
 
 
 class PreprocessorBase(ABC):
+    version: ClassVar[Optional[str]] = None
+    """Version of the output for a given input, or None to never cache it.
+
+    Results are memoized on disk keyed on the input config and this version,
+    so change it whenever the same input would produce a different output
+    (for example after changing the code or the data it reads).
+    """
+
     @abstractmethod
     def __init__(self, config_path: Optional[Path]):
         pass
 
     @abstractmethod
-    def preprocess(self, challenge_config: ChallengeConfig) -> ChallengeConfig:
-        pass
+    def preprocess(
+        self,
+        challenge_config: ChallengeConfig,
+    ) -> Union[ChallengeConfig, Awaitable[ChallengeConfig]]:
+        """Transform a challenge config before it is uploaded.
+
+        May be defined with ``async def``. Otherwise it is run in a worker
+        thread, so challenges are preprocessed concurrently either way and a
+        slow preprocessor does not block the event loop.
+        """
+
+
+class PreprocessorPipeline:
+    """Applies a chain of preprocessors to challenges.
+
+    Each preprocessor's output is the next one's input. Challenges run through
+    the chain concurrently, and the result of each preprocessor with a version
+    is cached in cache_directory, so unchanged challenges skip it on later runs.
+
+    Args:
+        preprocessors: Preprocessors to apply, in order
+        cache_directory: Where results are memoized (None to disable)
+        concurrency: Maximum challenges preprocessed at once
+    """
+
+    def __init__(
+        self,
+        preprocessors: Sequence[PreprocessorBase],
+        cache_directory: Optional[Path] = None,
+        concurrency: int = 8,
+    ) -> None:
+        self.preprocessors = list(preprocessors)
+        self.cache_directory = cache_directory
+        self._semaphore = asyncio.Semaphore(concurrency)
+
+    def cache_key(
+        self,
+        preprocessor: PreprocessorBase,
+        challenge_config: ChallengeConfig,
+    ) -> Optional[str]:
+        """Digest of a preprocessor and its input, or None if not cacheable."""
+
+        if preprocessor.version is None:
+            return None
+        cls = type(preprocessor)
+        digest = hashlib.sha256(
+            f"{cls.__module__}.{cls.__qualname__}\0{preprocessor.version}\0".encode(),
+        )
+        digest.update(dumps(challenge_config.model_dump(mode="json")))
+        return digest.hexdigest()
+
+    def _cache_path(
+        self,
+        preprocessor: PreprocessorBase,
+        challenge_config: ChallengeConfig,
+    ) -> Optional[Path]:
+        key = self.cache_key(preprocessor, challenge_config)
+        if key is None or self.cache_directory is None:
+            return None
+        return self.cache_directory / f"{key}.json"
+
+    @staticmethod
+    def _read_cache(path: Path) -> Optional[ChallengeConfig]:
+        try:
+            return ChallengeConfig.model_validate(loads(path.read_bytes()))
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def _write_cache(path: Path, challenge_config: ChallengeConfig) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        temp_path.write_bytes(dumps(challenge_config.model_dump(mode="json")))
+        temp_path.replace(path)
+
+    async def preprocess(self, challenge_config: ChallengeConfig) -> ChallengeConfig:
+        """Apply every preprocessor to a challenge config."""
+
+        async with self._semaphore:
+            for preprocessor in self.preprocessors:
+                name = type(preprocessor).__name__
+                cache_path = self._cache_path(preprocessor, challenge_config)
+                cached = self._read_cache(cache_path) if cache_path else None
+                if cached is not None:
+                    challenge_config = cached
+                    continue
+
+                with span("preprocess", preprocessor=name):
+                    if inspect.iscoroutinefunction(preprocessor.preprocess):
+                        result = preprocessor.preprocess(challenge_config)
+                    else:
+                        result = await asyncio.to_thread(
+                            preprocessor.preprocess,
+                            challenge_config,
+                        )
+                    if inspect.isawaitable(result):
+                        result = await result
+                challenge_config = result
+
+                if cache_path is not None:
+                    self._write_cache(cache_path, challenge_config)
+        return challenge_config
+
+    async def preprocess_many(
+        self,
+        challenge_configs: Sequence[ChallengeConfig],
+    ) -> list[Union[ChallengeConfig, BaseException]]:
+        """Preprocess challenge configs concurrently.
+
+        Returns:
+            Preprocessed configs, or the exception raised for each one
+        """
+
+        return list(
+            await asyncio.gather(
+                *(self.preprocess(config) for config in challenge_configs),
+                return_exceptions=True,
+            ),
+        )
@@ -0,0 +1,312 @@
+"""Delta-encoded scoreboard recordings.
+
+A recording is an append-only NDJSON file. The first line is a header, then
+every line is a frame for one division at one instant:
+
+    {"t": 1721300000.123, "d": 1, "k": [[team_id, score, rank, last_solve], ...]}
+    {"t": 1721300001.125, "d": 1, "c": [[team_id, score, rank, last_solve], ...],
+     "r": [team_id, ...]}
+
+Keyframes ("k") hold the full scoreboard; delta frames hold only the teams
+whose row changed ("c") or that disappeared ("r"). ``last_solve`` is stored as
+epoch milliseconds. Keyframes are written periodically so a reader can seek
+to the nearest one instead of replaying the file from the start.
+
+Recording again to an existing file appends to it, starting with a keyframe
+for every division, so the divisions of a recording are those in its header
+plus any that have keyframes. A last line without a newline was torn by an
+interrupted write; readers ignore it and the recorder truncates it before
+appending.
+"""
+
+import asyncio
+import bisect
+import time
+from pathlib import Path
+from typing import Any, Callable, Optional, TextIO
+
+from .client import NoCTFClient
+from .exceptions import NoCTFError
+from .fastjson import dumps_str, loads
+from .utils import parse_api_datetime
+
+RECORDING_VERSION = 1
+
+TeamRow = tuple[float, int, Optional[int]]
+"""Recorded (score, rank, last_solve) of a team."""
+
+
+def _truncate_torn_line(path: Path) -> int:
+    """Remove a trailing line that has no newline from a file.
+
+    Returns:
+        Size of the file afterwards (0 if it does not exist)
+    """
+
+    if not path.exists():
+        return 0
+    with open(path, "r+b") as f:
+        size = f.seek(0, 2)
+        end = size
+        while end > 0:
+            f.seek(max(0, end - 4096))
+            chunk = f.read(end - max(0, end - 4096))
+            newline = chunk.rfind(b"\n")
+            if newline >= 0:
+                end = end - len(chunk) + newline + 1
+                break
+            end -= len(chunk)
+        if end != size:
+            f.truncate(end)
+    return end
+
+
+def _entry_row(entry: dict[str, Any]) -> TeamRow:
+    last_solve = entry.get("last_solve")
+    return (
+        entry["score"],
+        entry["rank"],
+        int(parse_api_datetime(last_solve).timestamp() * 1000) if last_solve else None,
+    )
+
+
+class ScoreboardRecorder:
+    """Polls division scoreboards and appends delta-encoded frames to a file."""
+
+    def __init__(
+        self,
+        client: NoCTFClient,
+        output: Path,
+        division_ids: list[int],
+        interval: float = 1.0,
+        keyframe_interval: float = 300.0,
+        page_size: int = 1000,
+    ) -> None:
+        self.client = client
+        self.output = output
+        self.division_ids = division_ids
+        self.interval = interval
+        self.keyframe_interval = keyframe_interval
+        self.page_size = page_size
+        self.frames = 0
+        self.bytes_written = 0
+        self._state: dict[int, dict[int, TeamRow]] = {}
+        self._last_keyframe: dict[int, float] = {}
+        self._file: Optional[TextIO] = None
+
+    async def run(
+        self,
+        duration: Optional[float] = None,
+        on_error: Optional[Callable[[int, Exception], None]] = None,
+    ) -> None:
+        """Record until cancelled or until duration seconds have passed.
+
+        Polls are scheduled at a fixed rate; a tick is skipped rather than
+        queued if the previous poll overran it.
+        """
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + duration if duration else None
+
+        new_file = _truncate_torn_line(self.output) == 0
+        with open(self.output, "a", encoding="utf-8") as f:
+            self._file = f
+            if new_file:
+                self._write({"v": RECORDING_VERSION, "divisions": self.division_ids})
+
+            next_tick = loop.time()
+            while deadline is None or next_tick < deadline:
+                await self.poll(on_error)
+                next_tick += self.interval
+                now = loop.time()
+                if next_tick < now:
+                    missed = (now - next_tick) // self.interval + 1
+                    next_tick += missed * self.interval
+                await asyncio.sleep(next_tick - now)
+        self._file = None
+
+    async def poll(
+        self,
+        on_error: Optional[Callable[[int, Exception], None]] = None,
+    ) -> None:
+        """Fetch every division concurrently and append a frame for each."""
+
+        results = await asyncio.gather(
+            *(
+                self.client.get_scoreboard(division_id, page_size=self.page_size)
+                for division_id in self.division_ids
+            ),
+            return_exceptions=True,
+        )
+        timestamp = round(time.time(), 3)
+        for division_id, result in zip(self.division_ids, results):
+            if isinstance(result, Exception):
+                if on_error:
+                    on_error(division_id, result)
+                continue
+            if isinstance(result, BaseException):
+                raise result
+            self._record(division_id, timestamp, result)
+
+    def _record(
+        self,
+        division_id: int,
+        timestamp: float,
+        entries: list[dict[str, Any]],
+    ) -> None:
+        state = {e["team_id"]: _entry_row(e) for e in entries}
+        previous = self._state.get(division_id)
+        last_keyframe = self._last_keyframe.get(division_id)
+        self._state[division_id] = state
+
+        if (
+            previous is None
+            or last_keyframe is None
+            or timestamp - last_keyframe >= self.keyframe_interval
+        ):
+            self._last_keyframe[division_id] = timestamp
+            self._write(
+                {
+                    "t": timestamp,
+                    "d": division_id,
+                    "k": [[team_id, *row] for team_id, row in state.items()],
+                },
+            )
+            return
+
+        changed = [
+            [team_id, *row]
+            for team_id, row in state.items()
+            if previous.get(team_id) != row
+        ]
+        removed = [team_id for team_id in previous if team_id not in state]
+        if not changed and not removed:
+            return
+
+        frame: dict[str, Any] = {"t": timestamp, "d": division_id, "c": changed}
+        if removed:
+            frame["r"] = removed
+        self._write(frame)
+
+    def _write(self, record: dict[str, Any]) -> None:
+        if self._file is None:
+            msg = "Recorder is not running"
+            raise NoCTFError(msg)
+        line = dumps_str(record) + "\n"
+        self._file.write(line)
+        self._file.flush()
+        self.frames += 1
+        self.bytes_written += len(line)
+
+
+class ScoreboardRecording:
+    """Random-access reader for a scoreboard recording.
+
+    Opening a recording scans it once to index the byte offset of every
+    keyframe; reconstructing an instant then seeks to the closest preceding
+    keyframe and replays only the deltas after it.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.division_ids: list[int] = []
+        self._keyframes: dict[int, tuple[list[float], list[int]]] = {}
+        self._index()
+
+    def _index(self) -> None:
+        with open(self.path, "rb") as f:
+            header = loads(f.readline())
+            if header.get("v") != RECORDING_VERSION:
+                msg = f"Unsupported recording version: {header.get('v')}"
+                raise NoCTFError(msg)
+            self.division_ids = list(header["divisions"])
+
+            offset = f.tell()
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                # Keyframes are the only frames with a "k" key, so avoid
+                # decoding the (much more common) delta frames while indexing.
+                if b'"k":' in line:
+                    frame = loads(line)
+                    times, offsets = self._keyframes.setdefault(frame["d"], ([], []))
+                    times.append(frame["t"])
+                    offsets.append(offset)
+                    if frame["d"] not in self.division_ids:
+                        self.division_ids.append(frame["d"])
+                offset += len(line)
+
+    def _division_keyframes(self, division_id: int) -> tuple[list[float], list[int]]:
+        """Times and file offsets of a division's keyframes.
+
+        Raises:
+            NoCTFError: If the division was not recorded
+        """
+
+        if division_id not in self.division_ids:
+            msg = (
+                f"Division {division_id} is not in the recording "
+                f"(recorded divisions: {', '.join(map(str, self.division_ids))})"
+            )
+            raise NoCTFError(msg)
+        return self._keyframes.get(division_id, ([], []))
+
+    def timestamps(self, division_id: int) -> tuple[float, float]:
+        """Return the first keyframe time of a division and the last frame time.
+
+        Raises:
+            NoCTFError: If the division was not recorded or has no frames
+        """
+
+        times, _ = self._division_keyframes(division_id)
+        if not times:
+            msg = f"Division {division_id} has no frames in the recording"
+            raise NoCTFError(msg)
+        last = times[-1]
+        for frame in self._frames_from(division_id, times[-1]):
+            last = frame["t"]
+        return times[0], last
+
+    def at(self, division_id: int, timestamp: float) -> dict[int, TeamRow]:
+        """Reconstruct a division scoreboard as it was at the given instant.
+
+        Args:
+            division_id: Division ID
+            timestamp: Unix timestamp in seconds
+
+        Returns:
+            Team ID mapped to (score, rank, last_solve epoch ms)
+
+        Raises:
+            NoCTFError: If the division was not recorded
+        """
+
+        times, _ = self._division_keyframes(division_id)
+        i = bisect.bisect_right(times, timestamp) - 1
+        if i < 0:
+            return {}
+
+        state: dict[int, TeamRow] = {}
+        for frame in self._frames_from(division_id, times[i]):
+            if frame["t"] > timestamp:
+                break
+            if "k" in frame:
+                state = {row[0]: (row[1], row[2], row[3]) for row in frame["k"]}
+                continue
+            for row in frame["c"]:
+                state[row[0]] = (row[1], row[2], row[3])
+            for team_id in frame.get("r", []):
+                state.pop(team_id, None)
+        return state
+
+    def _frames_from(self, division_id: int, keyframe_time: float):
+        times, offsets = self._keyframes[division_id]
+        offset = offsets[bisect.bisect_left(times, keyframe_time)]
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                frame = loads(line)
+                if frame["d"] == division_id:
+                    yield frame
@@ -0,0 +1,391 @@
+"""Checks that regex flags are cheap to match.
+
+The server matches a regex flag against every submission to its challenge
+with a backtracking engine, so a pattern such as ``(a+)+$`` can take seconds on
+a few dozen characters. Each pattern is compiled, scanned for constructs known
+to backtrack badly, and timed against inputs generated to make it backtrack,
+up to the longest submission the server accepts.
+
+Patterns are written for the server's JavaScript ``RegExp``. They are
+translated to Python syntax where the two differ (named groups and their
+backreferences), and a pattern Python still cannot compile is reported as not
+checked rather than invalid. Timings use Python's ``re``, which backtracks like
+the server's engine. They show which flags are expensive rather than predicting
+the server's timings.
+"""
+
+import multiprocessing
+import re
+import string
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Optional
+
+from .models import FlagStrategy
+from .tracing import span
+
+if TYPE_CHECKING:
+    from multiprocessing.connection import Connection
+
+try:
+    from re import _parser as sre_parse  # type: ignore[attr-defined]
+except ImportError:  # Python < 3.11
+    import sre_parse  # type: ignore[no-redef]
+
+MAX_SUBMISSION_LENGTH = 512
+"""Longest submission the server accepts (SolveChallengeRequest.data)."""
+
+DEFAULT_BUDGET = 0.01
+"""Default seconds a single match may take."""
+
+MAX_INPUTS = 200
+
+REGEX_STRATEGIES = {FlagStrategy.REGEX_SENSITIVE, FlagStrategy.REGEX_INSENSITIVE}
+
+_REPEATS = {
+    sre_parse.MAX_REPEAT,
+    sre_parse.MIN_REPEAT,
+    getattr(sre_parse, "POSSESSIVE_REPEAT", sre_parse.MAX_REPEAT),
+}
+_ATOMIC_GROUP = getattr(sre_parse, "ATOMIC_GROUP", None)
+
+_CATEGORIES = {
+    sre_parse.CATEGORY_DIGIT: re.compile(r"\d"),
+    sre_parse.CATEGORY_NOT_DIGIT: re.compile(r"\D"),
+    sre_parse.CATEGORY_SPACE: re.compile(r"\s"),
+    sre_parse.CATEGORY_NOT_SPACE: re.compile(r"\S"),
+    sre_parse.CATEGORY_WORD: re.compile(r"\w"),
+    sre_parse.CATEGORY_NOT_WORD: re.compile(r"\W"),
+}
+
+_SAMPLE_CHARACTERS = "a0A _!-.{}" + string.printable
+_SUFFIXES = ("", "!", "a", "0", " ", "\n")
+
+
+@dataclass
+class RegexFlagReport:
+    """Outcome of checking one regex flag."""
+
+    pattern: str
+    strategy: FlagStrategy
+    budget: float
+    error: Optional[str] = None
+    """Why the benchmark could not run, if it could not."""
+    warnings: list[str] = field(default_factory=list)
+    """Constructs in the pattern known to backtrack badly, or why it was not
+    checked."""
+    inputs: int = 0
+    """Number of inputs the pattern was timed against."""
+    worst_seconds: Optional[float] = None
+    worst_input: Optional[str] = None
+    timed_out: bool = False
+    """True if a match was stopped before it finished."""
+
+    @property
+    def ok(self) -> bool:
+        """True if the benchmark ran and every match was within budget."""
+
+        return self.error is None and (
+            self.worst_seconds is None or self.worst_seconds <= self.budget
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "pattern": self.pattern,
+            "strategy": self.strategy.value,
+            "ok": self.ok,
+            "error": self.error,
+            "warnings": self.warnings,
+            "inputs": self.inputs,
+            "worst_ms": None
+            if self.worst_seconds is None
+            else round(self.worst_seconds * 1000, 3),
+            "worst_input_length": None
+            if self.worst_input is None
+            else len(self.worst_input),
+            "timed_out": self.timed_out,
+        }
+
+
+def _in_set(items: list[tuple[Any, Any]], char: str) -> bool:
+    """Whether a character is matched by the items of a character class."""
+
+    negate = False
+    matched = False
+    for op, av in items:
+        if op is sre_parse.NEGATE:
+            negate = True
+        elif op is sre_parse.LITERAL:
+            matched = matched or ord(char) == av
+        elif op in (sre_parse.RANGE, getattr(sre_parse, "RANGE_UNI_IGNORE", None)):
+            matched = matched or av[0] <= ord(char) <= av[1]
+        elif op is sre_parse.CATEGORY and av in _CATEGORIES:
+            matched = matched or bool(_CATEGORIES[av].match(char))
+    return matched != negate
+
+
+def _sample_character(items: list[tuple[Any, Any]]) -> str:
+    for char in _SAMPLE_CHARACTERS:
+        if _in_set(items, char):
+            return char
+    return ""
+
+
+def _example(items: Any) -> str:
+    """A short string matched by parsed pattern items (lookarounds ignored)."""
+
+    parts = []
+    for op, av in items:
+        if op is sre_parse.LITERAL:
+            parts.append(chr(av))
+        elif op is sre_parse.NOT_LITERAL:
+            parts.append(_sample_character([(sre_parse.NEGATE, None), (op, av)]))
+        elif op is sre_parse.ANY:
+            parts.append("a")
+        elif op is sre_parse.IN:
+            parts.append(_sample_character(av))
+        elif op in _REPEATS:
+            minimum, _, body = av
+            parts.append(_example(body) * minimum)
+        elif op is sre_parse.SUBPATTERN:
+            parts.append(_example(av[-1]))
+        elif op is sre_parse.BRANCH:
+            parts.append(_example(av[1][0]))
+        elif op is sre_parse.GROUPREF_EXISTS:
+            parts.append(_example(av[1]))
+        elif op is _ATOMIC_GROUP:
+            parts.append(_example(av))
+    return "".join(parts)
+
+
+def _children(op: Any, av: Any) -> list[Any]:
+    """Sub-patterns nested directly inside a parsed item."""
+
+    if op in _REPEATS:
+        return [av[2]]
+    if op is sre_parse.SUBPATTERN:
+        return [av[-1]]
+    if op is sre_parse.BRANCH:
+        return list(av[1])
+    if op is sre_parse.GROUPREF_EXISTS:
+        return [branch for branch in av[1:] if branch is not None]
+    if op in (sre_parse.ASSERT, sre_parse.ASSERT_NOT):
+        return [av[1]]
+    if op is _ATOMIC_GROUP:
+        return [av]
+    return []
+
+
+def _contains(items: Any, predicate: Any) -> bool:
+    return any(
+        predicate(op, av)
+        or any(_contains(child, predicate) for child in _children(op, av))
+        for op, av in items
+    )
+
+
+def _is_repeat(op: Any) -> bool:
+    return op in _REPEATS and op is not getattr(sre_parse, "POSSESSIVE_REPEAT", None)
+
+
+def _overlapping_branch(op: Any, av: Any) -> bool:
+    """Whether an alternation has alternatives that can start alike."""
+
+    if op is not sre_parse.BRANCH:
+        return False
+    starts = [_example(branch)[:1] for branch in av[1]]
+    return "" in starts or len(set(starts)) < len(starts)
+
+
+def find_backtracking_constructs(items: Any) -> list[str]:
+    """Describe constructs in a parsed pattern known to backtrack badly."""
+
+    warnings = []
+    for op, av in items:
+        if _is_repeat(op) and av[1] > 1:
+            body = av[2]
+            if _contains(body, lambda o, a: _is_repeat(o) and a[1] > 1):
+                warnings.append(
+                    f"nested quantifier: repeated group {_example(body)!r}... "
+                    "contains another quantifier",
+                )
+            elif _contains(body, _overlapping_branch):
+                warnings.append(
+                    f"overlapping alternation inside quantifier: repeated group "
+                    f"{_example(body)!r}... has alternatives that start alike",
+                )
+            if _contains(body, lambda o, _: o is sre_parse.GROUPREF):
+                warnings.append("backreference inside quantifier")
+        for child in _children(op, av):
+            warnings.extend(find_backtracking_constructs(child))
+    return warnings
+
+
+def _pumps(items: Any, prefix: str = "") -> list[tuple[str, str]]:
+    """Each repeated part of a pattern, with a string leading up to it.
+
+    Returns:
+        (prefix, pump) pairs where repeating pump after prefix makes the
+        pattern try many ways of matching
+    """
+
+    pumps = []
+    for op, av in items:
+        if op in _REPEATS and av[1] > 1:
+            pump = _example(av[2])
+            if pump:
+                pumps.append((prefix, pump))
+        for child in _children(op, av):
+            pumps.extend(_pumps(child, prefix))
+        prefix += _example([(op, av)])
+    return pumps
+
+
+def adversarial_inputs(
+    pattern: str,
+    flags: int = 0,
+    max_length: int = MAX_SUBMISSION_LENGTH,
+) -> list[str]:
+    """Inputs likely to make a pattern backtrack the most.
+
+    Each repeated part of the pattern is repeated up to max_length, then
+    followed by characters that make the rest of the pattern fail to match.
+    """
+
+    items = sre_parse.parse(pattern, flags)
+    inputs = [
+        _example(items)[:max_length],
+        *(char * max_length for char in "aA0 !"),
+    ]
+    for prefix, pump in _pumps(items):
+        for suffix in _SUFFIXES:
+            repeats = max(1, (max_length - len(prefix) - len(suffix)) // len(pump))
+            inputs.append(
+                (prefix + pump * repeats)[: max_length - len(suffix)] + suffix,
+            )
+    return list(dict.fromkeys(inputs))[:MAX_INPUTS]
+
+
+def to_python_pattern(pattern: str) -> str:
+    """Translate JavaScript regex syntax to the Python equivalent.
+
+    Rewrites named groups ``(?<name>...)`` to ``(?P<name>...)`` and named
+    backreferences ``\\k<name>`` to ``(?P=name)``, leaving escapes and
+    character classes alone. Other syntax is passed through unchanged.
+    """
+
+    parts = []
+    in_class = False
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == "\\":
+            name = re.match(r"k<(\w+)>", pattern[i + 1 :])
+            if name and not in_class:
+                parts.append(f"(?P={name.group(1)})")
+                i += 1 + name.end()
+                continue
+            parts.append(pattern[i : i + 2])
+            i += 2
+            continue
+        if in_class:
+            in_class = char != "]"
+        elif char == "[":
+            in_class = True
+        elif pattern.startswith("(?<", i) and pattern[i + 3 : i + 4] not in "=!":
+            parts.append("(?P<")
+            i += 3
+            continue
+        parts.append(char)
+        i += 1
+    return "".join(parts)
+
+
+def _time_matches(
+    pattern: str,
+    flags: int,
+    inputs: list[str],
+    conn: "Connection",
+) -> None:
+    compiled = re.compile(pattern, flags)
+    conn.send(None)
+    for text in inputs:
+        start = time.perf_counter()
+        compiled.search(text)
+        conn.send(time.perf_counter() - start)
+    conn.close()
+
+
+def check_regex_flag(
+    pattern: str,
+    strategy: FlagStrategy,
+    budget: float = DEFAULT_BUDGET,
+    max_length: int = MAX_SUBMISSION_LENGTH,
+) -> RegexFlagReport:
+    """Compile a regex flag and time it against adversarial inputs.
+
+    The pattern is translated from JavaScript syntax first. If Python still
+    cannot compile it, the report carries a warning that it was not checked.
+    Matches run in a separate process, which is killed if a match takes
+    much longer than budget, so catastrophic patterns cannot hang the check.
+    Timing stops at the first input over budget.
+
+    Args:
+        pattern: Flag pattern
+        strategy: REGEX_SENSITIVE or REGEX_INSENSITIVE
+        budget: Seconds a single match may take
+        max_length: Length of the longest input
+
+    Returns:
+        Per-flag report of warnings and timings
+    """
+
+    report = RegexFlagReport(pattern=pattern, strategy=strategy, budget=budget)
+    flags = re.IGNORECASE if strategy == FlagStrategy.REGEX_INSENSITIVE else 0
+    pattern = to_python_pattern(pattern)
+    try:
+        re.compile(pattern, flags)
+    except re.error as e:
+        report.warnings.append(f"not checked, Python cannot compile it: {e}")
+        return report
+
+    items = sre_parse.parse(pattern, flags)
+    report.warnings = list(dict.fromkeys(find_backtracking_constructs(items)))
+    inputs = adversarial_inputs(pattern, flags, max_length)
+    timeout = max(1.0, budget * 20)
+
+    context = multiprocessing.get_context()
+    receiver, sender = context.Pipe(duplex=False)
+    process = context.Process(
+        target=_time_matches,
+        args=(pattern, flags, inputs, sender),
+        daemon=True,
+    )
+    with span("regex.benchmark", pattern=pattern):
+        process.start()
+        sender.close()
+        try:
+            if not receiver.poll(30.0):
+                report.error = "Timed out starting the regex benchmark"
+                return report
+            receiver.recv()
+            for text in inputs:
+                report.inputs += 1
+                if not receiver.poll(timeout):
+                    report.worst_seconds = timeout
+                    report.worst_input = text
+                    report.timed_out = True
+                    break
+                elapsed = receiver.recv()
+                if report.worst_seconds is None or elapsed > report.worst_seconds:
+                    report.worst_seconds = elapsed
+                    report.worst_input = text
+                if elapsed > budget:
+                    break
+        except EOFError:
+            report.error = "Regex benchmark process exited unexpectedly"
+        finally:
+            process.kill()
+            process.join()
+            receiver.close()
+    return report
@@ -0,0 +1,65 @@
+"""Retrying requests that fail transiently."""
+
+import asyncio
+import random
+from collections.abc import Awaitable, Callable
+from typing import Optional, TypeVar
+
+from .exceptions import APIError, AuthenticationError, ConflictError, NotFoundError
+
+T = TypeVar("T")
+
+RETRY_DELAY = 0.5
+"""Seconds before the first retry of a failed request, doubled for each retry."""
+
+
+def is_retryable(error: APIError) -> bool:
+    """Whether a request failing with this error may succeed if sent again.
+
+    Errors without a status are connection or response failures; of the
+    rest, only 429s and 5xx responses are retried.
+    """
+
+    if isinstance(error, (AuthenticationError, NotFoundError, ConflictError)):
+        return False
+    return (
+        error.status_code is None
+        or error.status_code == 429
+        or error.status_code >= 500
+    )
+
+
+async def retry(
+    request: Callable[[], Awaitable[T]],
+    retries: int = 3,
+    limit: Optional[asyncio.Semaphore] = None,
+    on_retry: Optional[Callable[[APIError], None]] = None,
+) -> T:
+    """Send a request, retrying transient failures with exponential backoff.
+
+    Args:
+        request: Makes the request; called again for each attempt
+        retries: Retries before the last error is raised
+        limit: Held while each attempt is in flight, but not while waiting
+            to retry
+        on_retry: Called with the error before each retry
+
+    Raises:
+        APIError: The last error, or the first that is not retryable
+    """
+
+    attempt = 0
+    while True:
+        try:
+            if limit is None:
+                return await request()
+            async with limit:
+                return await request()
+        except APIError as e:
+            if not is_retryable(e) or attempt == retries:
+                raise
+            if on_retry is not None:
+                on_retry(e)
+        delay = RETRY_DELAY * 2**attempt
+        attempt += 1
+        await asyncio.sleep(delay * random.uniform(0.5, 1.5))
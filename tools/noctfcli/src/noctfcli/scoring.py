@@ -0,0 +1,843 @@
+"""Recomputes division scoreboards offline from exported solves.
+
+The server values a challenge by evaluating its scoring strategy with the
+number of solves n and, for some strategies, a per-solve weight w, then adds
+the challenge's bonus to each of its first solvers. Every solver is rescored
+whenever n changes. The core strategies are evaluated here with NumPy over
+all solves at once, rebuilding each team's score and rank from a static
+export's solves and sampling how they changed over the event. The result can
+be compared with the scoreboard the server exported.
+
+Fixed-value solves and solve weights are not public, so exports cannot show
+them. Solves of challenges scored by weight take their exported values.
+"""
+
+import time
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from .exceptions import ConfigurationError, ValidationError
+from .fastjson import loads
+from .models import ScoringConfig
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None  # type: ignore[assignment]
+
+DEFAULT_SAMPLES = 100
+"""Default number of instants in a recomputed timeline."""
+
+
+def _js_round(x: "np.ndarray") -> "np.ndarray":
+    """Round halves up like JavaScript's Math.round."""
+
+    return np.floor(x + 0.5)
+
+
+def _static(p: dict[str, "np.ndarray"], n: "np.ndarray", _w: "np.ndarray") -> Any:
+    return np.broadcast_to(p["base"], n.shape)
+
+
+def _quadratic(p: dict[str, "np.ndarray"], n: "np.ndarray", _w: "np.ndarray") -> Any:
+    minimum, initial = p["minimum"], p["initial"]
+    solves = np.maximum(0, n - 1).astype(np.float64)
+    # Same operation order as the server's expression, so ceil sees the
+    # same doubles
+    scale = (minimum - initial) / p["decay"] ** 2
+    return np.maximum(minimum, np.ceil(scale * solves**2 + initial))
+
+
+def _exponential(
+    p: dict[str, "np.ndarray"],
+    n: "np.ndarray",
+    _w: "np.ndarray",
+) -> Any:
+    minimum, initial = p["minimum"], p["initial"]
+    solves = np.maximum(0, n - 1).astype(np.float64)
+    return minimum + (initial - minimum) / (1 + (solves / p["k"]) ** p["j"])
+
+
+def _bounded_weight(
+    p: dict[str, "np.ndarray"],
+    _n: "np.ndarray",
+    w: "np.ndarray",
+) -> Any:
+    return np.maximum(p["lower"], np.minimum(p["upper"], w))
+
+
+@dataclass(frozen=True)
+class Strategy:
+    """A scoring strategy evaluated over arrays of solve counts and weights.
+
+    evaluate is called with each parameter as an array aligned with n and w,
+    and returns the unrounded values. Strategies may use n or w but not both,
+    since the timeline only tracks how n changes.
+    """
+
+    evaluate: Callable[
+        [dict[str, "np.ndarray"], "np.ndarray", "np.ndarray"],
+        Any,
+    ]
+    params: tuple[str, ...]
+    uses_n: bool = True
+    uses_w: bool = False
+
+
+STRATEGIES: dict[str, Strategy] = {
+    "core:static": Strategy(_static, ("base",), uses_n=False),
+    "core:quadratic": Strategy(_quadratic, ("minimum", "initial", "decay")),
+    "core:exponential": Strategy(
+        _exponential,
+        ("minimum", "initial", "k", "j"),
+    ),
+    "core:bounded_weight": Strategy(
+        _bounded_weight,
+        ("lower", "upper"),
+        uses_n=False,
+        uses_w=True,
+    ),
+}
+"""Strategies by name, matching the server's core strategies."""
+
+
+def _require_numpy() -> None:
+    if np is None:
+        msg = "Score recomputation requires numpy (pip install 'noctfcli[scoring]')"
+        raise ConfigurationError(msg)
+
+
+def parse_timestamps(values: Sequence[str]) -> "np.ndarray":
+    """Parse API timestamps to milliseconds since the epoch."""
+
+    _require_numpy()
+    return (
+        np.array([v[:-1] if v.endswith("Z") else v for v in values], dtype="M8[ms]")
+        .astype(np.int64)
+        .reshape(len(values))
+    )
+
+
+@dataclass
+class Solves:
+    """Solves as parallel arrays, one element per solve.
+
+    Solves of a challenge are scored in the order given, earliest first
+    when times are equal.
+    """
+
+    challenge_id: "np.ndarray"
+    team_id: "np.ndarray"
+    created_at: "np.ndarray"
+    """Milliseconds since the epoch."""
+    value: "np.ndarray"
+    """Fixed value of each solve, or NaN where its challenge scores it."""
+    weight: "np.ndarray"
+
+    @classmethod
+    def from_columns(
+        cls,
+        challenge_id: Sequence[int],
+        team_id: Sequence[int],
+        created_at: Sequence[int],
+        value: Optional[Sequence[float]] = None,
+        weight: Optional[Sequence[float]] = None,
+    ) -> "Solves":
+        """Build solves from sequences; values default to NaN, weights to 0."""
+
+        _require_numpy()
+        count = len(challenge_id)
+        return cls(
+            challenge_id=np.asarray(challenge_id, dtype=np.int64),
+            team_id=np.asarray(team_id, dtype=np.int64),
+            created_at=np.asarray(created_at, dtype=np.int64),
+            value=np.full(count, np.nan)
+            if value is None
+            else np.asarray(value, dtype=np.float64),
+            weight=np.zeros(count)
+            if weight is None
+            else np.asarray(weight, dtype=np.float64),
+        )
+
+    def __len__(self) -> int:
+        return len(self.challenge_id)
+
+
+@dataclass
+class Awards:
+    """Awards as parallel arrays, one element per award."""
+
+    team_id: "np.ndarray"
+    created_at: "np.ndarray"
+    value: "np.ndarray"
+
+    @classmethod
+    def empty(cls) -> "Awards":
+        _require_numpy()
+        return cls(
+            team_id=np.zeros(0, dtype=np.int64),
+            created_at=np.zeros(0, dtype=np.int64),
+            value=np.zeros(0),
+        )
+
+
+@dataclass
+class Recomputation:
+    """Recomputed scoreboard of a division.
+
+    Team arrays are aligned with team_id, which is sorted. Timeline arrays
+    have one row per team and one column per instant in times.
+    """
+
+    team_id: "np.ndarray"
+    score: "np.ndarray"
+    last_solve: "np.ndarray"
+    """Milliseconds since the epoch of each team's last solve, or 0."""
+    rank: "np.ndarray"
+    solve_value: "np.ndarray"
+    """Value of each solve, aligned with the solves recomputed."""
+    challenge_value: dict[int, int]
+    """Current value of each challenge, as shown before solving it."""
+    times: "np.ndarray"
+    timeline_score: "np.ndarray"
+    timeline_rank: "np.ndarray"
+    elapsed: float = 0.0
+
+    def timeline(self, team_ids: Optional[Iterable[int]] = None) -> dict[str, Any]:
+        """The timeline as JSON-serializable data.
+
+        Args:
+            team_ids: Only include these teams [default: all]
+        """
+
+        rows = np.arange(len(self.team_id))
+        if team_ids is not None:
+            rows = np.searchsorted(self.team_id, np.fromiter(team_ids, np.int64))
+        return {
+            "times": self.times.tolist(),
+            "teams": {
+                str(self.team_id[row]): {
+                    "score": self.timeline_score[row].tolist(),
+                    "rank": self.timeline_rank[row].tolist(),
+                }
+                for row in rows.tolist()
+            },
+        }
+
+
+class _ChallengeTable:
+    """Scoring configs of the challenges in a set of solves, as arrays."""
+
+    def __init__(
+        self,
+        challenge_ids: "np.ndarray",
+        scoring: dict[int, ScoringConfig],
+    ) -> None:
+        missing = [cid for cid in challenge_ids.tolist() if cid not in scoring]
+        if missing:
+            msg = f"No scoring config for challenges {', '.join(map(str, missing))}"
+            raise ValidationError(msg)
+
+        self.ids = challenge_ids
+        configs = [scoring[cid] for cid in challenge_ids.tolist()]
+        unknown = sorted(
+            name
+            for name in {c.strategy for c in configs}
+            if name not in STRATEGIES
+            or (STRATEGIES[name].uses_n and STRATEGIES[name].uses_w)
+        )
+        if unknown:
+            msg = f"Cannot recompute scoring strategies {', '.join(unknown)}"
+            raise ValidationError(msg)
+
+        self.names = sorted({c.strategy for c in configs})
+        self.strategy = np.array(
+            [self.names.index(c.strategy) for c in configs],
+            dtype=np.int64,
+        )
+        self.params: dict[str, dict[str, np.ndarray]] = {}
+        for name in self.names:
+            arrays = {p: np.full(len(configs), np.nan) for p in STRATEGIES[name].params}
+            for i, config in enumerate(configs):
+                if config.strategy != name:
+                    continue
+                absent = [p for p in arrays if p not in config.params]
+                if absent:
+                    msg = (
+                        f"Challenge {challenge_ids[i]}: {name} needs "
+                        f"params {', '.join(absent)}"
+                    )
+                    raise ValidationError(msg)
+                for p, array in arrays.items():
+                    array[i] = float(config.params[p])
+            self.params[name] = arrays
+
+        self.uses_n = np.array(
+            [STRATEGIES[name].uses_n for name in self.names],
+        )[self.strategy]
+        self.uses_w = np.array(
+            [STRATEGIES[name].uses_w for name in self.names],
+        )[self.strategy]
+        width = max((len(c.bonus) for c in configs), default=0)
+        self.bonus = np.zeros((len(configs), width))
+        for i, config in enumerate(configs):
+            self.bonus[i, : len(config.bonus)] = _js_round(np.array(config.bonus))
+
+    def values(
+        self,
+        index: "np.ndarray",
+        n: "np.ndarray",
+        w: "np.ndarray",
+    ) -> "np.ndarray":
+        """Rounded value of challenge index[i] with n[i] solves and weight w[i]."""
+
+        out = np.empty(index.shape)
+        for k, name in enumerate(self.names):
+            mask = self.strategy[index] == k
+            if not mask.any():
+                continue
+            rows = index[mask]
+            params = {p: a[rows] for p, a in self.params[name].items()}
+            out[mask] = STRATEGIES[name].evaluate(params, n[mask], w[mask])
+        return _js_round(out)
+
+
+def _small(ids: "np.ndarray", count: int) -> bool:
+    """Whether IDs are small enough to index a table of about count entries.
+
+    IDs are usually serial, so tables beat sorting and searching.
+    """
+
+    return bool(len(ids)) and ids.min() >= 0 and ids.max() < 8 * count + 65536
+
+
+def _unique(values: "np.ndarray") -> "np.ndarray":
+    if _small(values, len(values)):
+        return np.flatnonzero(np.bincount(values))
+    return np.unique(values)
+
+
+def _positions(ids: "np.ndarray", values: "np.ndarray") -> "np.ndarray":
+    """Position of each value in ids, which are sorted and include them all."""
+
+    if _small(ids, len(values)):
+        lookup = np.zeros(ids[-1] + 1, dtype=np.int64)
+        lookup[ids] = np.arange(len(ids))
+        return lookup[values]
+    return np.searchsorted(ids, values)
+
+
+def _rank(score: "np.ndarray", last: "np.ndarray") -> "np.ndarray":
+    """Rank teams like the server: highest score first, then earliest last
+    solve, then the order teams are listed in.
+
+    Rows are teams; each column of 2-D arrays is ranked separately.
+    """
+
+    shape, n_teams = score.shape, score.shape[0]
+    if not score.size:
+        return np.zeros(shape, dtype=np.int64)
+    score = score.reshape(n_teams, -1).T
+    last = last.reshape(n_teams, -1).T
+    behind = score.max() - score
+    # Teams yet to solve have a last solve of 0, which stays first
+    solved = last[last > 0]
+    since = np.maximum(last - (solved.min() - 1 if solved.size else 0), 0)
+    widths = [int(behind.max()).bit_length(), int(since.max()).bit_length()]
+    rank = np.empty(score.shape, dtype=np.int64)
+    positions = np.arange(1, n_teams + 1)
+    if sum(widths) + n_teams.bit_length() < 63:
+        # Pack the sort keys into one integer, unique per team, so a single
+        # unstable sort ranks every column
+        key = (behind << widths[1] | since) << n_teams.bit_length()
+        key |= np.arange(n_teams)
+        np.put_along_axis(rank, np.argsort(key, axis=1), positions[None], axis=1)
+    else:
+        for column, (s, t) in enumerate(zip(score, last)):
+            rank[column, np.lexsort((t, -s))] = positions
+    return np.ascontiguousarray(rank.T).reshape(shape)
+
+
+def recompute(
+    scoring: dict[int, ScoringConfig],
+    solves: Solves,
+    awards: Optional[Awards] = None,
+    team_ids: Optional[Iterable[int]] = None,
+    samples: int = DEFAULT_SAMPLES,
+) -> Recomputation:
+    """Recompute a division's scoreboard and its timeline from its solves.
+
+    Solves must exclude hidden solves and the solves of hidden teams, which
+    the server does not count. Teams are ranked in team ID order when tied,
+    as the server lists them.
+
+    Args:
+        scoring: Scoring config of each challenge by ID
+        solves: The division's solves
+        awards: The division's awards
+        team_ids: Teams to rank even if they have no solves or awards
+        samples: Number of evenly spaced instants in the timeline, from the
+            first solve or award to the last
+
+    Returns:
+        Final scores, ranks and solve values, and their timeline
+
+    Raises:
+        ValidationError: If a challenge has no scoring config, or one that
+            cannot be recomputed
+    """
+
+    _require_numpy()
+    start = time.perf_counter()
+    awards = awards if awards is not None else Awards.empty()
+    teams = _unique(
+        np.concatenate(
+            [
+                solves.team_id,
+                awards.team_id,
+                np.fromiter(team_ids or (), dtype=np.int64),
+            ],
+        ),
+    )
+    challenges = _ChallengeTable(_unique(solves.challenge_id), scoring)
+    n_teams, n_challenges = len(teams), len(challenges.ids)
+    team = _positions(teams, solves.team_id)
+    challenge = _positions(challenges.ids, solves.challenge_id)
+
+    # Solves scored by their challenge count towards n and get its bonuses
+    # in solve order
+    dynamic = np.isnan(solves.value)
+    order = np.lexsort((solves.created_at, challenge))
+    ordered = order[dynamic[order]]
+    ordered_challenge = challenge[ordered]
+    n = np.bincount(ordered_challenge, minlength=n_challenges)
+    first = np.cumsum(n) - n
+    position = np.arange(len(ordered)) - first[ordered_challenge]
+    bonus = np.zeros(len(solves))
+    has_bonus = position < challenges.bonus.shape[1]
+    bonus[ordered[has_bonus]] = challenges.bonus[
+        ordered_challenge[has_bonus],
+        position[has_bonus],
+    ]
+
+    # Without weights, a challenge's solves are all worth the same
+    challenge_value = challenges.values(
+        np.arange(n_challenges),
+        n,
+        np.zeros(n_challenges),
+    )
+    value = solves.value.copy()
+    value[dynamic] = challenge_value[challenge[dynamic]] + bonus[dynamic]
+    weighted = dynamic & challenges.uses_w[challenge]
+    value[weighted] = (
+        challenges.values(
+            challenge[weighted],
+            n[challenge[weighted]],
+            solves.weight[weighted],
+        )
+        + bonus[weighted]
+    )
+    award_team = _positions(teams, awards.team_id)
+    score = np.bincount(team, value, minlength=n_teams) + np.bincount(
+        award_team,
+        awards.value,
+        minlength=n_teams,
+    )
+    last_solve = np.zeros(n_teams, dtype=np.int64)
+    np.maximum.at(last_solve, team, solves.created_at)
+    score = score.astype(np.int64)
+
+    varying = dynamic & challenges.uses_n[challenge]
+    times, timeline_score, timeline_rank = _timeline(
+        challenges,
+        teams,
+        team,
+        challenge,
+        created_at=solves.created_at,
+        constant=np.where(varying, bonus, value),
+        varying=varying,
+        awards=awards,
+        award_team=award_team,
+        samples=samples,
+    )
+    return Recomputation(
+        team_id=teams,
+        score=score,
+        last_solve=last_solve,
+        rank=_rank(score, last_solve),
+        solve_value=value.astype(np.int64),
+        challenge_value=dict(
+            zip(challenges.ids.tolist(), challenge_value.astype(np.int64).tolist()),
+        ),
+        times=times,
+        timeline_score=timeline_score,
+        timeline_rank=timeline_rank,
+        elapsed=time.perf_counter() - start,
+    )
+
+
+def _timeline(
+    challenges: _ChallengeTable,
+    teams: "np.ndarray",
+    team: "np.ndarray",
+    challenge: "np.ndarray",
+    *,
+    created_at: "np.ndarray",
+    constant: "np.ndarray",
+    varying: "np.ndarray",
+    awards: Awards,
+    award_team: "np.ndarray",
+    samples: int,
+) -> tuple["np.ndarray", "np.ndarray", "np.ndarray"]:
+    """Scores and ranks of every team at evenly spaced instants.
+
+    A solve or award counts from the first instant at or after it. Solves
+    of challenges valued by n are worth more or less as n changes, so each
+    instant sums their values from a matrix of when each team solved each
+    challenge. The rest of every solve (its bonus, or its whole value when
+    it does not vary) and awards only change a score when they happen, so
+    they are accumulated once.
+    """
+
+    n_teams = len(teams)
+    events = np.concatenate([created_at, awards.created_at])
+    if not len(events):
+        empty = np.zeros((n_teams, 0), dtype=np.int64)
+        return np.zeros(0, dtype=np.int64), empty, empty
+    times = np.linspace(events.min(), events.max(), samples).round().astype(np.int64)
+    times[-1] = events.max()
+    at = np.searchsorted(times, created_at)
+    award_at = np.searchsorted(times, awards.created_at)
+
+    score = np.bincount(
+        np.concatenate([team * samples + at, award_team * samples + award_at]),
+        np.concatenate([constant, awards.value]),
+        minlength=n_teams * samples,
+    ).reshape(n_teams, samples)
+    np.cumsum(score, axis=1, out=score)
+
+    # Teams solve a challenge at most once, so solve instants fit a matrix
+    columns = np.flatnonzero(challenges.uses_n)
+    if len(columns):
+        column_of = np.zeros(len(challenges.ids), dtype=np.int64)
+        column_of[columns] = np.arange(len(columns))
+        column = column_of[challenge[varying]]
+        n = np.bincount(
+            column * samples + at[varying],
+            minlength=len(columns) * samples,
+        ).reshape(len(columns), samples)
+        np.cumsum(n, axis=1, out=n)
+        worth = challenges.values(
+            np.repeat(columns, samples),
+            n.ravel(),
+            np.zeros(n.size),
+        ).reshape(n.shape)
+        solved_at = np.full((n_teams, len(columns)), samples, dtype=np.int32)
+        solved_at[team[varying], column] = at[varying]
+        for j in range(samples):
+            score[:, j] += (solved_at <= j) @ worth[:, j]
+
+    last = np.zeros(n_teams * samples, dtype=np.int64)
+    np.maximum.at(last, team * samples + at, created_at)
+    last = np.maximum.accumulate(last.reshape(n_teams, samples), axis=1)
+    score = score.astype(np.int64)
+    return times, score, _rank(score, last)
+
+
+@dataclass
+class DivisionExport:
+    """A division's solves, awards and scoreboard read from a static export."""
+
+    division_id: int
+    challenge_slugs: dict[int, str]
+    solves: Solves
+    awards: Awards
+    entries: list[dict[str, Any]]
+    """Entries of the exported scoreboard."""
+
+
+def _read_json(path: Path) -> Any:
+    if not path.is_file():
+        raise ValidationError(f"Not a static export: {path} not found")
+    return loads(path.read_bytes())
+
+
+def load_export(export_dir: Path, division_id: int) -> DivisionExport:
+    """Read a division's solves, awards and scoreboard from a static export.
+
+    Solves are read from challenge_solves.json, or its shards in a sharded
+    export, and awards from the scoreboard.
+
+    Raises:
+        ValidationError: If a file of the export is missing
+    """
+
+    _require_numpy()
+    division_dir = export_dir / f"division:{division_id}"
+    challenges = _read_json(export_dir / "challenges.json")["data"]["challenges"]
+    entries = _read_json(division_dir / "scoreboard.json")["data"]["entries"]
+
+    shards = division_dir / "challenge_solves"
+    if shards.is_dir():
+        by_challenge = {
+            int(path.stem): loads(path.read_bytes()) for path in shards.glob("*.json")
+        }
+    elif (division_dir / "challenge_solves.json").is_file():
+        by_challenge = {
+            int(cid): solves
+            for cid, solves in _read_json(
+                division_dir / "challenge_solves.json",
+            ).items()
+        }
+    else:
+        by_challenge = {}
+
+    challenge_ids, team_ids, created_at = [], [], []
+    for cid, solves in sorted(by_challenge.items()):
+        for solve in solves["data"]:
+            challenge_ids.append(cid)
+            team_ids.append(solve["team_id"])
+            created_at.append(solve["created_at"])
+
+    award_teams, award_times, award_values = [], [], []
+    for entry in entries:
+        for award in entry.get("awards") or ():
+            award_teams.append(entry["team_id"])
+            award_times.append(award["created_at"])
+            award_values.append(award["value"])
+
+    return DivisionExport(
+        division_id=division_id,
+        challenge_slugs={c["id"]: c["slug"] for c in challenges},
+        solves=Solves.from_columns(
+            challenge_ids,
+            team_ids,
+            parse_timestamps(created_at),
+        ),
+        awards=Awards(
+            team_id=np.asarray(award_teams, dtype=np.int64),
+            created_at=parse_timestamps(award_times),
+            value=np.asarray(award_values, dtype=np.float64),
+        ),
+        entries=entries,
+    )
+
+
+@dataclass
+class Mismatch:
+    """A value that differs between the exported and recomputed scoreboards.
+
+    A value of None means the team or solve is missing from that side.
+    """
+
+    team_id: int
+    field: str
+    """One of score, rank or solve."""
+    exported: Optional[int]
+    recomputed: Optional[int]
+    challenge_id: Optional[int] = None
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "team_id": self.team_id,
+            "field": self.field,
+            "challenge_id": self.challenge_id,
+            "exported": self.exported,
+            "recomputed": self.recomputed,
+        }
+
+
+@dataclass
+class ScoreboardDiff:
+    """Outcome of comparing a recomputed scoreboard with an exported one."""
+
+    division_id: int
+    teams: int
+    solves: int
+    mismatches: list[Mismatch] = field(default_factory=list)
+    weighted: list[int] = field(default_factory=list)
+    """Challenges scored by weight, whose solves kept their exported values."""
+
+    @property
+    def ok(self) -> bool:
+        return not self.mismatches
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "division_id": self.division_id,
+            "teams": self.teams,
+            "solves": self.solves,
+            "weighted": self.weighted,
+            "mismatches": [m.to_dict() for m in self.mismatches],
+        }
+
+
+def _exported_solves(
+    entries: list[dict[str, Any]],
+) -> tuple["np.ndarray", "np.ndarray", "np.ndarray"]:
+    """Team, challenge and value of each visible solve on a scoreboard."""
+
+    solves = [
+        (entry["team_id"], solve["challenge_id"], solve["value"])
+        for entry in entries
+        for solve in entry["solves"]
+        if not solve.get("hidden")
+    ]
+    table = np.array(solves, dtype=np.int64).reshape(len(solves), 3)
+    return table[:, 0], table[:, 1], table[:, 2]
+
+
+def _match(keys: "np.ndarray", queries: "np.ndarray") -> tuple[Any, Any]:
+    """Position of each query in sorted keys, and whether it was found there."""
+
+    if not len(keys):
+        return np.zeros(len(queries), dtype=np.int64), np.zeros(len(queries), bool)
+    at = np.minimum(np.searchsorted(keys, queries), len(keys) - 1)
+    return at, keys[at] == queries
+
+
+def diff_scoreboard(
+    result: Recomputation,
+    solves: Solves,
+    entries: list[dict[str, Any]],
+    division_id: int = 0,
+) -> ScoreboardDiff:
+    """Compare a recomputed scoreboard with the exported entries.
+
+    Teams are matched by ID and solves by team and challenge. Teams hidden
+    on the exported scoreboard are skipped.
+    """
+
+    visible = [entry for entry in entries if not entry.get("hidden")]
+    diff = ScoreboardDiff(division_id, teams=len(visible), solves=len(solves))
+    mismatches = diff.mismatches
+
+    exported = np.array(
+        [(e["team_id"], e["score"], e["rank"]) for e in visible],
+        dtype=np.int64,
+    ).reshape(len(visible), 3)
+    ids = exported[:, 0]
+    rows, found = _match(result.team_id, ids)
+    for team_id in ids[~found].tolist():
+        mismatches.append(Mismatch(team_id, "score", None, None))
+    for column, name, recomputed in (
+        (1, "score", result.score),
+        (2, "rank", result.rank),
+    ):
+        for i in np.flatnonzero(found & (exported[:, column] != recomputed[rows])):
+            mismatches.append(
+                Mismatch(
+                    int(ids[i]),
+                    name,
+                    int(exported[i, column]),
+                    int(recomputed[rows[i]]),
+                ),
+            )
+    # Teams with nothing to score are hidden, so they are not missing
+    unexported = np.isin(result.team_id, ids, invert=True)
+    unexported &= (result.score != 0) | (result.last_solve != 0)
+    for row in np.flatnonzero(unexported):
+        mismatches.append(
+            Mismatch(int(result.team_id[row]), "score", None, int(result.score[row])),
+        )
+
+    team_id, challenge_id, value = _exported_solves(visible)
+    width = max(challenge_id.max(initial=0), solves.challenge_id.max(initial=0)) + 1
+    keys = solves.team_id * width + solves.challenge_id
+    order = np.argsort(keys)
+    exported_keys = team_id * width + challenge_id
+    at, matched = _match(keys[order], exported_keys)
+    recomputed = result.solve_value[order[at]]
+    for i in np.flatnonzero(~matched | (recomputed != value)):
+        mismatches.append(
+            Mismatch(
+                int(team_id[i]),
+                "solve",
+                int(value[i]),
+                int(recomputed[i]) if matched[i] else None,
+                int(challenge_id[i]),
+            ),
+        )
+    unexported = np.isin(keys, exported_keys, invert=True)
+    unexported &= np.isin(solves.team_id, ids)
+    for i in np.flatnonzero(unexported):
+        mismatches.append(
+            Mismatch(
+                int(solves.team_id[i]),
+                "solve",
+                None,
+                int(result.solve_value[i]),
+                int(solves.challenge_id[i]),
+            ),
+        )
+    return diff
+
+
+def verify_export(
+    export: DivisionExport,
+    scoring: dict[str, ScoringConfig],
+    samples: int = DEFAULT_SAMPLES,
+) -> tuple[Recomputation, ScoreboardDiff]:
+    """Recompute a division of a static export and compare it with the export.
+
+    Solves of challenges scored by weight keep their values on the exported
+    scoreboard, since exports do not include weights.
+
+    Args:
+        export: The division's export
+        scoring: Scoring config of each challenge by slug
+        samples: Number of instants in the timeline
+
+    Returns:
+        The recomputed scoreboard, and how it differs from the exported one
+
+    Raises:
+        ValidationError: If a solved challenge has no scoring config
+    """
+
+    solves = export.solves
+    slugs = {
+        cid: export.challenge_slugs.get(cid, str(cid))
+        for cid in np.unique(solves.challenge_id).tolist()
+    }
+    missing = sorted(slug for slug in slugs.values() if slug not in scoring)
+    if missing:
+        msg = f"No noctf.yaml for solved challenges {', '.join(missing)}"
+        raise ValidationError(msg)
+    by_id = {cid: scoring[slug] for cid, slug in slugs.items()}
+
+    weighted = sorted(
+        cid
+        for cid, config in by_id.items()
+        if config.strategy in STRATEGIES and STRATEGIES[config.strategy].uses_w
+    )
+    if weighted:
+        team_id, challenge_id, value = _exported_solves(export.entries)
+        width = max(challenge_id.max(initial=0), solves.challenge_id.max(initial=0)) + 1
+        order = np.argsort(team_id * width + challenge_id)
+        at, found = _match(
+            (team_id * width + challenge_id)[order],
+            solves.team_id * width + solves.challenge_id,
+        )
+        take = found & np.isin(solves.challenge_id, weighted)
+        value = np.where(take, value[order[at]] if len(order) else 0, solves.value)
+        solves = Solves(
+            challenge_id=solves.challenge_id,
+            team_id=solves.team_id,
+            created_at=solves.created_at,
+            value=value.astype(np.float64),
+            weight=solves.weight,
+        )
+
+    result = recompute(
+        by_id,
+        solves,
+        export.awards,
+        team_ids=(entry["team_id"] for entry in export.entries),
+        samples=samples,
+    )
+    diff = diff_scoreboard(result, solves, export.entries, export.division_id)
+    diff.weighted = weighted
+    return result, diff
@@ -0,0 +1,79 @@
+"""HTTP message signatures (RFC 9421) for endpoints keyed per challenge.
+
+The admin challenge weight endpoints do not take a session token. Instead the
+request is signed with HMAC-SHA256 using the challenge's
+``solve.weight_update_key``, covering the method, path and authority and, for
+requests with a body, its Content-Digest (RFC 9530).
+"""
+
+import base64
+import hashlib
+import hmac
+import time
+from typing import Optional
+
+SIGNATURE_LABEL = "sig1"
+SIGNATURE_ALGORITHM = "hmac-sha256"
+
+
+def content_digest(body: bytes) -> str:
+    """Content-Digest header value for a request body."""
+
+    digest = base64.b64encode(hashlib.sha256(body).digest()).decode()
+    return f"sha-256={digest}"
+
+
+def sign_request(
+    method: str,
+    path: str,
+    authority: str,
+    key: str,
+    key_id: str,
+    *,
+    digest: Optional[str] = None,
+    created: Optional[int] = None,
+) -> dict[str, str]:
+    """Sign a request with HMAC-SHA256.
+
+    Args:
+        method: HTTP method
+        path: Request path without the query string
+        authority: Host and port (if not the default) the request is sent to
+        key: Shared secret
+        key_id: Identifier of the key, sent as the keyid parameter
+        digest: Content-Digest header value, covered by the signature if given
+        created: Signature creation time (default: now)
+
+    Returns:
+        Signature-Input and Signature headers (plus Content-Digest if given)
+    """
+
+    components = {
+        "@method": method.upper(),
+        "@path": path,
+        "@authority": authority.lower(),
+    }
+    if digest is not None:
+        components["content-digest"] = digest
+
+    covered = " ".join(f'"{name}"' for name in components)
+    created = int(time.time()) if created is None else created
+    params = (
+        f'({covered});created={created};keyid="{key_id}";alg="{SIGNATURE_ALGORITHM}"'
+    )
+
+    lines = [f'"{name}": {value}' for name, value in components.items()]
+    lines.append(f'"@signature-params": {params}')
+    signature = hmac.new(
+        key.encode(),
+        "\n".join(lines).encode(),
+        hashlib.sha256,
+    ).digest()
+
+    headers = {
+        "Signature-Input": f"{SIGNATURE_LABEL}={params}",
+        "Signature": f"{SIGNATURE_LABEL}=:{base64.b64encode(signature).decode()}:",
+    }
+    if digest is not None:
+        headers["Content-Digest"] = digest
+    return headers
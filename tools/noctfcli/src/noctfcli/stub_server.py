@@ -0,0 +1,1017 @@
+"""In-process stub of the noCTF API for offline tests and benchmarks.
+
+StubServer serves the subset of the API used by NoCTFClient and the static
+exporter from memory, on a real socket in a background thread, so any HTTP
+client can be pointed at it:
+
+    with StubServer(faults=StubFaults(latency=0.05)) as server:
+        server.seed(challenges=20, teams=500)
+        client = NoCTFClient(server.url)
+
+Responses follow the server's contracts, including optimistic concurrency on
+challenge updates: a PUT with a stale ``version`` fails with 404 "Challenge
+and version not found" as it does upstream, and creating a duplicate slug
+fails with 409. The challenge weight endpoints check HTTP message signatures
+made with the challenge's weight update key instead of the bearer token.
+Latency, bandwidth limits and failures can be injected to measure client
+behaviour reproducibly.
+"""
+
+import email.parser
+import email.policy
+import hashlib
+import hmac
+import json
+import mimetypes
+import random
+import re
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Optional
+from urllib.parse import parse_qs, urlparse
+
+from .client import MAX_WEIGHT_ITEMS
+from .signing import content_digest, sign_request
+from .utils import format_api_datetime
+
+SIGNATURE_TOLERANCE = 10
+"""Seconds a signature's created time may differ from the server clock."""
+
+
+@dataclass
+class StubFaults:
+    """Faults injected into every response of a StubServer.
+
+    Attributes:
+        latency: Seconds to wait before handling each request
+        jitter: Maximum extra seconds of uniformly random latency
+        bandwidth: Bytes per second for request and response bodies
+        error_rate: Fraction of requests answered with error_status
+        error_status: HTTP status of injected failures
+        seed: Seed for jitter and failure injection
+    """
+
+    latency: float = 0.0
+    jitter: float = 0.0
+    bandwidth: Optional[float] = None
+    error_rate: float = 0.0
+    error_status: int = 503
+    seed: Optional[int] = None
+
+
+class StubError(Exception):
+    def __init__(self, status: int, error: str, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+        self.error = error
+        self.message = message
+
+
+def _now() -> str:
+    return format_api_datetime(datetime.now(timezone.utc))
+
+
+@dataclass
+class StubState:
+    """In-memory data served by a StubServer."""
+
+    challenges: dict[int, dict[str, Any]] = field(default_factory=dict)
+    files: dict[int, dict[str, Any]] = field(default_factory=dict)
+    blobs: dict[str, bytes] = field(default_factory=dict)
+    divisions: list[dict[str, Any]] = field(default_factory=list)
+    teams: dict[int, dict[str, Any]] = field(default_factory=dict)
+    users: dict[int, dict[str, Any]] = field(default_factory=dict)
+    team_tags: list[dict[str, Any]] = field(default_factory=list)
+    revocations: dict[int, int] = field(default_factory=dict)
+    """Number of times each user's sessions were revoked."""
+    solves: list[dict[str, Any]] = field(default_factory=list)
+    weights: dict[tuple[int, int], dict[str, Any]] = field(default_factory=dict)
+    next_id: int = 1
+
+    def allocate_id(self) -> int:
+        value = self.next_id
+        self.next_id += 1
+        return value
+
+
+Route = tuple[str, "re.Pattern[str]", str]
+
+ROUTES: list[tuple[str, str, str]] = [
+    ("GET", r"/admin/challenges", "admin_list_challenges"),
+    ("POST", r"/admin/challenges", "admin_create_challenge"),
+    ("GET", r"/admin/challenges/(?P<id>[^/]+)", "admin_get_challenge"),
+    ("PUT", r"/admin/challenges/(?P<id>\d+)", "admin_update_challenge"),
+    ("DELETE", r"/admin/challenges/(?P<id>\d+)", "admin_delete_challenge"),
+    ("GET", r"/admin/challenges/(?P<id>\d+)/weights", "admin_list_weights"),
+    ("PUT", r"/admin/challenges/(?P<id>\d+)/weights", "admin_update_weights"),
+    ("POST", r"/admin/teams/query", "admin_query_teams"),
+    ("POST", r"/admin/users/query", "admin_query_users"),
+    ("PUT", r"/admin/teams/(?P<id>\d+)", "admin_update_team"),
+    ("PUT", r"/admin/teams/(?P<id>\d+)/members", "admin_set_team_member"),
+    ("POST", r"/admin/users/(?P<id>\d+)/sessions/revoke", "admin_revoke_sessions"),
+    ("GET", r"/admin/team_tags", "admin_list_team_tags"),
+    ("POST", r"/admin/team_tags", "admin_create_team_tag"),
+    ("GET", r"/admin/divisions", "admin_list_divisions"),
+    ("POST", r"/admin/files", "admin_upload_file"),
+    ("GET", r"/admin/files/(?P<id>\d+)", "admin_get_file"),
+    ("GET", r"/files/local/(?P<ref>[^/]+)", "get_local_file"),
+    ("GET", r"/challenges", "list_challenges"),
+    ("GET", r"/challenges/(?P<id>\d+)", "get_challenge"),
+    ("GET", r"/challenges/(?P<id>\d+)/solves", "get_challenge_solves"),
+    ("POST", r"/challenges/(?P<id>\d+)/solves", "solve_challenge"),
+    ("GET", r"/divisions", "list_divisions"),
+    ("GET", r"/scoreboard/divisions/(?P<id>\d+)", "get_scoreboard"),
+    ("GET", r"/scoreboard/divisions/(?P<id>\d+)/ctftime", "get_ctftime_scoreboard"),
+    ("GET", r"/scoreboard/teams/(?P<id>\d+)", "get_team_scoreboard"),
+    ("POST", r"/teams/query", "query_teams"),
+    ("POST", r"/users/query", "query_users"),
+]
+"""Method, path pattern and StubServer handler method of every stubbed route."""
+
+ADMIN_QUERY_PAGE_SIZE = 100
+"""Largest page the admin team and user queries return."""
+
+SIGNED_ROUTES = {"admin_list_weights", "admin_update_weights"}
+"""Handlers authenticated by a weight update key signature, not the token."""
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "_HTTPServer"
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+        pass
+
+    def _handle(self) -> None:
+        self.server.stub.dispatch(self)
+
+    do_GET = do_POST = do_PUT = do_DELETE = _handle  # noqa: N815
+
+
+class _HTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    stub: "StubServer"
+
+
+class StubServer:
+    """Serves a stub noCTF API from a background thread.
+
+    Args:
+        host: Interface to bind
+        port: Port to bind (0 picks a free port)
+        faults: Faults injected into every response
+        token: Bearer token required on every request (any token if None)
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        faults: Optional[StubFaults] = None,
+        token: Optional[str] = None,
+    ) -> None:
+        self.faults = faults or StubFaults()
+        self.token = token
+        self.state = StubState()
+        self.requests: Counter[str] = Counter()
+        self._lock = threading.Lock()
+        self._rng = random.Random(self.faults.seed)
+        self._routes: list[Route] = [
+            (method, re.compile(f"^{pattern}$"), handler)
+            for method, pattern, handler in ROUTES
+        ]
+        self._httpd = _HTTPServer((host, port), _Handler)
+        self._httpd.stub = self
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StubServer":
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever,
+            name="noctf-stub-server",
+            daemon=True,
+        )
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        """Serve from the calling thread until interrupted."""
+
+        self._httpd.serve_forever()
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> "StubServer":
+        return self.start()
+
+    def __exit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        self.stop()
+
+    def seed(
+        self,
+        challenges: int = 0,
+        teams: int = 0,
+        divisions: int = 1,
+        solves_per_team: int = 3,
+        seed: int = 0,
+    ) -> None:
+        """Populate the stub with deterministic divisions, teams and solves."""
+
+        rng = random.Random(seed)
+        with self._lock:
+            state = self.state
+            start = datetime.now(timezone.utc) - timedelta(hours=24)
+            division_ids = []
+            for i in range(divisions):
+                division_id = state.allocate_id()
+                division_ids.append(division_id)
+                state.divisions.append(
+                    {
+                        "id": division_id,
+                        "name": f"Division {i + 1}",
+                        "slug": f"division-{i + 1}",
+                        "description": "",
+                        "is_visible": True,
+                        "is_joinable": True,
+                        "is_password": False,
+                        "created_at": format_api_datetime(start),
+                    },
+                )
+
+            challenge_ids = []
+            for i in range(challenges):
+                challenge = self._new_challenge(
+                    {
+                        "slug": f"seed-{i + 1}",
+                        "title": f"Seed challenge {i + 1}",
+                        "description": f"Seeded challenge number {i + 1}.",
+                        "tags": {"categories": rng.choice(["web", "pwn", "crypto"])},
+                        "hidden": False,
+                        "visible_at": None,
+                        "private_metadata": {
+                            "solve": {
+                                "source": "flag",
+                                "flag": [
+                                    {
+                                        "data": f"flag{{seed-{i + 1}}}",
+                                        "strategy": "case_sensitive",
+                                    },
+                                ],
+                            },
+                            "score": {
+                                "strategy": "core:static",
+                                "params": {"base": 100 * rng.randint(1, 5)},
+                                "bonus": [],
+                            },
+                            "files": [],
+                            "hints": [],
+                        },
+                    },
+                )
+                challenge_ids.append(challenge["id"])
+
+            for i in range(teams):
+                team_id = state.allocate_id()
+                state.teams[team_id] = {
+                    "id": team_id,
+                    "name": f"team-{i + 1}",
+                    "bio": "",
+                    "country": None,
+                    "tag_ids": [],
+                    "division_id": division_ids[i % len(division_ids)]
+                    if division_ids
+                    else 0,
+                    "flags": [],
+                    "created_at": format_api_datetime(start),
+                    "members": [],
+                }
+                user_id = state.allocate_id()
+                state.users[user_id] = {
+                    "id": user_id,
+                    "name": f"user-{i + 1}",
+                    "bio": "",
+                    "country": None,
+                    "team_id": team_id,
+                    "created_at": format_api_datetime(start),
+                }
+                state.teams[team_id]["members"].append(
+                    {"user_id": user_id, "role": "owner"},
+                )
+                solved = rng.sample(
+                    challenge_ids,
+                    min(len(challenge_ids), rng.randint(0, solves_per_team)),
+                )
+                for challenge_id in solved:
+                    state.solves.append(
+                        {
+                            "team_id": team_id,
+                            "challenge_id": challenge_id,
+                            "created_at": format_api_datetime(
+                                start + timedelta(seconds=rng.randint(0, 86400)),
+                            ),
+                        },
+                    )
+
+    def dispatch(self, request: BaseHTTPRequestHandler) -> None:
+        url = urlparse(request.path)
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        faults = self.faults
+        body = self._read_body(request)
+
+        with self._lock:
+            delay = faults.latency + faults.jitter * self._rng.random()
+            inject = faults.error_rate and self._rng.random() < faults.error_rate
+        if delay:
+            time.sleep(delay)
+
+        try:
+            handler, params, template = self._route(request.command, url.path)
+            with self._lock:
+                self.requests[f"{request.command} {template}"] += 1
+            if inject:
+                raise StubError(
+                    faults.error_status,
+                    HTTPStatus(faults.error_status).phrase.replace(" ", "") + "Error",
+                    "Injected failure",
+                )
+            if handler.__name__ in SIGNED_ROUTES:
+                self._check_signature(request, url.path, body, params["id"])
+            else:
+                self._check_auth(request)
+            status, payload = handler(
+                params,
+                query,
+                body,
+                request.headers.get("Content-Type", ""),
+            )
+        except StubError as e:
+            status = e.status
+            payload = json.dumps({"error": e.error, "message": e.message}).encode()
+            content_type = "application/json"
+        else:
+            content_type = "application/json"
+            if isinstance(payload, tuple):
+                content_type, payload = payload
+            elif not isinstance(payload, bytes):
+                payload = json.dumps(payload).encode()
+
+        etag = None
+        if status == 200 and content_type != "application/json":
+            # Files are served with an ETag so conditional requests can be tested
+            etag = f'"{hashlib.sha256(payload).hexdigest()[:32]}"'
+            if request.headers.get("If-None-Match") == etag:
+                status, payload = 304, b""
+
+        request.send_response(status)
+        request.send_header("Content-Type", content_type)
+        request.send_header("Content-Length", str(len(payload)))
+        if etag:
+            request.send_header("ETag", etag)
+        request.end_headers()
+        self._write_body(request, payload)
+
+    def _route(
+        self,
+        method: str,
+        path: str,
+    ) -> tuple[Callable[..., tuple[int, Any]], dict[str, str], str]:
+        path_found = False
+        for route_method, pattern, name in self._routes:
+            match = pattern.match(path)
+            if not match:
+                continue
+            path_found = True
+            if route_method == method:
+                template = re.sub(r"\(\?P<(\w+)>[^)]*\)", r":\1", pattern.pattern)
+                return getattr(self, name), match.groupdict(), template.strip("^$")
+        if path_found:
+            raise StubError(405, "MethodNotAllowedError", "Method not allowed")
+        raise StubError(404, "NotFoundError", f"Route {method}:{path} not found")
+
+    def _check_auth(self, request: BaseHTTPRequestHandler) -> None:
+        if self.token is None:
+            return
+        if request.headers.get("Authorization") != f"Bearer {self.token}":
+            raise StubError(401, "AuthenticationError", "Unauthorized")
+
+    def _check_signature(
+        self,
+        request: BaseHTTPRequestHandler,
+        path: str,
+        body: bytes,
+        challenge_id: str,
+    ) -> None:
+        with self._lock:
+            challenge = self._find_challenge(challenge_id)
+        key = challenge["private_metadata"].get("solve", {}).get("weight_update_key")
+        signature_input = request.headers.get("Signature-Input", "")
+        match = re.search(r';created=(\d+);keyid="([^"]*)"', signature_input)
+        if not key or not match:
+            raise StubError(401, "AuthenticationError", "Invalid signature")
+        created = int(match.group(1))
+        if abs(time.time() - created) > SIGNATURE_TOLERANCE:
+            raise StubError(401, "AuthenticationError", "Invalid signature")
+
+        digest = None
+        if request.command == "PUT":
+            digest = content_digest(body)
+            if request.headers.get("Content-Digest") != digest:
+                raise StubError(400, "BadRequestError", "InvalidDigest")
+        expected = sign_request(
+            request.command,
+            path,
+            request.headers.get("Host", ""),
+            key,
+            match.group(2),
+            digest=digest,
+            created=created,
+        )
+        if not all(
+            hmac.compare_digest(request.headers.get(name, ""), expected[name])
+            for name in ("Signature-Input", "Signature")
+        ):
+            raise StubError(401, "AuthenticationError", "Invalid signature")
+
+    def _throttle(self, size: int) -> None:
+        if self.faults.bandwidth:
+            time.sleep(size / self.faults.bandwidth)
+
+    def _read_body(self, request: BaseHTTPRequestHandler) -> bytes:
+        length = int(request.headers.get("Content-Length") or 0)
+        body = request.rfile.read(length) if length else b""
+        self._throttle(len(body))
+        return body
+
+    def _write_body(self, request: BaseHTTPRequestHandler, payload: bytes) -> None:
+        chunk_size = 65536
+        for i in range(0, len(payload), chunk_size):
+            chunk = payload[i : i + chunk_size]
+            self._throttle(len(chunk))
+            request.wfile.write(chunk)
+
+    @staticmethod
+    def _json(body: bytes) -> dict[str, Any]:
+        try:
+            return json.loads(body or b"{}")
+        except ValueError as e:
+            raise StubError(400, "BadRequestError", "Invalid JSON") from e
+
+    def _find_challenge(self, key: str) -> dict[str, Any]:
+        challenge = (
+            self.state.challenges.get(int(key))
+            if key.isdigit()
+            else next(
+                (c for c in self.state.challenges.values() if c["slug"] == key),
+                None,
+            )
+        )
+        if challenge is None:
+            raise StubError(404, "NotFoundError", "Challenge not found")
+        return challenge
+
+    def _new_challenge(self, data: dict[str, Any]) -> dict[str, Any]:
+        if any(c["slug"] == data["slug"] for c in self.state.challenges.values()):
+            raise StubError(409, "ConflictError", "The challenge slug already exists")
+        now = _now()
+        challenge = {
+            **data,
+            "id": self.state.allocate_id(),
+            "version": 1,
+            "created_at": now,
+            "updated_at": now,
+        }
+        self.state.challenges[challenge["id"]] = challenge
+        return challenge
+
+    def admin_list_challenges(self, _params, query, _body, _ctype):
+        hidden = query.get("hidden")
+        keys = (
+            "id",
+            "slug",
+            "title",
+            "tags",
+            "hidden",
+            "visible_at",
+            "created_at",
+            "updated_at",
+        )
+        with self._lock:
+            challenges = [
+                {k: c[k] for k in keys}
+                for c in self.state.challenges.values()
+                if hidden is None or c["hidden"] == (hidden == "true")
+            ]
+        return 200, {"data": challenges}
+
+    def admin_create_challenge(self, _params, _query, body, _ctype):
+        data = self._json(body)
+        with self._lock:
+            return 201, {"data": self._new_challenge(data)}
+
+    def admin_get_challenge(self, params, _query, _body, _ctype):
+        with self._lock:
+            return 200, {"data": self._find_challenge(params["id"])}
+
+    def admin_update_challenge(self, params, _query, body, _ctype):
+        data = self._json(body)
+        with self._lock:
+            challenge = self.state.challenges.get(int(params["id"]))
+            version = data.pop("version", None)
+            if challenge is None or (
+                version is not None and version != challenge["version"]
+            ):
+                raise StubError(404, "NotFoundError", "Challenge and version not found")
+            data.pop("slug", None)
+            challenge.update(data)
+            challenge["version"] += 1
+            challenge["updated_at"] = _now()
+            return 200, {"data": {"version": challenge["version"]}}
+
+    def admin_delete_challenge(self, params, _query, _body, _ctype):
+        with self._lock:
+            if self.state.challenges.pop(int(params["id"]), None) is None:
+                raise StubError(404, "NotFoundError", "Challenge not found")
+        return 200, {}
+
+    def admin_list_weights(self, params, query, _body, _ctype):
+        challenge_id = int(params["id"])
+        page = max(1, int(query.get("page", 1)))
+        page_size = min(MAX_WEIGHT_ITEMS, max(1, int(query.get("page_size", 60))))
+        keys = ("id", "team_id", "created_at", "updated_at")
+        with self._lock:
+            entries = [
+                {k: entry[k] for k in keys}
+                for (cid, _), entry in self.state.weights.items()
+                if cid == challenge_id
+            ]
+        return 200, {
+            "data": {
+                "entries": entries[(page - 1) * page_size : page * page_size],
+                "page_size": page_size,
+                "total": len(entries),
+            },
+        }
+
+    def admin_update_weights(self, params, _query, body, _ctype):
+        challenge_id = int(params["id"])
+        items = self._json(body).get("items") or []
+        if not items:
+            raise StubError(400, "BadRequestError", "items must not be empty")
+        if len(items) > MAX_WEIGHT_ITEMS:
+            raise StubError(
+                400,
+                "TooManyItems",
+                f"number of items in request should be less than {MAX_WEIGHT_ITEMS}",
+            )
+        now = _now()
+        keys = ("id", "team_id", "created_at", "updated_at")
+        entries = []
+        with self._lock:
+            for item in items:
+                key = (challenge_id, item["team_id"])
+                entry = self.state.weights.get(key)
+                if entry is None:
+                    entry = self.state.weights[key] = {
+                        "id": self.state.allocate_id(),
+                        "team_id": item["team_id"],
+                        "created_at": now,
+                    }
+                entry.update(weight=item["weight"], updated_at=now)
+                entries.append({k: entry[k] for k in keys})
+        return 200, {
+            "data": {"entries": entries, "page_size": 1000, "total": len(entries)},
+        }
+
+    def admin_upload_file(self, _params, query, body, ctype):
+        message = email.parser.BytesParser(policy=email.policy.HTTP).parsebytes(
+            f"Content-Type: {ctype}\r\n\r\n".encode() + body,
+        )
+        parts = message.iter_parts() if message.is_multipart() else []
+        part = next(
+            (
+                p
+                for p in parts
+                if p.get_param("name", header="content-disposition") == "file"
+            ),
+            None,
+        )
+        if part is None:
+            raise StubError(400, "NotMultipartError", "Expected a multipart file")
+        filename = part.get_filename() or "file"
+        content = part.get_payload(decode=True) or b""
+
+        mime = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+        if query.get("provider") == "external":
+            external = self._json(content)
+            metadata = {
+                "filename": filename,
+                "mime": mime,
+                "size": external["size"],
+                "hash": external["hash"],
+                "url": external["url"],
+                "provider": "external",
+            }
+        else:
+            metadata = {
+                "filename": filename,
+                "mime": mime,
+                "size": len(content),
+                "hash": f"sha256:{hashlib.sha256(content).hexdigest()}",
+                "provider": "local",
+            }
+
+        with self._lock:
+            file_id = self.state.allocate_id()
+            ref = f"{file_id}-{hashlib.sha256(content).hexdigest()[:16]}"
+            if metadata["provider"] == "local":
+                self.state.blobs[ref] = content
+                metadata["url"] = f"/files/local/{ref}"
+            self.state.files[file_id] = {"id": file_id, "ref": ref, **metadata}
+            return 201, {"data": self.state.files[file_id]}
+
+    def admin_get_file(self, params, _query, _body, _ctype):
+        with self._lock:
+            file = self.state.files.get(int(params["id"]))
+        if file is None:
+            raise StubError(404, "NotFoundError", "File not found")
+        return 200, {"data": file}
+
+    def get_local_file(self, params, _query, _body, _ctype):
+        with self._lock:
+            blob = self.state.blobs.get(params["ref"])
+        if blob is None:
+            raise StubError(404, "NotFoundError", "File not found")
+        return 200, ("application/octet-stream", blob)
+
+    def _visible_challenges(self) -> list[dict[str, Any]]:
+        return [c for c in self.state.challenges.values() if not c["hidden"]]
+
+    def list_challenges(self, _params, _query, _body, _ctype):
+        with self._lock:
+            solve_counts = Counter(s["challenge_id"] for s in self.state.solves)
+            challenges = [
+                {
+                    "id": c["id"],
+                    "slug": c["slug"],
+                    "title": c["title"],
+                    "tags": c["tags"],
+                    "hidden": c["hidden"],
+                    "value": c["private_metadata"]
+                    .get("score", {})
+                    .get("params", {})
+                    .get("base"),
+                    "solve_count": solve_counts[c["id"]],
+                    "solved_by_me": False,
+                }
+                for c in self._visible_challenges()
+            ]
+        return 200, {"data": {"challenges": challenges}}
+
+    def get_challenge(self, params, _query, _body, _ctype):
+        with self._lock:
+            challenge = self.state.challenges.get(int(params["id"]))
+            if challenge is None or challenge["hidden"]:
+                raise StubError(404, "NotFoundError", "Challenge not found")
+            metadata = challenge["private_metadata"]
+            files = []
+            for attachment in metadata.get("files", []):
+                file = self.state.files.get(attachment["id"])
+                if file is not None:
+                    files.append(
+                        {
+                            **{k: file[k] for k in ("filename", "size", "hash", "url")},
+                            "is_attachment": attachment["is_attachment"],
+                        },
+                    )
+            data = {
+                "id": challenge["id"],
+                "slug": challenge["slug"],
+                "title": challenge["title"],
+                "description": challenge["description"],
+                "hidden": challenge["hidden"],
+                "visible_at": challenge["visible_at"],
+                "updated_at": challenge["updated_at"],
+                "metadata": {
+                    "solve": {
+                        "input_type": metadata.get("solve", {})
+                        .get("manual", {})
+                        .get("input_type", "text"),
+                    },
+                    "files": files,
+                    "hints": metadata.get("hints", []),
+                },
+            }
+        return 200, {"data": data}
+
+    def get_challenge_solves(self, params, query, _body, _ctype):
+        challenge_id = int(params["id"])
+        division_id = int(query["division_id"]) if "division_id" in query else None
+        with self._lock:
+            solves = [
+                {"team_id": s["team_id"], "created_at": s["created_at"]}
+                for s in self.state.solves
+                if s["challenge_id"] == challenge_id
+                and (
+                    division_id is None
+                    or self.state.teams[s["team_id"]]["division_id"] == division_id
+                )
+            ]
+        solves.sort(key=lambda s: s["created_at"])
+        return 200, {"data": solves}
+
+    def solve_challenge(self, params, _query, body, _ctype):
+        submission = self._json(body).get("data", "")
+        with self._lock:
+            challenge = self.state.challenges.get(int(params["id"]))
+            if challenge is None or challenge["hidden"]:
+                raise StubError(404, "NotFoundError", "Challenge not found")
+            flags = challenge["private_metadata"].get("solve", {}).get("flag", [])
+        correct = any(_flag_matches(f, submission) for f in flags)
+        status = "correct" if correct else "incorrect"
+        return 200, {"data": {"status": status, "hidden": False}}
+
+    def list_divisions(self, _params, _query, _body, _ctype):
+        with self._lock:
+            return 200, {"data": list(self.state.divisions)}
+
+    def _scores(self, division_id: int) -> list[dict[str, Any]]:
+        challenges = self.state.challenges
+        entries: dict[int, dict[str, Any]] = {
+            team_id: {
+                "team_id": team_id,
+                "tag_ids": team["tag_ids"],
+                "score": 0,
+                "last_solve": team["created_at"],
+                "updated_at": team["created_at"],
+                "hidden": False,
+                "solves": [],
+                "awards": [],
+            }
+            for team_id, team in self.state.teams.items()
+            if team["division_id"] == division_id
+        }
+        for solve in self.state.solves:
+            entry = entries.get(solve["team_id"])
+            challenge = challenges.get(solve["challenge_id"])
+            if entry is None or challenge is None:
+                continue
+            value = (
+                challenge["private_metadata"].get("score", {}).get("params", {})
+            ).get("base", 0)
+            entry["score"] += value
+            entry["last_solve"] = max(entry["last_solve"], solve["created_at"])
+            entry["solves"].append(
+                {
+                    "challenge_id": solve["challenge_id"],
+                    "created_at": solve["created_at"],
+                    "value": value,
+                },
+            )
+
+        ranked = sorted(
+            entries.values(),
+            key=lambda e: (-e["score"], e["last_solve"], e["team_id"]),
+        )
+        for rank, entry in enumerate(ranked, 1):
+            entry["rank"] = rank
+        return ranked
+
+    def get_scoreboard(self, params, query, _body, _ctype):
+        page = max(1, int(query.get("page", 1)))
+        page_size = max(1, int(query.get("page_size", 50)))
+        with self._lock:
+            entries = self._scores(int(params["id"]))
+        page_entries = entries[(page - 1) * page_size : page * page_size]
+        if "graph_interval" in query:
+            for entry in page_entries:
+                entry["graph"] = [[], []]
+        return 200, {
+            "data": {
+                "entries": page_entries,
+                "page_size": page_size,
+                "total": len(entries),
+            },
+        }
+
+    def get_ctftime_scoreboard(self, params, _query, _body, _ctype):
+        with self._lock:
+            entries = self._scores(int(params["id"]))
+            names = {
+                team_id: team["name"] for team_id, team in self.state.teams.items()
+            }
+        standings = [
+            {"pos": pos, "team": names[entry["team_id"]], "score": entry["score"]}
+            for pos, entry in enumerate(entries, 1)
+        ]
+        return 200, {"standings": standings}
+
+    def get_team_scoreboard(self, params, _query, _body, _ctype):
+        team_id = int(params["id"])
+        with self._lock:
+            team = self.state.teams.get(team_id)
+            if team is None:
+                raise StubError(404, "NotFoundError", "Team not found")
+            entries = self._scores(team["division_id"])
+        entry = next(e for e in entries if e["team_id"] == team_id)
+        return 200, {"data": {**entry, "graph": [[], []]}}
+
+    def query_teams(self, _params, _query, body, _ctype):
+        data = self._json(body)
+        page = max(1, int(data.get("page", 1)))
+        page_size = max(1, int(data.get("page_size", 60)))
+        ids = set(data.get("ids") or [])
+        with self._lock:
+            teams = [
+                {k: v for k, v in team.items() if k not in ("flags", "join_code")}
+                for team in self.state.teams.values()
+                if data.get("division_id") in (None, team["division_id"])
+                and (not ids or team["id"] in ids)
+                and data.get("name", "").lower() in team["name"].lower()
+            ]
+        return 200, {
+            "data": {
+                "entries": teams[(page - 1) * page_size : page * page_size],
+                "page_size": page_size,
+                "total": len(teams),
+            },
+        }
+
+    def admin_query_teams(self, _params, _query, body, _ctype):
+        data = self._json(body)
+        page = max(1, int(data.get("page", 1)))
+        page_size = min(ADMIN_QUERY_PAGE_SIZE, max(1, int(data.get("page_size", 50))))
+        ids = set(data.get("ids") or [])
+        with self._lock:
+            teams = [
+                {k: v for k, v in team.items() if k != "join_code"}
+                for team in self.state.teams.values()
+                if data.get("division_id") in (None, team["division_id"])
+                and (not ids or team["id"] in ids)
+                and data.get("name", "").lower() in team["name"].lower()
+                and _split_yes_no(team.get("flags", []), data.get("flags"))
+            ]
+        return 200, {
+            "data": {
+                "entries": teams[(page - 1) * page_size : page * page_size],
+                "page_size": page_size,
+                "total": len(teams),
+            },
+        }
+
+    def admin_query_users(self, _params, _query, body, _ctype):
+        data = self._json(body)
+        page = max(1, int(data.get("page", 1)))
+        page_size = min(ADMIN_QUERY_PAGE_SIZE, max(1, int(data.get("page_size", 50))))
+        ids = set(data.get("ids") or [])
+        with self._lock:
+            users = [
+                {
+                    "flags": [],
+                    "roles": [],
+                    **user,
+                    "identities": [
+                        {
+                            "provider": "email",
+                            "provider_id": f"{user['name']}@example.com",
+                        },
+                    ],
+                }
+                for user in self.state.users.values()
+                if (not ids or user["id"] in ids)
+                and data.get("name", "").lower() in user["name"].lower()
+                and _split_yes_no(user.get("flags", []), data.get("flags"))
+                and _split_yes_no(user.get("roles", []), data.get("roles"))
+            ]
+        return 200, {
+            "data": {
+                "entries": users[(page - 1) * page_size : page * page_size],
+                "page_size": page_size,
+                "total": len(users),
+            },
+        }
+
+    def admin_update_team(self, params, _query, body, _ctype):
+        data = self._json(body)
+        fields = ("name", "bio", "country", "division_id", "tag_ids", "flags")
+        missing = [f for f in fields if f not in data]
+        if missing:
+            raise StubError(400, "BadRequestError", f"Missing {', '.join(missing)}")
+        with self._lock:
+            team = self.state.teams.get(int(params["id"]))
+            if team is None:
+                raise StubError(404, "NotFoundError", "Team not found")
+            team.update({f: data[f] for f in fields})
+        return 200, {"data": {}}
+
+    def admin_set_team_member(self, params, _query, body, _ctype):
+        data = self._json(body)
+        team_id = int(params["id"])
+        user_id = data.get("user_id")
+        role = data.get("role")
+        with self._lock:
+            team = self.state.teams.get(team_id)
+            user = self.state.users.get(user_id)
+            if team is None or user is None:
+                raise StubError(404, "NotFoundError", "Team or user not found")
+            members = team["members"]
+            if role == "none":
+                team["members"] = [m for m in members if m["user_id"] != user_id]
+                if user.get("team_id") == team_id:
+                    user["team_id"] = None
+                return 200, {}
+            if user.get("team_id") not in (None, team_id):
+                raise StubError(409, "ConflictError", "User is already in a team")
+            if role == "owner":
+                for member in members:
+                    if member["role"] == "owner":
+                        member["role"] = "member"
+            team["members"] = [m for m in members if m["user_id"] != user_id]
+            team["members"].append({"user_id": user_id, "role": role})
+            user["team_id"] = team_id
+        return 200, {}
+
+    def admin_revoke_sessions(self, params, _query, _body, _ctype):
+        user_id = int(params["id"])
+        with self._lock:
+            if user_id not in self.state.users:
+                raise StubError(404, "NotFoundError", "User not found")
+            revocations = self.state.revocations
+            revocations[user_id] = revocations.get(user_id, 0) + 1
+        return 200, {}
+
+    def admin_list_team_tags(self, _params, _query, _body, _ctype):
+        with self._lock:
+            return 200, {"data": {"tags": list(self.state.team_tags)}}
+
+    def admin_create_team_tag(self, _params, _query, body, _ctype):
+        data = self._json(body)
+        with self._lock:
+            tag = {
+                "id": self.state.allocate_id(),
+                "name": data.get("name", ""),
+                "description": data.get("description", ""),
+                "is_joinable": bool(data.get("is_joinable")),
+                "created_at": _now(),
+            }
+            self.state.team_tags.append(tag)
+        return 200, {"data": tag}
+
+    def admin_list_divisions(self, _params, _query, _body, _ctype):
+        with self._lock:
+            return 200, {"data": list(self.state.divisions)}
+
+    def query_users(self, _params, _query, body, _ctype):
+        data = self._json(body)
+        page = max(1, int(data.get("page", 1)))
+        page_size = max(1, int(data.get("page_size", 60)))
+        ids = set(data.get("ids") or [])
+        with self._lock:
+            users = [
+                dict(user)
+                for user in self.state.users.values()
+                if (not ids or user["id"] in ids)
+                and data.get("name", "").lower() in user["name"].lower()
+            ]
+        return 200, {
+            "data": {
+                "entries": users[(page - 1) * page_size : page * page_size],
+                "page_size": page_size,
+                "total": len(users),
+            },
+        }
+
+
+def _split_yes_no(values: list[str], wanted: Optional[list[str]]) -> bool:
+    """Whether values overlap the wanted ones and none of the ``!`` ones."""
+
+    if not wanted:
+        return True
+    no = {w[1:] for w in wanted if w.startswith("!")}
+    yes = {w for w in wanted if not w.startswith("!")}
+    return (not yes or bool(yes & set(values))) and not no & set(values)
+
+
+def _flag_matches(flag: dict[str, Any], submission: str) -> bool:
+    strategy = flag.get("strategy", "case_sensitive")
+    data = flag.get("data", "")
+    if strategy == "case_sensitive":
+        return submission == data
+    if strategy == "case_insensitive":
+        return submission.lower() == data.lower()
+    flags = re.IGNORECASE if strategy == "regex_insensitive" else 0
+    return re.fullmatch(data, submission, flags) is not None
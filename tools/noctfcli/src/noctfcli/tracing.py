@@ -0,0 +1,343 @@
+"""Request and local phase tracing.
+
+NoCTFClient calls each of its request hooks with a RequestEvent after every
+request, including the time spent waiting for a pooled connection,
+connecting, sending, waiting on the server and receiving. A Tracer is such a
+hook that also records spans of local work (YAML parsing, validation,
+hashing, preprocessing) and can write everything as a Chrome trace file for
+Perfetto or chrome://tracing.
+
+Code that wants to be traced calls the module-level span(), which is a no-op
+unless a tracer has been activated.
+"""
+
+import asyncio
+import json
+import re
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Optional
+
+if TYPE_CHECKING:
+    import httpx
+
+_NUMERIC_SEGMENT = re.compile(r"/\d+(?=/|$)")
+
+
+def path_template(path: str) -> str:
+    """Replace numeric path segments with ":id" to group requests by endpoint."""
+
+    return _NUMERIC_SEGMENT.sub("/:id", path.split("?", 1)[0])
+
+
+@dataclass
+class RequestEvent:
+    """Timing and size of a single API request.
+
+    Phases map a phase name (queue, connect, send, server, receive) to its
+    perf_counter start and duration in seconds. Phases that did not happen,
+    such as connect on a reused connection, are absent.
+    """
+
+    method: str
+    path: str
+    template: str
+    status: Optional[int]
+    bytes_sent: int
+    bytes_received: int
+    started: float
+    total: float
+    phases: dict[str, tuple[float, float]] = field(default_factory=dict)
+    error: Optional[str] = None
+
+    def phase(self, name: str) -> float:
+        return self.phases[name][1] if name in self.phases else 0.0
+
+
+RequestHook = Callable[[RequestEvent], None]
+
+
+class RequestTimer:
+    """httpx trace extension that timestamps the connection and HTTP phases."""
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.marks: dict[str, float] = {}
+
+    async def __call__(self, name: str, _info: dict[str, Any]) -> None:
+        # Names look like "connection.connect_tcp.started" or
+        # "http11.send_request_headers.complete"; the prefix is irrelevant.
+        event = name.split(".", 1)[1]
+        if event.endswith(".started"):
+            self.marks.setdefault(event, time.perf_counter())
+        else:
+            self.marks[event] = time.perf_counter()
+
+    def _phases(self) -> dict[str, tuple[float, float]]:
+        marks = self.marks
+        phases: dict[str, tuple[float, float]] = {}
+
+        def add(name: str, start: Optional[float], end: Optional[float]) -> None:
+            if start is not None and end is not None:
+                phases[name] = (start, end - start)
+
+        if marks:
+            add("queue", self.started, min(marks.values()))
+        add(
+            "connect",
+            marks.get("connect_tcp.started"),
+            marks.get("start_tls.complete", marks.get("connect_tcp.complete")),
+        )
+        sent = marks.get(
+            "send_request_body.complete",
+            marks.get("send_request_headers.complete"),
+        )
+        add("send", marks.get("send_request_headers.started"), sent)
+        add("server", sent, marks.get("receive_response_headers.complete"))
+        add(
+            "receive",
+            marks.get("receive_response_body.started"),
+            marks.get("receive_response_body.complete"),
+        )
+        return phases
+
+    def event(
+        self,
+        method: str,
+        path: str,
+        response: Optional["httpx.Response"] = None,
+        error: Optional[BaseException] = None,
+        template: Optional[str] = None,
+    ) -> RequestEvent:
+        """Build the event for a finished (or failed) request."""
+
+        bytes_sent = 0
+        if response is not None:
+            bytes_sent = int(response.request.headers.get("content-length", 0))
+        return RequestEvent(
+            method=method,
+            path=path,
+            template=template or path_template(path),
+            status=response.status_code if response else None,
+            bytes_sent=bytes_sent,
+            bytes_received=response.num_bytes_downloaded if response else 0,
+            started=self.started,
+            total=time.perf_counter() - self.started,
+            phases=self._phases(),
+            error=f"{type(error).__name__}: {error}" if error else None,
+        )
+
+
+@dataclass
+class Span:
+    name: str
+    started: float
+    duration: float
+    track: int
+    args: dict[str, Any]
+
+
+class Tracer:
+    """Collects request events and local spans.
+
+    Events are assigned to a track per asyncio task (or thread outside of an
+    event loop) so that concurrent work is shown side by side.
+    """
+
+    def __init__(self) -> None:
+        self.origin = time.perf_counter()
+        self.requests: list[tuple[int, RequestEvent]] = []
+        self.spans: list[Span] = []
+        self._tracks: dict[Any, int] = {}
+        self._track_names: dict[int, str] = {}
+        self._lock = threading.Lock()
+
+    def _track(self) -> int:
+        try:
+            task = asyncio.current_task()
+        except RuntimeError:
+            task = None
+        if task is not None:
+            key: Any = task
+            name = task.get_name()
+        else:
+            thread = threading.current_thread()
+            key = thread.ident
+            name = thread.name
+
+        with self._lock:
+            if key not in self._tracks:
+                track = len(self._tracks) + 1
+                self._tracks[key] = track
+                self._track_names[track] = name
+            return self._tracks[key]
+
+    def __call__(self, event: RequestEvent) -> None:
+        track = self._track()
+        with self._lock:
+            self.requests.append((track, event))
+
+    @contextmanager
+    def span(self, name: str, **args: Any) -> Iterator[None]:
+        """Record the duration of the enclosed block."""
+
+        track = self._track()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            with self._lock:
+                self.spans.append(Span(name, start, duration, track, args))
+
+    @contextmanager
+    def activate(self) -> Iterator["Tracer"]:
+        """Make this the tracer used by span() and new clients."""
+
+        token = _current_tracer.set(self)
+        try:
+            yield self
+        finally:
+            _current_tracer.reset(token)
+
+    def _us(self, t: float) -> float:
+        return round((t - self.origin) * 1e6, 3)
+
+    def chrome_trace(self) -> dict[str, Any]:
+        """Return the collected events in the Chrome trace event format."""
+
+        events: list[dict[str, Any]] = [
+            {"name": "process_name", "ph": "M", "pid": 1, "args": {"name": "noctfcli"}},
+        ]
+        events.extend(
+            {
+                "name": "thread_name",
+                "ph": "M",
+                "pid": 1,
+                "tid": track,
+                "args": {"name": name},
+            }
+            for track, name in self._track_names.items()
+        )
+
+        for span in self.spans:
+            events.append(
+                {
+                    "name": span.name,
+                    "cat": "local",
+                    "ph": "X",
+                    "pid": 1,
+                    "tid": span.track,
+                    "ts": self._us(span.started),
+                    "dur": round(span.duration * 1e6, 3),
+                    "args": span.args,
+                },
+            )
+
+        for track, request in self.requests:
+            events.append(
+                {
+                    "name": f"{request.method} {request.template}",
+                    "cat": "http",
+                    "ph": "X",
+                    "pid": 1,
+                    "tid": track,
+                    "ts": self._us(request.started),
+                    "dur": round(request.total * 1e6, 3),
+                    "args": {
+                        "path": request.path,
+                        "status": request.status,
+                        "bytes_sent": request.bytes_sent,
+                        "bytes_received": request.bytes_received,
+                        "error": request.error,
+                    },
+                },
+            )
+            events.extend(
+                {
+                    "name": phase,
+                    "cat": "http.phase",
+                    "ph": "X",
+                    "pid": 1,
+                    "tid": track,
+                    "ts": self._us(start),
+                    "dur": round(duration * 1e6, 3),
+                }
+                for phase, (start, duration) in request.phases.items()
+            )
+
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write(self, path: Path) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.chrome_trace(), f, separators=(",", ":"))
+
+    def request_summary(self) -> dict[str, dict[str, float]]:
+        """Aggregate requests by method and path template."""
+
+        summary: dict[str, dict[str, float]] = {}
+        for _, request in self.requests:
+            row = summary.setdefault(
+                f"{request.method} {request.template}",
+                {
+                    "count": 0,
+                    "errors": 0,
+                    "bytes_sent": 0,
+                    "bytes_received": 0,
+                    "queue": 0.0,
+                    "connect": 0.0,
+                    "server": 0.0,
+                    "total": 0.0,
+                    "max": 0.0,
+                },
+            )
+            row["count"] += 1
+            if request.error or (request.status or 0) >= 400:
+                row["errors"] += 1
+            row["bytes_sent"] += request.bytes_sent
+            row["bytes_received"] += request.bytes_received
+            for phase in ("queue", "connect", "server"):
+                row[phase] += request.phase(phase)
+            row["total"] += request.total
+            row["max"] = max(row["max"], request.total)
+        return summary
+
+    def span_summary(self) -> dict[str, dict[str, float]]:
+        """Aggregate local spans by name."""
+
+        summary: dict[str, dict[str, float]] = {}
+        for span in self.spans:
+            row = summary.setdefault(span.name, {"count": 0, "total": 0.0, "max": 0.0})
+            row["count"] += 1
+            row["total"] += span.duration
+            row["max"] = max(row["max"], span.duration)
+        return summary
+
+
+_current_tracer: ContextVar[Optional[Tracer]] = ContextVar(
+    "noctfcli_tracer",
+    default=None,
+)
+
+
+def current_tracer() -> Optional[Tracer]:
+    """Return the active tracer, if any."""
+
+    return _current_tracer.get()
+
+
+@contextmanager
+def span(name: str, **args: Any) -> Iterator[None]:
+    """Record a span on the active tracer, or do nothing if there is none."""
+
+    tracer = _current_tracer.get()
+    if tracer is None:
+        yield
+        return
+    with tracer.span(name, **args):
+        yield
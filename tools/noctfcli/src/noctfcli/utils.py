@@ -1,14 +1,36 @@
 import hashlib
 import os
+from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List
 from urllib.parse import unquote, urlparse
 
 import yaml
 from rich.console import Console
+from rich.markup import escape
+from rich.table import Table
 
 from noctfcli.exceptions import ConfigurationError
-from noctfcli.models import UploadUpdateResult, UploadUpdateResultEnum
+from noctfcli.models import (
+    ChallengeConfig,
+    FlagStrategy,
+    UploadUpdateResult,
+    UploadUpdateResultEnum,
+)
+from noctfcli.tracing import Tracer, current_tracer, span
+
+
+def cache_directory() -> Path:
+    """Directory for noctfcli's on-disk caches.
+
+    NOCTFCLI_CACHE_DIR if set, otherwise noctfcli under XDG_CACHE_HOME
+    (default ~/.cache).
+    """
+
+    if os.environ.get("NOCTFCLI_CACHE_DIR"):
+        return Path(os.environ["NOCTFCLI_CACHE_DIR"])
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "noctfcli"
 
 
 def find_challenge_files(directory_path: Path) -> List[Path]:
@@ -36,6 +58,46 @@ def load_yaml_file(file_path: str) -> Dict[str, Any]:
         raise ConfigurationError(f"Error loading YAML file {file_path}: {e}") from e
 
 
+class _ChallengeConfigDumper(yaml.SafeDumper):
+    """YAML dumper writing multi-line strings as literal blocks."""
+
+
+def _represent_str(dumper: yaml.SafeDumper, data: str) -> yaml.ScalarNode:
+    style = "|" if "\n" in data else None
+    return dumper.represent_scalar("tag:yaml.org,2002:str", data, style=style)
+
+
+_ChallengeConfigDumper.add_representer(str, _represent_str)
+
+
+def dump_challenge_config(config: ChallengeConfig) -> str:
+    """Serialize a challenge config to noctf.yaml contents.
+
+    Default values are omitted and case-sensitive flags are written as plain
+    strings, matching how challenge authors usually write the file.
+    """
+
+    data = config.model_dump(mode="json", exclude_defaults=True)
+    data = {"version": config.version, **data}
+    data["difficulty"] = config.difficulty or ""
+    data["flags"] = [
+        flag
+        if isinstance(flag, str)
+        else flag.data
+        if flag.strategy == FlagStrategy.CASE_SENSITIVE
+        else {"data": flag.data, "strategy": flag.strategy.value}
+        for flag in config.flags
+    ]
+    if not data["flags"]:
+        del data["flags"]
+    return yaml.dump(
+        data,
+        Dumper=_ChallengeConfigDumper,
+        sort_keys=False,
+        allow_unicode=True,
+    )
+
+
 def calculate_file_hash(file_path: Path) -> str:
     """Calculate SHA256 hash of a file.
 
@@ -47,12 +109,24 @@ def calculate_file_hash(file_path: Path) -> str:
     """
 
     sha256_hash = hashlib.sha256()
-    with open(file_path, "rb") as f:
+    with span("file.hash", path=str(file_path)), open(file_path, "rb") as f:
         for chunk in iter(lambda: f.read(4096), b""):
             sha256_hash.update(chunk)
     return sha256_hash.hexdigest()
 
 
+def format_api_datetime(value: datetime) -> str:
+    """Format a datetime the way the noCTF API serializes them."""
+
+    return value.isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+def parse_api_datetime(value: str) -> datetime:
+    """Parse a datetime serialized by the noCTF API."""
+
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
 def filename_from_url(url: str) -> str:
     """Derive a display filename from an external file URL.
 
@@ -75,12 +149,17 @@ def print_results_summary(console: Console, results: List[UploadUpdateResult]):
         in [
             UploadUpdateResultEnum.UPLOADED,
             UploadUpdateResultEnum.UPDATED,
+            UploadUpdateResultEnum.PULLED,
             UploadUpdateResultEnum.VALIDATED,
+            UploadUpdateResultEnum.RELEASED,
         ]
     )
     skipped_count = sum(
         1 for r in results if r.status == UploadUpdateResultEnum.SKIPPED
     )
+    rolled_back_count = sum(
+        1 for r in results if r.status == UploadUpdateResultEnum.ROLLED_BACK
+    )
     failed_count = sum(1 for r in results if r.status == UploadUpdateResultEnum.FAILED)
 
     console.print()
@@ -90,12 +169,78 @@ def print_results_summary(console: Console, results: List[UploadUpdateResult]):
     if skipped_count > 0:
         console.print(f"  [yellow]Skipped: {skipped_count}[/yellow]")
 
+    if rolled_back_count > 0:
+        console.print(f"  [yellow]Rolled back: {rolled_back_count}[/yellow]")
+
     if failed_count > 0:
         console.print(f"  [red]Failed: {failed_count}[/red]")
         console.print("\n[red]Failed challenges:[/red]")
         for result in results:
             if result.status == UploadUpdateResultEnum.FAILED:
                 error = result.error or "unknown error"
-                console.print(f"  - {result.challenge}: {error}")
+                console.print(f"  - {result.challenge}: {escape(error)}")
 
     console.print()
+
+    tracer = current_tracer()
+    if tracer is not None:
+        print_trace_summary(console, tracer)
+
+
+def format_bytes(n: float) -> str:
+    for unit in ("B", "KiB", "MiB"):
+        if n < 1024:
+            return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024
+    return f"{n:.1f} GiB"
+
+
+def print_trace_summary(console: Console, tracer: Tracer) -> None:
+    """Print per-endpoint request timings and local phase timings."""
+
+    requests = tracer.request_summary()
+    if requests:
+        table = Table(title="Requests (mean ms)")
+        table.add_column("Endpoint", style="bold")
+        table.add_column("Count", justify="right")
+        table.add_column("Errors", justify="right", style="red")
+        table.add_column("Sent", justify="right")
+        table.add_column("Received", justify="right")
+        table.add_column("Queue", justify="right")
+        table.add_column("Connect", justify="right")
+        table.add_column("Server", justify="right")
+        table.add_column("Total", justify="right", style="green")
+        table.add_column("Max", justify="right", style="dim")
+        for name, row in sorted(requests.items(), key=lambda r: -r[1]["total"]):
+            count = row["count"]
+            table.add_row(
+                name,
+                str(count),
+                str(row["errors"]),
+                format_bytes(row["bytes_sent"]),
+                format_bytes(row["bytes_received"]),
+                *(
+                    f"{row[phase] / count * 1000:.1f}"
+                    for phase in ("queue", "connect", "server", "total")
+                ),
+                f"{row['max'] * 1000:.1f}",
+            )
+        console.print(table)
+
+    spans = tracer.span_summary()
+    if spans:
+        table = Table(title="Local phases (ms)")
+        table.add_column("Phase", style="bold")
+        table.add_column("Count", justify="right")
+        table.add_column("Total", justify="right", style="green")
+        table.add_column("Mean", justify="right")
+        table.add_column("Max", justify="right", style="dim")
+        for name, row in sorted(spans.items(), key=lambda r: -r[1]["total"]):
+            table.add_row(
+                name,
+                str(row["count"]),
+                f"{row['total'] * 1000:.1f}",
+                f"{row['total'] / row['count'] * 1000:.1f}",
+                f"{row['max'] * 1000:.1f}",
+            )
+        console.print(table)
@@ -2,28 +2,40 @@ import json
 from pathlib import Path
 from typing import Any, Optional
 
-import jsonschema
 import yaml
 from pydantic import ValidationError as PydanticValidationError
 
 from .exceptions import ValidationError
 from .models import ChallengeConfig, ExternalFileConfig
+from .regexcheck import (
+    DEFAULT_BUDGET,
+    REGEX_STRATEGIES,
+    RegexFlagReport,
+    check_regex_flag,
+)
+from .tracing import span
 
 
 class ChallengeValidator:
     """Validates challenge configurations."""
 
-    def __init__(self, schema_path: Optional[Path] = None) -> None:
+    def __init__(
+        self,
+        schema_path: Optional[Path] = None,
+        regex_budget: float = DEFAULT_BUDGET,
+    ) -> None:
         """Initialize validator.
 
         Args:
             schema_path: Path to JSON schema file
+            regex_budget: Seconds a single match of a regex flag may take
         """
 
         if schema_path is None:
             schema_path = Path(__file__).parent / "schema" / "noctf.yaml.schema.json"
 
         self.schema_path = schema_path
+        self.regex_budget = regex_budget
         self._schema: Optional[dict[str, Any]] = None
 
     @property
@@ -63,7 +75,7 @@ class ChallengeValidator:
             raise ValidationError(msg)
 
         try:
-            with open(yaml_path) as f:
+            with span("yaml.parse", path=str(yaml_path)), open(yaml_path) as f:
                 data = yaml.safe_load(f)
         except Exception as e:
             msg = f"Invalid YAML file: {e}"
@@ -89,8 +101,11 @@ class ChallengeValidator:
             ValidationError: If validation fails
         """
 
+        import jsonschema
+
         try:
-            jsonschema.validate(data, self.schema)
+            with span("schema.validate"):
+                jsonschema.validate(data, self.schema)
         except jsonschema.ValidationError as e:
             source_info = f" in {source}" if source else ""
             raise ValidationError(
@@ -100,7 +115,8 @@ class ChallengeValidator:
             ) from e
 
         try:
-            return ChallengeConfig(**data)
+            with span("model.validate"):
+                return ChallengeConfig(**data)
         except PydanticValidationError as e:
             source_info = f" in {source}" if source else ""
             errors = []
@@ -138,6 +154,22 @@ class ChallengeValidator:
 
         return missing_files
 
+    def check_regex_flags(self, config: ChallengeConfig) -> list[RegexFlagReport]:
+        """Compile and time each regex flag against adversarial inputs.
+
+        Args:
+            config: Challenge configuration
+
+        Returns:
+            A report per regex flag; a flag failed if its report is not ok
+        """
+
+        return [
+            check_regex_flag(flag.data, flag.strategy, self.regex_budget)
+            for flag in config.flags
+            if flag.strategy in REGEX_STRATEGIES
+        ]
+
     def validate_challenge_complete(self, yaml_path: Path) -> ChallengeConfig:
         """Perform complete validation of a challenge.
 
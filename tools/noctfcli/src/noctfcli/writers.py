@@ -0,0 +1,177 @@
+import csv
+import json
+from abc import ABC, abstractmethod
+from collections.abc import Iterator
+from contextlib import contextmanager
+from enum import Enum
+from pathlib import Path
+from typing import Any, BinaryIO, TextIO
+
+from .exceptions import ConfigurationError
+from .fastjson import dumps
+
+
+class RecordFormat(str, Enum):
+    """Output formats for streamed record exports."""
+
+    NDJSON = "ndjson"
+    CSV = "csv"
+    PARQUET = "parquet"
+
+
+class RecordWriter(ABC):
+    """Writes a stream of flat records to a file without holding them in memory.
+
+    Fields map column names to Python types; formats with a schema use the
+    types, while line-based formats only use the column order.
+    """
+
+    def __init__(self, path: Path, fields: dict[str, type]) -> None:
+        self.path = path
+        self.fields = fields
+        self.count = 0
+
+    def __enter__(self) -> "RecordWriter":
+        return self
+
+    def __exit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        self.close()
+
+    def write(self, record: dict[str, Any]) -> None:
+        self._write(record)
+        self.count += 1
+
+    @abstractmethod
+    def _write(self, record: dict[str, Any]) -> None:
+        pass
+
+    @abstractmethod
+    def close(self) -> None:
+        pass
+
+
+class NDJSONWriter(RecordWriter):
+    """Writes records as JSON lines to a file opened in binary mode."""
+
+    def __init__(self, path: Path, fields: dict[str, type], file: BinaryIO) -> None:
+        super().__init__(path, fields)
+        self._file = file
+
+    def _write(self, record: dict[str, Any]) -> None:
+        self._file.write(dumps(record) + b"\n")
+
+    def close(self) -> None:
+        self._file.flush()
+
+
+class CSVWriter(RecordWriter):
+    """Writes records as CSV rows to a file opened in text mode with newline=""."""
+
+    def __init__(self, path: Path, fields: dict[str, type], file: TextIO) -> None:
+        super().__init__(path, fields)
+        self._file = file
+        self._writer = csv.DictWriter(
+            self._file,
+            fieldnames=list(fields),
+            extrasaction="ignore",
+        )
+        self._writer.writeheader()
+
+    def _write(self, record: dict[str, Any]) -> None:
+        self._writer.writerow(
+            {
+                k: json.dumps(v) if isinstance(v, (dict, list)) else v
+                for k, v in record.items()
+            },
+        )
+
+    def close(self) -> None:
+        self._file.flush()
+
+
+class ParquetWriter(RecordWriter):
+    """Buffers records into column batches and flushes each as a row group."""
+
+    def __init__(
+        self,
+        path: Path,
+        fields: dict[str, type],
+        row_group_size: int = 65536,
+    ) -> None:
+        super().__init__(path, fields)
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            msg = "Parquet output requires pyarrow (pip install 'noctfcli[parquet]')"
+            raise ConfigurationError(msg) from e
+
+        types = {
+            int: pa.int64(),
+            float: pa.float64(),
+            bool: pa.bool_(),
+            str: pa.string(),
+        }
+        self._pa = pa
+        self._schema = pa.schema(
+            [(name, types.get(t, pa.string())) for name, t in fields.items()],
+        )
+        self._writer = pq.ParquetWriter(path, self._schema)
+        self._row_group_size = row_group_size
+        self._columns: dict[str, list[Any]] = {name: [] for name in fields}
+        self._pending = 0
+
+    def _write(self, record: dict[str, Any]) -> None:
+        for name, column in self._columns.items():
+            column.append(record.get(name))
+        self._pending += 1
+        if self._pending >= self._row_group_size:
+            self._flush()
+
+    def _flush(self) -> None:
+        if not self._pending:
+            return
+        arrays = [
+            self._pa.array(self._columns[field.name], type=field.type)
+            for field in self._schema
+        ]
+        self._writer.write_batch(
+            self._pa.record_batch(arrays, schema=self._schema),
+        )
+        for column in self._columns.values():
+            column.clear()
+        self._pending = 0
+
+    def close(self) -> None:
+        self._flush()
+        self._writer.close()
+
+
+@contextmanager
+def open_record_writer(
+    fmt: RecordFormat,
+    path: Path,
+    fields: dict[str, type],
+) -> Iterator[RecordWriter]:
+    """Open a record writer for the given output format.
+
+    The writer and its file are closed when the context exits.
+
+    Args:
+        fmt: Output format
+        path: Output file path
+        fields: Column names mapped to their Python types
+
+    Yields:
+        Record writer
+    """
+
+    if fmt == RecordFormat.NDJSON:
+        with open(path, "wb") as file:
+            yield NDJSONWriter(path, fields, file)
+    elif fmt == RecordFormat.CSV:
+        with open(path, "w", encoding="utf-8", newline="") as file:
+            yield CSVWriter(path, fields, file)
+    else:
+        with ParquetWriter(path, fields) as writer:
+            yield writer
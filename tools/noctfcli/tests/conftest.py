@@ -0,0 +1,73 @@
+import httpx
+import pytest
+import yaml
+from click.testing import CliRunner
+
+from noctfcli.cli import build_cli
+from noctfcli.stub_server import StubServer
+
+
+@pytest.fixture
+def serve(monkeypatch):
+    """Route every httpx.AsyncClient to a handler instead of the network."""
+
+    client_class = httpx.AsyncClient
+
+    def install(handler):
+        monkeypatch.setattr(
+            httpx,
+            "AsyncClient",
+            lambda **kwargs: client_class(
+                transport=httpx.MockTransport(handler),
+                **kwargs,
+            ),
+        )
+
+    return install
+
+
+@pytest.fixture
+def run_cli(tmp_path, monkeypatch):
+    """Run noctfcli against an API URL, returning the click Result."""
+
+    monkeypatch.setenv("NOCTF_TOKEN", "token")
+
+    def run(url, *args):
+        config = tmp_path / "config.yaml"
+        config.write_text(f"api_url: {url}\n")
+        return CliRunner().invoke(build_cli(), ["--config", str(config), *args])
+
+    return run
+
+
+@pytest.fixture
+def stub():
+    """A running StubServer, stopped after the test."""
+
+    with StubServer() as server:
+        yield server
+
+
+@pytest.fixture
+def write_challenge(tmp_path):
+    """Write a noctf.yaml under tmp_path/challenges, returning its directory."""
+
+    root = tmp_path / "challenges"
+
+    def write(slug, **fields):
+        directory = root / slug
+        directory.mkdir(parents=True, exist_ok=True)
+        config = {
+            "slug": slug,
+            "title": slug.title(),
+            "categories": ["misc"],
+            "difficulty": "easy",
+            "description": f"The {slug} challenge",
+            "flags": [f"flag{{{slug}}}"],
+            "scoring": {"strategy": "core:static", "params": {"base": 100}},
+            **fields,
+        }
+        (directory / "noctf.yaml").write_text(yaml.safe_dump(config))
+        return directory
+
+    return write
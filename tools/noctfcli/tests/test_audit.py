@@ -0,0 +1,165 @@
+import asyncio
+import json
+from datetime import datetime, timedelta, timezone
+
+import httpx
+import pytest
+
+from noctfcli.utils import format_api_datetime, parse_api_datetime
+
+API_URL = "http://noctf.test"
+START = datetime(2025, 7, 19, 10, 0, tzinfo=timezone.utc)
+
+
+class AuditLog:
+    """Answers /admin/audit_log/query like the server, from a list of entries."""
+
+    def __init__(self):
+        self.entries = []
+        self.queries = []
+
+    def add(self, offset_ms, operation):
+        created_at = START + timedelta(milliseconds=offset_ms)
+        self.entries.append(
+            {
+                "created_at": format_api_datetime(created_at),
+                "actor": "user:1",
+                "operation": operation,
+                "entities": [],
+                "data": "",
+            },
+        )
+
+    def __call__(self, request):
+        assert request.url.path == "/admin/audit_log/query"
+        query = json.loads(request.content)
+        self.queries.append(query)
+        since, until = query.get("created_at", [None, None])
+        matching = [
+            e
+            for e in self.entries
+            if (since is None or e["created_at"] >= since)
+            and (until is None or e["created_at"] <= until)
+        ]
+        matching.sort(key=lambda e: e["created_at"], reverse=True)
+        return httpx.Response(
+            200,
+            json={"data": {"entries": matching[: query["page_size"]]}},
+        )
+
+
+class StopTailError(Exception):
+    pass
+
+
+@pytest.fixture
+def audit_log(serve):
+    log = AuditLog()
+    serve(log)
+    return log
+
+
+def _operations(output):
+    return [
+        json.loads(line)["operation"]
+        for line in output.splitlines()
+        if line.startswith("{")
+    ]
+
+
+def test_tail_prints_entries_sharing_the_high_water_mark_once(
+    audit_log,
+    run_cli,
+    monkeypatch,
+):
+    audit_log.add(0, "old")
+    audit_log.add(1000, "latest")
+    arrivals = [
+        # Same millisecond as the last entry printed, then a later one
+        [(1000, "same-instant"), (2000, "later")],
+        [],
+        [(2000, "same-as-later"), (2500, "last")],
+        [],
+    ]
+
+    async def sleep(_):
+        if not arrivals:
+            raise StopTailError
+        for offset, operation in arrivals.pop(0):
+            audit_log.add(offset, operation)
+
+    monkeypatch.setattr(asyncio, "sleep", sleep)
+    result = run_cli(API_URL, "audit", "tail", "--json", "-n", "2")
+
+    assert "Unexpected error" in result.output
+    assert _operations(result.output) == [
+        "old",
+        "latest",
+        "same-instant",
+        "later",
+        "same-as-later",
+        "last",
+    ]
+    # Polls start from the newest entry printed so far
+    assert audit_log.queries[-1]["created_at"][0] == format_api_datetime(
+        START + timedelta(milliseconds=2500),
+    )
+
+
+@pytest.mark.parametrize("concurrency", [1, 3, 4])
+def test_export_writes_each_entry_once_across_windows(
+    audit_log,
+    run_cli,
+    tmp_path,
+    concurrency,
+):
+    # Entries on and around every window bound, several per millisecond
+    for offset in range(0, 12001, 500):
+        for operation in ("a", "b"):
+            audit_log.add(offset, f"{operation}{offset}")
+    output = tmp_path / "audit.ndjson"
+
+    result = run_cli(
+        API_URL,
+        "audit",
+        "export",
+        str(output),
+        "--since",
+        "2025-07-19 10:00:00",
+        "--until",
+        "2025-07-19 10:00:12",
+        "--concurrency",
+        str(concurrency),
+        "--page-size",
+        "5",
+    )
+
+    assert result.exit_code == 0, result.output
+    rows = [json.loads(line) for line in output.read_text().splitlines()]
+    assert sorted(row["operation"] for row in rows) == sorted(
+        e["operation"] for e in audit_log.entries
+    )
+    times = [parse_api_datetime(row["created_at"]) for row in rows]
+    assert times == sorted(times, reverse=True)
+
+
+def test_export_excludes_entries_outside_the_range(audit_log, run_cli, tmp_path):
+    for offset in (-1, 0, 6000, 12000, 12001):
+        audit_log.add(offset, str(offset))
+    output = tmp_path / "audit.ndjson"
+
+    result = run_cli(
+        API_URL,
+        "audit",
+        "export",
+        str(output),
+        "--since",
+        "2025-07-19 10:00:00",
+        "--until",
+        "2025-07-19 10:00:12",
+        "--concurrency",
+        "2",
+    )
+
+    assert result.exit_code == 0, result.output
+    assert _operations(output.read_text()) == ["12000", "6000", "0"]
@@ -0,0 +1,70 @@
+import asyncio
+import hashlib
+
+import httpx
+import pytest
+from pydantic import ValidationError
+
+from noctfcli.exceptions import APIError, NoCTFError
+from noctfcli.external import RemoteFileHasher
+from noctfcli.models import ExternalFileConfig
+
+URL = "https://files.example.com/handout.zip"
+BODY = b"handout contents"
+
+
+def _hash(hasher):
+    async def main():
+        async with hasher:
+            return await hasher.digest(URL)
+
+    return asyncio.run(main())
+
+
+def test_hashes_streamed_body(tmp_path, serve):
+    serve(lambda _: httpx.Response(200, content=BODY))
+    digest = _hash(RemoteFileHasher(tmp_path / "cache.json", chunk_size=4))
+    assert digest.hash == f"sha256:{hashlib.sha256(BODY).hexdigest()}"
+    assert digest.size == len(BODY)
+    assert not digest.cached
+
+
+def test_reuses_cached_result_on_304(tmp_path, serve):
+    cache = tmp_path / "cache.json"
+    serve(lambda _: httpx.Response(200, content=BODY, headers={"ETag": '"v1"'}))
+    first = _hash(RemoteFileHasher(cache))
+
+    def not_modified(request):
+        assert request.headers["If-None-Match"] == '"v1"'
+        return httpx.Response(304)
+
+    serve(not_modified)
+    second = _hash(RemoteFileHasher(cache))
+    assert second.cached
+    assert (second.hash, second.size) == (first.hash, first.size)
+
+
+def test_304_without_cached_result_fails(tmp_path, serve):
+    serve(lambda _: httpx.Response(304))
+    with pytest.raises(APIError, match="HTTP 304"):
+        _hash(RemoteFileHasher(tmp_path / "cache.json"))
+
+
+def test_http_error(tmp_path, serve):
+    serve(lambda _: httpx.Response(404))
+    with pytest.raises(APIError, match="HTTP 404"):
+        _hash(RemoteFileHasher(tmp_path / "cache.json"))
+
+
+def test_requires_context_manager():
+    with pytest.raises(NoCTFError, match="context manager"):
+        asyncio.run(RemoteFileHasher().digest(URL))
+
+
+@pytest.mark.parametrize(
+    "declared",
+    [{"hash": "sha256:00"}, {"size": 3}],
+)
+def test_hash_and_size_are_declared_together(declared):
+    with pytest.raises(ValidationError, match="both hash and size"):
+        ExternalFileConfig(url=URL, **declared)
@@ -0,0 +1,98 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from noctfcli.client import MAX_QUERY_IDS, NoCTFClient
+
+API_URL = "http://noctf.test"
+TEAMS_QUERY = "POST /admin/teams/query"
+
+
+def _collect(url, **kwargs):
+    async def main():
+        async with NoCTFClient(url) as client:
+            return [team.id async for team in client.iter_teams(**kwargs)]
+
+    return asyncio.run(main())
+
+
+@pytest.mark.parametrize(
+    ("teams", "page_size", "requests"),
+    [(0, 100, 1), (99, 100, 1), (200, 100, 2), (250, 100, 3), (250, 1000, 3)],
+)
+def test_iter_teams_fetches_each_page_once(stub, teams, page_size, requests):
+    stub.seed(teams=teams)
+
+    ids = _collect(stub.url, page_size=page_size)
+
+    assert ids == sorted(stub.state.teams)
+    assert stub.requests[TEAMS_QUERY] == requests
+
+
+def test_iter_teams_splits_ids_into_chunks(stub):
+    stub.seed(teams=150)
+    wanted = sorted(stub.state.teams)[: MAX_QUERY_IDS * 2 + 1]
+
+    assert _collect(stub.url, ids=wanted) == wanted
+    assert stub.requests[TEAMS_QUERY] == 3
+
+
+class PagedTeams:
+    """Serves teams in pages, optionally without a total."""
+
+    def __init__(self, teams, page_size=100, *, total=True):
+        self.teams = teams
+        self.page_size = page_size
+        self.total = total
+        self.pages = []
+
+    def __call__(self, request):
+        page = json.loads(request.content)["page"]
+        self.pages.append(page)
+        start = (page - 1) * self.page_size
+        data = {
+            "entries": [
+                {
+                    "id": team_id,
+                    "name": f"team {team_id}",
+                    "division_id": 1,
+                    "created_at": "2025-07-19T10:00:00.000Z",
+                }
+                for team_id in range(start, min(start + self.page_size, self.teams))
+            ],
+            "page_size": self.page_size,
+        }
+        if self.total:
+            data["total"] = self.teams
+        return httpx.Response(200, json={"data": data})
+
+
+def test_pages_are_prefetched_and_cancelled_when_iteration_stops(serve):
+    teams = PagedTeams(1000)
+    serve(teams)
+
+    async def main():
+        async with NoCTFClient(API_URL) as client:
+            iterator = client.iter_teams(prefetch=4)
+            first = await iterator.__anext__()
+            await asyncio.sleep(0.01)
+            requested = sorted(teams.pages)
+            await iterator.aclose()
+            await asyncio.sleep(0.01)
+            return first.id, requested
+
+    first, requested = asyncio.run(main())
+
+    assert first == 0
+    assert requested == [1, 2, 3, 4, 5]
+    assert sorted(teams.pages) == requested
+
+
+def test_without_total_stops_at_a_short_page(serve):
+    teams = PagedTeams(250, total=False)
+    serve(teams)
+
+    assert _collect(API_URL, prefetch=1) == list(range(250))
+    assert teams.pages == [1, 2, 3]
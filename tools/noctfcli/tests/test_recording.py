@@ -0,0 +1,88 @@
+import asyncio
+import itertools
+
+import pytest
+
+from noctfcli import recording as recording_module
+from noctfcli.exceptions import NoCTFError
+from noctfcli.recording import ScoreboardRecorder, ScoreboardRecording
+
+
+class FakeClient:
+    """Serves a scripted sequence of scoreboards for each division."""
+
+    def __init__(self, boards):
+        self.boards = {d: iter(pages) for d, pages in boards.items()}
+
+    async def get_scoreboard(self, division_id, **_):
+        return next(self.boards[division_id])
+
+
+def _entry(team_id, score, rank):
+    return {"team_id": team_id, "score": score, "rank": rank, "last_solve": None}
+
+
+@pytest.fixture(autouse=True)
+def clock(monkeypatch):
+    ticks = itertools.count(1000)
+    monkeypatch.setattr(recording_module.time, "time", lambda: float(next(ticks)))
+
+
+def _record(path, boards, polls):
+    recorder = ScoreboardRecorder(
+        FakeClient(boards),
+        path,
+        list(boards),
+        interval=0.05,
+    )
+    asyncio.run(recorder.run(duration=0.05 * polls - 0.025))
+    return recorder
+
+
+def test_replay_reconstructs_each_instant(tmp_path):
+    path = tmp_path / "board.ndjson"
+    boards = {
+        1: [
+            [_entry(1, 100, 1)],
+            [_entry(1, 100, 1), _entry(2, 50, 2)],
+            [_entry(2, 150, 1)],
+        ],
+    }
+    recorder = _record(path, boards, polls=3)
+    assert recorder.frames == 4
+
+    recording = ScoreboardRecording(path)
+    assert recording.timestamps(1) == (1000.0, 1002.0)
+    assert recording.at(1, 999) == {}
+    assert recording.at(1, 1000) == {1: (100, 1, None)}
+    assert recording.at(1, 1001.5) == {1: (100, 1, None), 2: (50, 2, None)}
+    assert recording.at(1, 1002) == {2: (150, 1, None)}
+
+
+def test_append_adds_divisions(tmp_path):
+    path = tmp_path / "board.ndjson"
+    _record(path, {1: [[_entry(1, 100, 1)]]}, polls=1)
+    _record(path, {1: [[_entry(1, 200, 1)]], 2: [[_entry(5, 10, 1)]]}, polls=1)
+
+    recording = ScoreboardRecording(path)
+    assert recording.division_ids == [1, 2]
+    assert recording.at(1, 1000) == {1: (100, 1, None)}
+    assert recording.at(1, 1001) == {1: (200, 1, None)}
+    assert recording.at(2, 1001) == {5: (10, 1, None)}
+    with pytest.raises(NoCTFError, match="Division 3 is not in the recording"):
+        recording.at(3, 1001)
+
+
+def test_torn_last_line_is_ignored_and_truncated(tmp_path):
+    path = tmp_path / "board.ndjson"
+    _record(path, {1: [[_entry(1, 100, 1)]]}, polls=1)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"t": 1001.0, "d": 1, "c": [[1, 2')
+
+    recording = ScoreboardRecording(path)
+    assert recording.timestamps(1) == (1000.0, 1000.0)
+    assert recording.at(1, 2000) == {1: (100, 1, None)}
+
+    _record(path, {1: [[_entry(1, 300, 1)]]}, polls=1)
+    assert all(line.endswith("}") for line in path.read_text().splitlines())
+    assert ScoreboardRecording(path).at(1, 2000) == {1: (300, 1, None)}
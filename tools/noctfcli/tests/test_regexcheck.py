@@ -0,0 +1,63 @@
+import pytest
+
+from noctfcli.commands.validate import print_regex_reports
+from noctfcli.models import FlagStrategy
+from noctfcli.regexcheck import check_regex_flag, to_python_pattern
+
+
+@pytest.mark.parametrize(
+    ("pattern", "translated"),
+    [
+        (r"^flag\{(?<inner>[a-z]+)\}$", r"^flag\{(?P<inner>[a-z]+)\}$"),
+        (r"(?<a>x)\k<a>", r"(?P<a>x)(?P=a)"),
+        (r"(?<=a)(?<!b)c", r"(?<=a)(?<!b)c"),
+        (r"[(?<x>]\(?<y>", r"[(?<x>]\(?<y>"),
+    ],
+)
+def test_to_python_pattern(pattern, translated):
+    assert to_python_pattern(pattern) == translated
+
+
+def test_javascript_named_group_is_checked():
+    report = check_regex_flag(
+        r"^flag\{(?<inner>[a-z]+)\}$",
+        FlagStrategy.REGEX_SENSITIVE,
+    )
+    assert report.ok
+    assert report.inputs > 0
+    assert report.warnings == []
+
+
+def test_pattern_python_cannot_compile_is_not_checked():
+    report = check_regex_flag("[^]", FlagStrategy.REGEX_SENSITIVE)
+    assert report.ok
+    assert report.inputs == 0
+    assert report.warnings[0].startswith("not checked")
+
+
+def test_catastrophic_pattern_times_out():
+    report = check_regex_flag(r"^(a+)+$", FlagStrategy.REGEX_SENSITIVE, budget=0.001)
+    assert not report.ok
+    assert report.timed_out
+    assert report.worst_seconds == 1.0
+    assert report.worst_input is not None
+    assert report.worst_input.startswith("aaaa")
+    assert any("nested quantifier" in warning for warning in report.warnings)
+
+
+def test_cheap_pattern_is_within_budget():
+    report = check_regex_flag(r"^flag\{\w+\}$", FlagStrategy.REGEX_INSENSITIVE)
+    assert report.ok
+    assert not report.timed_out
+
+
+def test_reports_print_patterns_verbatim(capsys):
+    reports = [
+        check_regex_flag(r"^[a-z]+$", FlagStrategy.REGEX_SENSITIVE),
+        check_regex_flag(r"^(a+)+$", FlagStrategy.REGEX_SENSITIVE, budget=0.001),
+    ]
+    problems = print_regex_reports(reports)
+    output = capsys.readouterr().out
+    assert "[a-z]" in output
+    assert len(problems) == 1
+    assert problems[0].startswith("regex '^(a+)+$'")
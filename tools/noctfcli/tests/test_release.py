@@ -0,0 +1,80 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from rich.console import Console
+
+from noctfcli.client import NoCTFClient
+from noctfcli.commands.release import ReleaseProcessor
+from noctfcli.exceptions import NoCTFError
+from noctfcli.models import ReleasePlan
+from noctfcli.utils import format_api_datetime
+
+NOON = datetime(2025, 7, 19, 12, 0, tzinfo=timezone.utc)
+
+
+def _plan_waves(directory, plan=None):
+    processor = ReleaseProcessor(NoCTFClient("http://noctf.test"), Console())
+    waves = asyncio.run(processor.plan_waves(directory, plan))
+    return [
+        (wave.at, sorted(config.slug for config, _ in challenges))
+        for wave, challenges in waves
+    ]
+
+
+def test_waves_group_unhidden_challenges_by_visible_at(write_challenge):
+    write_challenge("late", visible_at="2025-07-19T14:00:00Z")
+    write_challenge("first", visible_at="2025-07-19T12:00:00Z")
+    write_challenge("also-first", visible_at="2025-07-19T12:00:00+00:00")
+    write_challenge("hidden", visible_at="2025-07-19T12:00:00Z", hidden=True)
+    directory = write_challenge("always-visible").parent
+
+    assert _plan_waves(directory) == [
+        (NOON, ["also-first", "first"]),
+        (NOON + timedelta(hours=2), ["late"]),
+    ]
+
+
+def test_plan_overrides_visible_at(write_challenge):
+    write_challenge("one", visible_at="2025-07-19T14:00:00Z")
+    directory = write_challenge("two").parent
+    plan = ReleasePlan.model_validate(
+        {
+            "waves": [
+                {"at": "2025-07-19T13:00:00Z", "challenges": ["two"]},
+                {"at": "2025-07-19T12:00:00Z", "challenges": ["one"]},
+            ],
+        },
+    )
+
+    assert _plan_waves(directory, plan) == [
+        (NOON, ["one"]),
+        (NOON + timedelta(hours=1), ["two"]),
+    ]
+
+
+def test_plan_with_unknown_challenge_fails(write_challenge):
+    directory = write_challenge("one").parent
+    plan = ReleasePlan.model_validate(
+        {"waves": [{"at": "2025-07-19T12:00:00Z", "challenges": ["one", "two"]}]},
+    )
+
+    with pytest.raises(NoCTFError, match="not found in directory: two"):
+        _plan_waves(directory, plan)
+
+
+def test_release_unhides_scheduled_challenges(stub, run_cli, write_challenge):
+    soon = format_api_datetime(datetime.now(timezone.utc) + timedelta(seconds=1))
+    write_challenge("scheduled", visible_at=soon)
+    directory = write_challenge("live").parent
+    result = run_cli(stub.url, "upload", str(directory))
+    assert result.exit_code == 0, result.output
+
+    result = run_cli(stub.url, "release", str(directory))
+
+    assert result.exit_code == 0, result.output
+    challenges = {c["slug"]: c for c in stub.state.challenges.values()}
+    assert not challenges["scheduled"]["hidden"]
+    # Hidden while staged, then unhidden at the wave
+    assert challenges["scheduled"]["version"] == 3
+    assert challenges["live"]["version"] == 1
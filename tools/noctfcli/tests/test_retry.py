@@ -0,0 +1,72 @@
+import asyncio
+
+import pytest
+
+from noctfcli import retry as retry_module
+from noctfcli.exceptions import APIError, NotFoundError
+from noctfcli.retry import is_retryable, retry
+
+
+@pytest.fixture(autouse=True)
+def no_delay(monkeypatch):
+    monkeypatch.setattr(retry_module, "RETRY_DELAY", 0)
+
+
+@pytest.mark.parametrize(
+    ("error", "retryable"),
+    [
+        (APIError("connection reset"), True),
+        (APIError("rate limited", status_code=429), True),
+        (APIError("bad gateway", status_code=502), True),
+        (APIError("bad request", status_code=400), False),
+        (NotFoundError("missing"), False),
+    ],
+)
+def test_is_retryable(error, retryable):
+    assert is_retryable(error) is retryable
+
+
+def _flaky(errors):
+    calls = []
+
+    async def request():
+        calls.append(None)
+        if len(calls) <= len(errors):
+            raise errors[len(calls) - 1]
+        return "ok"
+
+    return request, calls
+
+
+def test_retries_transient_errors():
+    request, calls = _flaky([APIError("down", status_code=503)] * 2)
+    retried = []
+    assert asyncio.run(retry(request, retries=3, on_retry=retried.append)) == "ok"
+    assert len(calls) == 3
+    assert len(retried) == 2
+
+
+def test_raises_last_error_after_retries():
+    errors = [APIError(f"attempt {i}", status_code=500) for i in range(3)]
+    request, calls = _flaky(errors)
+    with pytest.raises(APIError, match="attempt 2"):
+        asyncio.run(retry(request, retries=2))
+    assert len(calls) == 3
+
+
+def test_does_not_retry_client_errors():
+    request, calls = _flaky([APIError("bad request", status_code=400)])
+    with pytest.raises(APIError, match="bad request"):
+        asyncio.run(retry(request, retries=3))
+    assert len(calls) == 1
+
+
+def test_limit_is_released_while_waiting():
+    limit = asyncio.Semaphore(1)
+    request, _ = _flaky([APIError("down", status_code=503)])
+
+    async def main():
+        result = await retry(request, limit=limit)
+        return result, limit.locked()
+
+    assert asyncio.run(main()) == ("ok", False)
@@ -0,0 +1,137 @@
+import pytest
+
+from noctfcli.exceptions import ValidationError
+from noctfcli.models import ScoringConfig
+from noctfcli.scoring import (
+    Awards,
+    Solves,
+    _js_round,
+    _rank,
+    np,
+    parse_timestamps,
+    recompute,
+)
+
+pytestmark = pytest.mark.skipif(np is None, reason="requires numpy")
+
+QUADRATIC = ScoringConfig(
+    strategy="core:quadratic",
+    params={"minimum": 100, "initial": 500, "decay": 10},
+)
+EXPONENTIAL = ScoringConfig(
+    strategy="core:exponential",
+    params={"minimum": 100, "initial": 500, "k": 10, "j": 2},
+)
+
+
+def _solves(challenge_id, team_id, created_at=None, **kwargs):
+    if created_at is None:
+        created_at = list(range(1, len(challenge_id) + 1))
+    return Solves.from_columns(challenge_id, team_id, created_at, **kwargs)
+
+
+def test_js_round_rounds_halves_up():
+    values = _js_round(np.array([0.5, 1.5, 2.5, -0.5, -1.5, 2.4999]))
+    assert values.tolist() == [1.0, 2.0, 3.0, 0.0, -1.0, 2.0]
+
+
+def test_parse_timestamps():
+    times = parse_timestamps(["1970-01-01T00:00:01.500Z", "2025-07-19T10:00:00Z"])
+    assert times.tolist() == [1500, 1752919200000]
+
+
+def test_static_with_bonus_for_first_solvers():
+    scoring = {1: ScoringConfig(params={"base": 100}, bonus=[3, 2, 1])}
+    result = recompute(scoring, _solves([1, 1, 1, 1], [10, 11, 12, 13]))
+    assert result.solve_value.tolist() == [103, 102, 101, 100]
+    assert result.challenge_value == {1: 100}
+
+
+@pytest.mark.parametrize(
+    ("solvers", "value"),
+    [(1, 500), (2, 496), (6, 400), (11, 100), (20, 100)],
+)
+def test_quadratic(solvers, value):
+    result = recompute({1: QUADRATIC}, _solves([1] * solvers, range(solvers)))
+    assert result.challenge_value == {1: value}
+    assert set(result.solve_value.tolist()) == {value}
+
+
+@pytest.mark.parametrize(
+    ("solvers", "value"),
+    [(1, 500), (11, 300), (21, 180), (101, 104)],
+)
+def test_exponential(solvers, value):
+    result = recompute({1: EXPONENTIAL}, _solves([1] * solvers, range(solvers)))
+    assert result.challenge_value == {1: value}
+
+
+def test_bounded_weight_clamps_each_solve():
+    scoring = {
+        1: ScoringConfig(
+            strategy="core:bounded_weight",
+            params={"lower": 10, "upper": 50},
+        ),
+    }
+    solves = _solves([1, 1, 1], [1, 2, 3], weight=[5, 30, 80])
+    assert recompute(scoring, solves).solve_value.tolist() == [10, 30, 50]
+
+
+def test_fixed_values_do_not_count_as_solves():
+    solves = _solves([1, 1, 1], [1, 2, 3], value=[float("nan"), 42, float("nan")])
+    result = recompute({1: QUADRATIC}, solves)
+    assert result.solve_value.tolist() == [496, 42, 496]
+
+
+def test_scores_include_awards():
+    scoring = {1: ScoringConfig(params={"base": 100})}
+    awards = Awards(
+        team_id=np.array([2]),
+        created_at=np.array([5]),
+        value=np.array([250.0]),
+    )
+    result = recompute(scoring, _solves([1], [1]), awards, team_ids=[3])
+    assert result.team_id.tolist() == [1, 2, 3]
+    assert result.score.tolist() == [100, 250, 0]
+    assert result.rank.tolist() == [2, 1, 3]
+
+
+def test_rank_breaks_ties_by_last_solve_then_listing_order():
+    score = np.array([100, 200, 100, 100, 100])
+    last = np.array([30, 50, 20, 30, 0])
+    assert _rank(score, last).tolist() == [4, 1, 3, 5, 2]
+
+
+def test_rank_columns_are_ranked_separately():
+    score = np.array([[100, 0], [50, 10]])
+    last = np.array([[1, 0], [2, 3]])
+    assert _rank(score, last).tolist() == [[1, 2], [2, 1]]
+
+
+def test_timeline_follows_changing_values():
+    scoring = {1: ScoringConfig(params={"base": 100}), 2: QUADRATIC}
+    solves = _solves([1, 2, 2], [1, 1, 2], [0, 500, 1000])
+    result = recompute(scoring, solves, samples=3)
+    assert result.times.tolist() == [0, 500, 1000]
+    timeline = result.timeline([1, 2])
+    # Team 2's solve lowers the value of team 1's quadratic solve
+    assert timeline["teams"]["1"]["score"] == [100, 600, 596]
+    assert timeline["teams"]["2"]["score"] == [0, 0, 496]
+    assert timeline["teams"]["2"]["rank"] == [2, 2, 2]
+
+
+def test_missing_scoring_config():
+    with pytest.raises(ValidationError, match="No scoring config"):
+        recompute({}, _solves([1], [1]))
+
+
+def test_unknown_strategy():
+    scoring = {1: ScoringConfig(strategy="custom:thing", params={})}
+    with pytest.raises(ValidationError, match="custom:thing"):
+        recompute(scoring, _solves([1], [1]))
+
+
+def test_missing_strategy_params():
+    scoring = {1: ScoringConfig(strategy="core:quadratic", params={"minimum": 1})}
+    with pytest.raises(ValidationError, match="initial, decay"):
+        recompute(scoring, _solves([1], [1]))
@@ -0,0 +1,55 @@
+import base64
+import hashlib
+import hmac
+
+from noctfcli.signing import content_digest, sign_request
+
+
+def test_content_digest_matches_rfc_9530_example():
+    digest = content_digest(b'{"hello": "world"}')
+    assert digest == "sha-256=X48E9qOokqqrvdts8nOJRJN3OWDUoyWxBf7kbu9DBPE="
+
+
+def test_sign_request_covers_method_path_authority_and_digest():
+    digest = content_digest(b"[]")
+    headers = sign_request(
+        "put",
+        "/admin/challenges/7/weights",
+        "CTF.example.com",
+        "secret",
+        "challenge-7",
+        digest=digest,
+        created=1700000000,
+    )
+
+    params = (
+        '("@method" "@path" "@authority" "content-digest");created=1700000000;'
+        'keyid="challenge-7";alg="hmac-sha256"'
+    )
+    base = (
+        '"@method": PUT\n'
+        '"@path": /admin/challenges/7/weights\n'
+        '"@authority": ctf.example.com\n'
+        f'"content-digest": {digest}\n'
+        f'"@signature-params": {params}'
+    )
+    expected = hmac.new(b"secret", base.encode(), hashlib.sha256).digest()
+    assert headers == {
+        "Signature-Input": f"sig1={params}",
+        "Signature": f"sig1=:{base64.b64encode(expected).decode()}:",
+        "Content-Digest": digest,
+    }
+
+
+def test_sign_request_without_body():
+    headers = sign_request("GET", "/a", "host", "k", "id", created=1)
+    assert headers["Signature-Input"] == (
+        'sig1=("@method" "@path" "@authority");created=1;keyid="id";alg="hmac-sha256"'
+    )
+    assert "Content-Digest" not in headers
+
+
+def test_signature_depends_on_key():
+    first = sign_request("GET", "/a", "host", "k1", "id", created=1)
+    second = sign_request("GET", "/a", "host", "k2", "id", created=1)
+    assert first["Signature"] != second["Signature"]
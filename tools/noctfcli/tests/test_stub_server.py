@@ -0,0 +1,87 @@
+import asyncio
+
+import pytest
+import yaml
+
+from noctfcli.client import NoCTFClient
+from noctfcli.exceptions import APIError, ConflictError, NotFoundError
+from noctfcli.stub_server import StubFaults, StubServer
+
+
+def _run(server, func):
+    async def main():
+        async with NoCTFClient(server.url) as client:
+            client.set_token("token")
+            return await func(client)
+
+    return asyncio.run(main())
+
+
+def test_upload_update_and_pull_round_trip(stub, run_cli, write_challenge, tmp_path):
+    directory = write_challenge("warmup", files=["handout.txt"])
+    (directory / "handout.txt").write_text("hello")
+
+    result = run_cli(stub.url, "upload", str(directory.parent))
+    assert result.exit_code == 0, result.output
+    assert [c["slug"] for c in stub.state.challenges.values()] == ["warmup"]
+
+    write_challenge("warmup", title="Renamed", files=["handout.txt"])
+    result = run_cli(stub.url, "update", str(directory.parent))
+    assert result.exit_code == 0, result.output
+    (challenge,) = stub.state.challenges.values()
+    assert challenge["title"] == "Renamed"
+    assert challenge["version"] == 2
+
+    pulled = tmp_path / "pulled"
+    result = run_cli(stub.url, "pull", str(pulled))
+    assert result.exit_code == 0, result.output
+    config = yaml.safe_load((pulled / "warmup" / "noctf.yaml").read_text())
+    assert config["title"] == "Renamed"
+    assert config["flags"] == ["flag{warmup}"]
+    assert (pulled / "warmup" / "publish" / "handout.txt").read_text() == "hello"
+
+
+def test_stale_version_is_rejected(stub, run_cli, write_challenge):
+    directory = write_challenge("warmup")
+    run_cli(stub.url, "upload", str(directory.parent))
+    (challenge_id,) = stub.state.challenges
+
+    async def update(client):
+        challenge = await client.get_challenge_by_id(challenge_id)
+        config = client.challenge_to_config(challenge, [])
+        await client.update_challenge(challenge_id, config, [], challenge.version)
+        await client.update_challenge(challenge_id, config, [], challenge.version)
+
+    with pytest.raises(NotFoundError):
+        _run(stub, update)
+    assert stub.state.challenges[challenge_id]["version"] == 2
+
+
+def test_duplicate_slug_conflicts(stub, run_cli, write_challenge):
+    directory = write_challenge("warmup")
+    run_cli(stub.url, "upload", str(directory.parent))
+    (challenge_id,) = stub.state.challenges
+
+    async def create(client):
+        challenge = await client.get_challenge_by_id(challenge_id)
+        await client.create_challenge(client.challenge_to_config(challenge, []), [])
+
+    with pytest.raises(ConflictError):
+        _run(stub, create)
+
+
+def test_scoreboard_pages_cover_every_team(stub):
+    stub.seed(challenges=5, teams=120, seed=1)
+
+    entries = _run(stub, lambda client: client.get_scoreboard(1, page_size=50))
+
+    assert len(entries) == 120
+    assert len({e["team_id"] for e in entries}) == 120
+    assert [e["rank"] for e in entries] == sorted(e["rank"] for e in entries)
+
+
+def test_injected_errors_surface_as_api_errors():
+    server = StubServer(faults=StubFaults(error_rate=1.0, error_status=503))
+    with server, pytest.raises(APIError) as excinfo:
+        _run(server, lambda client: client.list_challenges())
+    assert excinfo.value.status_code == 503
@@ -0,0 +1,87 @@
+import pytest
+
+from noctfcli.commands.teams import read_team_rows
+from noctfcli.exceptions import ValidationError
+
+WRITES = (
+    "PUT /admin/teams/:id",
+    "PUT /admin/teams/:id/members",
+    "POST /admin/team_tags",
+)
+
+
+@pytest.fixture
+def seeded(stub):
+    stub.seed(teams=3, divisions=2)
+    return stub
+
+
+def _team(stub, name):
+    return next(t for t in stub.state.teams.values() if t["name"] == name)
+
+
+def _import(run_cli, stub, tmp_path, csv):
+    path = tmp_path / "teams.csv"
+    path.write_text(csv)
+    return run_cli(stub.url, "teams", "import", str(path))
+
+
+@pytest.mark.parametrize(
+    "rows",
+    [
+        ["{id},renamed,", ",team-1,"],
+        [",team-1,", ",TEAM-1,division-2"],
+        [",team-1,", "{id},team-1,"],
+    ],
+    ids=["id-then-name", "name-case", "name-then-id"],
+)
+def test_duplicate_rows_are_rejected_before_any_change(
+    seeded,
+    run_cli,
+    tmp_path,
+    rows,
+):
+    team_id = _team(seeded, "team-1")["id"]
+    csv = "id,name,division\n" + "\n".join(rows).format(id=team_id) + "\n"
+
+    result = _import(run_cli, seeded, tmp_path, csv)
+
+    assert result.exit_code == 1
+    assert "Line 3: team team-1 already imported on line 2" in result.output
+    assert not any(seeded.requests[key] for key in WRITES)
+
+
+def test_import_applies_changes_and_is_idempotent(seeded, run_cli, tmp_path):
+    csv = (
+        "name,division,tags,flags,owner,members\n"
+        "team-1,division-2,Students;Local,,user-1,user-2\n"
+        "team-3,,,hidden,,\n"
+    )
+
+    result = _import(run_cli, seeded, tmp_path, csv)
+
+    assert result.exit_code == 0, result.output
+    team = _team(seeded, "team-1")
+    tags = {tag["name"]: tag["id"] for tag in seeded.state.team_tags}
+    assert sorted(tags) == ["Local", "Students"]
+    assert team["division_id"] == seeded.state.divisions[1]["id"]
+    assert sorted(team["tag_ids"]) == sorted(tags.values())
+    assert sorted(m["role"] for m in team["members"]) == ["member", "owner"]
+    assert _team(seeded, "team-2")["members"] == []
+    assert _team(seeded, "team-3")["flags"] == ["hidden"]
+
+    writes = sum(seeded.requests[key] for key in WRITES)
+    result = _import(run_cli, seeded, tmp_path, csv)
+
+    assert result.exit_code == 0, result.output
+    assert "0 teams updated" in result.output
+    assert "2 unchanged" in result.output
+    assert sum(seeded.requests[key] for key in WRITES) == writes
+
+
+def test_unknown_column_is_rejected(tmp_path):
+    path = tmp_path / "teams.csv"
+    path.write_text("name,colour\nteam-1,red\n")
+
+    with pytest.raises(ValidationError, match="unknown columns: colour"):
+        read_team_rows(path)
@@ -0,0 +1,70 @@
+import pytest
+
+SLUGS = ("alpha", "bravo", "charlie")
+
+
+@pytest.fixture
+def uploaded(stub, run_cli, write_challenge):
+    """Upload three challenges, then edit their titles locally."""
+
+    for slug in SLUGS:
+        directory = write_challenge(slug)
+    result = run_cli(stub.url, "upload", str(directory.parent))
+    assert result.exit_code == 0, result.output
+    for slug in SLUGS:
+        write_challenge(slug, title=f"{slug} v2")
+    return directory.parent
+
+
+def _by_slug(stub):
+    return {c["slug"]: c for c in stub.state.challenges.values()}
+
+
+def test_atomic_update_applies_every_challenge(stub, run_cli, uploaded):
+    result = run_cli(stub.url, "update", "--atomic", str(uploaded))
+
+    assert result.exit_code == 0, result.output
+    assert {slug: c["title"] for slug, c in _by_slug(stub).items()} == {
+        slug: f"{slug} v2" for slug in SLUGS
+    }
+
+
+def test_mid_batch_failure_rolls_back_applied_updates(
+    stub,
+    run_cli,
+    uploaded,
+    monkeypatch,
+):
+    bravo = _by_slug(stub)["bravo"]
+    update_challenge = stub.admin_update_challenge
+
+    def admin_update_challenge(params, query, body, ctype):
+        # Someone else edits bravo after it was fetched, so its PUT is stale
+        if int(params["id"]) == bravo["id"]:
+            bravo["version"] += 1
+        return update_challenge(params, query, body, ctype)
+
+    monkeypatch.setattr(stub, "admin_update_challenge", admin_update_challenge)
+    result = run_cli(stub.url, "update", "--atomic", str(uploaded))
+
+    assert "Rolled back: 2" in result.output
+    assert "Failed: 1" in result.output
+    challenges = _by_slug(stub)
+    assert {slug: c["title"] for slug, c in challenges.items()} == {
+        slug: slug.title() for slug in SLUGS
+    }
+    # Applied and then restored, so two versions past the upload
+    assert challenges["alpha"]["version"] == 3
+    assert challenges["charlie"]["version"] == 3
+    assert challenges["bravo"]["version"] == 2
+
+
+def test_prepare_failure_updates_nothing(stub, run_cli, uploaded, write_challenge):
+    write_challenge("delta")
+
+    result = run_cli(stub.url, "update", "--atomic", str(uploaded))
+
+    assert "no challenges were updated" in result.output
+    assert "Failed: 1" in result.output
+    assert "Skipped: 3" in result.output
+    assert all(c["version"] == 1 for c in stub.state.challenges.values())
@@ -0,0 +1,104 @@
+import asyncio
+import json
+import time
+
+import pytest
+
+from noctfcli import retry as retry_module
+from noctfcli.client import NoCTFClient
+from noctfcli.commands.users import SessionRevoker
+from noctfcli.stub_server import StubError
+
+
+@pytest.fixture(autouse=True)
+def no_delay(monkeypatch):
+    monkeypatch.setattr(retry_module, "RETRY_DELAY", 0)
+
+
+@pytest.fixture
+def user_ids(stub):
+    stub.seed(teams=4)
+    return sorted(stub.state.users)
+
+
+def _revoke(stub, user_ids, **kwargs):
+    async def main():
+        async with NoCTFClient(stub.url) as client:
+            client.set_token("token")
+            return await SessionRevoker(client, **kwargs).revoke(user_ids)
+
+    return asyncio.run(main())
+
+
+def _fail(stub, monkeypatch, user_id, status, times=None):
+    """Make revoking a user's sessions fail, every time or the first few."""
+
+    revoke_sessions = stub.admin_revoke_sessions
+    failures = []
+
+    def admin_revoke_sessions(params, query, body, ctype):
+        if int(params["id"]) == user_id and (times is None or len(failures) < times):
+            failures.append(None)
+            raise StubError(status, "StubError", "Injected failure")
+        return revoke_sessions(params, query, body, ctype)
+
+    monkeypatch.setattr(stub, "admin_revoke_sessions", admin_revoke_sessions)
+
+
+def test_unknown_users_fail_without_stopping_the_others(stub, user_ids):
+    report = _revoke(stub, [*user_ids, 999], retries=2)
+
+    assert sorted(report.revoked) == user_ids
+    assert list(report.failed) == [999]
+    assert report.retries == 0
+    assert stub.state.revocations == dict.fromkeys(user_ids, 1)
+
+
+def test_transient_errors_are_retried(stub, user_ids, monkeypatch):
+    _fail(stub, monkeypatch, user_ids[0], 503, times=2)
+
+    report = _revoke(stub, user_ids, retries=2)
+
+    assert sorted(report.revoked) == user_ids
+    assert report.failed == {}
+    assert report.retries == 2
+
+
+def test_revocations_past_the_deadline_are_unfinished(stub, user_ids, monkeypatch):
+    revoke_sessions = stub.admin_revoke_sessions
+
+    def admin_revoke_sessions(params, query, body, ctype):
+        if int(params["id"]) == user_ids[-1]:
+            time.sleep(0.5)
+        return revoke_sessions(params, query, body, ctype)
+
+    monkeypatch.setattr(stub, "admin_revoke_sessions", admin_revoke_sessions)
+    report = _revoke(stub, user_ids, deadline=0.2)
+
+    assert sorted(report.revoked) == user_ids[:-1]
+    assert report.unfinished == [user_ids[-1]]
+
+
+def test_cli_reports_failed_users(stub, user_ids, run_cli, monkeypatch, tmp_path):
+    _fail(stub, monkeypatch, user_ids[1], 500)
+    report_path = tmp_path / "report.json"
+
+    result = run_cli(
+        stub.url,
+        "users",
+        "revoke-sessions",
+        *map(str, user_ids),
+        "--retries",
+        "1",
+        "--yes",
+        "--report",
+        str(report_path),
+    )
+
+    assert result.exit_code == 1
+    assert f"User {user_ids[1]}: Injected failure" in result.output
+    assert "Failed to revoke sessions of 1 users" in result.output
+    report = json.loads(report_path.read_text())
+    assert sorted(report["revoked"]) == [u for u in user_ids if u != user_ids[1]]
+    assert list(report["failed"]) == [str(user_ids[1])]
+    assert report["retries"] == 1
@@ -5,7 +5,16 @@ import logging
 import json
 import hashlib
 from pathlib import Path
-from typing import Dict
+from typing import Any, Dict
+
+try:
+    from noctfcli.fastjson import dumps as json_dumps, loads as json_loads
+except ImportError:
+
+    def json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode()
+
+    json_loads = json.loads
 
 
 class NoCTFFilePostProcessor:
@@ -52,14 +61,14 @@ class NoCTFFilePostProcessor:
 
     def run(self):
         try:
-            with open(self.challenge_details_file, "r") as f:
-                challenges = json.load(f)
+            with open(self.challenge_details_file, "rb") as f:
+                challenges = json_loads(f.read())
         except FileNotFoundError:
             self.logger.error(
                 f"Challenge details file not found: {self.challenge_details_file}"
             )
             return
-        except json.JSONDecodeError as e:
+        except ValueError as e:
             self.logger.error(f"Invalid JSON in challenge details file: {e}")
             return
 
@@ -121,8 +130,8 @@ class NoCTFFilePostProcessor:
                         self.logger.error(f"Could not determine hash for {filename}")
 
         try:
-            with open(self.challenge_details_file, "w") as f:
-                json.dump(challenges, f, separators=(",", ":"), ensure_ascii=False)
+            with open(self.challenge_details_file, "wb") as f:
+                f.write(json_dumps(challenges))
 
             self.logger.info(
                 f"Updated challenge details written to {self.challenge_details_file}"
@@ -2,24 +2,492 @@
 
 import os
 import argparse
+import hashlib
 import json
 import logging
+import math
+import sqlite3
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from itertools import accumulate, chain, repeat
 from pathlib import Path
 from typing import Any, Dict, Optional
 from urllib.parse import urljoin
 
 import requests
 from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    # orjson/msgspec-backed when installed (pip install 'noctfcli[fast]'),
+    # producing the same minified bytes as the json fallback below.
+    from noctfcli.fastjson import dumps as json_dumps, loads as json_loads
+except ImportError:
+
+    def json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode()
+
+    json_loads = json.loads
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+GRAPH_INTERVAL = 60
+GRAPH_BATCH_SIZE = 500
+
+
+def lttb_indices(xs: list["np.ndarray"], ys: list["np.ndarray"], target: int):
+    """Largest-Triangle-Three-Buckets over a batch of series at once.
+
+    Every series must have more than target points. The first and last points
+    are kept, and the rest are split into target - 2 buckets. From each bucket
+    the point forming the largest triangle with the point kept from the
+    previous bucket and the mean of the next bucket is kept. Buckets are
+    visited in order for all series together, so the Python loop runs once
+    per bucket rather than once per bucket per series.
+
+    Returns:
+        (len(xs), target) array of the indices to keep in each series
+    """
+    count = len(xs)
+    lengths = np.array([len(x) for x in xs])
+    width = lengths.max()
+    # Pad with each series' last point so gathers past its end stay in range
+    x = np.empty((count, width))
+    y = np.empty((count, width))
+    for i, (xi, yi) in enumerate(zip(xs, ys)):
+        x[i, : len(xi)], x[i, len(xi) :] = xi, xi[-1]
+        y[i, : len(yi)], y[i, len(yi) :] = yi, yi[-1]
+    rows = np.arange(count)
+
+    buckets = target - 2
+    every = (lengths - 2) / buckets
+    edges = (np.arange(buckets + 1) * every[:, None]).astype(int) + 1
+    edges[:, -1] = lengths - 1
+    starts, sizes = edges[:, :-1], np.diff(edges, axis=1)
+    offsets = np.arange(sizes.max())
+    index = starts[:, :, None] + offsets
+    valid = offsets < sizes[:, :, None]
+    index = np.where(valid, index, starts[:, :, None])
+
+    bx = x[rows[:, None, None], index]
+    by = y[rows[:, None, None], index]
+    # Mean of each bucket, then of the next bucket (the last point for the last)
+    mean_x = np.where(valid, bx, 0).sum(axis=2) / sizes
+    mean_y = np.where(valid, by, 0).sum(axis=2) / sizes
+    next_x = np.concatenate([mean_x[:, 1:], x[rows, lengths - 1, None]], axis=1)
+    next_y = np.concatenate([mean_y[:, 1:], y[rows, lengths - 1, None]], axis=1)
+
+    kept = np.empty((count, target), dtype=int)
+    kept[:, 0] = 0
+    kept[:, -1] = lengths - 1
+    ax, ay = x[:, 0], y[:, 0]
+    for bucket in range(buckets):
+        cx, cy = next_x[:, bucket, None], next_y[:, bucket, None]
+        area = np.abs(
+            (ax[:, None] - cx) * (by[:, bucket] - ay[:, None])
+            - (ax[:, None] - bx[:, bucket]) * (cy - ay[:, None])
+        )
+        area[~valid[:, bucket]] = -1
+        best = area.argmax(axis=1)
+        kept[:, bucket + 1] = index[rows, bucket, best]
+        ax, ay = bx[rows, bucket, best], by[rows, bucket, best]
+    return kept
+
+
+def _solve_times(entry: dict[str, Any]) -> list[float]:
+    return [
+        datetime.fromisoformat(solve["created_at"].replace("Z", "+00:00")).timestamp()
+        for solve in entry.get("solves", [])
+    ]
+
+
+def downsample_graphs(
+    entries: list[dict[str, Any]], target: int, exact_top: int = 10
+) -> int:
+    """Downsample the score graphs of scoreboard entries in place.
+
+    Graphs are [time deltas, score deltas] as returned by the API. Graphs
+    with more than target points are reduced to target points with LTTB.
+    For the exact_top highest ranked teams, the point of every solve is kept
+    as well, so their graphs step exactly where they solved.
+
+    Returns:
+        Number of graphs downsampled
+    """
+    long = [
+        entry for entry in entries if len(entry.get("graph", [[]])[0]) > target
+    ]
+    if not long or target < 3:
+        return 0
+    times = [np.cumsum(entry["graph"][0]) for entry in long]
+    scores = [np.cumsum(entry["graph"][1]) for entry in long]
+    # Batches are padded to their longest series, so bound their size
+    kept = [
+        keep
+        for start in range(0, len(long), GRAPH_BATCH_SIZE)
+        for keep in lttb_indices(
+            times[start : start + GRAPH_BATCH_SIZE],
+            scores[start : start + GRAPH_BATCH_SIZE],
+            target,
+        )
+    ]
+
+    for entry, t, score, lttb_keep in zip(long, times, scores, kept):
+        keep = lttb_keep
+        if entry.get("rank", exact_top + 1) <= exact_top:
+            solves = np.floor(np.array(_solve_times(entry)) / GRAPH_INTERVAL)
+            points = np.searchsorted(t, solves * GRAPH_INTERVAL, side="right") - 1
+            keep = np.union1d(keep, points[points >= 0])
+        entry["graph"] = [
+            np.diff(t[keep], prepend=0).tolist(),
+            np.diff(score[keep], prepend=0).tolist(),
+        ]
+    return len(long)
+
+
+ARCHIVE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS divisions (
+    id INTEGER PRIMARY KEY, name TEXT, slug TEXT, description TEXT,
+    is_visible INTEGER, is_joinable INTEGER, created_at TEXT
+);
+CREATE TABLE IF NOT EXISTS team_tags (
+    id INTEGER PRIMARY KEY, name TEXT, description TEXT, is_joinable INTEGER
+);
+CREATE TABLE IF NOT EXISTS teams (
+    id INTEGER PRIMARY KEY, name TEXT, bio TEXT, country TEXT,
+    division_id INTEGER, created_at TEXT
+);
+CREATE TABLE IF NOT EXISTS team_tag_members (
+    team_id INTEGER, tag_id INTEGER, PRIMARY KEY (team_id, tag_id)
+);
+CREATE TABLE IF NOT EXISTS team_members (
+    team_id INTEGER, user_id INTEGER, role TEXT, PRIMARY KEY (team_id, user_id)
+);
+CREATE TABLE IF NOT EXISTS users (
+    id INTEGER PRIMARY KEY, name TEXT, bio TEXT, country TEXT,
+    team_id INTEGER, created_at TEXT
+);
+CREATE TABLE IF NOT EXISTS challenges (
+    id INTEGER PRIMARY KEY, slug TEXT, title TEXT, description TEXT,
+    value REAL, solve_count INTEGER, hidden INTEGER
+);
+CREATE TABLE IF NOT EXISTS challenge_tags (
+    challenge_id INTEGER, key TEXT, value TEXT, PRIMARY KEY (challenge_id, key)
+);
+CREATE TABLE IF NOT EXISTS solves (
+    challenge_id INTEGER, team_id INTEGER, division_id INTEGER,
+    created_at TEXT, value INTEGER, bonus INTEGER, hidden INTEGER,
+    PRIMARY KEY (challenge_id, team_id)
+);
+CREATE INDEX IF NOT EXISTS solves_challenge_team_time
+    ON solves (challenge_id, team_id, created_at);
+CREATE INDEX IF NOT EXISTS solves_challenge_time ON solves (challenge_id, created_at);
+CREATE INDEX IF NOT EXISTS solves_team_time ON solves (team_id, created_at);
+CREATE TABLE IF NOT EXISTS awards (
+    id INTEGER PRIMARY KEY, team_id INTEGER, division_id INTEGER,
+    title TEXT, value REAL, created_at TEXT
+);
+CREATE TABLE IF NOT EXISTS scoreboard (
+    division_id INTEGER, team_id INTEGER, rank INTEGER, score REAL,
+    last_solve TEXT, updated_at TEXT, hidden INTEGER,
+    PRIMARY KEY (division_id, team_id)
+);
+CREATE TABLE IF NOT EXISTS score_history (
+    team_id INTEGER, time INTEGER, score REAL, PRIMARY KEY (team_id, time)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS challenge_stats (
+    division_id INTEGER, challenge_id INTEGER, correct_count INTEGER,
+    incorrect_count INTEGER, first_solve TEXT, first_solve_team_id INTEGER,
+    released_at TEXT, hidden INTEGER, PRIMARY KEY (division_id, challenge_id)
+);
+CREATE TABLE IF NOT EXISTS announcements (
+    id INTEGER PRIMARY KEY, title TEXT, message TEXT, important INTEGER,
+    created_at TEXT, updated_at TEXT
+);
+"""
+
+
+class SQLiteArchive:
+    """Single-file SQLite archive of an event, written alongside the JSON.
+
+    Each table is written in one transaction with executemany, so rows are
+    streamed from the API responses rather than built up in memory. Rows are
+    replaced by key, so exporting into an existing archive refreshes it.
+    """
+
+    def __init__(self, path: str):
+        self.db = sqlite3.connect(path)
+        self.db.execute("PRAGMA journal_mode = WAL")
+        self.db.execute("PRAGMA synchronous = NORMAL")
+        self.db.executescript(ARCHIVE_SCHEMA)
+
+    def _insert(
+        self, table: str, columns: list[str], rows: Iterable[tuple], upsert: str = ""
+    ) -> None:
+        verb = "INSERT" if upsert else "INSERT OR REPLACE"
+        sql = (
+            f"{verb} INTO {table} ({', '.join(columns)}) "
+            f"VALUES ({', '.join('?' * len(columns))}) {upsert}"
+        )
+        with self.db:
+            self.db.executemany(sql, rows)
+
+    def add_site_config(self, config: dict[str, Any]) -> None:
+        self._insert(
+            "meta",
+            ["key", "value"],
+            [("site_config", json_dumps(config["data"]).decode())],
+        )
+
+    def add_divisions(self, divisions: dict[str, Any]) -> None:
+        columns = ["id", "name", "slug", "description", "is_visible", "is_joinable"]
+        self._insert(
+            "divisions",
+            [*columns, "created_at"],
+            (
+                (*(d.get(c) for c in columns), d.get("created_at"))
+                for d in divisions["data"]
+            ),
+        )
+
+    def add_team_tags(self, team_tags: dict[str, Any]) -> None:
+        columns = ["id", "name", "description", "is_joinable"]
+        self._insert(
+            "team_tags",
+            columns,
+            (tuple(t.get(c) for c in columns) for t in team_tags["data"]["tags"]),
+        )
+
+    def add_teams(self, teams: dict[str, Any]) -> None:
+        entries = teams["data"]["entries"]
+        columns = ["id", "name", "bio", "country", "division_id", "created_at"]
+        self._insert(
+            "teams", columns, (tuple(t.get(c) for c in columns) for t in entries)
+        )
+        self._insert(
+            "team_tag_members",
+            ["team_id", "tag_id"],
+            ((t["id"], tag_id) for t in entries for tag_id in t.get("tag_ids", [])),
+        )
+        self._insert(
+            "team_members",
+            ["team_id", "user_id", "role"],
+            (
+                (t["id"], m["user_id"], m["role"])
+                for t in entries
+                for m in t.get("members", [])
+            ),
+        )
+
+    def add_users(self, users: dict[str, Any]) -> None:
+        columns = ["id", "name", "bio", "country", "team_id", "created_at"]
+        self._insert(
+            "users",
+            columns,
+            (tuple(u.get(c) for c in columns) for u in users["data"]["entries"]),
+        )
+
+    def add_challenges(
+        self, challenges: dict[str, Any], details: list[dict[str, Any]]
+    ) -> None:
+        entries = challenges["data"]["challenges"]
+        descriptions = {d["data"]["id"]: d["data"].get("description") for d in details}
+        self._insert(
+            "challenges",
+            ["id", "slug", "title", "description", "value", "solve_count", "hidden"],
+            (
+                (
+                    c["id"],
+                    c.get("slug"),
+                    c.get("title"),
+                    descriptions.get(c["id"]),
+                    c.get("value"),
+                    c.get("solve_count"),
+                    c.get("hidden"),
+                )
+                for c in entries
+            ),
+        )
+        self._insert(
+            "challenge_tags",
+            ["challenge_id", "key", "value"],
+            (
+                (c["id"], key, value)
+                for c in entries
+                for key, value in (c.get("tags") or {}).items()
+            ),
+        )
+
+    def add_challenge_solves(
+        self, division_id: int, solves: dict[int, dict[str, Any]]
+    ) -> None:
+        # Values are filled in from the scoreboard, which has them
+        self._insert(
+            "solves",
+            ["challenge_id", "team_id", "division_id", "created_at"],
+            (
+                (challenge_id, solve["team_id"], division_id, solve["created_at"])
+                for challenge_id, response in solves.items()
+                for solve in response["data"]
+            ),
+            upsert="ON CONFLICT DO NOTHING",
+        )
+
+    def add_scoreboard(self, division_id: int, scoreboard: dict[str, Any]) -> None:
+        entries = scoreboard["data"]["entries"]
+        self._insert(
+            "scoreboard",
+            [
+                "division_id",
+                "team_id",
+                "rank",
+                "score",
+                "last_solve",
+                "updated_at",
+                "hidden",
+            ],
+            (
+                (
+                    division_id,
+                    e["team_id"],
+                    e.get("rank"),
+                    e.get("score"),
+                    e.get("last_solve"),
+                    e.get("updated_at"),
+                    e.get("hidden"),
+                )
+                for e in entries
+            ),
+        )
+        self._insert(
+            "solves",
+            [
+                "challenge_id",
+                "team_id",
+                "division_id",
+                "created_at",
+                "value",
+                "bonus",
+                "hidden",
+            ],
+            (
+                (
+                    solve["challenge_id"],
+                    e["team_id"],
+                    division_id,
+                    solve["created_at"],
+                    solve.get("value"),
+                    solve.get("bonus"),
+                    solve.get("hidden"),
+                )
+                for e in entries
+                for solve in e.get("solves", [])
+            ),
+            upsert="ON CONFLICT (challenge_id, team_id) DO UPDATE SET "
+            "value = excluded.value, bonus = excluded.bonus, hidden = excluded.hidden",
+        )
+        self._insert(
+            "awards",
+            ["id", "team_id", "division_id", "title", "value", "created_at"],
+            (
+                (
+                    a["id"],
+                    e["team_id"],
+                    division_id,
+                    a["title"],
+                    a["value"],
+                    a["created_at"],
+                )
+                for e in entries
+                for a in e.get("awards", [])
+            ),
+        )
+        self._insert(
+            "score_history",
+            ["team_id", "time", "score"],
+            # Graphs are deltas; accumulate them into absolute times and scores
+            chain.from_iterable(
+                zip(repeat(e["team_id"]), accumulate(times), accumulate(scores))
+                for e in entries
+                for times, scores in [e.get("graph", [[], []])]
+            ),
+        )
+
+    def add_challenge_stats(self, division_id: int, stats: dict[str, Any]) -> None:
+        columns = [
+            "correct_count",
+            "incorrect_count",
+            "first_solve",
+            "first_solve_team_id",
+            "released_at",
+            "hidden",
+        ]
+        self._insert(
+            "challenge_stats",
+            ["division_id", "challenge_id", *columns],
+            (
+                (division_id, s["id"], *(s.get(c) for c in columns))
+                for s in stats["data"]["entries"]
+            ),
+        )
+
+    def add_announcements(self, announcements: dict[str, Any]) -> None:
+        columns = ["id", "title", "message", "important", "created_at", "updated_at"]
+        self._insert(
+            "announcements",
+            columns,
+            (
+                tuple(a.get(c) for c in columns)
+                for a in announcements["data"]["entries"]
+            ),
+        )
+
+    def add_user_stats(self, stats: dict[str, Any]) -> None:
+        self._insert(
+            "meta",
+            ["key", "value"],
+            [("user_stats", json_dumps(stats["data"]).decode())],
+        )
+
+    def close(self) -> None:
+        # Fold the write-ahead log back in so the archive is a single file
+        self.db.execute("PRAGMA journal_mode = DELETE")
+        self.db.close()
 
 
 class NoCTFExporter:
     def __init__(
-        self, base_url: str, token: Optional[str] = None, output_dir: str = "export"
+        self,
+        base_url: str,
+        token: Optional[str] = None,
+        output_dir: str = "export",
+        concurrency: int = 16,
+        retries: int = 3,
+        sharded: bool = False,
+        page_size: int = 25,
+        graph_points: Optional[int] = None,
+        graph_exact_top: int = 10,
+        sqlite_path: Optional[str] = None,
     ):
         self.base_url = base_url.rstrip("/")
         self.token = token
         self.output_dir = Path(output_dir)
+        self.concurrency = concurrency
+        self.retries = retries
+        self.sharded = sharded
+        self.page_size = page_size
+        self.graph_points = graph_points
+        self.graph_exact_top = graph_exact_top
+        self.archive = SQLiteArchive(sqlite_path) if sqlite_path else None
         self.session = self._create_session()
+        # Size and hash of each file written by this run, for the index
+        self.saved_files: dict[str, dict[str, Any]] = {}
 
         self.output_dir.mkdir(parents=True, exist_ok=True)
 
@@ -38,7 +506,20 @@ class NoCTFExporter:
         if self.token:
             session.headers.update({"Authorization": f"Bearer {self.token}"})
 
-        adapter = HTTPAdapter()
+        # Retry connection errors, rate limits (honouring Retry-After) and 5xx
+        # responses. The POSTs sent are read-only queries, so are safe to retry.
+        retry = Retry(
+            total=self.retries,
+            backoff_factor=0.5,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=("GET", "POST"),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=self.concurrency,
+            pool_maxsize=self.concurrency,
+            max_retries=retry,
+        )
         session.mount("http://", adapter)
         session.mount("https://", adapter)
 
@@ -53,8 +534,8 @@ class NoCTFExporter:
             self.logger.info(f"Fetching {method} {endpoint} {kwargs.get('params') or ''}")
             response = self.session.request(method, url, timeout=30, **kwargs)
             response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
+            return json_loads(response.content)
+        except (requests.exceptions.RequestException, ValueError) as e:
             self.logger.error(f"Failed to fetch {endpoint}: {e}")
             return None
 
@@ -66,9 +547,15 @@ class NoCTFExporter:
         else:
             filepath = self.output_dir / filename
         try:
-            with open(filepath, "w", encoding="utf-8") as f:
-                json.dump(data, f, separators=(",", ":"), ensure_ascii=False)
+            filepath.parent.mkdir(parents=True, exist_ok=True)
+            content = json_dumps(data)
+            with open(filepath, "wb") as f:
+                f.write(content)
                 # json.dump(data, f, indent=2, ensure_ascii=False)
+            self.saved_files[filepath.relative_to(self.output_dir).as_posix()] = {
+                "size": len(content),
+                "sha256": hashlib.sha256(content).hexdigest(),
+            }
             self.logger.info(f"Saved {filename}")
         except Exception as e:
             self.logger.error(f"Failed to save {filename}: {e}")
@@ -78,7 +565,12 @@ class NoCTFExporter:
     ) -> Dict[str, Any]:
         query_data.update({"page": 1, "page_size": page_size})
 
-        response = self._make_request(endpoint, method="POST", json=query_data)
+        response = self._make_request(
+            endpoint,
+            method="POST",
+            data=json_dumps(query_data),
+            headers={"Content-Type": "application/json"},
+        )
         assert response
         return response
 
@@ -86,11 +578,15 @@ class NoCTFExporter:
         data = self._make_request("/site/config")
         if data:
             self._save_json(data, "site_config.json")
+            if self.archive:
+                self.archive.add_site_config(data)
 
     def export_divisions(self) -> Dict[str, Any]:
         data = self._make_request("/divisions")
         if data:
             self._save_json(data, "divisions.json")
+            if self.archive:
+                self.archive.add_divisions(data)
             return data
         return {}
 
@@ -98,16 +594,22 @@ class NoCTFExporter:
         data = self._make_request("/team_tags")
         if data:
             self._save_json(data, "team_tags.json")
+            if self.archive:
+                self.archive.add_team_tags(data)
             return data
         return {}
 
-    def export_teams(self) -> None:
+    def export_teams(self) -> dict[str, Any]:
         query_data = {"filters": {}}
 
         teams = self._paginate_query("/teams/query", query_data, page_size=10000)
         if teams:
             self._save_json(teams, "teams.json")
+            if self.archive:
+                self.archive.add_teams(teams)
             self.logger.info(f"Exported {len(teams)} teams")
+            return teams
+        return {}
 
     def export_users(self) -> None:
         query_data = {"filters": {}}
@@ -115,6 +617,8 @@ class NoCTFExporter:
         users = self._paginate_query("/users/query", query_data, page_size=10000)
         if users:
             self._save_json(users, "users.json")
+            if self.archive:
+                self.archive.add_users(users)
             self.logger.info(f"Exported {len(users)} users")
 
     def export_challenges(self) -> Dict[str, Any]:
@@ -131,7 +635,13 @@ class NoCTFExporter:
                     if detail:
                         challenge_details.append(detail)
 
-            if challenge_details:
+            if self.archive:
+                self.archive.add_challenges(challenges, challenge_details)
+
+            if challenge_details and self.sharded:
+                for detail in challenge_details:
+                    self._save_json(detail, f"challenges/{detail['data']['id']}.json")
+            elif challenge_details:
                 self._save_json(challenge_details, "challenge_details.json")
                 self.logger.info(
                     f"Exported details for {len(challenge_details)} challenges"
@@ -158,7 +668,15 @@ class NoCTFExporter:
                 if solves:
                     div_solves[challenge_id] = solves
 
-            if div_solves:
+            if self.archive:
+                self.archive.add_challenge_solves(division_id, div_solves)
+
+            if div_solves and self.sharded:
+                for challenge_id, solves in div_solves.items():
+                    self._save_json(
+                        solves, f"challenge_solves/{challenge_id}.json", division_id
+                    )
+            elif div_solves:
                 self._save_json(div_solves, "challenge_solves.json", division_id)
                 self.logger.info(
                     f"Exported solves for {len(div_solves)} challenges for division {division_id}"
@@ -174,22 +692,95 @@ class NoCTFExporter:
 
             scoreboard = self._make_request(
                 f"/scoreboard/divisions/{division_id}",
-                params={"page": 1, "page_size": 10000, "graph_interval": 60},
+                params={
+                    "page": 1,
+                    "page_size": 10000,
+                    "graph_interval": GRAPH_INTERVAL,
+                },
             )
+            if scoreboard and self.archive:
+                # Before downsampling, so the archive keeps the full graphs
+                self.archive.add_scoreboard(division_id, scoreboard)
+            if scoreboard and self.graph_points:
+                downsampled = downsample_graphs(
+                    scoreboard["data"]["entries"],
+                    self.graph_points,
+                    self.graph_exact_top,
+                )
+                self.logger.info(
+                    f"Downsampled graphs of {downsampled} teams "
+                    f"in division {division_id}"
+                )
             if scoreboard:
                 self._save_json(scoreboard, "scoreboard.json", division_id)
                 self.logger.info(f"Exported main scoreboard for division {division_id}")
+                if self.sharded:
+                    self._save_scoreboard_pages(scoreboard, division_id)
+
+            ctftime = self._make_request(f"/scoreboard/divisions/{division_id}/ctftime")
+            if ctftime:
+                self._save_json(ctftime, "ctftime.json", division_id)
+                self.logger.info(f"Exported CTFtime feed for division {division_id}")
+
+    def _save_scoreboard_pages(
+        self, scoreboard: dict[str, Any], division_id: int
+    ) -> None:
+        # The full scoreboard is still saved for tag filters; pages serve the
+        # default view. Page 1 is saved even if the scoreboard is empty.
+        entries = scoreboard["data"]["entries"]
+        pages = max(1, math.ceil(len(entries) / self.page_size))
+        for page in range(1, pages + 1):
+            start = (page - 1) * self.page_size
+            data = {
+                "entries": entries[start : start + self.page_size],
+                "page_size": self.page_size,
+                "total": len(entries),
+            }
+            self._save_json({"data": data}, f"scoreboard/{page}.json", division_id)
+        self.logger.info(
+            f"Exported {pages} scoreboard pages for division {division_id}"
+        )
+
+    def export_team_scoreboards(self, teams: dict[str, Any]) -> None:
+        # One file per team, so the static site only loads the team page opened
+        team_ids = [team["id"] for team in teams["data"]["entries"]]
+
+        def export_team(team_id: int) -> bool:
+            scoreboard = self._make_request(
+                f"/scoreboard/teams/{team_id}",
+                params={"graph_interval": GRAPH_INTERVAL},
+            )
+            if scoreboard:
+                self._save_json(scoreboard, f"teams/{team_id}.json")
+            return bool(scoreboard)
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            exported = list(executor.map(export_team, team_ids))
+        failed = [team_id for team_id, ok in zip(team_ids, exported) if not ok]
+        if failed:
+            self.logger.error(
+                f"Failed to export scoreboards for {len(failed)} teams: "
+                f"{', '.join(map(str, failed))}"
+            )
+        self.logger.info(
+            f"Exported scoreboards for {len(team_ids) - len(failed)}/{len(team_ids)} "
+            "teams"
+        )
 
     def export_announcements(self) -> None:
         announcements = self._make_request("/announcements")
         if announcements:
             self._save_json(announcements, "announcements.json")
+            if self.archive:
+                self.archive.add_announcements(announcements)
             self.logger.info(f"Exported {len(announcements)} announcements")
 
     def export_statistics(self, divisions: Dict[str, Any]) -> None:
         user_stats = self._make_request("/stats/users")
         if user_stats:
             self._save_json(user_stats, "user_stats.json")
+            if self.archive:
+                self.archive.add_user_stats(user_stats)
             self.logger.info(f"Exported user statistics")
 
         for division in divisions["data"]:
@@ -202,35 +793,71 @@ class NoCTFExporter:
             )
             if challenge_stats:
                 self._save_json(challenge_stats, "challenge_stats.json", division_id)
+                if self.archive:
+                    self.archive.add_challenge_stats(division_id, challenge_stats)
                 self.logger.info(
                     f"Exported challenge statistics for division {division_id}"
                 )
 
+    def export_index(self) -> None:
+        # Lets the static site find shards and check their sizes and hashes.
+        # Team shards are left out to keep it small, as they are one per team.
+        # Only files written by this run are listed, not stale ones left over
+        # from an earlier export into the same directory.
+        files = {}
+        teams = 0
+        for name, entry in sorted(self.saved_files.items()):
+            if name.startswith("teams/"):
+                teams += 1
+                continue
+            if name == "index.json":
+                continue
+            files[name] = entry
+        index = {
+            "version": 1,
+            "scoreboard_page_size": self.page_size,
+            "team_shards": teams,
+            "files": files,
+        }
+        self._save_json(index, "index.json")
+        self.logger.info(f"Indexed {len(files)} files")
+
     def export_all(self) -> None:
         self.logger.info("Starting full export of noCTF data")
 
-        self.export_site_config()
-        divisions = self.export_divisions()
-        assert divisions, "Failed to export divisions"
-        for div in divisions["data"]:
-            div_id = div.get("id")
-            (self.output_dir / f"division:{div_id}").mkdir(parents=True, exist_ok=True)
+        try:
+            self.export_site_config()
+            divisions = self.export_divisions()
+            assert divisions, "Failed to export divisions"
+            for div in divisions["data"]:
+                div_id = div.get("id")
+                (self.output_dir / f"division:{div_id}").mkdir(
+                    parents=True, exist_ok=True
+                )
+
+            team_tags = self.export_team_tags()
 
-        team_tags = self.export_team_tags()
+            teams = self.export_teams()
+            self.export_users()
 
-        self.export_teams()
-        self.export_users()
+            challenges = self.export_challenges()
+            assert challenges, "Failed to export challenges"
 
-        challenges = self.export_challenges()
-        assert challenges, "Failed to export challenges"
+            self.export_challenge_solves(challenges, divisions)
 
-        self.export_challenge_solves(challenges, divisions)
+            self.export_scoreboards(divisions)
+            if teams:
+                self.export_team_scoreboards(teams)
 
-        self.export_scoreboards(divisions)
+            self.export_announcements()
 
-        self.export_announcements()
+            self.export_statistics(divisions)
 
-        self.export_statistics(divisions)
+            if self.sharded:
+                self.export_index()
+        finally:
+            if self.archive:
+                self.archive.close()
 
         self.logger.info(f"Export completed! Files saved to: {self.output_dir}")
 
@@ -252,6 +879,56 @@ def main():
         help="Output directory for exported files (default: export)",
     )
 
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=16,
+        help="Requests in flight when exporting team scoreboards (default: 16)",
+    )
+
+    parser.add_argument(
+        "--retries",
+        type=int,
+        default=3,
+        help="Retries for connection errors, 429 and 5xx responses (default: 3)",
+    )
+
+    parser.add_argument(
+        "--sharded",
+        action="store_true",
+        help="Save challenge details, solves and scoreboard pages as separate "
+        "files with an index.json manifest, so the static site loads only what "
+        "it shows",
+    )
+
+    parser.add_argument(
+        "--page-size",
+        type=int,
+        default=25,
+        help="Teams per scoreboard page with --sharded (default: 25, as on the site)",
+    )
+
+    parser.add_argument(
+        "--graph-points",
+        type=int,
+        help="Downsample division scoreboard graphs to this many points per "
+        "team (requires numpy)",
+    )
+
+    parser.add_argument(
+        "--graph-exact-top",
+        type=int,
+        default=10,
+        help="Keep every solve in the graphs of this many top teams "
+        "when downsampling (default: 10)",
+    )
+
+    parser.add_argument(
+        "--sqlite",
+        metavar="PATH",
+        help="Also write the event to a single-file SQLite archive",
+    )
+
     parser.add_argument(
         "--verbose", "-v", action="store_true", help="Enable verbose logging"
     )
@@ -266,7 +943,23 @@ def main():
        print("NOCTF_TOKEN env var for static_export user is required")
        exit(1)
 
-    exporter = NoCTFExporter(args.base_url, TOKEN, args.output)
+    if args.graph_points and np is None:
+        parser.error(
+            "--graph-points requires numpy (pip install -r requirements-graphs.txt)"
+        )
+
+    exporter = NoCTFExporter(
+        args.base_url,
+        TOKEN,
+        args.output,
+        args.concurrency,
+        args.retries,
+        args.sharded,
+        args.page_size,
+        args.graph_points,
+        args.graph_exact_top,
+        args.sqlite,
+    )
     exporter.export_all()
 
 
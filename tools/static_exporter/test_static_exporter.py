@@ -0,0 +1,92 @@
+import math
+import random
+
+import pytest
+
+from static_exporter import downsample_graphs, lttb_indices, np
+
+pytestmark = pytest.mark.skipif(np is None, reason="requires numpy")
+
+
+def reference_lttb(xs, ys, target):
+    """Straightforward per-series LTTB, as originally described by Steinarsson."""
+
+    every = (len(xs) - 2) / (target - 2)
+    kept = [0]
+    a = 0
+    for i in range(target - 2):
+        next_start = math.floor((i + 1) * every) + 1
+        next_end = min(math.floor((i + 2) * every) + 1, len(xs))
+        if i == target - 3:
+            next_start, next_end = len(xs) - 1, len(xs)
+        avg_x = sum(xs[next_start:next_end]) / (next_end - next_start)
+        avg_y = sum(ys[next_start:next_end]) / (next_end - next_start)
+
+        start = math.floor(i * every) + 1
+        end = len(xs) - 1 if i == target - 3 else math.floor((i + 1) * every) + 1
+        best, best_area = start, -1.0
+        for j in range(start, end):
+            area = abs(
+                (xs[a] - avg_x) * (ys[j] - ys[a]) - (xs[a] - xs[j]) * (avg_y - ys[a]),
+            )
+            if area > best_area:
+                best, best_area = j, area
+        kept.append(best)
+        a = best
+    kept.append(len(xs) - 1)
+    return kept
+
+
+def test_keeps_spike():
+    ys = [0, 0, 0, 0, 0, 10, 0, 0, 0, 0]
+    kept = lttb_indices([np.arange(10.0)], [np.array(ys, dtype=float)], 3)
+    assert kept.tolist() == [[0, 5, 9]]
+
+
+def test_keeps_endpoints_and_one_point_per_bucket():
+    xs = np.arange(100.0)
+    ys = np.sin(xs / 5)
+    kept = lttb_indices([xs], [ys], 12)[0]
+    assert kept[0] == 0
+    assert kept[-1] == 99
+    assert np.all(np.diff(kept) > 0)
+
+
+def test_batch_matches_reference():
+    rng = random.Random(0)
+    xs, ys = [], []
+    for _ in range(20):
+        length = rng.randint(12, 200)
+        x = sorted(rng.sample(range(10 * length), length))
+        xs.append(np.array(x, dtype=float))
+        ys.append(np.cumsum([rng.choice([0, 0, 0, 50, 100]) for _ in x]).astype(float))
+    target = 10
+    kept = lttb_indices(xs, ys, target)
+    for row, x, y in zip(kept, xs, ys):
+        assert row.tolist() == reference_lttb(x.tolist(), y.tolist(), target)
+
+
+def test_downsample_graphs_keeps_top_team_solves():
+    # One score step every other minute, as deltas like the API returns
+    steps = 50
+    graph = [[60] * steps, [10 if i % 2 else 0 for i in range(steps)]]
+    entries = [
+        {"rank": 1, "graph": [list(graph[0]), list(graph[1])], "solves": []},
+        {"rank": 2, "graph": [list(graph[0]), list(graph[1])]},
+        {"rank": 3, "graph": [[60, 60], [10, 10]]},
+    ]
+    entries[0]["solves"] = [
+        {"created_at": "1970-01-01T00:05:30Z"},
+        {"created_at": "1970-01-01T00:41:00Z"},
+    ]
+
+    assert downsample_graphs(entries, target=5, exact_top=1) == 2
+    top, second, short = entries
+    assert len(second["graph"][0]) == 5
+    assert short["graph"] == [[60, 60], [10, 10]]
+    # The solves fall in the minutes at 300s and 2460s, which are kept
+    times = np.cumsum(top["graph"][0])
+    assert {300, 2460} <= set(times.tolist())
+    # Deltas still add up to the final time and score
+    assert sum(top["graph"][0]) == 60 * steps
+    assert sum(top["graph"][1]) == sum(graph[1])